@@ -2,6 +2,8 @@
 Context processors para estudiantes
 Inyecta datos del estudiante en todos los templates automáticamente
 """
+from config import roles
+
 
 def estudiante_data(request):
     """
@@ -10,8 +12,9 @@ def estudiante_data(request):
     """
     context = {}
 
-    if request.user.is_authenticated and hasattr(request.user, 'estudiante'):
-        context['estudiante_actual'] = request.user.estudiante
+    estudiante = roles.obtener(request).estudiante
+    if estudiante is not None:
+        context['estudiante_actual'] = estudiante
 
     return context
 
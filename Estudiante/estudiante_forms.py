@@ -286,6 +286,7 @@ class EstudiantePerfilForm(forms.ModelForm):
             'programa_academico',
             'semestre',
             'promedio_academico',
+            'habilidades',
             'foto_perfil',
             'hoja_vida',
         ]
@@ -324,6 +325,11 @@ class EstudiantePerfilForm(forms.ModelForm):
                 'step': '0.01',
                 'placeholder': '0.00'
             }),
+            'habilidades': forms.Textarea(attrs={
+                'class': 'form-control',
+                'rows': 3,
+                'placeholder': 'Ej: Python, Django, bases de datos, trabajo en equipo...'
+            }),
             'hoja_vida': forms.FileInput(attrs={
                 'class': 'form-control',
                 'accept': '.pdf'
@@ -341,6 +347,7 @@ class EstudiantePerfilForm(forms.ModelForm):
             'programa_academico': 'Programa Académico',
             'semestre': 'Semestre Actual',
             'promedio_academico': 'Promedio Académico',
+            'habilidades': 'Habilidades',
             'hoja_vida': 'Hoja de Vida (PDF)',
             'foto_perfil': 'Foto de Perfil',
         }
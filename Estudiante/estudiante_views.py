@@ -3,9 +3,12 @@ from django.contrib.auth import login, logout, authenticate
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import F, Value, Case, When, Exists, OuterRef, BooleanField
+from django.db.models.functions import Lower
+from django.db.models.lookups import Contains
+from django.core.paginator import Paginator
 from functools import wraps
-from django.http import HttpResponseForbidden
+from django.http import HttpResponse, HttpResponseForbidden
 
 # ✅ Importar modelos desde coordinacion
 from coordinacion.models import (
@@ -21,7 +24,8 @@ from .estudiante_forms import (
 )
 
 # ✅ Importar serializadores de coordinacion para React
-from coordinacion import serializers
+from coordinacion import afinidad, busqueda, serializers, chat_pubsub, lectura, sondeo
+from config.basedatos import escribir
 
 
 # ============================================
@@ -39,8 +43,8 @@ def estudiante_required(view_func):
             messages.warning(request, 'Debes iniciar sesión como estudiante')
             return redirect('login_unificado')
 
-        # Verificar que tenga el objeto estudiante asociado
-        if not hasattr(request.user, 'estudiante'):
+        # Verificar que tenga el perfil de estudiante asociado
+        if 'estudiante' not in request.roles:
             messages.error(request, 'Tu cuenta no está registrada como estudiante')
             return HttpResponseForbidden('Acceso denegado: solo estudiantes')
 
@@ -80,7 +84,7 @@ def estudiante_registro(request):
     ✅ Asigna automáticamente estado según programa y semestre
     """
     # Si ya está autenticado, redirigir al dashboard
-    if request.user.is_authenticated and hasattr(request.user, 'estudiante'):
+    if 'estudiante' in request.roles:
         return redirect('estudiante:dashboard')
 
     if request.method == 'POST':
@@ -135,8 +139,8 @@ def estudiante_logout(request):
     """
     Cerrar sesión del estudiante
     """
-    if request.user.is_authenticated and hasattr(request.user, 'estudiante'):
-        nombre = request.user.estudiante.nombre_completo
+    if 'estudiante' in request.roles:
+        nombre = request.roles.estudiante.nombre_completo
         messages.info(request, f'Hasta pronto, {nombre}. Has cerrado sesión correctamente 👋')
 
     logout(request)
@@ -150,6 +154,9 @@ def estudiante_logout(request):
 # DASHBOARD PRINCIPAL
 # ============================================
 
+VACANTES_RECOMENDADAS = 5
+
+
 @estudiante_required
 def estudiante_dashboard(request):
     """
@@ -167,15 +174,14 @@ def estudiante_dashboard(request):
         ).select_related('empresa', 'tutor_empresarial', 'docente_asesor').first()
 
     # Obtener postulaciones recientes
-    postulaciones_recientes = Postulacion.objects.filter(
+    postulaciones_recientes = serializers.preparar(Postulacion.objects.filter(
         estudiante=estudiante
-    ).select_related('vacante', 'vacante__empresa').order_by('-fecha_postulacion')[:3]
+    )).order_by('-fecha_postulacion')[:3]
 
-    # Obtener vacantes disponibles según su programa
-    vacantes_disponibles = Vacante.objects.filter(
-        estado='DISPONIBLE',
-        programa_academico__icontains=estudiante.programa_academico
-    ).select_related('empresa').order_by('-fecha_publicacion')[:5]
+    # Vacantes recomendadas: las de mayor afinidad en el índice precalculado
+    vacantes_disponibles = list(afinidad.vacantes_recomendadas(
+        estudiante, serializers.preparar(Vacante.objects.all())
+    )[:VACANTES_RECOMENDADAS])
 
     # Estadísticas
     stats = {
@@ -185,7 +191,7 @@ def estudiante_dashboard(request):
             estudiante=estudiante,
             estado__in=['POSTULADO', 'SELECCIONADO']
         ).count(),
-        'vacantes_disponibles': vacantes_disponibles.count(),
+        'vacantes_disponibles': len(vacantes_disponibles),
         'tiene_hoja_vida': bool(estudiante.hoja_vida),
     }
 
@@ -210,12 +216,11 @@ def estudiante_dashboard(request):
     stats_json = json.dumps(stats, cls=DjangoJSONEncoder)
 
     # Serializar datos para React
-    postulaciones_json = serializers.to_json([
-        serializers.serialize_postulacion(p) for p in postulaciones_recientes
-    ])
+    postulaciones_json = serializers.to_json(serializers.serializar_lista(postulaciones_recientes))
 
     vacantes_json = serializers.to_json([
-        serializers.serialize_vacante(v) for v in vacantes_disponibles
+        {**datos, 'afinidad': vacante.afinidad}
+        for vacante, datos in zip(vacantes_disponibles, serializers.serializar_lista(vacantes_disponibles))
     ])
 
     practica_json = None
@@ -315,69 +320,93 @@ def estudiante_subir_hoja_vida(request):
 # VACANTES DISPONIBLES (SOLO LECTURA)
 # ============================================
 
+VACANTES_POR_PAGINA = 12
+
+
+def anotar_elegibilidad(vacantes, estudiante):
+    """
+    Anota en SQL, para cada vacante, si el estudiante ya está postulado y si
+    cumple semestre y programa (el programa de la vacante debe estar contenido
+    en el del estudiante, sin distinguir mayúsculas, también las acentuadas).
+    """
+    return vacantes.annotate(
+        ya_postulado=Exists(
+            Postulacion.objects.filter(estudiante=estudiante, vacante=OuterRef('pk'))
+        ),
+        cumple_semestre=Case(
+            When(semestre_minimo__lte=estudiante.semestre, then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        ),
+        cumple_programa=Case(
+            When(Contains(Lower(Value(estudiante.programa_academico)), Lower('programa_academico')), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        ),
+    )
+
+
 @estudiante_required
 def vacantes_disponibles(request):
     """
     Ver vacantes disponibles
     ✅ El estudiante NO puede postularse directamente (lo hace Coordinación)
+    ✅ Requisitos y postulación calculados en una sola consulta, con paginación
     """
     estudiante = request.user.estudiante
 
     # Filtros
     programa_filtro = request.GET.get('programa', '')
     buscar = request.GET.get('buscar', '')
+    solo_aptos = request.GET.get('solo_aptos') == '1'
 
-    # Obtener vacantes disponibles
-    vacantes = Vacante.objects.filter(
-        estado='DISPONIBLE'
-    ).select_related('empresa', 'creada_por')
+    # Obtener vacantes disponibles con la información de requisitos, las más afines primero
+    vacantes = afinidad.anotar_afinidad(anotar_elegibilidad(
+        serializers.preparar(Vacante.objects.filter(estado='DISPONIBLE')),
+        estudiante
+    ), estudiante).order_by(F('afinidad').desc(nulls_last=True), '-fecha_creacion', '-id')
 
     # Filtrar por programa académico del estudiante (opcional)
     if programa_filtro == 'mi_programa':
-        vacantes = vacantes.filter(programa_academico__icontains=estudiante.programa_academico)
+        vacantes = vacantes.alias(programa=Lower('programa_academico')).filter(
+            programa__contains=estudiante.programa_academico.lower()
+        )
+
+    # Solo vacantes cuyos requisitos cumple el estudiante
+    if solo_aptos:
+        vacantes = vacantes.filter(cumple_semestre=True, cumple_programa=True)
 
     # Búsqueda
     if buscar:
-        vacantes = vacantes.filter(
-            Q(titulo__icontains=buscar) |
-            Q(area_practica__icontains=buscar) |
-            Q(empresa__razon_social__icontains=buscar)
-        )
-
-    # Verificar si el estudiante cumple requisitos para cada vacante
-    vacantes_con_info = []
-    for vacante in vacantes:
-        cumple_semestre = estudiante.semestre >= vacante.semestre_minimo
-        cumple_programa = vacante.programa_academico.lower() in estudiante.programa_academico.lower()
+        vacantes = busqueda.filtrar(vacantes, buscar)
 
-        # Verificar si ya está postulado a esta vacante
-        ya_postulado = Postulacion.objects.filter(
-            estudiante=estudiante,
-            vacante=vacante
-        ).exists()
-
-        vacantes_con_info.append({
-            'vacante': vacante,
-            'cumple_requisitos': cumple_semestre and cumple_programa,
-            'cumple_semestre': cumple_semestre,
-            'cumple_programa': cumple_programa,
-            'ya_postulado': ya_postulado,
-        })
+    pagina = Paginator(vacantes, VACANTES_POR_PAGINA).get_page(request.GET.get('page'))
 
     # Serializar para React
     vacantes_json = serializers.to_json([
         {
-            **serializers.serialize_vacante(item['vacante']),
-            'cumple_requisitos': item['cumple_requisitos'],
-            'ya_postulado': item['ya_postulado'],
+            **serializers.serialize_vacante(vacante),
+            'cumple_requisitos': vacante.cumple_semestre and vacante.cumple_programa,
+            'cumple_semestre': vacante.cumple_semestre,
+            'cumple_programa': vacante.cumple_programa,
+            'ya_postulado': vacante.ya_postulado,
+            'afinidad': vacante.afinidad,
         }
-        for item in vacantes_con_info
+        for vacante in pagina
     ])
 
+    pagina_json = serializers.to_json({
+        'numero': pagina.number,
+        'total_paginas': pagina.paginator.num_pages,
+        'total_vacantes': pagina.paginator.count,
+    })
+
     context = {
         'vacantes': vacantes_json,
+        'pagina': pagina_json,
         'programa_filtro': programa_filtro,
         'buscar': buscar,
+        'solo_aptos': solo_aptos,
         'estudiante_programa': estudiante.programa_academico,
     }
 
@@ -426,9 +455,9 @@ def mis_postulaciones(request):
     # Filtro por estado
     estado_filtro = request.GET.get('estado', '')
 
-    postulaciones = Postulacion.objects.filter(
+    postulaciones = serializers.preparar(Postulacion.objects.filter(
         estudiante=estudiante
-    ).select_related('vacante', 'vacante__empresa', 'postulado_por')
+    ))
 
     if estado_filtro:
         postulaciones = postulaciones.filter(estado=estado_filtro)
@@ -436,9 +465,7 @@ def mis_postulaciones(request):
     postulaciones = postulaciones.order_by('-fecha_postulacion')
 
     # Serializar para React
-    postulaciones_json = serializers.to_json([
-        serializers.serialize_postulacion(p) for p in postulaciones
-    ])
+    postulaciones_json = serializers.to_json(serializers.serializar_lista(postulaciones))
 
     context = {
         'postulaciones': postulaciones_json,
@@ -620,7 +647,8 @@ def crear_seguimiento(request):
             return redirect('estudiante:crear_seguimiento')
 
         # Crear seguimiento
-        seguimiento = SeguimientoSemanal.objects.create(
+        seguimiento = escribir(
+            SeguimientoSemanal.objects.create,
             practica=practica,
             semana_numero=semana_numero,
             fecha_inicio=fecha_inicio,
@@ -739,13 +767,8 @@ def mi_docente_asesor(request):
 
     docente = practica.docente_asesor
 
-    # Contar mensajes no leídos del docente
-    from coordinacion.models import Mensaje
-    mensajes_no_leidos = Mensaje.objects.filter(
-        practica=practica,
-        remitente=docente.user,
-        leido=False
-    ).count()
+    # Contar mensajes no leídos del docente (posteriores al cursor de lectura)
+    mensajes_no_leidos = lectura.no_leidos(practica.id, request.user.id)
 
     context = {
         'estudiante': estudiante,
@@ -765,11 +788,11 @@ def chat_con_docente(request):
 
     estudiante = request.user.estudiante
 
-    # Obtener la práctica activa
+    # Obtener la práctica activa (con su último mensaje)
     practica = PracticaEmpresarial.objects.filter(
         estudiante=estudiante,
         estado='EN_CURSO'
-    ).select_related('docente_asesor').first()
+    ).select_related('docente_asesor', 'conversacion').first()
 
     if not practica or not practica.docente_asesor:
         messages.error(request, 'No tienes un docente asesor asignado.')
@@ -777,17 +800,13 @@ def chat_con_docente(request):
 
     docente = practica.docente_asesor
 
-    # Obtener mensajes de esta práctica (últimos 100)
-    mensajes_list = list(Mensaje.objects.filter(
+    # Página más reciente del historial (las anteriores se piden con ?before_id=)
+    mensajes_list, hay_anteriores = sondeo.historial(lectura.anotar_leido(Mensaje.objects.filter(
         practica=practica
-    ).select_related('remitente').order_by('fecha_envio')[:100])
+    )).select_related('remitente'))
 
-    # Marcar como leídos los mensajes del docente
-    Mensaje.objects.filter(
-        practica=practica,
-        remitente=docente.user,
-        leido=False
-    ).update(leido=True, fecha_lectura=timezone.now())
+    # Marcar la conversación como leída (avanza el cursor de lectura)
+    lectura.avanzar(practica.id, request.user.id, sondeo.ultimo_mensaje(practica)[0])
 
     # Obtener ID del último mensaje
     ultimo_mensaje_id = mensajes_list[-1].id if mensajes_list else 0
@@ -798,6 +817,7 @@ def chat_con_docente(request):
         'docente': docente,
         'mensajes': mensajes_list,
         'ultimo_mensaje_id': ultimo_mensaje_id,
+        'hay_anteriores': hay_anteriores,
     }
 
     return render(request, 'estudiante/chat.html', context)
@@ -830,7 +850,8 @@ def enviar_mensaje(request):
         return JsonResponse({'error': 'Debes escribir un mensaje o adjuntar un archivo'}, status=400)
 
     # Crear el mensaje
-    mensaje = Mensaje.objects.create(
+    mensaje = escribir(
+        Mensaje.objects.create,
         practica=practica,
         remitente=request.user,
         contenido=contenido,
@@ -851,56 +872,45 @@ def enviar_mensaje(request):
 
 @estudiante_required
 def obtener_mensajes(request):
-    """AJAX: Obtener nuevos mensajes"""
+    """
+    AJAX: Obtener nuevos mensajes (?ultimo_id=&visible=0|1) o una página
+    anterior del historial (?before_id=). Sin novedades responde 304 o una
+    lista vacía sin consultar Mensaje (ver coordinacion/sondeo.py)
+    """
     from django.http import JsonResponse
     from coordinacion.models import Mensaje
 
     estudiante = request.user.estudiante
 
-    # Obtener la práctica activa
+    # Obtener la práctica activa (con su último mensaje)
     practica = PracticaEmpresarial.objects.filter(
         estudiante=estudiante,
         estado='EN_CURSO'
-    ).first()
+    ).select_related('conversacion').first()
 
     if not practica:
-        return JsonResponse({'mensajes': []})
+        return JsonResponse({'mensajes': [], 'next_poll_ms': sondeo.INTERVALO_OCULTO})
 
-    # Obtener ID del último mensaje que tiene el cliente
-    ultimo_id = request.GET.get('ultimo_id', 0)
+    mensajes = lectura.anotar_leido(Mensaje.objects.filter(
+        practica=practica
+    )).select_related('remitente__estudiante', 'remitente__docente_asesor')
 
-    # Obtener mensajes nuevos
-    mensajes = Mensaje.objects.filter(
-        practica=practica,
-        id__gt=ultimo_id
-    ).select_related('remitente').order_by('fecha_envio')
+    return sondeo.responder(request, practica, mensajes)
 
-    # Marcar como leídos los mensajes del docente
-    Mensaje.objects.filter(
-        practica=practica,
-        remitente=practica.docente_asesor.user,
-        leido=False,
-        id__gt=ultimo_id
-    ).update(leido=True, fecha_lectura=timezone.now())
-
-    mensajes_data = []
-    for mensaje in mensajes:
-        mensajes_data.append({
-            'id': mensaje.id,
-            'contenido': mensaje.contenido,
-            'fecha_envio': mensaje.fecha_envio.strftime('%d/%m/%Y %H:%M'),
-            'remitente': mensaje.remitente.username,
-            'remitente_nombre': (
-                mensaje.remitente.estudiante.nombre_completo
-                if hasattr(mensaje.remitente, 'estudiante')
-                else mensaje.remitente.docente_asesor.nombre_completo
-            ),
-            'es_mio': mensaje.remitente == request.user,
-            'archivo': mensaje.archivo_adjunto.url if mensaje.archivo_adjunto else None,
-            'leido': mensaje.leido,
-        })
 
-    return JsonResponse({'mensajes': mensajes_data})
+@estudiante_required
+def stream_mensajes(request):
+    """SSE: mensajes nuevos del chat con el docente en cuanto se envían"""
+    practica = PracticaEmpresarial.objects.filter(
+        estudiante=request.user.estudiante,
+        estado='EN_CURSO'
+    ).only('id').first()
+
+    if not practica:
+        # 204 le indica a EventSource que no vuelva a conectar
+        return HttpResponse(status=204)
+
+    return chat_pubsub.stream_mensajes(request, practica, chat_pubsub.ultimo_id_cliente(request))
 
 
 
@@ -56,4 +56,5 @@ urlpatterns = [
     path('chat/', estudiante_views.chat_con_docente, name='chat_con_docente'),
     path('chat/enviar/', estudiante_views.enviar_mensaje, name='enviar_mensaje'),
     path('chat/mensajes/', estudiante_views.obtener_mensajes, name='obtener_mensajes'),
+    path('chat/stream/', estudiante_views.stream_mensajes, name='stream_mensajes'),
 ]
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Almacenamiento de archivos subidos con deduplicación por contenido
+
+Cada archivo se guarda una sola vez en MEDIA_ROOT/.blobs/ab/<sha256>. El
+nombre que queda en el FileField (p. ej. empresas/documentos/rut.pdf) es un
+enlace duro (hard link) a ese blob, así que url(), path() y open() siguen
+siendo los de FileSystemStorage y las plantillas no cambian; lo que no se
+repite es el contenido en disco.
+
+El conteo de referencias es el del propio sistema de archivos: st_nlink del
+blob = 1 + nombres que lo usan. Al borrar el último nombre se borra el blob.
+
+El SHA-256 se calcula mientras el archivo se escribe, por bloques, sin
+cargarlo completo en memoria. Los archivos nunca se modifican en su sitio
+(Storage solo crea y borra), por eso es seguro compartir el inodo.
+
+Si el sistema de archivos no admite enlaces duros (FAT, algunos volúmenes
+de red) se guarda como FileSystemStorage normal, sin deduplicar.
+
+Para convertir los archivos que ya existían: python manage.py deduplicate_media
+"""
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+DIRECTORIO_BLOBS = '.blobs'
+TAMANO_BLOQUE = 64 * 1024
+
+
+def sha256_archivo(ruta):
+    """SHA-256 (hex) de un archivo en disco, leído por bloques"""
+    resumen = hashlib.sha256()
+    with open(ruta, 'rb') as fh:
+        for bloque in iter(lambda: fh.read(TAMANO_BLOQUE), b''):
+            resumen.update(bloque)
+    return resumen.hexdigest()
+
+
+class AlmacenamientoDeduplicado(FileSystemStorage):
+    """FileSystemStorage que comparte un único blob entre archivos idénticos"""
+
+    def ruta_blob(self, sha256):
+        return os.path.join(self.location, DIRECTORIO_BLOBS, sha256[:2], sha256)
+
+    def _crear_directorio(self, directorio):
+        if self.directory_permissions_mode is not None:
+            # Igual que FileSystemStorage: sin umask para aplicar el modo exacto
+            umask_anterior = os.umask(0o777 & ~self.directory_permissions_mode)
+            try:
+                os.makedirs(directorio, self.directory_permissions_mode, exist_ok=True)
+            finally:
+                os.umask(umask_anterior)
+        else:
+            os.makedirs(directorio, exist_ok=True)
+
+    # ============================================
+    # BLOBS
+    # ============================================
+
+    def guardar_blob(self, content):
+        """
+        Escribir el contenido en un temporal calculando su SHA-256 y dejarlo
+        como blob (si ya existía uno igual, el temporal se descarta).
+        Devuelve (sha256, ruta del blob, bytes); la ruta es None si el
+        sistema de archivos no admite enlaces duros.
+        """
+        directorio = os.path.join(self.location, DIRECTORIO_BLOBS)
+        self._crear_directorio(directorio)
+
+        resumen = hashlib.sha256()
+        tamano = 0
+        descriptor, temporal = tempfile.mkstemp(dir=directorio, prefix='.subida-')
+        try:
+            with os.fdopen(descriptor, 'wb') as fh:
+                for bloque in content.chunks(TAMANO_BLOQUE):
+                    if isinstance(bloque, str):
+                        bloque = bloque.encode()
+                    resumen.update(bloque)
+                    fh.write(bloque)
+                    tamano += len(bloque)
+
+            sha256 = resumen.hexdigest()
+            blob = self.ruta_blob(sha256)
+            self._crear_directorio(os.path.dirname(blob))
+            if self.file_permissions_mode is not None:
+                os.chmod(temporal, self.file_permissions_mode)
+            try:
+                # link() falla si el blob ya existe: dos subidas simultáneas
+                # del mismo contenido terminan compartiendo el mismo inodo
+                os.link(temporal, blob)
+            except FileExistsError:
+                pass
+            except OSError:
+                blob = None
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+        return sha256, blob, tamano
+
+    def enlazar(self, blob, name):
+        """
+        Crear `name` apuntando al blob; si el nombre ya está ocupado se usa
+        otro disponible. Devuelve el nombre final (None si no se pudo enlazar).
+        """
+        while True:
+            ruta = self.path(name)
+            self._crear_directorio(os.path.dirname(ruta))
+            try:
+                os.link(blob, ruta)
+            except FileExistsError:
+                if getattr(self, '_allow_overwrite', False):
+                    os.remove(ruta)
+                else:
+                    name = self.get_available_name(name)
+                continue
+            except OSError:
+                return None
+            return name
+
+    def referencias(self, sha256):
+        """Nombres que comparten el blob (0 si no existe)"""
+        try:
+            return os.stat(self.ruta_blob(sha256)).st_nlink - 1
+        except FileNotFoundError:
+            return 0
+
+    def blobs(self):
+        """(sha256, ruta) de todos los blobs guardados"""
+        raiz = os.path.join(self.location, DIRECTORIO_BLOBS)
+        if not os.path.isdir(raiz):
+            return
+        for prefijo in sorted(os.listdir(raiz)):
+            directorio = os.path.join(raiz, prefijo)
+            if len(prefijo) != 2 or not os.path.isdir(directorio):
+                continue
+            for sha256 in sorted(os.listdir(directorio)):
+                yield sha256, os.path.join(directorio, sha256)
+
+    def limpiar_blobs(self):
+        """Borrar los blobs que ya no usa ningún nombre. Devuelve (blobs, bytes)"""
+        borrados = liberados = 0
+        for _, ruta in self.blobs():
+            estado = os.stat(ruta)
+            if estado.st_nlink == 1:
+                os.remove(ruta)
+                borrados += 1
+                liberados += estado.st_size
+        return borrados, liberados
+
+    # ============================================
+    # API DE STORAGE
+    # ============================================
+
+    def _save(self, name, content):
+        _, blob, _ = self.guardar_blob(content)
+        enlazado = self.enlazar(blob, name) if blob is not None else None
+        if enlazado is None:
+            if blob is not None:
+                self._borrar_si_huerfano(blob)
+            return super()._save(name, content)
+        return enlazado.replace('\\', '/')
+
+    def delete(self, name):
+        if not name:
+            raise ValueError('The name must be given to delete().')
+        ruta = self.path(name)
+        try:
+            estado = os.stat(ruta)
+        except FileNotFoundError:
+            return
+
+        # Con dos enlaces, el otro es el blob: queda huérfano al borrar este nombre
+        blob = None
+        if estado.st_nlink == 2:
+            blob = self.ruta_blob(sha256_archivo(ruta))
+        super().delete(name)
+        if blob is not None:
+            self._borrar_si_huerfano(blob)
+
+    def _borrar_si_huerfano(self, blob):
+        try:
+            if os.stat(blob).st_nlink == 1:
+                os.remove(blob)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,95 @@
+"""
+Escrituras con reintento ante "database is locked"
+
+SQLite admite un solo escritor a la vez. Con WAL y busy_timeout (ver
+DATABASES en settings.py) casi todas las esperas se resuelven dentro de
+SQLite, pero una transacción puede seguir recibiendo SQLITE_BUSY si el
+bloqueo dura más que busy_timeout. `reintentar_bloqueos` ejecuta la
+escritura en su propia transacción y, si falla por bloqueo, la repite
+entera con espera exponencial y jitter.
+
+Solo reintenta la transacción más externa: dentro de otra transacción un
+reintento no puede deshacer lo anterior, así que el error se propaga.
+
+Uso:
+    @reintentar_bloqueos
+    def vincular(postulacion):
+        ...
+
+    mensaje = escribir(Mensaje.objects.create, practica=practica, contenido=texto)
+
+También reemplaza LOWER() de SQLite, que solo convierte ASCII ('Í' queda
+igual), por str.lower de Python: así Lower() en una consulta compara igual
+que .lower() en el código y que PostgreSQL.
+"""
+import functools
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+MENSAJES_BLOQUEO = ('database is locked', 'database table is locked', 'database is busy')
+
+
+def es_bloqueo(error):
+    return isinstance(error, OperationalError) and any(texto in str(error) for texto in MENSAJES_BLOQUEO)
+
+
+def espera(intento):
+    """Segundos antes del reintento `intento` (1, 2, ...): base * 2^(intento-1) con jitter"""
+    base = getattr(settings, 'BD_REINTENTO_BASE', 0.05)
+    maximo = getattr(settings, 'BD_REINTENTO_MAXIMO', 1.0)
+    return random.uniform(0.5, 1.0) * min(base * 2 ** (intento - 1), maximo)
+
+
+def reintentar_bloqueos(funcion=None, *, using=DEFAULT_DB_ALIAS, intentos=None):
+    """Decorador: ejecutar `funcion` en transaction.atomic() y repetirla si la base está bloqueada"""
+    if funcion is None:
+        return functools.partial(reintentar_bloqueos, using=using, intentos=intentos)
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        if connections[using].in_atomic_block:
+            with transaction.atomic(using=using):
+                return funcion(*args, **kwargs)
+
+        maximo = intentos or getattr(settings, 'BD_REINTENTOS', 5)
+        for intento in range(1, maximo + 1):
+            try:
+                with transaction.atomic(using=using):
+                    return funcion(*args, **kwargs)
+            except OperationalError as e:
+                if not es_bloqueo(e) or intento == maximo:
+                    raise
+                segundos = espera(intento)
+                logger.warning('%s: base de datos bloqueada (intento %s/%s), reintento en %.3f s',
+                               funcion.__qualname__, intento, maximo, segundos)
+                time.sleep(segundos)
+
+    return envoltura
+
+
+def escribir(funcion, *args, using=DEFAULT_DB_ALIAS, **kwargs):
+    """Llamar una vez a `funcion(*args, **kwargs)` con reintento ante bloqueos"""
+    return reintentar_bloqueos(funcion, using=using)(*args, **kwargs)
+
+
+# ============================================
+# LOWER() CON UNICODE EN SQLITE
+# ============================================
+
+def minusculas(texto):
+    return texto.lower() if isinstance(texto, str) else texto
+
+
+@receiver(connection_created, dispatch_uid='basedatos_lower_unicode')
+def lower_unicode(sender, connection, **kwargs):
+    """Registrar LOWER(texto) con str.lower en cada conexión nueva de SQLite"""
+    if connection.vendor == 'sqlite':
+        connection.connection.create_function('LOWER', 1, minusculas, deterministic=True)
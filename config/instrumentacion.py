@@ -0,0 +1,225 @@
+"""
+Instrumentación de rendimiento por petición
+
+Mide, para cada vista:
+    - número de consultas SQL y tiempo en la base de datos
+      (connection.execute_wrapper, funciona también con DEBUG=False);
+    - tiempo de render de plantillas (backend DjangoTemplatesInstrumentados);
+    - latencia total de la petición.
+
+InstrumentacionMiddleware (config/middleware.py) publica los valores en la
+cabecera Server-Timing y en el log estructurado `config.instrumentacion`,
+y avisa cuando la vista supera su presupuesto (settings.PRESUPUESTOS_VISTAS).
+
+El SQL que se ejecuta mientras se renderiza una plantilla (querysets
+perezosos) cuenta tanto en `sql_ms` como en `plantillas_ms`. En respuestas
+streaming solo se mide hasta que empieza el envío.
+"""
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+logger = logging.getLogger('config.instrumentacion')
+
+_medicion_actual = contextvars.ContextVar('medicion_actual', default=None)
+
+
+@dataclass
+class Medicion:
+    """Contadores de una petición"""
+    vista: str = ''
+    consultas: int = 0
+    sql_ms: float = 0.0
+    plantillas_ms: float = 0.0
+    total_ms: float = 0.0
+    inicio: float = field(default_factory=time.perf_counter)
+    _profundidad_plantillas: int = 0
+
+    def como_dict(self):
+        return {
+            'vista': self.vista,
+            'consultas': self.consultas,
+            'sql_ms': round(self.sql_ms, 2),
+            'plantillas_ms': round(self.plantillas_ms, 2),
+            'total_ms': round(self.total_ms, 2),
+        }
+
+
+def medicion_actual():
+    """Medición de la petición en curso (None fuera del middleware)"""
+    return _medicion_actual.get()
+
+
+# ============================================
+# SQL
+# ============================================
+
+def _contar_consulta(execute, sql, params, many, context):
+    medicion = _medicion_actual.get()
+    if medicion is None:
+        return execute(sql, params, many, context)
+
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medicion.consultas += 1
+        medicion.sql_ms += (time.perf_counter() - inicio) * 1000
+
+
+@contextmanager
+def medir(vista=''):
+    """
+    Medir el bloque: consultas en todas las conexiones, plantillas y tiempo
+    total. Devuelve la Medicion (total_ms se completa al salir).
+    """
+    medicion = Medicion(vista=vista)
+    token = _medicion_actual.set(medicion)
+    try:
+        with ExitStack() as stack:
+            for conexion in connections.all():
+                stack.enter_context(conexion.execute_wrapper(_contar_consulta))
+            yield medicion
+    finally:
+        medicion.total_ms = (time.perf_counter() - medicion.inicio) * 1000
+        _medicion_actual.reset(token)
+
+
+# ============================================
+# PLANTILLAS
+# ============================================
+
+class PlantillaInstrumentada(Template):
+    def render(self, context=None, request=None):
+        medicion = _medicion_actual.get()
+        if medicion is None:
+            return super().render(context, request)
+
+        # Solo se mide el render exterior (render_to_string anidados ya están dentro)
+        medicion._profundidad_plantillas += 1
+        inicio = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            medicion._profundidad_plantillas -= 1
+            if medicion._profundidad_plantillas == 0:
+                medicion.plantillas_ms += (time.perf_counter() - inicio) * 1000
+
+
+class DjangoTemplatesInstrumentados(DjangoTemplates):
+    """Backend de plantillas de Django que suma el tiempo de render a la medición"""
+
+    def from_string(self, template_code):
+        return PlantillaInstrumentada(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return PlantillaInstrumentada(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+# ============================================
+# PRESUPUESTOS Y REPORTE
+# ============================================
+
+def presupuesto(vista):
+    """
+    Presupuesto de la vista: {'consultas': n, 'total_ms': ms}.
+    settings.PRESUPUESTOS_VISTAS por nombre de URL ('app:nombre'), con
+    PRESUPUESTO_VISTA_DEFECTO para las demás.
+    """
+    por_defecto = getattr(settings, 'PRESUPUESTO_VISTA_DEFECTO', {})
+    return {**por_defecto, **getattr(settings, 'PRESUPUESTOS_VISTAS', {}).get(vista, {})}
+
+
+def excesos(medicion):
+    """Métricas que superan el presupuesto: {'consultas': (valor, límite), ...}"""
+    limites = presupuesto(medicion.vista)
+    valores = medicion.como_dict()
+    return {
+        metrica: (valores[metrica], limite)
+        for metrica, limite in limites.items()
+        if metrica in valores and valores[metrica] > limite
+    }
+
+
+def server_timing(medicion):
+    """Valor de la cabecera Server-Timing"""
+    return ', '.join([
+        f'db;dur={medicion.sql_ms:.1f};desc="{medicion.consultas} consultas"',
+        f'tpl;dur={medicion.plantillas_ms:.1f}',
+        f'total;dur={medicion.total_ms:.1f}',
+    ])
+
+
+def registrar(medicion, request, response):
+    """Una línea JSON por petición; WARNING si se superó el presupuesto"""
+    superados = excesos(medicion)
+    registro = {
+        **medicion.como_dict(),
+        'metodo': request.method,
+        'ruta': request.path,
+        'estado': response.status_code,
+    }
+    if superados:
+        registro['excede'] = {metrica: limite for metrica, (_, limite) in superados.items()}
+
+    nivel = logging.WARNING if superados else logging.INFO
+    if logger.isEnabledFor(nivel):
+        logger.log(nivel, json.dumps(registro, ensure_ascii=False))
+    return superados
+
+
+class ArchivoRotativo(logging.handlers.RotatingFileHandler):
+    """
+    Handler del log de rendimiento: abre el archivo (y crea su carpeta) con
+    el primer registro, no al cargar la configuración de logging. Así los
+    comandos y tests que no registran nada no tocan el disco.
+    """
+
+    def __init__(self, filename, **kwargs):
+        kwargs.setdefault('delay', True)
+        super().__init__(filename, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+# ============================================
+# TESTS
+# ============================================
+
+class PresupuestoConsultasMixin:
+    """
+    Mixin para TestCase: falla si la vista que respondió superó su
+    presupuesto de consultas (settings.PRESUPUESTOS_VISTAS).
+
+        response = self.client.get(url)
+        self.assertDentroDelPresupuesto(response)
+    """
+
+    def assertDentroDelPresupuesto(self, response):
+        medicion = getattr(response.wsgi_request, 'medicion', None)
+        if medicion is None:
+            self.fail('La petición no pasó por InstrumentacionMiddleware')
+
+        limite = presupuesto(medicion.vista).get('consultas')
+        if limite is None:
+            self.fail(f'La vista {medicion.vista or response.wsgi_request.path} no tiene presupuesto de consultas')
+        if medicion.consultas > limite:
+            self.fail(
+                f'{medicion.vista} hizo {medicion.consultas} consultas '
+                f'(presupuesto: {limite})'
+            )
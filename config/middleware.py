@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.utils.functional import SimpleLazyObject
 
 class AutoSetRoleMiddleware:
     """Middleware de desarrollo: si DEBUG=True y el usuario está autenticado y
@@ -15,7 +16,9 @@ class AutoSetRoleMiddleware:
         try:
             if settings.DEBUG and request.user.is_authenticated:
                 # Si el usuario tiene atributo 'estudiante' y no hay rol activo, asignarlo
-                if hasattr(request.user, 'estudiante') and request.session.get('active_role') is None:
+                from . import roles
+
+                if 'estudiante' in roles.obtener(request) and request.session.get('active_role') is None:
                     request.session['active_role'] = 'estudiante'
         except Exception:
             # No romper la petición por cualquier error aquí (es solo ayuda de desarrollo)
@@ -23,3 +26,53 @@ class AutoSetRoleMiddleware:
 
         response = self.get_response(request)
         return response
+
+
+class RolesMiddleware:
+    """Adjunta `request.roles` con los perfiles del usuario autenticado.
+
+    Se resuelve de forma perezosa (una consulta, la primera vez que se usa)
+    y se comparte entre decoradores, context processors y vistas. Va después
+    de AuthenticationMiddleware. Ver config/roles.py.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from . import roles
+
+        request.roles = SimpleLazyObject(lambda: roles.resolver(request))
+        return self.get_response(request)
+
+
+class InstrumentacionMiddleware:
+    """Mide consultas SQL, render de plantillas y latencia de cada vista.
+
+    Añade la cabecera Server-Timing (visible en las DevTools del navegador) y
+    escribe una línea JSON por petición en el logger `config.instrumentacion`,
+    en nivel WARNING cuando la vista supera su presupuesto
+    (settings.PRESUPUESTOS_VISTAS). Va primero en MIDDLEWARE para que la
+    latencia incluya al resto de middlewares. Ver config/instrumentacion.py.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.activa = getattr(settings, 'INSTRUMENTACION_ACTIVA', True)
+        self.server_timing = getattr(settings, 'INSTRUMENTACION_SERVER_TIMING', True)
+
+    def __call__(self, request):
+        if not self.activa:
+            return self.get_response(request)
+
+        from . import instrumentacion
+
+        with instrumentacion.medir() as medicion:
+            request.medicion = medicion
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        medicion.vista = match.view_name if match else ''
+
+        if self.server_timing:
+            response['Server-Timing'] = instrumentacion.server_timing(medicion)
+        instrumentacion.registrar(medicion, request, response)
+        return response
@@ -0,0 +1,138 @@
+"""
+Roles del usuario de la petición
+
+RolesMiddleware (config/middleware.py) adjunta `request.roles` con los
+perfiles Coordinador, Estudiante y DocenteAsesor del usuario, resueltos una
+sola vez por petición en una consulta (select_related sobre las tres
+relaciones inversas de User). Decoradores, context processors y el login
+leen de ahí en lugar de hacer `hasattr(request.user, ...)`, que cuesta una
+consulta por cada relación que no existe.
+
+Los perfiles quedan además en la caché de relaciones de `request.user`, así
+que `request.user.coordinador` tampoco vuelve a consultar.
+
+Qué roles tiene cada usuario se guarda en la sesión al iniciarla (por id
+de usuario) junto con su versión: con eso solo se unen las tablas de los
+perfiles que existen. Al crear o borrar un perfil (coordinacion/signals.py)
+sube la versión del usuario (modelo VersionRoles) y sus sesiones lo vuelven
+a resolver. La versión está en la base de datos, no en una caché por
+proceso, así que con varios trabajadores la invalidación llega a todos; se
+lee como subconsulta en la misma consulta de los perfiles.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from coordinacion.models import VersionRoles
+
+# Rol (valor de session['active_role']) -> relación inversa en User
+RELACIONES = {
+    'coordinador': 'coordinador',
+    'estudiante': 'estudiante',
+    'docente': 'docente_asesor',
+}
+
+CLAVE_SESION = '_roles'
+
+
+class Roles:
+    """Perfiles del usuario; None en los roles que no tiene"""
+
+    def __init__(self, coordinador=None, estudiante=None, docente=None, version=None):
+        self.coordinador = coordinador
+        self.estudiante = estudiante
+        self.docente = docente
+        self.version = version  # VersionRoles leída junto con los perfiles
+
+    @property
+    def disponibles(self):
+        """Roles del usuario, en el orden de RELACIONES"""
+        return [rol for rol in RELACIONES if getattr(self, rol) is not None]
+
+    def __contains__(self, rol):
+        return rol in RELACIONES and getattr(self, rol) is not None
+
+    def __repr__(self):
+        return f'<Roles {self.disponibles}>'
+
+
+# ============================================
+# VERSIÓN POR USUARIO (invalidación)
+# ============================================
+
+def version_actual():
+    """Expresión con la versión de roles del usuario de la consulta (0 si nunca cambió)"""
+    version = VersionRoles.objects.filter(usuario_id=OuterRef('pk')).values('version')
+    return Coalesce(Subquery(version), 0)
+
+
+def invalidar(user_id):
+    """Marcar como obsoletos los roles guardados en las sesiones del usuario"""
+    if not VersionRoles.objects.filter(usuario_id=user_id).update(version=F('version') + 1):
+        VersionRoles.objects.bulk_create([VersionRoles(usuario_id=user_id, version=1)], ignore_conflicts=True)
+
+
+# ============================================
+# RESOLUCIÓN
+# ============================================
+
+def cargar(user, roles=None):
+    """
+    Roles de `user` y su versión en una consulta. `roles` limita qué
+    relaciones se unen (None = las tres); las demás se marcan como
+    inexistentes sin consultar. Deja los perfiles en la caché de relaciones
+    de `user`.
+    """
+    roles = list(RELACIONES) if roles is None else [rol for rol in roles if rol in RELACIONES]
+    User = get_user_model()
+    cargado = User._default_manager.select_related(
+        *(RELACIONES[rol] for rol in roles)
+    ).annotate(version_roles=version_actual()).get(pk=user.pk)
+    perfiles = {rol: getattr(cargado, RELACIONES[rol], None) for rol in roles}
+
+    for rol, relacion in RELACIONES.items():
+        User._meta.get_field(relacion).set_cached_value(user, perfiles.get(rol))
+    return Roles(**perfiles, version=cargado.version_roles)
+
+
+def resolver(request):
+    """Roles del usuario de la petición, usando los guardados en la sesión si siguen vigentes"""
+    user = request.user
+    if not user.is_authenticated:
+        return Roles()
+
+    sesion = getattr(request, 'session', None)
+    guardado = sesion.get(CLAVE_SESION) if sesion is not None else None
+    if guardado and guardado.get('usuario') == user.pk:
+        roles = cargar(user, guardado['roles'])
+        if roles.version == guardado.get('version'):
+            return roles
+        # Cambiaron los perfiles desde que se guardó la sesión: resolver los tres
+
+    roles = cargar(user)
+    if sesion is not None:
+        _guardar(sesion, user, roles)
+    return roles
+
+
+def _guardar(sesion, user, roles):
+    sesion[CLAVE_SESION] = {'usuario': user.pk, 'version': roles.version, 'roles': roles.disponibles}
+
+
+def recordar(request, user):
+    """
+    Resolver los roles al iniciar sesión (señal user_logged_in) para que la
+    primera petición ya los encuentre en la sesión.
+    """
+    roles = cargar(user)
+    _guardar(request.session, user, roles)
+    request.roles = roles
+    return roles
+
+
+def obtener(request):
+    """`request.roles`, resolviéndolo si la petición no pasó por RolesMiddleware"""
+    roles = getattr(request, 'roles', None)
+    if roles is None:
+        roles = request.roles = resolver(request)
+    return roles
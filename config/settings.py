@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,11 +44,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'config.middleware.InstrumentacionMiddleware',  # Primero: mide la petición completa
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'config.middleware.RolesMiddleware',  # request.roles (después de la autenticación)
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -56,7 +59,8 @@ ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates + medición del tiempo de render (config/instrumentacion.py)
+        'BACKEND': 'config.instrumentacion.DjangoTemplatesInstrumentados',
         'DIRS': [BASE_DIR / 'config' / 'templates',
                  ],
         'APP_DIRS': True,
@@ -80,13 +84,57 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Perfil de SQLite para varios usuarios concurrentes:
+#   - WAL: las lecturas no bloquean la escritura ni al revés (un escritor a la vez);
+#   - synchronous=NORMAL: en WAL no pierde integridad, solo la última
+#     transacción si se corta la luz; evita un fsync por commit;
+#   - cache_size (KiB si es negativo) y mmap_size por conexión;
+#   - busy_timeout: esperar al escritor actual en lugar de fallar al instante;
+#   - transaction_mode IMMEDIATE: atomic() toma el bloqueo de escritura al
+#     empezar; con DEFERRED una transacción que lee y luego escribe recibe
+#     "database is locked" sin esperar si otro escribió entre medias.
+# Conexiones persistentes (CONN_MAX_AGE) comprobadas antes de reutilizarlas.
+# Las escrituras concurrentes usan config/basedatos.py (reintento con espera).
+# Medición: python scripts/bench_escrituras_sqlite.py
+#
+# db.sqlite3 (datos de ejemplo) está en git y journal_mode=WAL se guarda en
+# la cabecera del archivo: activarlo al conectar modificaría el archivo
+# versionado. WAL y synchronous=NORMAL solo se aplican a una base fuera del
+# repositorio, indicada con SQLITE_PATH (producción):
+#     SQLITE_PATH=/var/lib/practicas/db.sqlite3 python manage.py migrate
+SQLITE_VERSIONADA = BASE_DIR / 'db.sqlite3'
+SQLITE_PATH = Path(os.environ.get('SQLITE_PATH', SQLITE_VERSIONADA))
+SQLITE_WAL = SQLITE_PATH.resolve() != SQLITE_VERSIONADA.resolve()
+
+PRAGMAS_WAL = (
+    'PRAGMA journal_mode=WAL;'
+    'PRAGMA synchronous=NORMAL;'
+)
+PRAGMAS_SQLITE = (
+    'PRAGMA busy_timeout=5000;'
+    'PRAGMA cache_size=-32000;'
+    'PRAGMA mmap_size=134217728;'
+    'PRAGMA temp_store=MEMORY;'
+)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': SQLITE_PATH,
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (PRAGMAS_WAL if SQLITE_WAL else '') + PRAGMAS_SQLITE,
+        },
     }
 }
 
+# Reintentos de escrituras bloqueadas (config/basedatos.py)
+BD_REINTENTOS = 5
+BD_REINTENTO_BASE = 0.05     # segundos; se duplica en cada reintento
+BD_REINTENTO_MAXIMO = 1.0
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -123,6 +171,95 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Bundles JSX precompilados (python manage.py build_jsx)
+# Si no existe el manifest, las plantillas vuelven a usar Babel en el navegador
+JSX_BUNDLES_ENABLED = True
+JSX_BUNDLES_DIR = BASE_DIR / 'coordinacion' / 'static' / 'coordinacion' / 'dist'
+JSX_BUILD_COMMAND = [
+    'npx', '--no-install', 'esbuild',
+    '--loader=jsx', '--minify', '--format=iife', '--target=es2017',
+]
+
+# Chat estudiante-docente por Server-Sent Events (coordinacion/chat_pubsub.py)
+# Sin URL el pub/sub es en memoria (un solo proceso); con varios workers usar Redis
+CHAT_PUBSUB_URL = None       # p. ej. 'redis://localhost:6379/0'
+CHAT_STREAM_TIMEOUT = 55     # segundos antes de cerrar y dejar que EventSource reconecte
+CHAT_STREAM_KEEPALIVE = 15   # segundos entre comentarios keep-alive
+
+# Caché de serializadores por objeto (coordinacion/serializers.py)
+# En memoria por proceso; con varios workers conviene Redis o Memcached
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'serializadores': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'serializadores',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+SERIALIZADORES_CACHE = 'serializadores'  # None desactiva la caché
+SERIALIZADORES_CACHE_TIMEOUT = 60 * 60
+
+# Capacidad de referencia de un docente asesor (prácticas en curso) para medir su carga
+DOCENTE_MAX_PRACTICAS = 10
+
+# Cola de tareas en segundo plano (coordinacion/cola.py): python manage.py run_tasks
+TAREAS_MAX_INTENTOS = 5
+TAREAS_REINTENTO_BASE = 10   # segundos; se duplica en cada reintento (máximo una hora)
+TAREAS_TIMEOUT = 300         # segundos antes de que otro trabajador retome una tarea en proceso
+TAREAS_EN_LINEA = False      # True: ejecutarlas al confirmar la transacción, sin trabajador (desarrollo)
+
+# Instrumentación de rendimiento (config/middleware.py, config/instrumentacion.py)
+# Cabecera Server-Timing y una línea JSON por petición en logs/rendimiento.log
+INSTRUMENTACION_ACTIVA = True
+INSTRUMENTACION_SERVER_TIMING = True
+
+# Presupuesto por vista (nombre de URL); si se supera, el log pasa a WARNING
+# y PresupuestoConsultasMixin hace fallar los tests
+PRESUPUESTO_VISTA_DEFECTO = {'consultas': 30, 'total_ms': 500}
+PRESUPUESTOS_VISTAS = {
+    'coordinacion:dashboard': {'consultas': 15},
+    'coordinacion:empresas_lista': {'consultas': 10},
+    'coordinacion:vacantes_lista': {'consultas': 10},
+    'coordinacion:estudiantes_lista': {'consultas': 10},
+    'coordinacion:postulaciones_lista': {'consultas': 10},
+    'coordinacion:practicas_lista': {'consultas': 10},
+    'coordinacion:tutores_lista': {'consultas': 10},
+    'coordinacion:sustentaciones_lista': {'consultas': 10},
+    'coordinacion:api_lista': {'consultas': 8, 'total_ms': 250},
+}
+
+# La carpeta se crea con el primer registro (config.instrumentacion.ArchivoRotativo)
+LOGS_DIR = BASE_DIR / 'logs'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'rendimiento': {'format': '%(asctime)s %(levelname)s %(message)s'},
+    },
+    'handlers': {
+        'rendimiento': {
+            'class': 'config.instrumentacion.ArchivoRotativo',
+            'filename': LOGS_DIR / 'rendimiento.log',
+            'maxBytes': 10 * 1024 * 1024,  # 10MB
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'formatter': 'rendimiento',
+        },
+    },
+    'loggers': {
+        'config.instrumentacion': {
+            'handlers': ['rendimiento'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -141,6 +278,16 @@ DEFAULT_ROLE_PRIORITY = ['coordinador', 'estudiante']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Archivos subidos deduplicados por SHA-256 (config/almacenamiento.py)
+STORAGES = {
+    'default': {
+        'BACKEND': 'config.almacenamiento.AlmacenamientoDeduplicado',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 
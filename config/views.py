@@ -3,6 +3,8 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
 from django.utils.http import url_has_allowed_host_and_scheme
 
+from config.roles import cargar as cargar_roles
+
 
 def login_unificado(request):
     """
@@ -18,14 +20,8 @@ def login_unificado(request):
         if active_role == 'docente':
             return redirect('docente:dashboard')
 
-        # Si no hay rol activo, detectar por relaciones OneToOne
-        roles = []
-        if hasattr(request.user, 'coordinador'):
-            roles.append('coordinador')
-        if hasattr(request.user, 'estudiante'):
-            roles.append('estudiante')
-        if hasattr(request.user, 'docente_asesor'):
-            roles.append('docente')
+        # Si no hay rol activo, detectar por los perfiles del usuario
+        roles = request.roles.disponibles
 
         # Si tiene un solo rol, redirigir directamente
         if len(roles) == 1:
@@ -57,19 +53,13 @@ def login_unificado(request):
                 messages.error(request, '❌ Tu cuenta está desactivada. Contacta al administrador.')
                 return render(request, 'login_unificado.html')
 
-            # Verificar que el usuario tenga el rol seleccionado
-            has_role = False
-            role_name = ''
-
-            if selected_role == 'coordinador':
-                has_role = hasattr(user, 'coordinador')
-                role_name = 'Coordinador'
-            elif selected_role == 'estudiante':
-                has_role = hasattr(user, 'estudiante')
-                role_name = 'Estudiante'
-            elif selected_role == 'docente':
-                has_role = hasattr(user, 'docente_asesor')
-                role_name = 'Docente Asesor'
+            # Verificar que el usuario tenga el rol seleccionado (una consulta para los tres perfiles)
+            has_role = selected_role in cargar_roles(user)
+            role_name = {
+                'coordinador': 'Coordinador',
+                'estudiante': 'Estudiante',
+                'docente': 'Docente Asesor',
+            }.get(selected_role, '')
 
             if not has_role:
                 messages.error(request, f'❌ Tu cuenta no tiene permisos de {role_name}. Verifica tu rol.')
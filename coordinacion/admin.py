@@ -2,7 +2,7 @@ from django.contrib import admin
 from .models import (
     Coordinador, Empresa, Vacante, Estudiante, Postulacion,
     TutorEmpresarial, DocenteAsesor, PracticaEmpresarial,
-    Sustentacion, Evaluacion, SeguimientoSemanal
+    Sustentacion, Evaluacion, SeguimientoSemanal, Tarea
 )
 
 
@@ -83,3 +83,10 @@ class SeguimientoSemanalAdmin(admin.ModelAdmin):
     search_fields = ['practica__estudiante__nombre_completo']
     list_filter = ['estado', 'validado_docente', 'validado_tutor', 'fecha_registro']
     readonly_fields = ['fecha_registro', 'fecha_actualizacion']
+
+
+@admin.register(Tarea)
+class TareaAdmin(admin.ModelAdmin):
+    list_display = ['id', 'nombre', 'estado', 'intentos', 'max_intentos', 'ejecutar_despues', 'fecha_fin']
+    search_fields = ['nombre', 'clave']
+    list_filter = ['estado', 'nombre']
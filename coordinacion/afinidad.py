@@ -0,0 +1,223 @@
+"""
+Índice de afinidad estudiante-vacante (modelo AfinidadVacante)
+
+Para cada par en el que el estudiante cumple los requisitos de la vacante
+(el programa de la vacante contenido en el del estudiante y semestre
+suficiente) se guarda un puntaje de 0 a 100:
+
+    programa     30   mismo programa: 30; programa contenido en el del estudiante: 15
+    semestre     20   semestres por encima del mínimo (5 o más: puntaje completo)
+    promedio     25   promedio académico / 5
+    habilidades  25   fracción de las habilidades requeridas que el estudiante menciona
+
+Las palabras clave se normalizan como en la asignación de docentes
+(asignacion.palabras_clave). Solo se indexan vacantes DISPONIBLE u OCUPADA
+(una ocupada vuelve a estar disponible al liberar un cupo); las lecturas
+filtran por el estado actual.
+
+La migración 0012 llena la tabla con los datos existentes usando una copia
+congelada de estas reglas. Al guardar una vacante o un estudiante, las
+señales encolan el recálculo de sus filas (tareas afinidad_vacante y
+afinidad_estudiante, ver cola.py). Si cambian las reglas, o para los datos
+cargados con bulk_create: `python manage.py rebuild_match_index`.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Exists, F, FilteredRelation, OuterRef, Q, Value
+from django.db.models.functions import Lower
+from django.db.models.lookups import Contains
+
+from .asignacion import palabras_clave
+from .models import AfinidadVacante, Estudiante, Postulacion, Vacante
+
+PESOS = {'programa': 30, 'semestre': 20, 'promedio': 25, 'habilidades': 25}
+SEMESTRES_PUNTAJE_COMPLETO = 5
+ESTADOS_INDEXADOS = ('DISPONIBLE', 'OCUPADA')
+
+# Campos que alteran el puntaje: guardar otros no recalcula el índice
+CAMPOS_VACANTE = ('programa_academico', 'semestre_minimo', 'habilidades_requeridas', 'estado')
+CAMPOS_ESTUDIANTE = ('programa_academico', 'semestre', 'promedio_academico', 'habilidades')
+
+TAMANO_LOTE = 1000
+
+
+# ============================================
+# PUNTAJE
+# ============================================
+
+def palabras_estudiante(estudiante):
+    return palabras_clave(f'{estudiante.habilidades} {estudiante.programa_academico}')
+
+
+def palabras_vacante(vacante):
+    return palabras_clave(vacante.habilidades_requeridas)
+
+
+def cumple_requisitos(estudiante, vacante):
+    """
+    Mismas reglas que Estudiante/estudiante_views.anotar_elegibilidad. Los
+    filtros en SQL de actualizar_* comparan igual, con Lower() (LOWER() de
+    SQLite con Unicode, ver config/basedatos.py)
+    """
+    return (
+        estudiante.semestre >= vacante.semestre_minimo
+        and vacante.programa_academico.lower() in estudiante.programa_academico.lower()
+    )
+
+
+def puntuar(estudiante, vacante, habilidades_estudiante=None, habilidades_vacante=None):
+    """
+    AfinidadVacante sin guardar para el par, o None si el
+    estudiante no cumple los requisitos. Las palabras clave se pueden pasar
+    ya calculadas.
+    """
+    if not cumple_requisitos(estudiante, vacante):
+        return None
+    if habilidades_estudiante is None:
+        habilidades_estudiante = palabras_estudiante(estudiante)
+    if habilidades_vacante is None:
+        habilidades_vacante = palabras_vacante(vacante)
+
+    mismo_programa = vacante.programa_academico.strip().lower() == estudiante.programa_academico.strip().lower()
+    semestres = min(estudiante.semestre - vacante.semestre_minimo + 1, SEMESTRES_PUNTAJE_COMPLETO)
+    comunes = len(habilidades_estudiante & habilidades_vacante)
+
+    puntaje = (
+        PESOS['programa'] * (1 if mismo_programa else 0.5)
+        + PESOS['semestre'] * semestres / SEMESTRES_PUNTAJE_COMPLETO
+        + PESOS['promedio'] * min(float(estudiante.promedio_academico or 0) / 5, 1)
+        + PESOS['habilidades'] * (comunes / len(habilidades_vacante) if habilidades_vacante else 0)
+    )
+    return AfinidadVacante(
+        estudiante_id=estudiante.pk, vacante_id=vacante.pk,
+        puntaje=round(puntaje), habilidades_comunes=comunes,
+    )
+
+
+def _estudiantes():
+    return Estudiante.objects.only('id', *CAMPOS_ESTUDIANTE)
+
+
+def _vacantes():
+    return Vacante.objects.filter(estado__in=ESTADOS_INDEXADOS).only('id', *CAMPOS_VACANTE)
+
+
+# ============================================
+# MANTENIMIENTO DEL ÍNDICE
+# ============================================
+
+def actualizar_vacante(vacante_id):
+    """Recalcular las filas de una vacante (al crearla, editarla o cerrarla)"""
+    vacante = _vacantes().filter(pk=vacante_id).first()
+    nuevas = []
+    if vacante is not None:
+        habilidades = palabras_vacante(vacante)
+        candidatos = _estudiantes().alias(programa=Lower('programa_academico')).filter(
+            semestre__gte=vacante.semestre_minimo,
+            programa__contains=vacante.programa_academico.lower(),
+        )
+        for estudiante in candidatos.iterator():
+            afinidad = puntuar(estudiante, vacante, habilidades_vacante=habilidades)
+            if afinidad is not None:
+                nuevas.append(afinidad)
+
+    with transaction.atomic():
+        AfinidadVacante.objects.filter(vacante_id=vacante_id).delete()
+        AfinidadVacante.objects.bulk_create(nuevas, batch_size=TAMANO_LOTE)
+    return len(nuevas)
+
+
+def actualizar_estudiante(estudiante_id):
+    """Recalcular las filas de un estudiante (al registrarse o editar su perfil)"""
+    estudiante = _estudiantes().filter(pk=estudiante_id).first()
+    nuevas = []
+    if estudiante is not None:
+        habilidades = palabras_estudiante(estudiante)
+        vacantes = _vacantes().filter(semestre_minimo__lte=estudiante.semestre).filter(
+            Contains(Value(estudiante.programa_academico.lower()), Lower('programa_academico'))
+        )
+        for vacante in vacantes.iterator():
+            afinidad = puntuar(estudiante, vacante, habilidades_estudiante=habilidades)
+            if afinidad is not None:
+                nuevas.append(afinidad)
+
+    with transaction.atomic():
+        AfinidadVacante.objects.filter(estudiante_id=estudiante_id).delete()
+        AfinidadVacante.objects.bulk_create(nuevas, batch_size=TAMANO_LOTE)
+    return len(nuevas)
+
+
+def reconstruir():
+    """Recalcular el índice completo; devuelve las filas creadas"""
+    vacantes = [(vacante, palabras_vacante(vacante)) for vacante in _vacantes()]
+
+    # Agrupar por programa: cada estudiante solo se compara con las vacantes de su programa
+    por_programa = defaultdict(list)
+    for vacante, habilidades in vacantes:
+        por_programa[vacante.programa_academico.lower()].append((vacante, habilidades))
+
+    total = 0
+    with transaction.atomic():
+        AfinidadVacante.objects.all().delete()
+        lote = []
+        for estudiante in _estudiantes().iterator(chunk_size=2000):
+            programa = estudiante.programa_academico.lower()
+            habilidades = palabras_estudiante(estudiante)
+            for programa_vacante, opciones in por_programa.items():
+                if programa_vacante not in programa:
+                    continue
+                for vacante, habilidades_vacante in opciones:
+                    afinidad = puntuar(estudiante, vacante, habilidades, habilidades_vacante)
+                    if afinidad is not None:
+                        lote.append(afinidad)
+            if len(lote) >= TAMANO_LOTE:
+                AfinidadVacante.objects.bulk_create(lote)
+                total += len(lote)
+                lote = []
+        AfinidadVacante.objects.bulk_create(lote)
+        total += len(lote)
+    return total
+
+
+# ============================================
+# LECTURA
+# ============================================
+
+def vacantes_recomendadas(estudiante, queryset=None):
+    """
+    Vacantes DISPONIBLE cuyos requisitos cumple el estudiante, de mayor a
+    menor afinidad (anotada como `afinidad`). Recortar con [:n].
+    """
+    queryset = Vacante.objects.all() if queryset is None else queryset
+    return queryset.filter(
+        afinidades__estudiante=estudiante, estado='DISPONIBLE'
+    ).annotate(
+        afinidad=F('afinidades__puntaje'),
+    ).order_by('-afinidad', '-fecha_publicacion', '-id')
+
+
+def anotar_afinidad(vacantes, estudiante):
+    """
+    Anotar `afinidad` (None si el estudiante no cumple los requisitos) con
+    un LEFT JOIN al índice, sin cambiar qué vacantes se listan
+    """
+    return vacantes.annotate(
+        afinidad_estudiante=FilteredRelation('afinidades', condition=Q(afinidades__estudiante=estudiante)),
+        afinidad=F('afinidad_estudiante__puntaje'),
+    )
+
+
+def estudiantes_recomendados(vacante):
+    """
+    Estudiantes APTO que cumplen los requisitos de la vacante y aún no están
+    postulados a ella, de mayor a menor afinidad. Recortar con [:n].
+    """
+    return Estudiante.objects.filter(
+        afinidades__vacante=vacante, estado='APTO'
+    ).exclude(
+        Exists(Postulacion.objects.filter(vacante=vacante, estudiante=OuterRef('pk')))
+    ).annotate(
+        afinidad=F('afinidades__puntaje'),
+        habilidades_comunes=F('afinidades__habilidades_comunes'),
+    ).order_by('-afinidad', 'nombre_completo')
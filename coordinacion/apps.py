@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoordinacionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'coordinacion'
+
+    def ready(self):
+        from config import basedatos  # noqa: F401  (LOWER() con Unicode en SQLite)
+        from . import signals  # noqa: F401
@@ -0,0 +1,214 @@
+"""
+Asignación automática de docentes asesores
+
+Propone un docente para cada postulación VINCULADO que aún no tiene
+práctica, repartiendo la carga y prefiriendo docentes cuya especialidad
+coincida con el área de práctica de la vacante.
+
+El algoritmo es un greedy con montículos (heapq):
+    - un montículo global (carga, docente) y uno por palabra clave de
+      especialidad;
+    - cada solicitud toma el docente afín de menor carga, salvo que supere
+      en más de `tolerancia` prácticas al de menor carga global, en cuyo
+      caso se asigna a este último para no disparar la carga máxima.
+
+Coste O((P + D) log D) para P solicitudes y D docentes; ver
+scripts/bench_asignacion.py (5.000 prácticas / 200 docentes).
+"""
+import heapq
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q
+
+from .models import DocenteAsesor, PracticaEmpresarial, Postulacion, TutorEmpresarial
+
+# Prácticas de más que se aceptan para respetar la afinidad de especialidad
+TOLERANCIA_AFINIDAD = 2
+
+# Palabras que no sirven para relacionar especialidad y área
+PALABRAS_VACIAS = {
+    'de', 'del', 'la', 'las', 'el', 'los', 'en', 'y', 'e', 'o', 'u', 'para', 'con', 'por',
+    'area', 'areas', 'gestion', 'practica', 'practicas',
+}
+
+
+def palabras_clave(texto):
+    """Palabras normalizadas (sin tildes, minúsculas) útiles para comparar áreas"""
+    texto = unicodedata.normalize('NFKD', texto or '').encode('ascii', 'ignore').decode('ascii')
+    return {
+        palabra for palabra in re.findall(r'[a-z0-9]+', texto.lower())
+        if len(palabra) > 2 and palabra not in PALABRAS_VACIAS
+    }
+
+
+@dataclass
+class Solicitud:
+    """Una práctica por asignar (normalmente una postulación vinculada)"""
+    id: int
+    area: str
+
+
+@dataclass
+class Candidato:
+    """Docente disponible con su carga actual (prácticas en curso)"""
+    id: int
+    especialidad: str
+    carga: int = 0
+
+
+@dataclass
+class Propuesta:
+    asignaciones: dict = field(default_factory=dict)   # solicitud_id -> docente_id
+    afines: set = field(default_factory=set)            # solicitudes asignadas por especialidad
+    cargas: dict = field(default_factory=dict)          # docente_id -> carga final
+
+    @property
+    def carga_maxima(self):
+        return max(self.cargas.values(), default=0)
+
+
+def proponer(solicitudes, candidatos, tolerancia=TOLERANCIA_AFINIDAD):
+    """
+    Calcular la asignación sin tocar la base de datos.
+    `solicitudes` y `candidatos` son iterables de Solicitud y Candidato.
+    """
+    cargas = {c.id: c.carga for c in candidatos}
+    propuesta = Propuesta(cargas=cargas)
+    if not cargas:
+        return propuesta
+
+    palabras_docente = {c.id: palabras_clave(c.especialidad) for c in candidatos}
+    palabras_area = {}
+
+    # Montículos (carga, docente_id); las entradas con carga vieja se descartan al salir
+    global_heap = [(c.carga, c.id) for c in candidatos]
+    heapq.heapify(global_heap)
+    por_palabra = {}
+    for c in candidatos:
+        for palabra in palabras_docente[c.id]:
+            por_palabra.setdefault(palabra, []).append((c.carga, c.id))
+    for heap in por_palabra.values():
+        heapq.heapify(heap)
+
+    def tope(heap):
+        while heap and cargas[heap[0][1]] != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def empujar(docente_id):
+        carga = cargas[docente_id]
+        heapq.heappush(global_heap, (carga, docente_id))
+        for palabra in palabras_docente[docente_id]:
+            heapq.heappush(por_palabra[palabra], (carga, docente_id))
+
+    for solicitud in solicitudes:
+        if solicitud.area not in palabras_area:
+            palabras_area[solicitud.area] = palabras_clave(solicitud.area)
+
+        minimo = tope(global_heap)
+        afin = None
+        for palabra in palabras_area[solicitud.area]:
+            heap = por_palabra.get(palabra)
+            candidato = tope(heap) if heap else None
+            if candidato and (afin is None or candidato < afin):
+                afin = candidato
+
+        if afin and afin[0] <= minimo[0] + tolerancia:
+            docente_id = afin[1]
+            propuesta.afines.add(solicitud.id)
+        else:
+            docente_id = minimo[1]
+
+        cargas[docente_id] += 1
+        propuesta.asignaciones[solicitud.id] = docente_id
+        empujar(docente_id)
+
+    return propuesta
+
+
+# ============================================
+# INTEGRACIÓN CON LOS MODELOS
+# ============================================
+
+def postulaciones_por_asignar():
+    """Postulaciones vinculadas que todavía no tienen práctica creada"""
+    return Postulacion.objects.filter(estado='VINCULADO').annotate(
+        tiene_practica=Exists(PracticaEmpresarial.objects.filter(
+            estudiante=OuterRef('estudiante'), vacante=OuterRef('vacante')
+        ))
+    ).filter(tiene_practica=False).select_related(
+        'estudiante', 'vacante__empresa'
+    ).order_by('id')
+
+
+def docentes_disponibles():
+    """Docentes activos con su número de prácticas en curso"""
+    return DocenteAsesor.objects.filter(activo=True).annotate(
+        practicas_activas=Count(
+            'practicas_asesoradas', filter=Q(practicas_asesoradas__estado='EN_CURSO')
+        )
+    ).order_by('id')
+
+
+def proponer_para_postulaciones(postulaciones=None, tolerancia=TOLERANCIA_AFINIDAD):
+    """
+    Vista previa (dry-run): devuelve (postulaciones, docentes por id, Propuesta).
+    """
+    postulaciones = list(postulaciones if postulaciones is not None else postulaciones_por_asignar())
+    docentes = {d.id: d for d in docentes_disponibles()}
+    propuesta = proponer(
+        [Solicitud(p.id, p.vacante.area_practica) for p in postulaciones],
+        [Candidato(d.id, d.especialidad, d.practicas_activas) for d in docentes.values()],
+        tolerancia=tolerancia,
+    )
+    return postulaciones, docentes, propuesta
+
+
+def sugerir_docente(postulacion):
+    """Docente propuesto para una sola postulación (formulario manual)"""
+    _, docentes, propuesta = proponer_para_postulaciones([postulacion])
+    return docentes.get(propuesta.asignaciones.get(postulacion.id))
+
+
+@transaction.atomic
+def aplicar(postulaciones, propuesta, coordinador, fecha_inicio):
+    """
+    Crear las prácticas EN_CURSO de la propuesta con bulk_create.
+    El tutor empresarial queda en el primer tutor activo de la empresa
+    (se puede cambiar luego desde el detalle de la práctica).
+    """
+    from .signals import aplicar_deltas
+
+    empresas = {p.vacante.empresa_id for p in postulaciones}
+    tutores = {}
+    for empresa_id, tutor_id in TutorEmpresarial.objects.filter(
+        empresa_id__in=empresas, activo=True
+    ).order_by('id').values_list('empresa_id', 'id'):
+        tutores.setdefault(empresa_id, tutor_id)
+
+    practicas = [
+        PracticaEmpresarial(
+            estudiante=postulacion.estudiante,
+            empresa=postulacion.vacante.empresa,
+            vacante=postulacion.vacante,
+            tutor_empresarial_id=tutores.get(postulacion.vacante.empresa_id),
+            docente_asesor_id=propuesta.asignaciones[postulacion.id],
+            fecha_inicio=fecha_inicio,
+            fecha_fin_estimada=fecha_inicio + timedelta(days=postulacion.vacante.duracion_meses * 30),
+            estado='EN_CURSO',
+            plan_aprobado=False,
+            asignada_por=coordinador,
+            observaciones=f'Práctica creada desde postulación #{postulacion.id} (asignación automática)',
+        )
+        for postulacion in postulaciones
+        if postulacion.id in propuesta.asignaciones
+    ]
+    creadas = PracticaEmpresarial.objects.bulk_create(practicas)
+
+    # bulk_create no dispara señales: actualizar los indicadores a mano
+    aplicar_deltas(PracticaEmpresarial, {'practicas_en_curso': len(creadas)})
+    return creadas
@@ -0,0 +1,313 @@
+"""
+Búsqueda de texto completo (empresas, vacantes, estudiantes, tutores y docentes)
+
+Cada objeto buscable tiene una fila en la tabla `coordinacion_busqueda` con
+su tipo, su id, un título (nombre o razón social) y un cuerpo con el resto
+de campos de texto, incluidos los de sus relaciones (la razón social de la
+empresa de una vacante, por ejemplo). Las señales mantienen la fila al
+guardar o borrar el objeto y al cambiar la empresa de la que copia datos.
+
+Según la base de datos:
+
+    SQLite       tabla virtual FTS5, tokenize='unicode61 remove_diacritics 2'
+    PostgreSQL   tabla con columna tsvector ('spanish' + unaccent) e índice GIN
+
+En los dos casos cada palabra buscada es un prefijo ("gom anal" encuentra
+a "Gómez, analista"), todas deben aparecer, mayúsculas y tildes dan igual
+y el título pesa más que el cuerpo al ordenar por relevancia.
+
+Uso:
+    busqueda.filtrar(Vacante.objects.all(), 'analista')    # filtro de un listado
+    Q(estudiante_id__in=busqueda.ids('estudiante', texto))  # por una relación
+    busqueda.buscar('gomez', tipos=['estudiante'])          # búsqueda global
+
+La migración que crea la tabla indexa los datos existentes con una copia
+de DOCUMENTOS: si estos cambian, o para los datos
+cargados después con bulk_create() o SQL directo (no disparan las señales):
+python manage.py rebuild_search_index
+"""
+import re
+from dataclasses import dataclass
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.urls import reverse
+
+from .models import DocenteAsesor, Empresa, Estudiante, TutorEmpresarial, Vacante
+
+TABLA = 'coordinacion_busqueda'
+PESO_TITULO = 10.0
+TAMANO_LOTE = 1000
+
+
+# ============================================
+# DOCUMENTOS INDEXADOS
+# ============================================
+
+@dataclass
+class Documento:
+    tipo: str
+    codigo: int             # clave de la fila = id * 8 + codigo
+    modelo: type
+    titulo: str             # campo del título
+    cuerpo: tuple           # campos del cuerpo; 'empresa__razon_social' sigue la relación
+    url: str                # vista de detalle (recibe el id)
+
+    def clave(self, objeto_id):
+        return objeto_id * 8 + self.codigo
+
+    @property
+    def campos(self):
+        """Campos del modelo que alimentan la fila (update_fields que obligan a reindexar)"""
+        return {campo.split('__')[0] for campo in (self.titulo, *self.cuerpo)}
+
+    @property
+    def relaciones(self):
+        """{campo FK: campos del modelo relacionado que se copian al cuerpo}"""
+        relaciones = {}
+        for campo in self.cuerpo:
+            if '__' in campo:
+                relacion, resto = campo.split('__', 1)
+                relaciones.setdefault(relacion, set()).add(resto)
+        return relaciones
+
+    def consulta(self):
+        return self.modelo.objects.select_related(*self.relaciones)
+
+    def fila(self, objeto):
+        cuerpo = ' '.join(filter(None, (_valor(objeto, campo) for campo in self.cuerpo)))
+        return (self.clave(objeto.pk), self.tipo, objeto.pk, _valor(objeto, self.titulo), cuerpo)
+
+    def condicion_simple(self, texto):
+        """Filtro icontains equivalente, para bases de datos sin motor de búsqueda"""
+        condicion = Q()
+        for campo in (self.titulo, *self.cuerpo):
+            condicion |= Q(**{f'{campo}__icontains': texto})
+        return condicion
+
+
+def _valor(objeto, campo):
+    for parte in campo.split('__'):
+        objeto = getattr(objeto, parte, None)
+        if objeto is None:
+            return ''
+    return str(objeto)
+
+
+DOCUMENTOS = {
+    documento.tipo: documento
+    for documento in (
+        Documento('empresa', 1, Empresa, 'razon_social',
+                  ('nit', 'ciudad', 'representante_nombre'), 'coordinacion:empresa_detalle'),
+        Documento('vacante', 2, Vacante, 'titulo',
+                  ('area_practica', 'habilidades_requeridas', 'empresa__razon_social'),
+                  'coordinacion:vacante_detalle'),
+        Documento('estudiante', 3, Estudiante, 'nombre_completo',
+                  ('codigo', 'email'), 'coordinacion:estudiante_detalle'),
+        Documento('tutor', 4, TutorEmpresarial, 'nombre_completo',
+                  ('cargo', 'email', 'empresa__razon_social'), 'coordinacion:tutor_detalle'),
+        Documento('docente', 5, DocenteAsesor, 'nombre_completo',
+                  ('especialidad', 'email', 'cedula'), 'coordinacion:docente_asesor_detalle'),
+    )
+}
+
+
+def documento_de(modelo):
+    for documento in DOCUMENTOS.values():
+        if documento.modelo is modelo:
+            return documento
+    raise KeyError(modelo)
+
+
+def terminos(texto):
+    """Palabras de la búsqueda; la puntuación no cuenta"""
+    return re.findall(r'\w+', texto or '')
+
+
+# ============================================
+# MOTORES
+# ============================================
+
+class MotorSQLite:
+    """FTS5: la clave de la fila es el rowid, ordenado con bm25()"""
+
+    def guardar(self, cursor, filas):
+        cursor.executemany(
+            f'INSERT OR REPLACE INTO {TABLA} (rowid, tipo, objeto_id, titulo, cuerpo) '
+            f'VALUES (%s, %s, %s, %s, %s)', filas,
+        )
+
+    def borrar(self, cursor, claves):
+        cursor.executemany(f'DELETE FROM {TABLA} WHERE rowid = %s', [(clave,) for clave in claves])
+
+    def vaciar(self, cursor):
+        cursor.execute(f'DELETE FROM {TABLA}')
+
+    def consulta(self, palabras):
+        return ' '.join(f'"{palabra}"*' for palabra in palabras)
+
+    def ids(self, tipo, consulta):
+        return f'SELECT objeto_id FROM {TABLA} WHERE {TABLA} MATCH %s AND tipo = %s', [consulta, tipo]
+
+    def ranking(self, tipos, consulta, limite):
+        marcas = ', '.join(['%s'] * len(tipos))
+        return (
+            f'SELECT tipo, objeto_id, titulo, cuerpo FROM {TABLA} '
+            f'WHERE {TABLA} MATCH %s AND tipo IN ({marcas}) '
+            f'ORDER BY bm25({TABLA}, 0, 0, {PESO_TITULO}, 1.0) LIMIT %s',
+            [consulta, *tipos, limite],
+        )
+
+
+class MotorPostgres:
+    """tsvector calculado al escribir (unaccent no es IMMUTABLE), ordenado con ts_rank()"""
+
+    VECTOR = (
+        "setweight(to_tsvector('spanish', unaccent(%s)), 'A') || "
+        "setweight(to_tsvector('spanish', unaccent(%s)), 'B')"
+    )
+    QUERY = "to_tsquery('spanish', unaccent(%s))"
+
+    def guardar(self, cursor, filas):
+        cursor.executemany(
+            f'INSERT INTO {TABLA} (clave, tipo, objeto_id, titulo, cuerpo, documento) '
+            f'VALUES (%s, %s, %s, %s, %s, {self.VECTOR}) '
+            f'ON CONFLICT (clave) DO UPDATE SET titulo = EXCLUDED.titulo, '
+            f'cuerpo = EXCLUDED.cuerpo, documento = EXCLUDED.documento',
+            [(*fila, fila[3], fila[4]) for fila in filas],
+        )
+
+    def borrar(self, cursor, claves):
+        cursor.execute(f'DELETE FROM {TABLA} WHERE clave = ANY(%s)', [list(claves)])
+
+    def vaciar(self, cursor):
+        cursor.execute(f'TRUNCATE {TABLA}')
+
+    def consulta(self, palabras):
+        return ' & '.join(f'{palabra}:*' for palabra in palabras)
+
+    def ids(self, tipo, consulta):
+        return (
+            f'SELECT objeto_id FROM {TABLA} WHERE tipo = %s AND documento @@ {self.QUERY}',
+            [tipo, consulta],
+        )
+
+    def ranking(self, tipos, consulta, limite):
+        return (
+            f'SELECT tipo, objeto_id, titulo, cuerpo FROM {TABLA} '
+            f'WHERE tipo = ANY(%s) AND documento @@ {self.QUERY} '
+            f'ORDER BY ts_rank(documento, {self.QUERY}) DESC LIMIT %s',
+            [list(tipos), consulta, consulta, limite],
+        )
+
+
+MOTORES = {'sqlite': MotorSQLite(), 'postgresql': MotorPostgres()}
+
+
+def motor():
+    """Motor de la base de datos actual; None si no tiene índice (se usa icontains)"""
+    return MOTORES.get(connection.vendor)
+
+
+# ============================================
+# MANTENIMIENTO DEL ÍNDICE
+# ============================================
+
+def indexar(tipo, ids):
+    """Reescribir las filas de los objetos `ids` de `tipo` (los que ya no existen se borran)"""
+    motor_actual = motor()
+    if motor_actual is None:
+        return
+    documento = DOCUMENTOS[tipo]
+    ids = list(ids)
+    filas = [documento.fila(objeto) for objeto in documento.consulta().filter(pk__in=ids)]
+    borrados = set(ids) - {fila[2] for fila in filas}
+    with connection.cursor() as cursor:
+        if filas:
+            motor_actual.guardar(cursor, filas)
+        if borrados:
+            motor_actual.borrar(cursor, [documento.clave(objeto_id) for objeto_id in borrados])
+
+
+def eliminar(tipo, ids):
+    motor_actual = motor()
+    if motor_actual is None:
+        return
+    documento = DOCUMENTOS[tipo]
+    with connection.cursor() as cursor:
+        motor_actual.borrar(cursor, [documento.clave(objeto_id) for objeto_id in ids])
+
+
+def reconstruir():
+    """Reindexar todo; devuelve {tipo: filas}"""
+    motor_actual = motor()
+    if motor_actual is None:
+        return {}
+    totales = {}
+    with connection.cursor() as cursor:
+        motor_actual.vaciar(cursor)
+        for documento in DOCUMENTOS.values():
+            lote, total = [], 0
+            for objeto in documento.consulta().iterator(chunk_size=2000):
+                lote.append(documento.fila(objeto))
+                if len(lote) >= TAMANO_LOTE:
+                    motor_actual.guardar(cursor, lote)
+                    total += len(lote)
+                    lote = []
+            if lote:
+                motor_actual.guardar(cursor, lote)
+            totales[documento.tipo] = total + len(lote)
+    return totales
+
+
+# ============================================
+# LECTURA
+# ============================================
+
+def ids(tipo, texto):
+    """
+    Subconsulta con los ids de `tipo` que coinciden con `texto`, para usar
+    como `pk__in=` o `<fk>_id__in=` sin traer los ids a Python
+    """
+    documento = DOCUMENTOS[tipo]
+    palabras = terminos(texto)
+    if not palabras:
+        return documento.modelo.objects.none().values('pk')
+    motor_actual = motor()
+    if motor_actual is None:
+        return documento.modelo.objects.filter(documento.condicion_simple(texto)).values('pk')
+    return RawSQL(*motor_actual.ids(tipo, motor_actual.consulta(palabras)))
+
+
+def filtrar(queryset, texto, tipo=None):
+    """Restringir `queryset` a los objetos que coinciden con `texto` (conserva su orden)"""
+    tipo = tipo or documento_de(queryset.model).tipo
+    return queryset.filter(pk__in=ids(tipo, texto))
+
+
+def buscar(texto, tipos=None, limite=20):
+    """
+    Búsqueda global ordenada por relevancia:
+    [{'tipo', 'id', 'titulo', 'detalle', 'url'}, ...]
+    """
+    tipos = [tipo for tipo in (tipos or DOCUMENTOS) if tipo in DOCUMENTOS]
+    palabras = terminos(texto)
+    motor_actual = motor()
+    if not palabras or not tipos or motor_actual is None:
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(*motor_actual.ranking(tipos, motor_actual.consulta(palabras), limite))
+        filas = cursor.fetchall()
+
+    return [
+        {
+            'tipo': tipo,
+            'id': objeto_id,
+            'titulo': titulo,
+            'detalle': cuerpo,
+            'url': reverse(DOCUMENTOS[tipo].url, args=[objeto_id]),
+        }
+        for tipo, objeto_id, titulo, cuerpo in filas
+    ]
@@ -0,0 +1,226 @@
+"""
+Pub/sub del chat estudiante-docente
+
+Cada práctica es un canal. Al guardarse un Mensaje (ver signals.py) se
+publica ya serializado, y las conexiones abiertas por stream_mensajes lo
+reciben sin volver a consultar la base de datos: una pestaña de chat
+inactiva solo espera en el broker.
+
+Backends:
+    - Local (por defecto): en memoria del proceso. Suficiente con un único
+      proceso (runserver o un worker con hilos).
+    - Redis: con varios workers, CHAT_PUBSUB_URL = 'redis://host:6379/0'
+      (cualquier servidor compatible con el protocolo de Redis). Requiere el
+      paquete `redis`.
+"""
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.http import StreamingHttpResponse
+
+from . import lectura
+from .models import Mensaje
+from .serializers import serialize_mensaje
+
+
+def canal_practica(practica_id):
+    """Nombre del canal de una práctica"""
+    return f'chat:practica:{practica_id}'
+
+
+class LocalSuscripcion:
+    """Cola de mensajes pendientes de un suscriptor del broker local"""
+
+    def __init__(self, broker, canal):
+        self.broker = broker
+        self.canal = canal
+        self.pendientes = deque()
+
+    def esperar(self, timeout):
+        """Bloquea hasta que haya mensajes o venza el timeout; devuelve la lista (puede ser vacía)"""
+        fin = time.monotonic() + timeout
+        with self.broker.condicion:
+            while not self.pendientes:
+                restante = fin - time.monotonic()
+                if restante <= 0:
+                    return []
+                self.broker.condicion.wait(restante)
+            recibidos = list(self.pendientes)
+            self.pendientes.clear()
+        return recibidos
+
+
+class LocalBroker:
+    """Pub/sub en memoria del proceso"""
+
+    def __init__(self):
+        self.condicion = threading.Condition()
+        self.suscriptores = {}
+
+    def publicar(self, canal, payload):
+        with self.condicion:
+            for suscripcion in self.suscriptores.get(canal, ()):
+                suscripcion.pendientes.append(payload)
+            self.condicion.notify_all()
+
+    @contextmanager
+    def suscribir(self, canal):
+        suscripcion = LocalSuscripcion(self, canal)
+        with self.condicion:
+            self.suscriptores.setdefault(canal, set()).add(suscripcion)
+        try:
+            yield suscripcion
+        finally:
+            with self.condicion:
+                activos = self.suscriptores.get(canal)
+                activos.discard(suscripcion)
+                if not activos:
+                    del self.suscriptores[canal]
+
+
+class RedisSuscripcion:
+    """Suscripción a un canal de Redis"""
+
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    def esperar(self, timeout):
+        fin = time.monotonic() + timeout
+        recibidos = []
+        while not recibidos:
+            restante = fin - time.monotonic()
+            if restante <= 0:
+                break
+            mensaje = self.pubsub.get_message(timeout=restante)
+            while mensaje:
+                recibidos.append(json.loads(mensaje['data']))
+                mensaje = self.pubsub.get_message(timeout=0)
+        return recibidos
+
+
+class RedisBroker:
+    """Pub/sub sobre Redis para repartir mensajes entre varios workers"""
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured(
+                'CHAT_PUBSUB_URL apunta a Redis pero el paquete "redis" no está instalado.'
+            )
+        self.redis = redis.Redis.from_url(url)
+
+    def publicar(self, canal, payload):
+        self.redis.publish(canal, json.dumps(payload))
+
+    @contextmanager
+    def suscribir(self, canal):
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(canal)
+        try:
+            yield RedisSuscripcion(pubsub)
+        finally:
+            pubsub.close()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Broker configurado en settings.CHAT_PUBSUB_URL (local si no está definido)"""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            url = getattr(settings, 'CHAT_PUBSUB_URL', None)
+            _broker = RedisBroker(url) if url else LocalBroker()
+        return _broker
+
+
+def publicar_mensaje(mensaje):
+    """Publicar un Mensaje recién creado cuando se confirme la transacción"""
+    payload = serialize_mensaje(mensaje)
+    transaction.on_commit(
+        lambda: get_broker().publicar(canal_practica(mensaje.practica_id), payload)
+    )
+
+
+# ============================================
+# STREAM (Server-Sent Events)
+# ============================================
+
+def evento_sse(payload):
+    return f'id: {payload["id"]}\nevent: mensaje\ndata: {json.dumps(payload)}\n\n'
+
+
+def stream_mensajes(request, practica, ultimo_id):
+    """
+    Respuesta text/event-stream con los mensajes de la práctica posteriores
+    a ultimo_id. Al conectar se envían los pendientes (una consulta); luego la
+    conexión solo espera en el broker y manda un comentario keep-alive cada
+    CHAT_STREAM_KEEPALIVE segundos. Tras CHAT_STREAM_TIMEOUT segundos se
+    cierra y EventSource reconecta con Last-Event-ID.
+
+    Cada conexión abierta ocupa un hilo del servidor mientras dura.
+    """
+    usuario_id = request.user.id
+    duracion = getattr(settings, 'CHAT_STREAM_TIMEOUT', 55)
+    keepalive = getattr(settings, 'CHAT_STREAM_KEEPALIVE', 15)
+
+    def entregar(payloads):
+        nonlocal ultimo_id
+        nuevos = [p for p in payloads if p['id'] > ultimo_id]
+        if not nuevos:
+            return ''
+
+        ultimo_id = max(p['id'] for p in nuevos)
+
+        # Marcar como leídos los mensajes del otro participante (avanza el cursor de lectura)
+        if any(p['remitente_id'] != usuario_id for p in nuevos):
+            lectura.avanzar(practica.id, usuario_id, ultimo_id)
+
+        return ''.join(
+            evento_sse({**p, 'es_mio': p['remitente_id'] == usuario_id}) for p in nuevos
+        )
+
+    def eventos():
+        fin = time.monotonic() + duracion
+        yield 'retry: 3000\n\n'
+
+        with get_broker().suscribir(canal_practica(practica.id)) as suscripcion:
+            # Suscrito antes de consultar: lo que llegue mientras tanto queda en cola
+            pendientes = lectura.anotar_leido(Mensaje.objects.filter(
+                practica=practica, id__gt=ultimo_id
+            )).select_related(
+                'remitente__estudiante', 'remitente__docente_asesor'
+            ).order_by('id')
+            datos = entregar([serialize_mensaje(m) for m in pendientes])
+            if datos:
+                yield datos
+
+            while True:
+                restante = fin - time.monotonic()
+                if restante <= 0:
+                    break
+                recibidos = suscripcion.esperar(min(restante, keepalive))
+                yield entregar(recibidos) or ': keepalive\n\n'
+
+    response = StreamingHttpResponse(eventos(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def ultimo_id_cliente(request):
+    """ID del último mensaje que tiene el cliente (Last-Event-ID al reconectar)"""
+    valor = request.headers.get('Last-Event-ID') or request.GET.get('ultimo_id') or 0
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return 0
@@ -0,0 +1,279 @@
+"""
+Cola de tareas en segundo plano respaldada por la base de datos
+
+Los efectos secundarios de los cambios de estado (actualizar al estudiante,
+notificaciones, documentos, miniaturas...) no se ejecutan dentro de la
+petición: la vista los encola y `python manage.py run_tasks` los ejecuta
+con un pool de hilos. No hace falta ningún broker externo.
+
+    @cola.tarea('estudiante_actualizar_estado')
+    def estudiante_actualizar_estado(estudiante_id, estado): ...
+
+    cola.encolar('estudiante_actualizar_estado', clave=f'postulacion:{p.id}:VINCULADO:estudiante',
+                 estudiante_id=p.estudiante_id, estado='EN_PRACTICA')
+
+- La fila de la tarea se inserta en la transacción de la vista: si el
+  cambio de estado se revierte, la tarea también.
+- La tarea se ejecuta en una transacción junto con su marca de
+  COMPLETADA, así que sus cambios se aplican una sola vez.
+- Si falla se reintenta con espera exponencial hasta max_intentos; después
+  queda FALLIDA y puede reintentarse desde la página de tareas.
+- `clave` es de idempotencia: encolar de nuevo la misma clave mientras la
+  tarea sigue PENDIENTE o EN_PROCESO devuelve esa tarea. Una vez terminada
+  (o FALLIDA) la clave queda libre: la misma transición repetida más tarde
+  (vincular, desvincular y volver a vincular) encola su propia tarea.
+- encolar_recalculo() es para tareas que recalculan a partir de los datos
+  actuales (índice de afinidad): no encola otra si ya hay una igual
+  pendiente.
+- Un trabajador reclama una tarea con un UPDATE condicional (sirve en
+  SQLite, sin SELECT ... FOR UPDATE); si muere, otro la retoma cuando vence
+  `bloqueada_hasta`.
+
+Las tareas se registran en el módulo `tareas.py` de cada app.
+En los tests: cola.ejecutar_pendientes() las corre en el hilo actual.
+"""
+import logging
+import threading
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Tarea
+
+logger = logging.getLogger(__name__)
+
+TAREAS = {}
+
+# Estados en los que una tarea ocupa su clave de idempotencia
+ESTADOS_ACTIVOS = ('PENDIENTE', 'EN_PROCESO')
+
+
+def tarea(nombre):
+    """Registrar una función como tarea; los parámetros deben ser serializables a JSON"""
+    def decorador(funcion):
+        if nombre in TAREAS and TAREAS[nombre] is not funcion:
+            raise ValueError(f'Ya existe una tarea "{nombre}"')
+        TAREAS[nombre] = funcion
+        return funcion
+    return decorador
+
+
+def descubrir():
+    """Importar los módulos tareas.py de las apps instaladas"""
+    autodiscover_modules('tareas')
+
+
+def _ajuste(nombre, defecto):
+    return getattr(settings, nombre, defecto)
+
+
+# ============================================
+# ENCOLAR
+# ============================================
+
+def encolar(nombre, clave=None, retraso=0, max_intentos=None, **parametros):
+    """
+    Crear la tarea `nombre` con `parametros`. Con `clave`, si ya hay una
+    tarea pendiente o en proceso con esa clave se devuelve esa en lugar de
+    crear otra.
+    """
+    descubrir()
+    if nombre not in TAREAS:
+        raise ValueError(f'La tarea "{nombre}" no está registrada')
+
+    if clave is not None:
+        existente = Tarea.objects.filter(clave=clave, estado__in=ESTADOS_ACTIVOS).first()
+        if existente is not None:
+            return existente
+
+    datos = {
+        'nombre': nombre,
+        'parametros': parametros,
+        'clave': clave,
+        'max_intentos': max_intentos or _ajuste('TAREAS_MAX_INTENTOS', 5),
+        'ejecutar_despues': timezone.now() + timedelta(seconds=retraso),
+    }
+    try:
+        with transaction.atomic():
+            nueva = Tarea.objects.create(**datos)
+    except IntegrityError:
+        existente = clave and Tarea.objects.filter(clave=clave, estado__in=ESTADOS_ACTIVOS).first()
+        if not existente:
+            raise
+        # Otra petición encoló la misma clave entre la consulta y el INSERT
+        return existente
+
+    if _ajuste('TAREAS_EN_LINEA', False):
+        # Desarrollo sin trabajador: se ejecuta al confirmar la transacción de la vista
+        transaction.on_commit(lambda: ejecutar(nueva.pk))
+    return nueva
+
+
+def encolar_recalculo(nombre, **parametros):
+    """
+    Encolar `nombre` salvo que ya haya una tarea igual PENDIENTE: esa leerá
+    los datos más recientes al ejecutarse, así que varios guardados seguidos
+    del mismo objeto se recalculan una sola vez. Una EN_PROCESO no cuenta
+    (pudo leer los datos anteriores al cambio).
+    """
+    pendiente = Tarea.objects.filter(nombre=nombre, parametros=parametros, estado='PENDIENTE').first()
+    return pendiente or encolar(nombre, **parametros)
+
+
+# ============================================
+# EJECUTAR
+# ============================================
+
+def _listas(ahora):
+    """Pendientes cuya espera venció, o en proceso de un trabajador que no terminó a tiempo"""
+    return Q(estado='PENDIENTE', ejecutar_despues__lte=ahora) | Q(estado='EN_PROCESO', bloqueada_hasta__lt=ahora)
+
+
+def reclamar(limite):
+    """Marcar como EN_PROCESO hasta `limite` tareas listas y devolver sus ids"""
+    ahora = timezone.now()
+    candidatas = list(
+        Tarea.objects.filter(_listas(ahora))
+        .order_by('ejecutar_despues', 'id')
+        .values_list('id', flat=True)[:limite * 2]
+    )
+    bloqueo = ahora + timedelta(seconds=_ajuste('TAREAS_TIMEOUT', 300))
+    reclamadas = []
+    for tarea_id in candidatas:
+        # Si otro trabajador la reclamó primero, el UPDATE no afecta filas
+        if Tarea.objects.filter(_listas(ahora), pk=tarea_id).update(
+            estado='EN_PROCESO', intentos=F('intentos') + 1,
+            bloqueada_hasta=bloqueo, fecha_inicio=ahora,
+        ):
+            reclamadas.append(tarea_id)
+            if len(reclamadas) == limite:
+                break
+    return reclamadas
+
+
+def espera_reintento(intentos):
+    """Segundos hasta el siguiente intento: base * 2^(intentos-1), máximo una hora"""
+    base = _ajuste('TAREAS_REINTENTO_BASE', 10)
+    return min(base * 2 ** max(intentos - 1, 0), 3600)
+
+
+def ejecutar(tarea_id):
+    """Ejecutar una tarea reclamada. Devuelve True si terminó bien."""
+    descubrir()
+    actual = Tarea.objects.get(pk=tarea_id)
+    if actual.estado != 'EN_PROCESO':
+        # Modo en línea: la tarea aún no se reclamó
+        if not Tarea.objects.filter(pk=tarea_id, estado='PENDIENTE').update(
+            estado='EN_PROCESO', intentos=F('intentos') + 1, fecha_inicio=timezone.now(),
+        ):
+            return False
+        actual.refresh_from_db()
+
+    try:
+        funcion = TAREAS[actual.nombre]
+        with transaction.atomic():
+            funcion(**actual.parametros)
+            Tarea.objects.filter(pk=tarea_id).update(
+                estado='COMPLETADA', fecha_fin=timezone.now(), bloqueada_hasta=None, ultimo_error='',
+            )
+        return True
+    except Exception:
+        error = traceback.format_exc()
+        ahora = timezone.now()
+        if actual.intentos >= actual.max_intentos:
+            cambios = {'estado': 'FALLIDA', 'fecha_fin': ahora}
+            logger.error('Tarea %s #%s fallida tras %s intentos', actual.nombre, tarea_id, actual.intentos)
+        else:
+            cambios = {
+                'estado': 'PENDIENTE',
+                'ejecutar_despues': ahora + timedelta(seconds=espera_reintento(actual.intentos)),
+            }
+            logger.warning('Tarea %s #%s falló (intento %s), se reintentará',
+                           actual.nombre, tarea_id, actual.intentos)
+        Tarea.objects.filter(pk=tarea_id).update(bloqueada_hasta=None, ultimo_error=error, **cambios)
+        return False
+
+
+def reintentar(tarea_id):
+    """
+    Volver a poner en cola una tarea FALLIDA (página de tareas). Devuelve 0
+    si ya hay otra tarea activa con su clave (encolada por una transición
+    posterior)
+    """
+    try:
+        with transaction.atomic():
+            return Tarea.objects.filter(pk=tarea_id, estado='FALLIDA').update(
+                estado='PENDIENTE', intentos=0, ejecutar_despues=timezone.now(), fecha_fin=None,
+            )
+    except IntegrityError:
+        return 0
+
+
+def ejecutar_pendientes(limite=100):
+    """Ejecutar en el hilo actual las tareas listas (tests y --once sin hilos)"""
+    ejecutadas = 0
+    while ejecutadas < limite:
+        ids = reclamar(min(10, limite - ejecutadas))
+        if not ids:
+            break
+        for tarea_id in ids:
+            ejecutar(tarea_id)
+        ejecutadas += len(ids)
+    return ejecutadas
+
+
+# ============================================
+# TRABAJADOR
+# ============================================
+
+def _ejecutar_en_hilo(tarea_id):
+    try:
+        return ejecutar(tarea_id)
+    except Exception:
+        logger.exception('Error inesperado ejecutando la tarea #%s', tarea_id)
+        return False
+    finally:
+        # Cada hilo del pool tiene su propia conexión
+        connections.close_all()
+
+
+def trabajar(hilos=4, intervalo=1.0, una_vez=False, detener=None):
+    """
+    Bucle del trabajador: reclama tantas tareas como hilos libres y espera
+    `intervalo` segundos cuando no hay nada que hacer. Con `una_vez` termina
+    en cuanto la cola queda vacía. Devuelve (completadas, fallidas).
+    """
+    descubrir()
+    detener = detener or threading.Event()
+    completadas = fallidas = 0
+    en_curso = set()
+    with ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='tareas') as pool:
+        while not detener.is_set():
+            libres = hilos - len(en_curso)
+            if libres:
+                en_curso.update(pool.submit(_ejecutar_en_hilo, tarea_id) for tarea_id in reclamar(libres))
+
+            if not en_curso:
+                if una_vez:
+                    break
+                detener.wait(intervalo)
+                continue
+
+            hechas, en_curso = wait(en_curso, timeout=intervalo, return_when=FIRST_COMPLETED)
+            for futuro in hechas:
+                if futuro.result():
+                    completadas += 1
+                else:
+                    fallidas += 1
+        for futuro in en_curso:
+            if futuro.result():
+                completadas += 1
+            else:
+                fallidas += 1
+    return completadas, fallidas
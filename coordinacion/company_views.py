@@ -16,7 +16,7 @@ def coordinator_required(view_func):
     def _wrapped_view(request, *args, **kwargs):
         if not request.user.is_authenticated:
             return redirect('coordinacion:login')
-        if not hasattr(request.user, 'coordinador'):
+        if 'coordinador' not in request.roles:
             messages.error(request, 'Acceso denegado: se requiere rol Coordinador')
             return HttpResponseForbidden('Acceso denegado')
         return view_func(request, *args, **kwargs)
@@ -2,6 +2,8 @@
 Context processors para coordinación
 Inyecta datos del coordinador en todos los templates automáticamente
 """
+from config import roles
+
 
 def coordinador_data(request):
     """
@@ -10,8 +12,9 @@ def coordinador_data(request):
     """
     context = {}
 
-    if request.user.is_authenticated and hasattr(request.user, 'coordinador'):
-        context['coordinador'] = request.user.coordinador
+    coordinador = roles.obtener(request).coordinador
+    if coordinador is not None:
+        context['coordinador'] = coordinador
 
     return context
 
@@ -0,0 +1,143 @@
+"""
+Contabilidad de cupos de las vacantes
+
+Ocupar o liberar un cupo no lee, suma y guarda en Python (dos
+coordinadores aprobando a la vez perderían una de las dos sumas y podrían
+sobrepasar la vacante): cada operación es un UPDATE condicional que la base
+de datos aplica de forma atómica:
+
+    UPDATE vacante SET cupos_ocupados = cupos_ocupados + 1
+     WHERE id = %s AND cupos_ocupados < cantidad_cupos
+
+Si no afecta ninguna fila, la vacante ya estaba llena. El cambio de estado
+DISPONIBLE <-> OCUPADA es otro UPDATE condicional en la misma transacción;
+su resultado dice si hay que ajustar KpiSnapshot (las actualizaciones por
+queryset no disparan señales).
+
+Vincular o desvincular una postulación mueve primero su estado con otro
+UPDATE condicional (SELECCIONADO <-> VINCULADO) y solo si ese UPDATE
+afectó la fila se ocupa o libera el cupo, en la misma transacción: un doble
+envío o dos coordinadores con la misma postulación la mueven una sola vez.
+
+Uso:
+    if not cupos.vincular(postulacion, fecha_respuesta=timezone.now()):
+        ...  # postulacion.estado tiene el valor guardado o la vacante está llena
+    cupos.desvincular(postulacion, observaciones=texto)
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Postulacion, Vacante
+from .signals import aplicar_deltas, campos_kpi
+
+
+def _cambiar_estado(vacante, anterior, nuevo, **condicion):
+    """Pasar la vacante de `anterior` a `nuevo` si cumple `condicion`; ajusta los indicadores"""
+    if not Vacante.objects.filter(pk=vacante.pk, estado=anterior, **condicion).update(
+        estado=nuevo, fecha_actualizacion=timezone.now()
+    ):
+        return
+    deltas = Counter()
+    deltas.subtract(campos_kpi(Vacante, anterior, totales=False))
+    deltas.update(campos_kpi(Vacante, nuevo, totales=False))
+    aplicar_deltas(Vacante, deltas)
+
+
+def _recargar(vacante):
+    vacante.refresh_from_db(fields=['cupos_ocupados', 'estado', 'fecha_actualizacion'])
+    # Las señales de KpiSnapshot comparan con el estado que se cargó
+    vacante._kpi_estado = vacante.estado
+
+
+def reservar(vacante):
+    """
+    Ocupar un cupo de `vacante`. Devuelve False, sin cambiar nada, si ya no
+    quedaban cupos. La vacante pasa a OCUPADA al llenarse.
+    """
+    with transaction.atomic():
+        if not Vacante.objects.filter(pk=vacante.pk, cupos_ocupados__lt=F('cantidad_cupos')).update(
+            cupos_ocupados=F('cupos_ocupados') + 1, fecha_actualizacion=timezone.now()
+        ):
+            _recargar(vacante)
+            return False
+        _cambiar_estado(vacante, 'DISPONIBLE', 'OCUPADA', cupos_ocupados__gte=F('cantidad_cupos'))
+    _recargar(vacante)
+    return True
+
+
+def liberar(vacante):
+    """
+    Devolver un cupo de `vacante` (desvinculación, práctica cancelada).
+    Devuelve False si no había cupos ocupados. Una vacante OCUPADA vuelve a
+    DISPONIBLE; una CERRADA sigue cerrada.
+    """
+    with transaction.atomic():
+        if not Vacante.objects.filter(pk=vacante.pk, cupos_ocupados__gt=0).update(
+            cupos_ocupados=F('cupos_ocupados') - 1, fecha_actualizacion=timezone.now()
+        ):
+            _recargar(vacante)
+            return False
+        _cambiar_estado(vacante, 'OCUPADA', 'DISPONIBLE', cupos_ocupados__lt=F('cantidad_cupos'))
+    _recargar(vacante)
+    return True
+
+
+# ============================================
+# POSTULACIONES
+# ============================================
+
+CAMPOS_POSTULACION = ['estado', 'fecha_respuesta', 'observaciones', 'fecha_actualizacion']
+
+
+def _mover_postulacion(postulacion, anterior, nuevo, **campos):
+    """Pasar la postulación de `anterior` a `nuevo` (y guardar `campos`); False si ya no estaba en `anterior`"""
+    campos.update(estado=nuevo, fecha_actualizacion=timezone.now())
+    if not Postulacion.objects.filter(pk=postulacion.pk, estado=anterior).update(**campos):
+        return False
+    deltas = Counter()
+    deltas.subtract(campos_kpi(Postulacion, anterior, totales=False))
+    deltas.update(campos_kpi(Postulacion, nuevo, totales=False))
+    aplicar_deltas(Postulacion, deltas)
+
+    for campo, valor in campos.items():
+        setattr(postulacion, campo, valor)
+    postulacion._kpi_estado = nuevo
+    return True
+
+
+def _recargar_postulacion(postulacion):
+    postulacion.refresh_from_db(fields=CAMPOS_POSTULACION)
+    postulacion._kpi_estado = postulacion.estado
+
+
+def vincular(postulacion, **campos):
+    """
+    Pasar la postulación de SELECCIONADO a VINCULADO y ocupar un cupo de su
+    vacante, las dos cosas o ninguna. Devuelve False si ya no estaba
+    SELECCIONADO (postulacion.estado queda con el valor guardado) o si la
+    vacante no tenía cupos.
+    """
+    with transaction.atomic():
+        if _mover_postulacion(postulacion, 'SELECCIONADO', 'VINCULADO', **campos):
+            if reservar(postulacion.vacante):
+                return True
+            # Sin cupo: deshacer el cambio de estado
+            transaction.set_rollback(True)
+    _recargar_postulacion(postulacion)
+    return False
+
+
+def desvincular(postulacion, **campos):
+    """
+    Devolver la postulación de VINCULADO a SELECCIONADO y liberar su cupo.
+    Devuelve False, sin liberar nada, si ya no estaba VINCULADO.
+    """
+    with transaction.atomic():
+        if _mover_postulacion(postulacion, 'VINCULADO', 'SELECCIONADO', **campos):
+            liberar(postulacion.vacante)
+            return True
+    _recargar_postulacion(postulacion)
+    return False
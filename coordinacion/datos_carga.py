@@ -0,0 +1,565 @@
+"""
+Datos sintéticos para pruebas de carga
+
+Genera un grafo completo y consistente (usuarios, coordinadores, docentes,
+empresas, tutores, vacantes, estudiantes, postulaciones, prácticas,
+seguimientos, mensajes y cursores de lectura) con bulk_create por lotes,
+cada lote en su propia transacción. Las reglas de negocio se respetan:
+    - solo las empresas APROBADA tienen vacantes y tutores;
+    - cada práctica sale de una vacante del programa del estudiante con
+      cupo libre, y tiene su postulación VINCULADO;
+    - cupos_ocupados y el estado de la vacante cuadran con sus prácticas;
+    - un estudiante no tiene más de 3 postulaciones activas;
+    - el estado del estudiante corresponde a su práctica.
+
+Con la misma semilla, el mismo volumen y la misma fecha `hasta`, el
+resultado es idéntico (ids incluidos si la base está vacía). Los ids se
+asignan explícitamente desde el máximo actual, así no hace falta que el
+motor devuelva las filas insertadas.
+
+Lo usa `python manage.py generate_load_dataset`.
+"""
+import itertools
+import random
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import (
+    Coordinador, Empresa, Vacante, Estudiante, Postulacion, TutorEmpresarial,
+    DocenteAsesor, PracticaEmpresarial, SeguimientoSemanal, Mensaje, CursorLectura, KpiSnapshot,
+)
+from . import afinidad, busqueda, sondeo
+from .postulaciones_lote import MAX_POSTULACIONES_ACTIVAS
+
+PASSWORD = 'carga123'
+
+NOMBRES = [
+    'Ana', 'Andrés', 'Camila', 'Carlos', 'Daniela', 'David', 'Diana', 'Diego', 'Felipe',
+    'Gabriela', 'Isabella', 'Jorge', 'Juan', 'Julián', 'Laura', 'Luis', 'Manuela', 'María',
+    'Mateo', 'Natalia', 'Paula', 'Santiago', 'Sara', 'Sebastián', 'Sofía', 'Valentina',
+]
+APELLIDOS = [
+    'Álvarez', 'Castro', 'Díaz', 'Gómez', 'González', 'Gutiérrez', 'Herrera', 'Jiménez',
+    'López', 'Martínez', 'Morales', 'Moreno', 'Muñoz', 'Ortiz', 'Pérez', 'Ramírez',
+    'Restrepo', 'Rodríguez', 'Rojas', 'Ruiz', 'Sánchez', 'Torres', 'Vargas',
+]
+CIUDADES = ['Armenia', 'Bogotá', 'Medellín', 'Cali', 'Pereira', 'Manizales', 'Bucaramanga']
+SECTORES = ['Tecnología', 'Soluciones', 'Consultores', 'Logística', 'Ingeniería', 'Servicios', 'Digital']
+SOCIEDADES = ['S.A.S.', 'S.A.', 'Ltda.']
+PROGRAMAS = [
+    'Ingeniería de Software', 'Ingeniería de Sistemas', 'Ingeniería Industrial',
+    'Administración de Empresas', 'Contaduría Pública', 'Diseño Gráfico',
+]
+AREAS = [
+    ('Desarrollo de Software', 'Practicante de Desarrollo'),
+    ('Business Intelligence', 'Practicante de Analítica de Datos'),
+    ('Infraestructura TI', 'Practicante de Soporte Técnico'),
+    ('Marketing y Comunicaciones', 'Practicante de Marketing Digital'),
+    ('Gestión de Proyectos', 'Practicante de Proyectos'),
+    ('Finanzas', 'Practicante Contable'),
+    ('Diseño de Experiencia de Usuario', 'Practicante de Diseño UX/UI'),
+]
+ESPECIALIDADES = [
+    'Ingeniería de Software', 'Bases de Datos', 'Gestión de Proyectos',
+    'Desarrollo de Aplicaciones', 'Finanzas', 'Diseño',
+]
+HORARIOS = ['Lunes a viernes 8:00 - 17:00', 'Medio tiempo (mañana)', 'Medio tiempo (tarde)']
+FRASES = [
+    'Buenos días, adjunto el avance de la semana.',
+    'Revisé el informe, por favor complete la sección de logros.',
+    '¿Podemos reunirnos el jueves para revisar el plan?',
+    'Listo, ya hice las correcciones.',
+    'La empresa aprobó la propuesta del módulo.',
+    'Recuerde subir la evidencia del seguimiento.',
+    'Gracias, quedo atento a sus comentarios.',
+]
+
+
+@dataclass
+class Volumen:
+    """Tamaño del conjunto de datos (los promedios varían por registro)"""
+    estudiantes: int = 5000
+    empresas: int = 200
+    docentes: int = None                # por defecto 1 por cada 50 estudiantes
+    coordinadores: int = 3
+    vacantes_por_empresa: float = 3     # promedio, solo empresas APROBADA
+    postulaciones_por_estudiante: float = 2
+    proporcion_practicas: float = 0.3   # estudiantes con práctica
+    semanas_seguimiento: int = 8
+    mensajes_por_practica: float = 10
+
+    def __post_init__(self):
+        if self.docentes is None:
+            self.docentes = max(1, self.estudiantes // 50)
+
+
+@dataclass
+class Reporte:
+    """Filas insertadas y tiempo por modelo"""
+    filas: dict = field(default_factory=dict)       # nombre -> (filas, segundos)
+
+    def agregar(self, nombre, filas, segundos):
+        previas, tiempo = self.filas.get(nombre, (0, 0.0))
+        self.filas[nombre] = (previas + filas, tiempo + segundos)
+
+    @property
+    def total(self):
+        return sum(filas for filas, _ in self.filas.values())
+
+    @property
+    def segundos(self):
+        return sum(tiempo for _, tiempo in self.filas.values())
+
+
+@contextmanager
+def fechas_manuales(*modelos):
+    """
+    Desactivar auto_now/auto_now_add mientras se generan los datos, para
+    poder repartir las fechas en el tiempo. Solo para comandos: el cambio
+    afecta a todo el proceso.
+    """
+    campos = [
+        (campo, campo.auto_now, campo.auto_now_add)
+        for modelo in modelos for campo in modelo._meta.concrete_fields
+        if getattr(campo, 'auto_now', False) or getattr(campo, 'auto_now_add', False)
+    ]
+    for campo, _, _ in campos:
+        campo.auto_now = campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        for campo, auto_now, auto_now_add in campos:
+            campo.auto_now, campo.auto_now_add = auto_now, auto_now_add
+
+
+class GeneradorDatos:
+    MODELOS = (
+        User, Coordinador, DocenteAsesor, Empresa, TutorEmpresarial, Vacante,
+        Estudiante, PracticaEmpresarial, Postulacion, SeguimientoSemanal, Mensaje, CursorLectura,
+    )
+
+    def __init__(self, volumen, semilla=42, prefijo='carga', lote=5000, hasta=None, progreso=None):
+        self.volumen = volumen
+        self.semilla = semilla
+        self.prefijo = prefijo
+        self.lote = lote
+        self.rng = random.Random(semilla)
+        self.progreso = progreso or (lambda nombre, filas, segundos: None)
+        self.reporte = Reporte()
+
+        hasta = hasta or timezone.localdate()
+        self.hasta = datetime(hasta.year, hasta.month, hasta.day, 18, tzinfo=dt_timezone.utc)
+        self.password = make_password(PASSWORD, salt=f'{prefijo}{semilla}')
+
+    # ============================================
+    # UTILIDADES
+    # ============================================
+
+    def hace(self, dias_max, dias_min=0):
+        """Momento aleatorio entre `dias_max` y `dias_min` días antes de `hasta`"""
+        return self.hasta - timedelta(seconds=self.rng.randint(dias_min * 86400, dias_max * 86400))
+
+    def nombre(self):
+        return (f'{self.rng.choice(NOMBRES)} {self.rng.choice(APELLIDOS)} '
+                f'{self.rng.choice(APELLIDOS)}')
+
+    def cantidad(self, promedio):
+        """Entero aleatorio con ese promedio (0 .. 2 * promedio)"""
+        return self.rng.randint(0, max(0, round(2 * promedio)))
+
+    def telefono(self):
+        return f'3{self.rng.randint(100000000, 299999999)}'
+
+    def ids(self, modelo, cantidad):
+        inicio = (modelo.objects.aggregate(maximo=Max('pk'))['maximo'] or 0) + 1
+        return range(inicio, inicio + cantidad)
+
+    def insertar(self, modelo, objetos):
+        """bulk_create en lotes de `self.lote`, cada uno en su transacción"""
+        inicio = time.perf_counter()
+        total = 0
+        objetos = iter(objetos)
+        while True:
+            bloque = list(itertools.islice(objetos, self.lote))
+            if not bloque:
+                break
+            with transaction.atomic():
+                modelo.objects.bulk_create(bloque)
+            total += len(bloque)
+
+        segundos = time.perf_counter() - inicio
+        self.reporte.agregar(modelo.__name__, total, segundos)
+        self.progreso(modelo.__name__, total, segundos)
+
+    def usuarios(self, ids, tipo, fechas):
+        for numero, (id_usuario, fecha) in enumerate(zip(ids, fechas), start=1):
+            yield User(
+                id=id_usuario, username=f'{self.prefijo}_{tipo}_{numero:06d}',
+                email=f'{self.prefijo}.{tipo}{numero}@carga.test',
+                password=self.password, date_joined=fecha,
+            )
+
+    # ============================================
+    # GENERACIÓN
+    # ============================================
+
+    def verificar_prefijo(self):
+        if User.objects.filter(username__startswith=f'{self.prefijo}_').exists():
+            raise ValueError(
+                f'Ya hay datos generados con el prefijo "{self.prefijo}"; '
+                'usa otro prefijo o una base de datos limpia'
+            )
+
+    def generar(self):
+        """Generar todo el conjunto; devuelve el Reporte"""
+        self.verificar_prefijo()
+        with fechas_manuales(*self.MODELOS):
+            coordinadores = self.generar_coordinadores()
+            docentes = self.generar_docentes()
+            empresas, tutores = self.generar_empresas(coordinadores)
+            vacantes = self.planear_vacantes(empresas)
+            estudiantes = self.planear_estudiantes()
+            practicas = self.planear_practicas(estudiantes, vacantes, tutores, docentes)
+
+            self.insertar(Vacante, self.vacantes(vacantes, coordinadores))
+            self.generar_estudiantes(estudiantes)
+            self.insertar(PracticaEmpresarial, self.practicas(practicas, coordinadores))
+            self.insertar(Postulacion, self.postulaciones(estudiantes, vacantes, practicas, coordinadores))
+            self.insertar(SeguimientoSemanal, self.seguimientos(practicas))
+            leidos = []
+            self.insertar(Mensaje, self.mensajes(practicas, leidos))
+            self.insertar(CursorLectura, self.cursores_lectura(leidos))
+
+        self.reiniciar_secuencias()
+        inicio = time.perf_counter()
+        KpiSnapshot.reconstruir()
+        self.progreso('KpiSnapshot', 1, time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        pares = afinidad.reconstruir()
+        self.progreso('AfinidadVacante', pares, time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        filas = sum(busqueda.reconstruir().values())
+        self.progreso('Búsqueda', filas, time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        conversaciones = sondeo.reconstruir()
+        self.progreso('ConversacionChat', conversaciones, time.perf_counter() - inicio)
+        return self.reporte
+
+    def reiniciar_secuencias(self):
+        """Los ids se asignaron a mano: ajustar las secuencias (PostgreSQL, Oracle)"""
+        sentencias = connection.ops.sequence_reset_sql(no_style(), self.MODELOS)
+        if sentencias:
+            with connection.cursor() as cursor:
+                for sql in sentencias:
+                    cursor.execute(sql)
+
+    def generar_coordinadores(self):
+        cantidad = self.volumen.coordinadores
+        fechas = [self.hace(1500, 1000) for _ in range(cantidad)]
+        ids_usuarios = self.ids(User, cantidad)
+        self.insertar(User, self.usuarios(ids_usuarios, 'coord', fechas))
+
+        ids = list(self.ids(Coordinador, cantidad))
+        self.insertar(Coordinador, (
+            Coordinador(
+                id=id_coordinador, user_id=id_usuario, nombre_completo=self.nombre(),
+                email=f'{self.prefijo}.coord{numero}@carga.test', telefono=self.telefono(),
+                fecha_creacion=fecha, fecha_actualizacion=fecha,
+            )
+            for numero, (id_coordinador, id_usuario, fecha)
+            in enumerate(zip(ids, ids_usuarios, fechas), start=1)
+        ))
+        return ids
+
+    def generar_docentes(self):
+        """[(id, user_id, especialidad)]"""
+        cantidad = self.volumen.docentes
+        fechas = [self.hace(1500, 200) for _ in range(cantidad)]
+        ids_usuarios = self.ids(User, cantidad)
+        self.insertar(User, self.usuarios(ids_usuarios, 'doc', fechas))
+
+        docentes = [
+            (id_docente, id_usuario, self.rng.choice(ESPECIALIDADES))
+            for id_docente, id_usuario in zip(self.ids(DocenteAsesor, cantidad), ids_usuarios)
+        ]
+        self.insertar(DocenteAsesor, (
+            DocenteAsesor(
+                id=id_docente, user_id=id_usuario, nombre_completo=self.nombre(),
+                cedula=f'{self.prefijo}D{numero:07d}', email=f'{self.prefijo}.doc{numero}@carga.test',
+                telefono=self.telefono(), especialidad=especialidad,
+                fecha_registro=fecha, fecha_actualizacion=fecha,
+            )
+            for numero, ((id_docente, id_usuario, especialidad), fecha)
+            in enumerate(zip(docentes, fechas), start=1)
+        ))
+        return docentes
+
+    def generar_empresas(self, coordinadores):
+        """Devuelve ([ids de empresas APROBADA], {empresa_id: [tutor_id, ...]})"""
+        estados = ['APROBADA'] * 17 + ['PENDIENTE', 'RECHAZADA', 'INACTIVA']
+        empresas, aprobadas = [], []
+        for numero, id_empresa in enumerate(self.ids(Empresa, self.volumen.empresas), start=1):
+            estado = self.rng.choice(estados)
+            registro = self.hace(1100, 30)
+            representante = self.nombre()
+            empresas.append(Empresa(
+                id=id_empresa,
+                razon_social=f'{self.rng.choice(SECTORES)} {self.rng.choice(APELLIDOS)} {numero} '
+                             f'{self.rng.choice(SOCIEDADES)}',
+                nit=f'{self.prefijo}-{numero:07d}', direccion=f'Calle {self.rng.randint(1, 150)} '
+                                                            f'#{self.rng.randint(1, 99)}-{self.rng.randint(1, 99)}',
+                telefono=self.telefono(), email=f'contacto{numero}@empresa.carga.test',
+                ciudad=self.rng.choice(CIUDADES), representante_nombre=representante,
+                representante_cargo='Gerente', representante_email=f'gerencia{numero}@empresa.carga.test',
+                representante_telefono=self.telefono(), estado=estado,
+                fecha_registro=registro, fecha_actualizacion=registro,
+                fecha_aprobacion=registro + timedelta(days=self.rng.randint(1, 20)) if estado == 'APROBADA' else None,
+                aprobada_por_id=self.rng.choice(coordinadores) if estado == 'APROBADA' else None,
+            ))
+            if estado == 'APROBADA':
+                aprobadas.append(id_empresa)
+        self.insertar(Empresa, empresas)
+
+        tutores = defaultdict(list)
+        planeados = [(id_empresa, self.rng.randint(1, 2)) for id_empresa in aprobadas]
+        ids = iter(self.ids(TutorEmpresarial, sum(n for _, n in planeados)))
+        objetos = []
+        for id_empresa, cantidad in planeados:
+            for _ in range(cantidad):
+                id_tutor = next(ids)
+                tutores[id_empresa].append(id_tutor)
+                registro = self.hace(1000, 30)
+                objetos.append(TutorEmpresarial(
+                    id=id_tutor, empresa_id=id_empresa, nombre_completo=self.nombre(),
+                    cargo=self.rng.choice(['Líder técnico', 'Jefe de área', 'Coordinador']),
+                    email=f'tutor{id_tutor}@empresa.carga.test', telefono=self.telefono(),
+                    activo=self.rng.random() > 0.05, fecha_registro=registro, fecha_actualizacion=registro,
+                ))
+        self.insertar(TutorEmpresarial, objetos)
+        return aprobadas, tutores
+
+    def planear_vacantes(self, empresas):
+        """Lista de dicts; cupos_ocupados y estado se completan con las prácticas"""
+        planeadas = []
+        for id_empresa in empresas:
+            for _ in range(max(1, self.cantidad(self.volumen.vacantes_por_empresa))):
+                area, titulo = self.rng.choice(AREAS)
+                planeadas.append({
+                    'empresa_id': id_empresa, 'titulo': titulo, 'area_practica': area,
+                    'programa_academico': self.rng.choice(PROGRAMAS),
+                    'semestre_minimo': self.rng.randint(5, 8),
+                    'cantidad_cupos': self.rng.randint(1, 4), 'cupos_ocupados': 0,
+                    'fecha_creacion': self.hace(700, 1),
+                })
+        for vacante, id_vacante in zip(planeadas, self.ids(Vacante, len(planeadas))):
+            vacante['id'] = id_vacante
+        return planeadas
+
+    def vacantes(self, vacantes, coordinadores):
+        for vacante in vacantes:
+            if vacante['cupos_ocupados'] >= vacante['cantidad_cupos']:
+                estado = 'OCUPADA'
+            else:
+                estado = 'CERRADA' if self.rng.random() < 0.1 else 'DISPONIBLE'
+            yield Vacante(
+                **vacante, estado=estado, creada_por_id=self.rng.choice(coordinadores),
+                descripcion=f'{vacante["titulo"]} en el área de {vacante["area_practica"]}.',
+                horario=self.rng.choice(HORARIOS), duracion_meses=6,
+                fecha_publicacion=vacante['fecha_creacion'],
+                fecha_actualizacion=vacante['fecha_creacion'],
+                fecha_cierre=self.hasta if estado == 'CERRADA' else None,
+            )
+
+    def planear_estudiantes(self):
+        cantidad = self.volumen.estudiantes
+        estudiantes = []
+        for numero, id_estudiante in enumerate(self.ids(Estudiante, cantidad), start=1):
+            estudiantes.append({
+                'id': id_estudiante, 'numero': numero,
+                'programa_academico': self.rng.choice(PROGRAMAS),
+                'semestre': self.rng.randint(5, 10),
+                'promedio_academico': Decimal(self.rng.randint(300, 500)) / 100,
+                'estado': 'NO_APTO' if self.rng.random() < 0.05 else 'APTO',
+                'fecha_registro': self.hace(1400, 60),
+            })
+        return estudiantes
+
+    def generar_estudiantes(self, estudiantes):
+        ids_usuarios = self.ids(User, len(estudiantes))
+        self.insertar(User, self.usuarios(ids_usuarios, 'est', [e['fecha_registro'] for e in estudiantes]))
+
+        def objetos():
+            for estudiante, id_usuario in zip(estudiantes, ids_usuarios):
+                estudiante['user_id'] = id_usuario
+                yield Estudiante(
+                    id=estudiante['id'], user_id=id_usuario,
+                    codigo=f'{self.prefijo.upper()}{estudiante["numero"]:07d}',
+                    nombre_completo=self.nombre(),
+                    email=f'{self.prefijo}.est{estudiante["numero"]}@carga.test',
+                    telefono=self.telefono(), programa_academico=estudiante['programa_academico'],
+                    semestre=estudiante['semestre'], estado=estudiante['estado'],
+                    promedio_academico=estudiante['promedio_academico'],
+                    fecha_registro=estudiante['fecha_registro'],
+                    fecha_actualizacion=estudiante['fecha_registro'],
+                )
+        self.insertar(Estudiante, objetos())
+
+    def planear_practicas(self, estudiantes, vacantes, tutores, docentes):
+        """Prácticas en vacantes del programa del estudiante con cupo libre"""
+        libres = defaultdict(list)
+        for indice, vacante in enumerate(vacantes):
+            libres[vacante['programa_academico']].append(indice)
+
+        candidatos = [e for e in estudiantes if e['estado'] == 'APTO']
+        cantidad = min(len(candidatos), round(len(estudiantes) * self.volumen.proporcion_practicas))
+        practicas = []
+        for estudiante in self.rng.sample(candidatos, cantidad):
+            indices = libres[estudiante['programa_academico']]
+            if not indices:
+                continue
+            posicion = self.rng.randrange(len(indices))
+            vacante = vacantes[indices[posicion]]
+
+            estado = self.rng.choices(['EN_CURSO', 'FINALIZADA', 'CANCELADA'], [70, 25, 5])[0]
+            if estado != 'CANCELADA':
+                vacante['cupos_ocupados'] += 1
+                if vacante['cupos_ocupados'] >= vacante['cantidad_cupos']:
+                    indices[posicion] = indices[-1]
+                    indices.pop()
+            estudiante['estado'] = {
+                'EN_CURSO': 'EN_PRACTICA', 'FINALIZADA': 'FINALIZADO', 'CANCELADA': 'APTO',
+            }[estado]
+
+            if estado == 'EN_CURSO':
+                inicio = self.hace(170, 7)
+            else:
+                inicio = self.hace(540, 200)
+            practicas.append({
+                'estudiante': estudiante, 'vacante': vacante, 'estado': estado,
+                'fecha_inicio': inicio,
+                'tutor_id': self.rng.choice(tutores[vacante['empresa_id']]),
+                'docente': self.rng.choice(docentes),
+            })
+
+        for practica, id_practica in zip(practicas, self.ids(PracticaEmpresarial, len(practicas))):
+            practica['id'] = id_practica
+        return practicas
+
+    def practicas(self, practicas, coordinadores):
+        for practica in practicas:
+            inicio = practica['fecha_inicio']
+            fin_estimado = (inicio + timedelta(days=180)).date()
+            fin_real = None
+            if practica['estado'] == 'FINALIZADA':
+                fin_real = min(fin_estimado + timedelta(days=self.rng.randint(-10, 10)), self.hasta.date())
+            elif practica['estado'] == 'CANCELADA':
+                fin_real = (inicio + timedelta(days=self.rng.randint(10, 90))).date()
+            creada = inicio - timedelta(days=self.rng.randint(1, 10))
+            yield PracticaEmpresarial(
+                id=practica['id'], estudiante_id=practica['estudiante']['id'],
+                empresa_id=practica['vacante']['empresa_id'], vacante_id=practica['vacante']['id'],
+                tutor_empresarial_id=practica['tutor_id'], docente_asesor_id=practica['docente'][0],
+                fecha_inicio=inicio.date(), fecha_fin_estimada=fin_estimado, fecha_fin_real=fin_real,
+                plan_aprobado=practica['estado'] != 'CANCELADA' and self.rng.random() < 0.9,
+                estado=practica['estado'], asignada_por_id=self.rng.choice(coordinadores),
+                fecha_creacion=creada, fecha_actualizacion=creada,
+            )
+
+    def postulaciones(self, estudiantes, vacantes, practicas, coordinadores):
+        por_programa = defaultdict(list)
+        for vacante in vacantes:
+            por_programa[vacante['programa_academico']].append(vacante)
+        vinculadas = {p['estudiante']['id']: p for p in practicas}
+
+        for estudiante in estudiantes:
+            if estudiante['estado'] == 'NO_APTO':
+                continue
+            practica = vinculadas.get(estudiante['id'])
+            en_practica = practica is not None and practica['estado'] != 'CANCELADA'
+            elegidas = {}
+            if practica:
+                fecha = practica['fecha_inicio'] - timedelta(days=self.rng.randint(11, 40))
+                estado = 'RECHAZADO' if practica['estado'] == 'CANCELADA' else 'VINCULADO'
+                elegidas[practica['vacante']['id']] = (estado, fecha)
+
+            opciones = por_programa[estudiante['programa_academico']]
+            extra = min(self.cantidad(self.volumen.postulaciones_por_estudiante), len(opciones))
+            activas = 0
+            for vacante in self.rng.sample(opciones, extra):
+                if vacante['id'] in elegidas:
+                    continue
+                estado = self.rng.choice(['POSTULADO', 'SELECCIONADO', 'RECHAZADO'])
+                if en_practica or activas >= MAX_POSTULACIONES_ACTIVAS:
+                    estado = 'RECHAZADO'
+                activas += estado != 'RECHAZADO'
+                elegidas[vacante['id']] = (estado, self.hace(365, 1))
+
+            for id_vacante, (estado, fecha) in elegidas.items():
+                respuesta = fecha + timedelta(days=self.rng.randint(1, 10)) if estado != 'POSTULADO' else None
+                yield Postulacion(
+                    vacante_id=id_vacante, estudiante_id=estudiante['id'],
+                    postulado_por_id=self.rng.choice(coordinadores), estado=estado,
+                    fecha_postulacion=fecha, fecha_actualizacion=respuesta or fecha,
+                    fecha_respuesta=respuesta,
+                )
+
+    def seguimientos(self, practicas):
+        for practica in practicas:
+            if practica['estado'] == 'CANCELADA':
+                continue
+            inicio = practica['fecha_inicio']
+            semanas = min(self.volumen.semanas_seguimiento, (self.hasta - inicio).days // 7)
+            for semana in range(1, semanas + 1):
+                desde = inicio + timedelta(weeks=semana - 1)
+                reciente = semana > semanas - 2 and practica['estado'] == 'EN_CURSO'
+                estado = self.rng.choice(['PENDIENTE', 'RECHAZADO']) if reciente else 'APROBADO'
+                registro = desde + timedelta(days=self.rng.randint(5, 7))
+                yield SeguimientoSemanal(
+                    practica_id=practica['id'], semana_numero=semana,
+                    fecha_inicio=desde.date(), fecha_fin=(desde + timedelta(days=6)).date(),
+                    actividades_realizadas=f'Actividades de la semana {semana}.',
+                    estado=estado, validado_tutor=estado == 'APROBADO', validado_docente=estado == 'APROBADO',
+                    calificacion=Decimal(self.rng.randint(35, 50)) / 10 if estado == 'APROBADO' else None,
+                    fecha_revision_docente=registro + timedelta(days=2) if estado != 'PENDIENTE' else None,
+                    fecha_registro=registro, fecha_actualizacion=registro,
+                )
+
+    def mensajes(self, practicas, leidos):
+        """Mensajes con id asignado; agrega a `leidos` (práctica, usuarios, último leído, fecha)"""
+        ids = itertools.count(self.ids(Mensaje, 0).start)
+        for practica in practicas:
+            usuarios = (practica['estudiante']['user_id'], practica['docente'][1])
+            cantidad = self.cantidad(self.volumen.mensajes_por_practica)
+            # Los últimos mensajes (de 0 a 2) quedan sin leer
+            sin_leer = self.rng.randint(0, min(2, cantidad))
+            momento = practica['fecha_inicio']
+            for indice in range(cantidad):
+                momento = min(momento + timedelta(minutes=self.rng.randint(5, 4 * 24 * 60)), self.hasta)
+                mensaje = Mensaje(
+                    id=next(ids), practica_id=practica['id'], remitente_id=self.rng.choice(usuarios),
+                    contenido=self.rng.choice(FRASES), fecha_envio=momento,
+                )
+                if indice == cantidad - sin_leer - 1:
+                    leidos.append((practica['id'], usuarios, mensaje.id, momento))
+                yield mensaje
+
+    def cursores_lectura(self, leidos):
+        """Los dos participantes leyeron hasta el mismo mensaje"""
+        for practica_id, usuarios, hasta, momento in leidos:
+            fecha = min(momento + timedelta(minutes=self.rng.randint(1, 600)), self.hasta)
+            for usuario_id in usuarios:
+                yield CursorLectura(
+                    practica_id=practica_id, usuario_id=usuario_id, ultimo_leido_id=hasta,
+                    fecha_actualizacion=fecha,
+                )
@@ -7,10 +7,16 @@ from django.utils import timezone
 from django.contrib.auth.decorators import login_required
 from functools import wraps
 from django.http import HttpResponseForbidden
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Count, F, Q
+from django.db.models.functions import Least
 
 from .models import DocenteAsesor, PracticaEmpresarial, SeguimientoSemanal
 from .forms import DocenteAsesorForm
 
+DOCENTES_POR_PAGINA = 25
+
 
 def coordinator_required(view_func):
     """Decorador para proteger rutas de coordinador."""
@@ -18,17 +24,47 @@ def coordinator_required(view_func):
     def _wrapped_view(request, *args, **kwargs):
         if not request.user.is_authenticated:
             return redirect('login_unificado')
-        if not hasattr(request.user, 'coordinador'):
+        if 'coordinador' not in request.roles:
             messages.error(request, 'Acceso denegado: se requiere rol Coordinador')
             return HttpResponseForbidden('Acceso denegado')
         return view_func(request, *args, **kwargs)
     return _wrapped_view
 
 
+def anotar_carga(docentes):
+    """
+    Anotar en una sola consulta la carga de cada docente:
+    practicas_activas, seguimientos_pendientes y carga (% de
+    DOCENTE_MAX_PRACTICAS ocupado por prácticas en curso).
+    """
+    capacidad = max(getattr(settings, 'DOCENTE_MAX_PRACTICAS', 10), 1)
+    return docentes.annotate(
+        practicas_activas=Count(
+            'practicas_asesoradas',
+            filter=Q(practicas_asesoradas__estado='EN_CURSO'),
+            distinct=True,
+        ),
+        seguimientos_pendientes=Count(
+            'practicas_asesoradas__seguimientos',
+            filter=Q(practicas_asesoradas__seguimientos__estado='PENDIENTE'),
+        ),
+    ).annotate(
+        carga=F('practicas_activas') * 100 / capacidad,
+        carga_barra=Least(F('practicas_activas') * 100 / capacidad, 100),
+    )
+
+
+ORDEN_DOCENTES = {
+    'nombre': ('nombre_completo',),
+    'carga': ('-practicas_activas', '-seguimientos_pendientes', 'nombre_completo'),
+    'disponibilidad': ('practicas_activas', 'seguimientos_pendientes', 'nombre_completo'),
+}
+
+
 @coordinator_required
 def docentes_asesores_lista(request):
-    """Lista de todos los docentes asesores"""
-    docentes = DocenteAsesor.objects.all().order_by('nombre_completo')
+    """Lista de todos los docentes asesores con su carga de trabajo"""
+    docentes = DocenteAsesor.objects.select_related('user')
 
     # Filtros
     estado_filtro = request.GET.get('estado', '')
@@ -37,20 +73,20 @@ def docentes_asesores_lista(request):
     elif estado_filtro == 'inactivos':
         docentes = docentes.filter(activo=False)
 
-    # Agregar estadísticas a cada docente
-    for docente in docentes:
-        docente.practicas_activas = PracticaEmpresarial.objects.filter(
-            docente_asesor=docente,
-            estado='EN_CURSO'
-        ).count()
-        docente.seguimientos_pendientes = SeguimientoSemanal.objects.filter(
-            practica__docente_asesor=docente,
-            estado='PENDIENTE'
-        ).count()
+    # Ordenar por nombre o por carga (para balancear asignaciones)
+    orden = request.GET.get('orden', 'nombre')
+    if orden not in ORDEN_DOCENTES:
+        orden = 'nombre'
+    docentes = anotar_carga(docentes).order_by(*ORDEN_DOCENTES[orden], 'id')
+
+    page_obj = Paginator(docentes, DOCENTES_POR_PAGINA).get_page(request.GET.get('page'))
 
     context = {
-        'docentes': docentes,
+        'docentes': page_obj,
+        'page_obj': page_obj,
         'estado_filtro': estado_filtro,
+        'orden': orden,
+        'capacidad': getattr(settings, 'DOCENTE_MAX_PRACTICAS', 10),
     }
 
     return render(request, 'coordinacion/docentes_asesores/lista.html', context)
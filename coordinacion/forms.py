@@ -288,6 +288,36 @@ class PostulacionForm(forms.ModelForm):
         return postulacion
 
 
+class PostulacionCSVForm(forms.Form):
+    """
+    Carga masiva de postulaciones desde un CSV (ver postulaciones_lote.py)
+    Columnas: vacante (id), estudiante (código), observaciones (opcional)
+    """
+    archivo = forms.FileField(
+        label='Archivo CSV',
+        widget=forms.ClearableFileInput(attrs={
+            'class': 'form-control',
+            'accept': '.csv',
+        }),
+    )
+    solo_validar = forms.BooleanField(
+        label='Solo validar (no crear postulaciones)',
+        required=False,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+    )
+
+    def clean_archivo(self):
+        archivo = self.cleaned_data.get('archivo')
+        if archivo:
+            # Validar tamaño (máximo 5MB)
+            if archivo.size > 5242880:
+                raise ValidationError('El archivo no debe superar los 5MB')
+            # Validar extensión
+            if not archivo.name.lower().endswith('.csv'):
+                raise ValidationError('Solo se permiten archivos CSV')
+        return archivo
+
+
 # ==============================
 # EmpresaForm (CRUD para Empresa)
 # ==============================
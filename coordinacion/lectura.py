@@ -0,0 +1,93 @@
+"""
+Cursores de lectura del chat estudiante-docente
+
+Cada participante tiene un CursorLectura por práctica con el id del último
+mensaje que leyó. Un mensaje está sin leer para un usuario si no lo envió
+él y su id es mayor que su cursor, y está leído (doble check para quien lo
+envió) si el cursor del otro participante ya lo alcanzó:
+
+    sin leer    practica_id = p AND id > cursor AND remitente_id <> usuario
+    leído       id <= cursor del otro participante
+
+Leer el chat solo avanza el cursor (un UPDATE condicional de una fila, o un
+INSERT la primera vez) y solo cuando se entregan mensajes que el lector no
+tenía: un sondeo sin novedades no escribe nada.
+
+Uso:
+    lectura.avanzar(practica.id, request.user.id, ultimo_id_entregado)
+    lectura.no_leidos(practica.id, request.user.id)
+    lectura.anotar_leido(Mensaje.objects.filter(practica=practica))
+"""
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import CursorLectura, Mensaje
+
+
+# ============================================
+# ESCRITURA
+# ============================================
+
+def avanzar(practica_id, usuario_id, mensaje_id):
+    """Mover el cursor del usuario hasta mensaje_id (nunca hacia atrás)"""
+    if not mensaje_id:
+        return
+    cursor = CursorLectura.objects.filter(practica_id=practica_id, usuario_id=usuario_id)
+    if cursor.filter(ultimo_leido_id__lt=mensaje_id).update(ultimo_leido_id=mensaje_id):
+        return
+    if cursor.exists():
+        return  # ya estaba más adelante (otra pestaña)
+    CursorLectura.objects.bulk_create(
+        [CursorLectura(practica_id=practica_id, usuario_id=usuario_id, ultimo_leido_id=mensaje_id)],
+        ignore_conflicts=True,
+    )
+    # Si otra petición lo creó a la vez con un id anterior
+    cursor.filter(ultimo_leido_id__lt=mensaje_id).update(ultimo_leido_id=mensaje_id)
+
+
+# ============================================
+# LECTURA
+# ============================================
+
+def leido_hasta(usuario_id, practica=OuterRef('pk')):
+    """Expresión con el cursor del usuario en `practica` (0 si no ha leído nada)"""
+    cursor = CursorLectura.objects.filter(practica=practica, usuario_id=usuario_id).values('ultimo_leido_id')
+    return Coalesce(Subquery(cursor), 0)
+
+
+def sin_leer(usuario_id, practica=OuterRef('pk')):
+    """Mensajes de `practica` que `usuario_id` no ha leído (filtrable y agregable)"""
+    # El cursor se busca por la misma práctica, no por la fila de Mensaje: así
+    # no depende de cada mensaje y la condición queda como rango sobre el índice
+    cursor_de = OuterRef(practica) if isinstance(practica, OuterRef) else practica
+    return Mensaje.objects.filter(
+        practica=practica, id__gt=leido_hasta(usuario_id, cursor_de)
+    ).exclude(remitente_id=usuario_id)
+
+
+def no_leidos(practica_id, usuario_id):
+    """Cantidad de mensajes sin leer del usuario en la práctica (una consulta)"""
+    return sin_leer(usuario_id, practica_id).count()
+
+
+def anotar_no_leidos(practicas, usuario_id):
+    """Anotar `no_leidos` en un queryset de prácticas, como subconsulta de la misma consulta"""
+    cantidad = (
+        sin_leer(usuario_id)
+        .order_by()
+        .values('practica')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    return practicas.annotate(no_leidos=Coalesce(Subquery(cantidad), 0))
+
+
+def anotar_leido(mensajes):
+    """
+    Anotar `leido` en un queryset de Mensaje (doble check en el chat): algún
+    participante distinto del remitente ya tiene el cursor en ese id o más
+    """
+    return mensajes.annotate(leido=Exists(
+        CursorLectura.objects.filter(practica=OuterRef('practica'), ultimo_leido_id__gte=OuterRef('id'))
+        .exclude(usuario=OuterRef('remitente'))
+    ))
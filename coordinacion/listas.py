@@ -0,0 +1,173 @@
+"""
+Listados paginados de coordinación
+
+Cada listado (empresas, vacantes, estudiantes, postulaciones, prácticas,
+tutores y sustentaciones) declara su queryset base, sus filtros de
+servidor y su serializador. La vista HTML envía la primera página y los
+conteos para las tarjetas; la API `api/listas/<nombre>/` devuelve las
+páginas siguientes ("Cargar más") con los mismos filtros. La búsqueda de
+texto usa el índice de busqueda.py.
+"""
+from dataclasses import dataclass
+
+from django.db.models import Q
+from django.urls import reverse
+
+from . import busqueda, serializers
+from .models import (
+    Empresa, Vacante, Estudiante, Postulacion, PracticaEmpresarial,
+    TutorEmpresarial, Sustentacion,
+)
+from .paginacion import POR_PAGINA, conteos, paginar
+
+
+# ============================================
+# FILTROS DE CADA LISTADO
+# ============================================
+
+def filtrar_empresas(queryset, params):
+    if params.get('estado'):
+        queryset = queryset.filter(estado=params['estado'])
+    if params.get('buscar'):
+        queryset = busqueda.filtrar(queryset, params['buscar'])
+    return queryset
+
+
+def filtrar_vacantes(queryset, params):
+    if params.get('estado'):
+        queryset = queryset.filter(estado=params['estado'])
+    if params.get('buscar'):
+        queryset = busqueda.filtrar(queryset, params['buscar'])
+    return queryset
+
+
+def filtrar_estudiantes(queryset, params):
+    if params.get('estado'):
+        queryset = queryset.filter(estado=params['estado'])
+    if params.get('programa'):
+        queryset = queryset.filter(programa_academico=params['programa'])
+    if params.get('buscar'):
+        queryset = busqueda.filtrar(queryset, params['buscar'])
+    return queryset
+
+
+def filtrar_postulaciones(queryset, params):
+    if params.get('estado'):
+        queryset = queryset.filter(estado=params['estado'])
+    if params.get('buscar'):
+        queryset = queryset.filter(
+            Q(estudiante_id__in=busqueda.ids('estudiante', params['buscar'])) |
+            Q(vacante_id__in=busqueda.ids('vacante', params['buscar']))
+        )
+    return queryset
+
+
+def filtrar_practicas(queryset, params):
+    if params.get('estado'):
+        queryset = queryset.filter(estado=params['estado'])
+    if params.get('buscar'):
+        queryset = queryset.filter(
+            Q(estudiante_id__in=busqueda.ids('estudiante', params['buscar'])) |
+            Q(empresa_id__in=busqueda.ids('empresa', params['buscar']))
+        )
+    return queryset
+
+
+def filtrar_tutores(queryset, params):
+    if params.get('activo'):
+        queryset = queryset.filter(activo=params['activo'] == 'true')
+    if params.get('empresa', '').isdigit():
+        queryset = queryset.filter(empresa_id=params['empresa'])
+    if params.get('busqueda'):
+        queryset = busqueda.filtrar(queryset, params['busqueda'])
+    return queryset
+
+
+def filtrar_sustentaciones(queryset, params):
+    if params.get('estado'):
+        queryset = queryset.filter(estado=params['estado'])
+    if params.get('busqueda'):
+        queryset = queryset.filter(
+            Q(practica__estudiante_id__in=busqueda.ids('estudiante', params['busqueda'])) |
+            Q(jurado_1_id__in=busqueda.ids('docente', params['busqueda'])) |
+            Q(lugar__icontains=params['busqueda'])
+        )
+    return queryset
+
+
+# ============================================
+# REGISTRO DE LISTADOS
+# ============================================
+
+@dataclass
+class Lista:
+    consulta: callable          # () -> queryset base
+    filtrar: callable           # (queryset, params) -> queryset
+    serializar: callable        # serializador registrado (serializers.py)
+    filtros: tuple              # parámetros GET que entiende `filtrar`
+    campo_conteo: str = 'estado'
+
+    def queryset(self, params):
+        # select_related/only() según lo que lee el serializador
+        return self.filtrar(serializers.preparar(self.consulta(), self.serializar), params)
+
+    def pagina(self, params, cursor=None, por_pagina=POR_PAGINA):
+        """Página serializada: {'resultados': [...], 'siguiente': cursor}"""
+        pagina = paginar(self.queryset(params), cursor, por_pagina)
+        return {
+            'resultados': serializers.serializar_lista(pagina.objetos, self.serializar),
+            'siguiente': pagina.siguiente,
+        }
+
+    def conteos(self):
+        """Conteos para las tarjetas de resumen (sin filtros)"""
+        return conteos(self.consulta(), self.campo_conteo)
+
+
+LISTAS = {
+    'empresas': Lista(
+        Empresa.objects.all,
+        filtrar_empresas, serializers.serialize_empresa, ('estado', 'buscar'),
+    ),
+    'vacantes': Lista(
+        Vacante.objects.all,
+        filtrar_vacantes, serializers.serialize_vacante, ('estado', 'buscar'),
+    ),
+    'estudiantes': Lista(
+        Estudiante.objects.all,
+        filtrar_estudiantes, serializers.serialize_estudiante, ('estado', 'programa', 'buscar'),
+    ),
+    'postulaciones': Lista(
+        Postulacion.objects.all,
+        filtrar_postulaciones, serializers.serialize_postulacion, ('estado', 'buscar'),
+    ),
+    'practicas': Lista(
+        PracticaEmpresarial.objects.all,
+        filtrar_practicas, serializers.serialize_practica, ('estado', 'buscar'),
+    ),
+    'tutores': Lista(
+        TutorEmpresarial.objects.all,
+        filtrar_tutores, serializers.serialize_tutor, ('activo', 'empresa', 'busqueda'),
+        campo_conteo='activo',
+    ),
+    'sustentaciones': Lista(
+        Sustentacion.objects.all,
+        filtrar_sustentaciones, serializers.serialize_sustentacion, ('estado', 'busqueda'),
+    ),
+}
+
+
+def contexto_lista(nombre, request, **extra):
+    """
+    Datos iniciales para el componente React de un listado: primera página,
+    cursor, filtros activos, conteos y URL de la API (JSON para la plantilla).
+    """
+    lista = LISTAS[nombre]
+    filtros = {clave: request.GET.get(clave, '') for clave in lista.filtros}
+    return serializers.to_json({
+        **lista.pagina(filtros),
+        'filtros': filtros,
+        'conteos': lista.conteos(),
+        'url': reverse('coordinacion:api_lista', args=[nombre]),
+        **extra,
+    })
@@ -0,0 +1,68 @@
+"""
+Asigna docentes asesores a las postulaciones vinculadas sin práctica
+
+Por defecto solo muestra la propuesta (dry-run). Con --aplicar crea las
+prácticas EN_CURSO con el docente propuesto.
+
+Uso:
+    python manage.py asignar_docentes
+    python manage.py asignar_docentes --aplicar --coordinador coordinador1 --fecha-inicio 2026-02-02
+"""
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from coordinacion import asignacion
+from coordinacion.models import Coordinador
+
+
+class Command(BaseCommand):
+    help = 'Propone (o aplica con --aplicar) la asignación de docentes asesores balanceando su carga'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--aplicar', action='store_true', help='Crear las prácticas propuestas')
+        parser.add_argument('--coordinador', help='Usuario del coordinador que registra las prácticas')
+        parser.add_argument('--fecha-inicio', type=date.fromisoformat, default=None,
+                            help='Fecha de inicio AAAA-MM-DD (por defecto hoy)')
+        parser.add_argument('--tolerancia', type=int, default=asignacion.TOLERANCIA_AFINIDAD,
+                            help='Prácticas de más aceptadas para asignar por especialidad')
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        postulaciones, docentes, propuesta = asignacion.proponer_para_postulaciones(
+            tolerancia=options['tolerancia']
+        )
+        duracion = (time.perf_counter() - inicio) * 1000
+
+        if not postulaciones:
+            self.stdout.write('No hay postulaciones vinculadas pendientes de práctica')
+            return
+        if not docentes:
+            raise CommandError('No hay docentes asesores activos')
+
+        for postulacion in postulaciones:
+            docente = docentes[propuesta.asignaciones[postulacion.id]]
+            marca = '*' if postulacion.id in propuesta.afines else ' '
+            self.stdout.write(
+                f'  #{postulacion.id:<6} {postulacion.estudiante.nombre_completo[:30]:<30} '
+                f'{postulacion.vacante.area_practica[:25]:<25} {marca} {docente.nombre_completo}'
+            )
+
+        self.stdout.write(
+            f'{len(postulaciones)} postulaciones, {len(docentes)} docentes, '
+            f'{len(propuesta.afines)} por especialidad (*), carga máxima {propuesta.carga_maxima} '
+            f'({duracion:.0f} ms)'
+        )
+
+        if not options['aplicar']:
+            self.stdout.write(self.style.WARNING('Dry-run: no se guardó nada (usa --aplicar)'))
+            return
+
+        coordinador = Coordinador.objects.filter(user__username=options['coordinador']).first()
+        if coordinador is None:
+            raise CommandError('Indica un coordinador válido con --coordinador <usuario>')
+
+        fecha_inicio = options['fecha_inicio'] or date.today()
+        creadas = asignacion.aplicar(postulaciones, propuesta, coordinador, fecha_inicio)
+        self.stdout.write(self.style.SUCCESS(f'✅ {len(creadas)} prácticas creadas'))
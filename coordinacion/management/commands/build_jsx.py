@@ -0,0 +1,128 @@
+"""
+Precompila el JSX embebido en las plantillas de coordinación
+
+Recorre las plantillas de las apps del proyecto, extrae cada bloque
+{% jsxbundle "nombre" %} y lo transpila/minifica con esbuild. El resultado se
+guarda con hash de contenido en JSX_BUNDLES_DIR junto a un manifest.json que
+lee el template tag para referenciar el bundle desde las plantillas.
+
+Uso:
+    python manage.py build_jsx
+    python manage.py build_jsx --compiler "npx --no-install esbuild --loader=jsx --minify"
+"""
+import hashlib
+import json
+import shlex
+import subprocess
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import get_template
+
+from coordinacion.templatetags.jsx_bundles import JsxBundleNode, manifest_path
+
+
+class Command(BaseCommand):
+    help = 'Precompila los bloques {% jsxbundle %} de las plantillas en bundles minificados con hash'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--compiler',
+            help='Comando que lee JSX por stdin y escribe JS minificado por stdout '
+                 '(por defecto settings.JSX_BUILD_COMMAND)',
+        )
+
+    def handle(self, *args, **options):
+        compiler = (
+            shlex.split(options['compiler']) if options['compiler']
+            else list(settings.JSX_BUILD_COMMAND)
+        )
+        output_dir = Path(settings.JSX_BUNDLES_DIR)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        bloques = self.encontrar_bloques()
+        if not bloques:
+            raise CommandError('No se encontraron bloques {% jsxbundle %} en las plantillas')
+
+        manifest = {}
+        total_fuente = total_bundle = 0
+        for nombre, (plantilla, fuente) in sorted(bloques.items()):
+            compilado = self.compilar(compiler, nombre, fuente)
+            digest = hashlib.sha256(compilado).hexdigest()[:12]
+            archivo = f'{nombre}.{digest}.js'
+
+            # Eliminar versiones anteriores del mismo bundle
+            for anterior in output_dir.glob(f'{nombre}.*.js'):
+                if anterior.name != archivo:
+                    anterior.unlink()
+            (output_dir / archivo).write_bytes(compilado)
+
+            manifest[nombre] = self.ruta_estatica(output_dir / archivo)
+            fuente_bytes = len(fuente.encode('utf-8'))
+            total_fuente += fuente_bytes
+            total_bundle += len(compilado)
+            self.stdout.write(
+                f'  {nombre:<24} {plantilla:<45} {fuente_bytes:>8} B JSX -> {len(compilado):>8} B'
+            )
+
+        with open(manifest_path(), 'w', encoding='utf-8') as fh:
+            json.dump(manifest, fh, indent=2, sort_keys=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {len(manifest)} bundles generados ({total_fuente} B JSX -> {total_bundle} B minificado)'
+        ))
+
+    def encontrar_bloques(self):
+        """Devuelve {nombre: (plantilla, fuente_jsx)} para cada {% jsxbundle %}"""
+        base_dir = Path(settings.BASE_DIR).resolve()
+        bloques = {}
+
+        for app_config in apps.get_app_configs():
+            templates_dir = Path(app_config.path).resolve() / 'templates'
+            if base_dir not in templates_dir.parents or not templates_dir.is_dir():
+                continue
+
+            for ruta in templates_dir.rglob('*.html'):
+                if '{% jsxbundle' not in ruta.read_text(encoding='utf-8'):
+                    continue
+
+                nombre_plantilla = ruta.relative_to(templates_dir).as_posix()
+                nodelist = get_template(nombre_plantilla).template.nodelist
+                for nodo in nodelist.get_nodes_by_type(JsxBundleNode):
+                    if nodo.nombre in bloques:
+                        raise CommandError(
+                            f'Bundle "{nodo.nombre}" duplicado en {nombre_plantilla} '
+                            f'y {bloques[nodo.nombre][0]}'
+                        )
+                    bloques[nodo.nombre] = (nombre_plantilla, nodo.source())
+
+        return bloques
+
+    def compilar(self, compiler, nombre, fuente):
+        """Ejecutar el compilador externo sobre el JSX de un bundle"""
+        try:
+            resultado = subprocess.run(
+                compiler,
+                input=fuente.encode('utf-8'),
+                capture_output=True,
+                check=False,
+            )
+        except FileNotFoundError:
+            raise CommandError(
+                f'No se encontró el compilador "{compiler[0]}". '
+                f'Instala esbuild (npm install --save-dev esbuild) o usa --compiler.'
+            )
+
+        if resultado.returncode != 0:
+            raise CommandError(
+                f'Error compilando "{nombre}":\n{resultado.stderr.decode("utf-8", "replace")}'
+            )
+        return resultado.stdout
+
+    def ruta_estatica(self, archivo):
+        """Ruta relativa a static/ de la app (la que espera {% static %})"""
+        partes = archivo.resolve().parts
+        indice = len(partes) - 1 - partes[::-1].index('static')
+        return '/'.join(partes[indice + 1:])
@@ -0,0 +1,109 @@
+"""
+Deduplica los archivos subidos que ya existen en MEDIA_ROOT
+
+Calcula el SHA-256 de cada archivo (sin los ocultos) y reemplaza cada copia
+por un enlace duro al blob de su contenido (config/almacenamiento.py). Los
+nombres guardados en la base de datos no cambian, así que no hace falta
+tocar ningún modelo. Es idempotente: una segunda ejecución no recupera nada.
+
+Uso:
+    python manage.py deduplicate_media --dry-run
+    python manage.py deduplicate_media
+    python manage.py deduplicate_media --prune     # además borra blobs sin referencias
+"""
+import os
+from collections import defaultdict
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.template.defaultfilters import filesizeformat
+
+from config.almacenamiento import AlmacenamientoDeduplicado, DIRECTORIO_BLOBS, sha256_archivo
+
+
+def ocupado(rutas):
+    """Bytes en disco de las rutas, contando una vez cada inodo"""
+    inodos = {}
+    for ruta in rutas:
+        estado = os.stat(ruta)
+        inodos[(estado.st_dev, estado.st_ino)] = estado.st_size
+    return sum(inodos.values())
+
+
+class Command(BaseCommand):
+    help = 'Reemplaza los archivos subidos repetidos por enlaces a un único blob y reporta los bytes recuperados'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Solo calcular cuánto se recuperaría, sin modificar archivos')
+        parser.add_argument('--prune', action='store_true',
+                            help='Borrar también los blobs que ningún archivo usa')
+
+    def handle(self, *args, **options):
+        almacenamiento = default_storage
+        if not isinstance(almacenamiento, AlmacenamientoDeduplicado):
+            raise CommandError('STORAGES["default"] debe ser config.almacenamiento.AlmacenamientoDeduplicado')
+
+        raiz = almacenamiento.location
+        archivos = []
+        for directorio, subdirectorios, nombres in os.walk(raiz):
+            subdirectorios[:] = sorted(d for d in subdirectorios if not d.startswith('.'))
+            archivos.extend(os.path.join(directorio, n) for n in sorted(nombres) if not n.startswith('.'))
+
+        por_contenido = defaultdict(list)
+        for ruta in archivos:
+            por_contenido[sha256_archivo(ruta)].append(ruta)
+
+        blobs = [ruta for _, ruta in almacenamiento.blobs()]
+        antes = ocupado(archivos + blobs)
+        repetidos = {sha: rutas for sha, rutas in por_contenido.items() if len(rutas) > 1}
+        self.stdout.write(
+            f'{len(archivos)} archivos, {len(por_contenido)} contenidos distintos, '
+            f'{len(repetidos)} con copias; {filesizeformat(antes)} en disco'
+        )
+        for sha256, rutas in sorted(repetidos.items(), key=lambda par: -len(par[1])):
+            self.stdout.write(f'  {sha256[:12]}  {len(rutas)} copias  {filesizeformat(os.path.getsize(rutas[0]))}')
+            for ruta in rutas:
+                self.stdout.write(f'      {os.path.relpath(ruta, raiz)}')
+
+        if options['dry_run']:
+            # Tras migrar quedaría un inodo por contenido (más los blobs de contenidos ya borrados)
+            usados = {almacenamiento.ruta_blob(sha) for sha in por_contenido}
+            huerfanos = [] if options['prune'] else [ruta for ruta in blobs if ruta not in usados]
+            despues = sum(os.path.getsize(rutas[0]) for rutas in por_contenido.values()) + ocupado(huerfanos)
+            self.stdout.write(self.style.SUCCESS(
+                f'Se recuperarían {filesizeformat(antes - despues)} ({antes - despues:,} bytes)'
+            ))
+            return
+
+        enlazados = 0
+        for sha256, rutas in por_contenido.items():
+            blob = almacenamiento.ruta_blob(sha256)
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            for ruta in rutas:
+                try:
+                    if not os.path.exists(blob):
+                        os.link(ruta, blob)
+                        continue
+                    if os.path.samefile(ruta, blob):
+                        continue
+                    # Reemplazo atómico: el nombre nunca deja de existir
+                    temporal = f'{ruta}.dedup'
+                    os.link(blob, temporal)
+                    os.replace(temporal, ruta)
+                    enlazados += 1
+                except FileExistsError as e:
+                    raise CommandError(f'❌ {e.filename} ya existe; elimínalo y vuelve a ejecutar')
+                except OSError as e:
+                    raise CommandError(f'❌ No se pudo crear el enlace duro para {ruta}: {e}')
+
+        if options['prune']:
+            borrados, _ = almacenamiento.limpiar_blobs()
+            self.stdout.write(f'  {borrados} blobs sin referencias borrados')
+
+        blobs = [ruta for _, ruta in almacenamiento.blobs()]
+        despues = ocupado(archivos + blobs)
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {enlazados} copias enlazadas a {len(por_contenido)} blobs en {DIRECTORIO_BLOBS}/; '
+            f'recuperados {filesizeformat(antes - despues)} ({antes - despues:,} bytes)'
+        ))
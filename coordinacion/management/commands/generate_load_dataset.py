@@ -0,0 +1,93 @@
+"""
+Genera un conjunto de datos sintético a escala de producción
+
+Inserta con bulk_create, en lotes transaccionales, un grafo consistente de
+usuarios, coordinadores, docentes, empresas, tutores, vacantes,
+estudiantes, postulaciones, prácticas, seguimientos y mensajes (ver
+coordinacion/datos_carga.py). Con la misma semilla y la misma fecha --until
+el resultado es el mismo. Es la base contra la que se mide cualquier
+cambio de rendimiento.
+
+Todos los usuarios generados tienen la contraseña "carga123".
+
+Uso:
+    python manage.py generate_load_dataset --students 50000 --companies 2000
+    python manage.py generate_load_dataset --students 2000 --seed 7 --prefix prueba
+"""
+import re
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from coordinacion.datos_carga import GeneradorDatos, Volumen
+
+
+class Command(BaseCommand):
+    help = 'Genera datos sintéticos consistentes para pruebas de carga y reporta filas por segundo'
+
+    def add_arguments(self, parser):
+        defecto = Volumen()
+        parser.add_argument('--students', type=int, default=defecto.estudiantes, help='Estudiantes')
+        parser.add_argument('--companies', type=int, default=defecto.empresas, help='Empresas')
+        parser.add_argument('--teachers', type=int, default=None,
+                            help='Docentes asesores (por defecto 1 por cada 50 estudiantes)')
+        parser.add_argument('--coordinators', type=int, default=defecto.coordinadores, help='Coordinadores')
+        parser.add_argument('--vacancies-per-company', type=float, default=defecto.vacantes_por_empresa,
+                            help='Promedio de vacantes por empresa aprobada')
+        parser.add_argument('--applications-per-student', type=float,
+                            default=defecto.postulaciones_por_estudiante,
+                            help='Promedio de postulaciones por estudiante')
+        parser.add_argument('--internship-ratio', type=float, default=defecto.proporcion_practicas,
+                            help='Proporción de estudiantes con práctica (0-1)')
+        parser.add_argument('--weeks', type=int, default=defecto.semanas_seguimiento,
+                            help='Seguimientos semanales por práctica (máximo)')
+        parser.add_argument('--messages-per-internship', type=float, default=defecto.mensajes_por_practica,
+                            help='Promedio de mensajes de chat por práctica')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla del generador')
+        parser.add_argument('--prefix', default='carga',
+                            help='Prefijo de usuarios, códigos y NIT generados (letras y números)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Filas por transacción')
+        parser.add_argument('--until', type=date.fromisoformat, default=None,
+                            help='Fecha de referencia AAAA-MM-DD (por defecto hoy)')
+
+    def handle(self, *args, **options):
+        if not re.fullmatch(r'[A-Za-z0-9]{1,8}', options['prefix']):
+            raise CommandError('--prefix debe tener de 1 a 8 letras o números')
+        if options['students'] < 0 or options['companies'] < 0 or options['coordinators'] < 1:
+            raise CommandError('Las cantidades no pueden ser negativas y se necesita al menos un coordinador')
+        if not 0 <= options['internship_ratio'] <= 1:
+            raise CommandError('--internship-ratio debe estar entre 0 y 1')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size debe ser mayor que 0')
+
+        volumen = Volumen(
+            estudiantes=options['students'],
+            empresas=options['companies'],
+            docentes=options['teachers'],
+            coordinadores=options['coordinators'],
+            vacantes_por_empresa=options['vacancies_per_company'],
+            postulaciones_por_estudiante=options['applications_per_student'],
+            proporcion_practicas=options['internship_ratio'],
+            semanas_seguimiento=options['weeks'],
+            mensajes_por_practica=options['messages_per_internship'],
+        )
+        if volumen.docentes < 1:
+            raise CommandError('Se necesita al menos un docente asesor')
+
+        def progreso(nombre, filas, segundos):
+            self.stdout.write(f'  {nombre:<20} {filas:>10,} filas {segundos:>8.2f} s '
+                              f'{filas / segundos if segundos else 0:>12,.0f} filas/s')
+
+        generador = GeneradorDatos(
+            volumen, semilla=options['seed'], prefijo=options['prefix'],
+            lote=options['batch_size'], hasta=options['until'], progreso=progreso,
+        )
+        try:
+            reporte = generador.generar()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {reporte.total:,} filas en {reporte.segundos:.2f} s '
+            f'({reporte.total / reporte.segundos if reporte.segundos else 0:,.0f} filas/s)'
+        ))
@@ -0,0 +1,73 @@
+"""
+Genera las miniaturas WebP de las fotos de perfil que ya existen
+
+Las fotos nuevas se procesan solas al guardarse (señales + miniaturas.py);
+este comando cubre las subidas anteriores y reintenta las que fallaron.
+Solo genera las que faltan salvo con --force.
+
+Uso:
+    python manage.py generate_thumbnails
+    python manage.py generate_thumbnails --force --workers 4
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.template.defaultfilters import filesizeformat
+
+from coordinacion import miniaturas
+from coordinacion.models import Coordinador, DocenteAsesor, Estudiante
+
+
+class Command(BaseCommand):
+    help = 'Genera las miniaturas WebP (32/64/256 px) de las fotos de perfil existentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerar aunque ya existan')
+        parser.add_argument('--workers', type=int, default=2, help='Hilos de procesamiento')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError('--workers debe ser mayor que 0')
+
+        nombres = set()
+        for modelo in (Coordinador, Estudiante, DocenteAsesor):
+            nombres.update(
+                modelo.objects.exclude(foto_perfil='').exclude(foto_perfil__isnull=True)
+                .values_list('foto_perfil', flat=True).iterator()
+            )
+
+        def procesar(nombre):
+            try:
+                return nombre, miniaturas.generar(nombre, forzar=options['force']), None
+            except Exception as e:
+                return nombre, None, e
+
+        inicio = time.perf_counter()
+        generadas = omitidas = originales = derivados = 0
+        errores = []
+        with ThreadPoolExecutor(max_workers=options['workers']) as ejecutor:
+            for nombre, escritos, error in ejecutor.map(procesar, sorted(nombres)):
+                if error is not None:
+                    errores.append((nombre, error))
+                elif not escritos:
+                    omitidas += 1
+                else:
+                    generadas += 1
+                    originales += default_storage.size(nombre)
+                    derivados += escritos[miniaturas.TAMANOS[0]]
+
+        for nombre, error in errores:
+            self.stdout.write(self.style.ERROR(f'  ❌ {nombre}: {error}'))
+        if generadas:
+            self.stdout.write(
+                f'  {filesizeformat(originales)} en fotos originales -> '
+                f'{filesizeformat(derivados)} en miniaturas de {miniaturas.TAMANOS[0]} px'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {generadas} fotos procesadas, {omitidas} ya tenían miniaturas, '
+            f'{len(errores)} con error ({time.perf_counter() - inicio:.1f} s)'
+        ))
+        if errores:
+            raise CommandError(f'{len(errores)} fotos no se pudieron procesar')
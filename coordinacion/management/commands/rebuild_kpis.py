@@ -0,0 +1,45 @@
+"""
+Reconstruye la fila de indicadores (KpiSnapshot) de los dashboards
+
+Las señales mantienen los contadores al día, pero los cambios hechos con
+queryset.update(), bulk_create() o SQL directo no las disparan. Este comando
+recalcula todo desde las tablas o, con --check, solo compara.
+
+Uso:
+    python manage.py rebuild_kpis
+    python manage.py rebuild_kpis --check
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from coordinacion.models import KpiSnapshot
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los contadores de KpiSnapshot o verifica que coincidan con los conteos reales'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Solo comparar el snapshot con los conteos reales; falla si difieren',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            snapshot = KpiSnapshot.objects.filter(pk=1).first()
+            if snapshot is None:
+                raise CommandError('No existe KpiSnapshot; ejecuta python manage.py rebuild_kpis')
+
+            diferencias = snapshot.diferencias()
+            if diferencias:
+                for campo, (guardado, real) in diferencias.items():
+                    self.stdout.write(f'  {campo:<26} snapshot={guardado:<8} real={real}')
+                raise CommandError(f'❌ {len(diferencias)} contadores no coinciden con los datos')
+
+            self.stdout.write(self.style.SUCCESS('✅ KpiSnapshot coincide con los conteos reales'))
+            return
+
+        snapshot = KpiSnapshot.reconstruir()
+        for campo, valor in snapshot.contadores().items():
+            self.stdout.write(f'  {campo:<26} {valor}')
+        self.stdout.write(self.style.SUCCESS('✅ KpiSnapshot reconstruido'))
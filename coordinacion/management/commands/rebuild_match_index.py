@@ -0,0 +1,26 @@
+"""
+Reconstruye el índice de afinidad estudiante-vacante (AfinidadVacante)
+
+Las señales mantienen el índice al guardar una vacante o un estudiante,
+pero los datos cargados con bulk_create() o SQL directo no las disparan.
+Este comando recalcula todos los pares desde las tablas.
+
+Uso:
+    python manage.py rebuild_match_index
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from coordinacion import afinidad
+
+
+class Command(BaseCommand):
+    help = 'Recalcula el índice de afinidad estudiante-vacante de las recomendaciones'
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        filas = afinidad.reconstruir()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Índice de afinidad reconstruido: {filas} pares ({time.perf_counter() - inicio:.1f} s)'
+        ))
@@ -0,0 +1,30 @@
+"""
+Reconstruye el índice de búsqueda de texto completo (coordinacion/busqueda.py)
+
+Las señales mantienen el índice al guardar o borrar empresas, vacantes,
+estudiantes, tutores y docentes, pero los datos cargados con bulk_create()
+o SQL directo no las disparan. Este comando vuelve a indexar todo.
+
+Uso:
+    python manage.py rebuild_search_index
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from coordinacion import busqueda
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de búsqueda de texto completo'
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        totales = busqueda.reconstruir()
+        if not totales:
+            self.stdout.write('Esta base de datos no tiene índice de búsqueda (se usa icontains)')
+            return
+        detalle = ', '.join(f'{tipo}: {filas}' for tipo, filas in totales.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Índice de búsqueda reconstruido ({detalle}) ({time.perf_counter() - inicio:.1f} s)'
+        ))
@@ -0,0 +1,58 @@
+"""
+Trabajador de la cola de tareas en segundo plano (coordinacion/cola.py)
+
+Reclama tareas de la tabla Tarea y las ejecuta con un pool de hilos. Se
+pueden lanzar varios trabajadores a la vez: cada tarea la reclama uno solo.
+Ctrl+C (o SIGTERM) deja de reclamar y espera a que terminen las que están
+en curso.
+
+Uso:
+    python manage.py run_tasks
+    python manage.py run_tasks --threads 8 --interval 0.5
+    python manage.py run_tasks --once      # vaciar la cola y salir (cron, CI)
+"""
+import signal
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from coordinacion import cola
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta las tareas en segundo plano encoladas en la base de datos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4, help='Tareas en paralelo')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Segundos entre consultas cuando la cola está vacía')
+        parser.add_argument('--once', action='store_true', help='Salir cuando no queden tareas listas')
+
+    def handle(self, *args, **options):
+        if options['threads'] < 1:
+            raise CommandError('--threads debe ser mayor que 0')
+
+        detener = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *_: detener.set())
+
+        cola.descubrir()
+        self.stdout.write(
+            f'Trabajador con {options["threads"]} hilos; tareas: {", ".join(sorted(cola.TAREAS))}'
+        )
+        inicio = time.perf_counter()
+        try:
+            completadas, fallidas = cola.trabajar(
+                hilos=options['threads'], intervalo=options['interval'],
+                una_vez=options['once'], detener=detener,
+            )
+        except KeyboardInterrupt:
+            detener.set()
+            self.stdout.write('Detenido')
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {completadas} tareas completadas, {fallidas} con error '
+            f'({time.perf_counter() - inicio:.1f} s)'
+        ))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coordinacion', '0007_coordinador_foto_perfil_docenteasesor_cedula_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KpiSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_empresas', models.IntegerField(default=0)),
+                ('empresas_activas', models.IntegerField(default=0)),
+                ('total_vacantes', models.IntegerField(default=0)),
+                ('vacantes_disponibles', models.IntegerField(default=0)),
+                ('total_estudiantes', models.IntegerField(default=0)),
+                ('estudiantes_activos', models.IntegerField(default=0)),
+                ('practicas_en_curso', models.IntegerField(default=0)),
+                ('practicas_finalizadas', models.IntegerField(default=0)),
+                ('postulaciones_pendientes', models.IntegerField(default=0)),
+                ('empresas_top', models.JSONField(blank=True, default=list)),
+                ('empresas_top_vigente', models.BooleanField(default=False)),
+                ('fecha_reconstruccion', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Indicadores (KPI)',
+                'verbose_name_plural': 'Indicadores (KPI)',
+            },
+        ),
+    ]
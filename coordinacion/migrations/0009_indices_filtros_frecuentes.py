@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coordinacion', '0008_kpisnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='empresa',
+            index=models.Index(fields=['estado', '-fecha_registro'], name='empresa_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='estudiante',
+            index=models.Index(fields=['estado', 'nombre_completo'], name='estudiante_estado_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mensaje',
+            index=models.Index(fields=['practica', 'fecha_envio'], name='mensaje_practica_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mensaje',
+            index=models.Index(fields=['practica', 'remitente', 'leido'], name='mensaje_no_leido_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postulacion',
+            index=models.Index(fields=['estado', '-fecha_postulacion'], name='postulacion_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postulacion',
+            index=models.Index(fields=['estudiante', 'estado'], name='postulacion_estud_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='practicaempresarial',
+            index=models.Index(fields=['estado', '-fecha_creacion'], name='practica_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='practicaempresarial',
+            index=models.Index(fields=['estudiante', 'estado', '-fecha_creacion'], name='practica_estud_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='practicaempresarial',
+            index=models.Index(fields=['docente_asesor', 'estado', '-fecha_creacion'], name='practica_docente_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seguimientosemanal',
+            index=models.Index(fields=['practica', 'estado', '-fecha_registro'], name='seguimiento_prac_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sustentacion',
+            index=models.Index(fields=['estado', 'fecha_programada'], name='sustentacion_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vacante',
+            index=models.Index(fields=['estado', '-fecha_creacion'], name='vacante_estado_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coordinacion', '0009_indices_filtros_frecuentes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coordinador',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='docenteasesor',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='empresa',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='estudiante',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='postulacion',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='practicaempresarial',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='sustentacion',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='tutorempresarial',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='vacante',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coordinacion', '0010_fecha_actualizacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tarea',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(help_text='Tarea registrada con @cola.tarea', max_length=100)),
+                ('parametros', models.JSONField(blank=True, default=dict)),
+                ('clave', models.CharField(blank=True, help_text='Clave de idempotencia: encolar dos veces la misma clave devuelve la tarea existente', max_length=200, null=True, unique=True)),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('EN_PROCESO', 'En proceso'), ('COMPLETADA', 'Completada'), ('FALLIDA', 'Fallida')], default='PENDIENTE', max_length=20)),
+                ('intentos', models.PositiveIntegerField(default=0)),
+                ('max_intentos', models.PositiveIntegerField(default=5)),
+                ('ejecutar_despues', models.DateTimeField(help_text='No se ejecuta antes de esta fecha (reintentos con espera)')),
+                ('bloqueada_hasta', models.DateTimeField(blank=True, help_text='Si el trabajador muere, otro la retoma pasada esta fecha', null=True)),
+                ('ultimo_error', models.TextField(blank=True)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_inicio', models.DateTimeField(blank=True, null=True)),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Tarea en segundo plano',
+                'verbose_name_plural': 'Tareas en segundo plano',
+                'ordering': ['-fecha_creacion'],
+                'indexes': [models.Index(fields=['estado', 'ejecutar_despues'], name='tarea_lista_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,114 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:29
+
+import re
+import unicodedata
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Copia congelada de las reglas de coordinacion/afinidad.py y de
+# asignacion.palabras_clave al crear el índice: la migración no importa el
+# código actual, que puede cambiar después. Lo que cambie más tarde se
+# recalcula con `python manage.py rebuild_match_index`.
+PESOS = {'programa': 30, 'semestre': 20, 'promedio': 25, 'habilidades': 25}
+SEMESTRES_PUNTAJE_COMPLETO = 5
+ESTADOS_INDEXADOS = ('DISPONIBLE', 'OCUPADA')
+PALABRAS_VACIAS = {
+    'de', 'del', 'la', 'las', 'el', 'los', 'en', 'y', 'e', 'o', 'u', 'para', 'con', 'por',
+    'area', 'areas', 'gestion', 'practica', 'practicas',
+}
+TAMANO_LOTE = 1000
+
+
+def palabras_clave(texto):
+    texto = unicodedata.normalize('NFKD', texto or '').encode('ascii', 'ignore').decode('ascii')
+    return {
+        palabra for palabra in re.findall(r'[a-z0-9]+', texto.lower())
+        if len(palabra) > 2 and palabra not in PALABRAS_VACIAS
+    }
+
+
+def puntaje(estudiante, vacante, habilidades_estudiante, habilidades_vacante):
+    """(puntaje, habilidades comunes) del par; el estudiante ya cumple los requisitos"""
+    mismo_programa = vacante.programa_academico.strip().lower() == estudiante.programa_academico.strip().lower()
+    semestres = min(estudiante.semestre - vacante.semestre_minimo + 1, SEMESTRES_PUNTAJE_COMPLETO)
+    comunes = len(habilidades_estudiante & habilidades_vacante)
+    total = (
+        PESOS['programa'] * (1 if mismo_programa else 0.5)
+        + PESOS['semestre'] * semestres / SEMESTRES_PUNTAJE_COMPLETO
+        + PESOS['promedio'] * min(float(estudiante.promedio_academico or 0) / 5, 1)
+        + PESOS['habilidades'] * (comunes / len(habilidades_vacante) if habilidades_vacante else 0)
+    )
+    return round(total), comunes
+
+
+def llenar_indice(apps, schema_editor):
+    """Afinidad de los estudiantes y vacantes que ya existían"""
+    Estudiante = apps.get_model('coordinacion', 'Estudiante')
+    Vacante = apps.get_model('coordinacion', 'Vacante')
+    AfinidadVacante = apps.get_model('coordinacion', 'AfinidadVacante')
+
+    # Vacantes agrupadas por programa: cada estudiante solo se compara con las de su programa
+    por_programa = defaultdict(list)
+    vacantes = Vacante.objects.filter(estado__in=ESTADOS_INDEXADOS).only(
+        'id', 'programa_academico', 'semestre_minimo', 'habilidades_requeridas',
+    )
+    for vacante in vacantes:
+        por_programa[vacante.programa_academico.lower()].append(
+            (vacante, palabras_clave(vacante.habilidades_requeridas))
+        )
+
+    lote = []
+    estudiantes = Estudiante.objects.only('id', 'programa_academico', 'semestre', 'promedio_academico', 'habilidades')
+    for estudiante in estudiantes.iterator(chunk_size=2000):
+        programa = estudiante.programa_academico.lower()
+        habilidades = palabras_clave(f'{estudiante.habilidades} {estudiante.programa_academico}')
+        for programa_vacante, opciones in por_programa.items():
+            if programa_vacante not in programa:
+                continue
+            for vacante, habilidades_vacante in opciones:
+                if estudiante.semestre < vacante.semestre_minimo:
+                    continue
+                valor, comunes = puntaje(estudiante, vacante, habilidades, habilidades_vacante)
+                lote.append(AfinidadVacante(
+                    estudiante_id=estudiante.pk, vacante_id=vacante.pk,
+                    puntaje=valor, habilidades_comunes=comunes,
+                ))
+        if len(lote) >= TAMANO_LOTE:
+            AfinidadVacante.objects.bulk_create(lote)
+            lote = []
+    AfinidadVacante.objects.bulk_create(lote)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coordinacion', '0011_tarea'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='estudiante',
+            name='habilidades',
+            field=models.TextField(blank=True, default='', help_text='Habilidades y conocimientos; se comparan con las habilidades requeridas de las vacantes'),
+        ),
+        migrations.CreateModel(
+            name='AfinidadVacante',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('puntaje', models.PositiveSmallIntegerField()),
+                ('habilidades_comunes', models.PositiveSmallIntegerField(default=0)),
+                ('estudiante', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='afinidades', to='coordinacion.estudiante')),
+                ('vacante', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='afinidades', to='coordinacion.vacante')),
+            ],
+            options={
+                'verbose_name': 'Afinidad estudiante-vacante',
+                'verbose_name_plural': 'Afinidades estudiante-vacante',
+                'indexes': [models.Index(fields=['estudiante', '-puntaje'], name='afinidad_estudiante_idx'), models.Index(fields=['vacante', '-puntaje'], name='afinidad_vacante_idx')],
+                'constraints': [models.UniqueConstraint(fields=('estudiante', 'vacante'), name='afinidad_par_unico')],
+            },
+        ),
+        migrations.RunPython(llenar_indice, migrations.RunPython.noop),
+    ]
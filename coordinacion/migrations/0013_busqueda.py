@@ -0,0 +1,108 @@
+"""
+Tabla del índice de búsqueda de texto completo (coordinacion/busqueda.py)
+
+No es un modelo: en SQLite es una tabla virtual FTS5 y en PostgreSQL una
+tabla con columna tsvector. En otras bases de datos no se crea nada y la
+búsqueda usa icontains. La tabla se llena con los objetos que ya existían.
+"""
+from django.db import migrations
+
+SQL = {
+    'sqlite': (
+        [
+            "CREATE VIRTUAL TABLE coordinacion_busqueda USING fts5("
+            "tipo UNINDEXED, objeto_id UNINDEXED, titulo, cuerpo, "
+            "tokenize='unicode61 remove_diacritics 2')",
+        ],
+        ['DROP TABLE IF EXISTS coordinacion_busqueda'],
+    ),
+    'postgresql': (
+        [
+            'CREATE EXTENSION IF NOT EXISTS unaccent',
+            'CREATE TABLE coordinacion_busqueda ('
+            'clave bigint PRIMARY KEY, tipo varchar(20) NOT NULL, objeto_id bigint NOT NULL, '
+            'titulo text NOT NULL, cuerpo text NOT NULL, documento tsvector NOT NULL)',
+            'CREATE INDEX coordinacion_busqueda_documento_idx ON coordinacion_busqueda USING gin (documento)',
+        ],
+        ['DROP TABLE IF EXISTS coordinacion_busqueda'],
+    ),
+}
+
+
+def crear_tabla(apps, schema_editor):
+    for sentencia in SQL.get(schema_editor.connection.vendor, ([], []))[0]:
+        schema_editor.execute(sentencia)
+
+
+# Copia congelada de busqueda.DOCUMENTOS al crear la tabla (tipo, código de
+# la clave id * 8 + código, modelo, título, cuerpo): la migración no importa
+# el código actual. Si los documentos cambian, python manage.py rebuild_search_index
+DOCUMENTOS = (
+    ('empresa', 1, 'Empresa', 'razon_social', ('nit', 'ciudad', 'representante_nombre')),
+    ('vacante', 2, 'Vacante', 'titulo', ('area_practica', 'habilidades_requeridas', 'empresa__razon_social')),
+    ('estudiante', 3, 'Estudiante', 'nombre_completo', ('codigo', 'email')),
+    ('tutor', 4, 'TutorEmpresarial', 'nombre_completo', ('cargo', 'email', 'empresa__razon_social')),
+    ('docente', 5, 'DocenteAsesor', 'nombre_completo', ('especialidad', 'email', 'cedula')),
+)
+
+INSERTAR = {
+    'sqlite': (
+        'INSERT INTO coordinacion_busqueda (rowid, tipo, objeto_id, titulo, cuerpo) '
+        'VALUES (%s, %s, %s, %s, %s)'
+    ),
+    'postgresql': (
+        'INSERT INTO coordinacion_busqueda (clave, tipo, objeto_id, titulo, cuerpo, documento) '
+        "VALUES (%s, %s, %s, %s, %s, setweight(to_tsvector('spanish', unaccent(%s)), 'A') || "
+        "setweight(to_tsvector('spanish', unaccent(%s)), 'B'))"
+    ),
+}
+TAMANO_LOTE = 1000
+
+
+def valor(objeto, campo):
+    for parte in campo.split('__'):
+        objeto = getattr(objeto, parte, None)
+        if objeto is None:
+            return ''
+    return str(objeto)
+
+
+def llenar_indice(apps, schema_editor):
+    """Indexar lo que ya existía, con los modelos históricos"""
+    vendor = schema_editor.connection.vendor
+    if vendor not in INSERTAR:
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        for tipo, codigo, modelo, titulo, cuerpo in DOCUMENTOS:
+            relaciones = {campo.split('__')[0] for campo in cuerpo if '__' in campo}
+            objetos = apps.get_model('coordinacion', modelo).objects.select_related(*relaciones)
+            lote = []
+            for objeto in objetos.iterator(chunk_size=2000):
+                fila = (
+                    objeto.pk * 8 + codigo, tipo, objeto.pk, valor(objeto, titulo),
+                    ' '.join(filter(None, (valor(objeto, campo) for campo in cuerpo))),
+                )
+                lote.append(fila if vendor == 'sqlite' else (*fila, fila[3], fila[4]))
+                if len(lote) >= TAMANO_LOTE:
+                    cursor.executemany(INSERTAR[vendor], lote)
+                    lote = []
+            if lote:
+                cursor.executemany(INSERTAR[vendor], lote)
+
+
+def borrar_tabla(apps, schema_editor):
+    for sentencia in SQL.get(schema_editor.connection.vendor, ([], []))[1]:
+        schema_editor.execute(sentencia)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coordinacion', '0012_afinidadvacante'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_tabla, borrar_tabla),
+        migrations.RunPython(llenar_indice, migrations.RunPython.noop),
+    ]
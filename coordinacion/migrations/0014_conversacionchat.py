@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def llenar_conversaciones(apps, schema_editor):
+    """Último mensaje de cada práctica que ya tenía chat"""
+    Mensaje = apps.get_model('coordinacion', 'Mensaje')
+    ConversacionChat = apps.get_model('coordinacion', 'ConversacionChat')
+    ultimos = Mensaje.objects.values('practica_id').annotate(ultimo=Max('id'), fecha=Max('fecha_envio'))
+    ConversacionChat.objects.bulk_create(
+        [
+            ConversacionChat(practica_id=fila['practica_id'], ultimo_mensaje_id=fila['ultimo'],
+                             fecha_ultimo_mensaje=fila['fecha'])
+            for fila in ultimos.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coordinacion', '0013_busqueda'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConversacionChat',
+            fields=[
+                ('practica', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='conversacion', serialize=False, to='coordinacion.practicaempresarial')),
+                ('ultimo_mensaje_id', models.PositiveBigIntegerField(default=0)),
+                ('fecha_ultimo_mensaje', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Conversación del chat',
+                'verbose_name_plural': 'Conversaciones del chat',
+            },
+        ),
+        migrations.RunPython(llenar_conversaciones, migrations.RunPython.noop),
+    ]
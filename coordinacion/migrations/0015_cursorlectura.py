@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def llenar_cursores(apps, schema_editor):
+    """
+    Cursor de cada participante: el mensaje leído más reciente que recibió.
+    Lo anterior a ese mensaje queda leído aunque su marca dijera lo contrario
+    """
+    Mensaje = apps.get_model('coordinacion', 'Mensaje')
+    PracticaEmpresarial = apps.get_model('coordinacion', 'PracticaEmpresarial')
+    CursorLectura = apps.get_model('coordinacion', 'CursorLectura')
+
+    leidos = Mensaje.objects.filter(leido=True).values('practica_id', 'remitente_id').annotate(hasta=Max('id'))
+    participantes = {
+        practica_id: (estudiante, docente)
+        for practica_id, estudiante, docente in PracticaEmpresarial.objects.filter(
+            mensajes__leido=True
+        ).distinct().values_list('id', 'estudiante__user_id', 'docente_asesor__user_id')
+    }
+
+    cursores = {}
+    for fila in leidos.iterator():
+        estudiante, docente = participantes.get(fila['practica_id'], (None, None))
+        # Lo leyó el participante que no lo envió
+        lector = docente if fila['remitente_id'] == estudiante else estudiante
+        if lector is None:
+            continue
+        clave = (fila['practica_id'], lector)
+        cursores[clave] = max(cursores.get(clave, 0), fila['hasta'])
+
+    CursorLectura.objects.bulk_create(
+        [
+            CursorLectura(practica_id=practica_id, usuario_id=usuario_id, ultimo_leido_id=hasta)
+            for (practica_id, usuario_id), hasta in cursores.items()
+        ],
+        batch_size=1000,
+    )
+
+
+def restaurar_leidos(apps, schema_editor):
+    """Marcar como leídos los mensajes que ya alcanzó el cursor del otro participante"""
+    Mensaje = apps.get_model('coordinacion', 'Mensaje')
+    CursorLectura = apps.get_model('coordinacion', 'CursorLectura')
+    for cursor in CursorLectura.objects.iterator():
+        Mensaje.objects.filter(
+            practica_id=cursor.practica_id, id__lte=cursor.ultimo_leido_id
+        ).exclude(remitente_id=cursor.usuario_id).update(leido=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coordinacion', '0014_conversacionchat'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CursorLectura',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ultimo_leido_id', models.PositiveBigIntegerField(default=0)),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+                ('practica', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cursores_lectura', to='coordinacion.practicaempresarial')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cursores_lectura', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Cursor de lectura del chat',
+                'verbose_name_plural': 'Cursores de lectura del chat',
+                'constraints': [models.UniqueConstraint(fields=('practica', 'usuario'), name='cursor_lectura_unico')],
+            },
+        ),
+        migrations.RunPython(llenar_cursores, restaurar_leidos),
+        migrations.RemoveIndex(
+            model_name='mensaje',
+            name='mensaje_no_leido_idx',
+        ),
+        migrations.RemoveField(
+            model_name='mensaje',
+            name='fecha_lectura',
+        ),
+        migrations.RemoveField(
+            model_name='mensaje',
+            name='leido',
+        ),
+        migrations.AddIndex(
+            model_name='mensaje',
+            index=models.Index(fields=['practica', 'id'], name='mensaje_practica_id_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coordinacion', '0015_cursorlectura'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersionRoles',
+            fields=[
+                ('usuario_id', models.PositiveBigIntegerField(primary_key=True, serialize=False)),
+                ('version', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Versión de roles',
+                'verbose_name_plural': 'Versiones de roles',
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coordinacion', '0016_versionroles'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tarea',
+            name='clave',
+            field=models.CharField(blank=True, help_text='Clave de idempotencia: mientras la tarea esté pendiente o en proceso, encolar la misma clave devuelve la tarea existente', max_length=200, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='tarea',
+            constraint=models.UniqueConstraint(condition=models.Q(('estado__in', ['PENDIENTE', 'EN_PROCESO'])), fields=('clave',), name='tarea_clave_activa_unica'),
+        ),
+    ]
@@ -0,0 +1,86 @@
+"""
+Miniaturas WebP de las fotos de perfil
+
+Las fotos de Coordinador, Estudiante y DocenteAsesor se muestran en la
+navbar/sidebar de todas las páginas. En lugar de servir la subida original
+(JPEG de cientos de KB, AVIF...) se generan derivados cuadrados en WebP de
+TAMANOS píxeles:
+
+    estudiantes/fotos_perfil/ana.jpg -> miniaturas/estudiantes/fotos_perfil/ana.jpg_32.webp
+                                        miniaturas/estudiantes/fotos_perfil/ana.jpg_64.webp
+                                        miniaturas/estudiantes/fotos_perfil/ana.jpg_256.webp
+
+El nombre se deriva del original completo, extensión incluida (ana.jpg y
+ana.png son fotos distintas), así que la plantilla obtiene las URLs sin
+consultar nada (templatetags/miniaturas.py). Al cambiar la foto las
+señales encolan la generación (cola.py, `python manage.py run_tasks`);
+mientras no existan, la plantilla usa la foto original.
+
+Para las fotos que ya existían: python manage.py generate_thumbnails
+"""
+import io
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from . import cola
+
+TAMANOS = (32, 64, 256)
+CALIDAD_WEBP = 80
+DIRECTORIO = 'miniaturas'
+
+
+def nombre_miniatura(nombre, tamano):
+    """Nombre en el storage del derivado de `tamano` px de la foto `nombre`"""
+    return f'{DIRECTORIO}/{nombre}_{tamano}.webp'
+
+
+def disponible(nombre):
+    """
+    ¿Ya se generaron los derivados? Se escriben de menor a mayor, así que
+    basta con comprobar el último.
+    """
+    return bool(nombre) and default_storage.exists(nombre_miniatura(nombre, TAMANOS[-1]))
+
+
+def generar(nombre, forzar=False):
+    """
+    Generar los derivados WebP de la foto `nombre`. Devuelve los bytes
+    escritos por tamaño ({} si ya existían y no se pidió forzar).
+    """
+    if not forzar and disponible(nombre):
+        return {}
+
+    from PIL import Image, ImageOps
+
+    with default_storage.open(nombre, 'rb') as fh:
+        imagen = Image.open(fh)
+        # JPEG: decodificar ya reducido cuando el original es mucho mayor
+        imagen.draft('RGB', (TAMANOS[-1] * 2, TAMANOS[-1] * 2))
+        imagen = ImageOps.exif_transpose(imagen)
+        imagen.load()
+
+    tiene_alfa = imagen.mode in ('RGBA', 'LA') or (imagen.mode == 'P' and 'transparency' in imagen.info)
+    imagen = imagen.convert('RGBA' if tiene_alfa else 'RGB')
+
+    escritos = {}
+    for tamano in TAMANOS:
+        miniatura = ImageOps.fit(imagen, (tamano, tamano), Image.Resampling.LANCZOS)
+        salida = io.BytesIO()
+        miniatura.save(salida, 'WEBP', quality=CALIDAD_WEBP, method=6)
+        destino = nombre_miniatura(nombre, tamano)
+        default_storage.delete(destino)
+        default_storage.save(destino, ContentFile(salida.getvalue()))
+        escritos[tamano] = salida.tell()
+    return escritos
+
+
+def eliminar(nombre):
+    """Borrar los derivados de una foto que ya no se usa"""
+    for tamano in TAMANOS:
+        default_storage.delete(nombre_miniatura(nombre, tamano))
+
+
+def programar(nombre):
+    """Encolar la generación de los derivados de `nombre` (tarea generar_miniaturas)"""
+    cola.encolar('generar_miniaturas', foto=nombre)
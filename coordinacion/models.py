@@ -22,6 +22,7 @@ class Coordinador(models.Model):
     )
 
     fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
     activo = models.BooleanField(default=True)
 
     class Meta:
@@ -76,6 +77,7 @@ class Empresa(models.Model):
     # Estado y control
     estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='PENDIENTE')
     fecha_registro = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
     fecha_aprobacion = models.DateTimeField(blank=True, null=True)
     aprobada_por = models.ForeignKey(
         Coordinador,
@@ -90,6 +92,10 @@ class Empresa(models.Model):
         verbose_name = 'Empresa Formadora'
         verbose_name_plural = 'Empresas Formadoras'
         ordering = ['-fecha_registro']
+        indexes = [
+            # Listado filtrado por estado en el orden por defecto
+            models.Index(fields=['estado', '-fecha_registro'], name='empresa_estado_fecha_idx'),
+        ]
 
     def __str__(self):
         return f"{self.razon_social} - {self.nit}"
@@ -127,6 +133,7 @@ class Vacante(models.Model):
     estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='DISPONIBLE')
     creada_por = models.ForeignKey(Coordinador, on_delete=models.CASCADE, related_name='vacantes_creadas')
     fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
     fecha_publicacion = models.DateTimeField(blank=True, null=True)
     fecha_cierre = models.DateTimeField(blank=True, null=True)
 
@@ -134,6 +141,10 @@ class Vacante(models.Model):
         verbose_name = 'Vacante de Práctica'
         verbose_name_plural = 'Vacantes de Práctica'
         ordering = ['-fecha_creacion']
+        indexes = [
+            # Vacantes DISPONIBLE (estudiantes, formularios) y listado por estado
+            models.Index(fields=['estado', '-fecha_creacion'], name='vacante_estado_fecha_idx'),
+        ]
 
     def __str__(self):
         return f"{self.titulo} - {self.empresa.razon_social}"
@@ -184,12 +195,22 @@ class Estudiante(models.Model):
     # Estado y control
     estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='APTO')
     promedio_academico = models.DecimalField(max_digits=3, decimal_places=2, blank=True, null=True)
+    habilidades = models.TextField(
+        blank=True,
+        default='',
+        help_text="Habilidades y conocimientos; se comparan con las habilidades requeridas de las vacantes"
+    )
     fecha_registro = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = 'Estudiante'
         verbose_name_plural = 'Estudiantes'
         ordering = ['nombre_completo']
+        indexes = [
+            # Estudiantes APTO (formularios de postulación) y listado por estado
+            models.Index(fields=['estado', 'nombre_completo'], name='estudiante_estado_nombre_idx'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre_completo}"
@@ -214,6 +235,7 @@ class Postulacion(models.Model):
 
     estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='POSTULADO')
     fecha_postulacion = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
     fecha_respuesta = models.DateTimeField(blank=True, null=True)
     observaciones = models.TextField(blank=True, null=True)
 
@@ -222,6 +244,11 @@ class Postulacion(models.Model):
         verbose_name_plural = 'Postulaciones'
         ordering = ['-fecha_postulacion']
         unique_together = ['vacante', 'estudiante']
+        indexes = [
+            models.Index(fields=['estado', '-fecha_postulacion'], name='postulacion_estado_fecha_idx'),
+            # Postulaciones activas de un estudiante (máximo 3)
+            models.Index(fields=['estudiante', 'estado'], name='postulacion_estud_estado_idx'),
+        ]
 
     def __str__(self):
         return f"{self.estudiante.nombre_completo} -> {self.vacante.titulo}"
@@ -240,6 +267,7 @@ class TutorEmpresarial(models.Model):
     telefono = models.CharField(max_length=20)
     activo = models.BooleanField(default=True)
     fecha_registro = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = 'Tutor Empresarial'
@@ -272,6 +300,7 @@ class DocenteAsesor(models.Model):
 
     activo = models.BooleanField(default=True)
     fecha_registro = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = 'Docente Asesor'
@@ -320,12 +349,20 @@ class PracticaEmpresarial(models.Model):
     estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='EN_CURSO')
     asignada_por = models.ForeignKey(Coordinador, on_delete=models.CASCADE, related_name='practicas_asignadas')
     fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
     observaciones = models.TextField(blank=True, null=True)
 
     class Meta:
         verbose_name = 'Práctica Empresarial'
         verbose_name_plural = 'Prácticas Empresariales'
         ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['estado', '-fecha_creacion'], name='practica_estado_fecha_idx'),
+            # Práctica actual del estudiante
+            models.Index(fields=['estudiante', 'estado', '-fecha_creacion'], name='practica_estud_estado_idx'),
+            # Prácticas en curso / finalizadas de cada docente
+            models.Index(fields=['docente_asesor', 'estado', '-fecha_creacion'], name='practica_docente_estado_idx'),
+        ]
 
     def __str__(self):
         return f"{self.estudiante.nombre_completo} - {self.empresa.razon_social}"
@@ -376,10 +413,14 @@ class Sustentacion(models.Model):
     # Control
     registrada_por = models.ForeignKey(Coordinador, on_delete=models.CASCADE, related_name='sustentaciones_registradas')
     fecha_registro = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = 'Sustentación'
         verbose_name_plural = 'Sustentaciones'
+        indexes = [
+            models.Index(fields=['estado', 'fecha_programada'], name='sustentacion_estado_fecha_idx'),
+        ]
 
     def __str__(self):
         return f"Sustentación - {self.practica.estudiante.nombre_completo}"
@@ -473,6 +514,10 @@ class SeguimientoSemanal(models.Model):
         verbose_name_plural = 'Seguimientos Semanales'
         ordering = ['practica', 'semana_numero']
         unique_together = ['practica', 'semana_numero']
+        indexes = [
+            # Seguimientos pendientes de las prácticas de un docente
+            models.Index(fields=['practica', 'estado', '-fecha_registro'], name='seguimiento_prac_estado_idx'),
+        ]
 
     def __str__(self):
         return f"Semana {self.semana_numero} - {self.practica.estudiante.nombre_completo}"
@@ -507,16 +552,318 @@ class Mensaje(models.Model):
         help_text="Archivo adjunto opcional"
     )
 
-    # Control
-    leido = models.BooleanField(default=False, help_text="Indica si el mensaje fue leído")
+    # Control (lo leído se guarda en CursorLectura, no en cada mensaje)
     fecha_envio = models.DateTimeField(auto_now_add=True)
-    fecha_lectura = models.DateTimeField(blank=True, null=True)
 
     class Meta:
         verbose_name = 'Mensaje'
         verbose_name_plural = 'Mensajes'
         ordering = ['fecha_envio']
+        indexes = [
+            # Historial del chat de una práctica
+            models.Index(fields=['practica', 'fecha_envio'], name='mensaje_practica_fecha_idx'),
+            # No leídos (id mayor que el cursor de lectura) y páginas del historial por id
+            models.Index(fields=['practica', 'id'], name='mensaje_practica_id_idx'),
+        ]
 
     def __str__(self):
         return f"Mensaje de {self.remitente.username} - {self.fecha_envio.strftime('%d/%m/%Y %H:%M')}"
 
+
+class ConversacionChat(models.Model):
+    """
+    Último mensaje del chat de una práctica, escrito solo por la señal de
+    Mensaje (ver coordinacion/sondeo.py). El sondeo del chat lo lee junto
+    con la práctica para responder 304 o "sin novedades" sin consultar
+    Mensaje. Va aparte de PracticaEmpresarial para que guardar la práctica
+    no sobrescriba estos campos con valores viejos.
+    """
+
+    practica = models.OneToOneField(
+        PracticaEmpresarial,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='conversacion'
+    )
+    ultimo_mensaje_id = models.PositiveBigIntegerField(default=0)
+    fecha_ultimo_mensaje = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Conversación del chat'
+        verbose_name_plural = 'Conversaciones del chat'
+
+    def __str__(self):
+        return f"Práctica {self.practica_id}: último mensaje {self.ultimo_mensaje_id}"
+
+
+class CursorLectura(models.Model):
+    """
+    Último mensaje que leyó cada participante del chat de una práctica (ver
+    coordinacion/lectura.py). Solo avanza. Un mensaje está sin leer para un
+    usuario si no lo envió él y su id es mayor que su cursor, así que leer el
+    chat escribe una fila por conversación en lugar de actualizar mensajes.
+    """
+
+    practica = models.ForeignKey(
+        PracticaEmpresarial,
+        on_delete=models.CASCADE,
+        related_name='cursores_lectura'
+    )
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='cursores_lectura'
+    )
+    ultimo_leido_id = models.PositiveBigIntegerField(default=0)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Cursor de lectura del chat'
+        verbose_name_plural = 'Cursores de lectura del chat'
+        constraints = [
+            models.UniqueConstraint(fields=['practica', 'usuario'], name='cursor_lectura_unico'),
+        ]
+
+    def __str__(self):
+        return f"Práctica {self.practica_id}, usuario {self.usuario_id}: leído hasta {self.ultimo_leido_id}"
+
+
+
+# ============================================
+# MODELO: INDICADORES MATERIALIZADOS (KPI)
+# ============================================
+class KpiSnapshot(models.Model):
+    """
+    Contadores de los dashboards de coordinación en una sola fila.
+    Las señales de coordinacion/signals.py los ajustan en cada cambio de
+    estado; `python manage.py rebuild_kpis` los recalcula desde cero y
+    `--check` los compara con los conteos reales.
+    """
+
+    # campo: (modelo, estado contado; None cuenta todos los registros)
+    CONTADORES = {
+        'total_empresas': ('Empresa', None),
+        'empresas_activas': ('Empresa', 'APROBADA'),
+        'total_vacantes': ('Vacante', None),
+        'vacantes_disponibles': ('Vacante', 'DISPONIBLE'),
+        'total_estudiantes': ('Estudiante', None),
+        'estudiantes_activos': ('Estudiante', 'EN_PRACTICA'),
+        'practicas_en_curso': ('PracticaEmpresarial', 'EN_CURSO'),
+        'practicas_finalizadas': ('PracticaEmpresarial', 'FINALIZADA'),
+        'postulaciones_pendientes': ('Postulacion', 'POSTULADO'),
+    }
+    EMPRESAS_TOP = 5
+
+    total_empresas = models.IntegerField(default=0)
+    empresas_activas = models.IntegerField(default=0)
+    total_vacantes = models.IntegerField(default=0)
+    vacantes_disponibles = models.IntegerField(default=0)
+    total_estudiantes = models.IntegerField(default=0)
+    estudiantes_activos = models.IntegerField(default=0)
+    practicas_en_curso = models.IntegerField(default=0)
+    practicas_finalizadas = models.IntegerField(default=0)
+    postulaciones_pendientes = models.IntegerField(default=0)
+
+    # Ranking de empresas con más prácticas; se recalcula al leerlo si quedó invalidado
+    empresas_top = models.JSONField(default=list, blank=True)
+    empresas_top_vigente = models.BooleanField(default=False)
+
+    fecha_reconstruccion = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = 'Indicadores (KPI)'
+        verbose_name_plural = 'Indicadores (KPI)'
+
+    def __str__(self):
+        return f"KPIs reconstruidos {self.fecha_reconstruccion or '-'}"
+
+    @classmethod
+    def conteos_reales(cls):
+        """Contadores calculados sobre las tablas (una consulta por modelo)"""
+        from django.apps import apps
+        from django.db.models import Count, Q
+
+        por_modelo = {}
+        for campo, (modelo, estado) in cls.CONTADORES.items():
+            filtro = Q(estado=estado) if estado else None
+            por_modelo.setdefault(modelo, {})[campo] = Count('pk', filter=filtro)
+
+        conteos = {}
+        for modelo, agregados in por_modelo.items():
+            conteos.update(apps.get_model('coordinacion', modelo).objects.aggregate(**agregados))
+        return conteos
+
+    @classmethod
+    def calcular_empresas_top(cls):
+        from django.db.models import Count
+
+        return [
+            {
+                'id': empresa.id,
+                'razon_social': empresa.razon_social,
+                'nit': empresa.nit,
+                'ciudad': empresa.ciudad,
+                'num_practicas': empresa.num_practicas,
+            }
+            for empresa in Empresa.objects.annotate(
+                num_practicas=Count('practicas')
+            ).order_by('-num_practicas')[:cls.EMPRESAS_TOP]
+        ]
+
+    @classmethod
+    def reconstruir(cls):
+        """Recalcular la fila completa desde las tablas"""
+        from django.utils import timezone
+
+        snapshot, _ = cls.objects.update_or_create(pk=1, defaults={
+            **cls.conteos_reales(),
+            'empresas_top': cls.calcular_empresas_top(),
+            'empresas_top_vigente': True,
+            'fecha_reconstruccion': timezone.now(),
+        })
+        return snapshot
+
+    @classmethod
+    def obtener(cls):
+        """Fila de indicadores para los dashboards (se construye la primera vez)"""
+        snapshot = cls.objects.filter(pk=1).first()
+        if snapshot is None:
+            return cls.reconstruir()
+
+        if not snapshot.empresas_top_vigente:
+            snapshot.empresas_top = cls.calcular_empresas_top()
+            snapshot.empresas_top_vigente = True
+            cls.objects.filter(pk=1).update(
+                empresas_top=snapshot.empresas_top, empresas_top_vigente=True
+            )
+        return snapshot
+
+    def contadores(self):
+        return {campo: getattr(self, campo) for campo in self.CONTADORES}
+
+    def diferencias(self):
+        """{campo: (snapshot, real)} de los contadores que no coinciden"""
+        reales = self.conteos_reales()
+        return {
+            campo: (valor, reales[campo])
+            for campo, valor in self.contadores().items()
+            if valor != reales[campo]
+        }
+
+
+# ============================================
+# MODELO: COLA DE TAREAS EN SEGUNDO PLANO
+# ============================================
+class Tarea(models.Model):
+    """
+    Trabajo pendiente de la cola en base de datos (ver coordinacion/cola.py).
+    Se inserta en la misma transacción que el cambio de estado que lo
+    origina y lo ejecuta `python manage.py run_tasks`.
+    """
+
+    ESTADOS = [
+        ('PENDIENTE', 'Pendiente'),
+        ('EN_PROCESO', 'En proceso'),
+        ('COMPLETADA', 'Completada'),
+        ('FALLIDA', 'Fallida'),
+    ]
+
+    nombre = models.CharField(max_length=100, help_text="Tarea registrada con @cola.tarea")
+    parametros = models.JSONField(default=dict, blank=True)
+    clave = models.CharField(
+        max_length=200,
+        blank=True,
+        null=True,
+        help_text="Clave de idempotencia: mientras la tarea esté pendiente o en proceso, "
+                  "encolar la misma clave devuelve la tarea existente"
+    )
+
+    estado = models.CharField(max_length=20, choices=ESTADOS, default='PENDIENTE')
+    intentos = models.PositiveIntegerField(default=0)
+    max_intentos = models.PositiveIntegerField(default=5)
+    ejecutar_despues = models.DateTimeField(help_text="No se ejecuta antes de esta fecha (reintentos con espera)")
+    bloqueada_hasta = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="Si el trabajador muere, otro la retoma pasada esta fecha"
+    )
+    ultimo_error = models.TextField(blank=True)
+
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_inicio = models.DateTimeField(blank=True, null=True)
+    fecha_fin = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = 'Tarea en segundo plano'
+        verbose_name_plural = 'Tareas en segundo plano'
+        ordering = ['-fecha_creacion']
+        indexes = [
+            # Reclamar la siguiente tarea lista
+            models.Index(fields=['estado', 'ejecutar_despues'], name='tarea_lista_idx'),
+        ]
+        constraints = [
+            # Una sola tarea activa por clave; las terminadas no impiden encolar de nuevo
+            models.UniqueConstraint(
+                fields=['clave'], condition=models.Q(estado__in=['PENDIENTE', 'EN_PROCESO']),
+                name='tarea_clave_activa_unica',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.nombre} #{self.id} - {self.get_estado_display()}"
+
+
+# ============================================
+# MODELO: ÍNDICE DE AFINIDAD ESTUDIANTE-VACANTE
+# ============================================
+class AfinidadVacante(models.Model):
+    """
+    Puntaje precalculado (0-100) de cada par estudiante-vacante en el que el
+    estudiante cumple programa y semestre (ver coordinacion/afinidad.py).
+    Las señales lo mantienen al guardar Vacante o Estudiante; las
+    recomendaciones se leen ordenadas por puntaje con una sola consulta.
+    """
+
+    estudiante = models.ForeignKey(Estudiante, on_delete=models.CASCADE, related_name='afinidades')
+    vacante = models.ForeignKey(Vacante, on_delete=models.CASCADE, related_name='afinidades')
+    puntaje = models.PositiveSmallIntegerField()
+    habilidades_comunes = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Afinidad estudiante-vacante'
+        verbose_name_plural = 'Afinidades estudiante-vacante'
+        constraints = [
+            models.UniqueConstraint(fields=['estudiante', 'vacante'], name='afinidad_par_unico'),
+        ]
+        indexes = [
+            # Vacantes recomendadas a un estudiante / estudiantes recomendados para una vacante
+            models.Index(fields=['estudiante', '-puntaje'], name='afinidad_estudiante_idx'),
+            models.Index(fields=['vacante', '-puntaje'], name='afinidad_vacante_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.estudiante_id} -> {self.vacante_id}: {self.puntaje}"
+
+
+# ============================================
+# MODELO: VERSIÓN DE LOS ROLES DE UN USUARIO
+# ============================================
+class VersionRoles(models.Model):
+    """
+    Contador por usuario que sube al crear o borrar uno de sus perfiles
+    (Coordinador, Estudiante, DocenteAsesor). Las sesiones guardan los roles
+    con la versión con la que se resolvieron (ver config/roles.py); al estar
+    en la base de datos, la invalidación la ven todos los procesos. Sin
+    clave foránea: borrar el usuario (y en cascada sus perfiles) no choca
+    con la fila que escribe la señal.
+    """
+
+    usuario_id = models.PositiveBigIntegerField(primary_key=True)
+    version = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Versión de roles'
+        verbose_name_plural = 'Versiones de roles'
+
+    def __str__(self):
+        return f"Usuario {self.usuario_id}: versión {self.version}"
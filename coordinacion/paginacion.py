@@ -0,0 +1,135 @@
+"""
+Paginación por cursor (keyset) para los listados de coordinación
+
+En lugar de OFFSET, cada página continúa desde los valores de orden de la
+última fila enviada:
+
+    WHERE (fecha, id) < (:fecha_ultima, :id_ultimo) ORDER BY fecha DESC, id DESC LIMIT n
+
+así la página 1 y la página 2.000 cuestan lo mismo y nunca se cargan en
+memoria más de `por_pagina` + 1 filas. El orden es el Meta.ordering del
+modelo (o -pk si no tiene) con la pk como desempate para que sea estable;
+los campos de orden no pueden ser nulos.
+
+El cursor es un JSON en base64 con esos valores; el cliente lo devuelve
+tal cual para pedir la siguiente página.
+"""
+import base64
+import datetime
+import json
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Q
+
+POR_PAGINA = 50
+MAX_POR_PAGINA = 200
+
+
+@dataclass
+class Pagina:
+    objetos: list = field(default_factory=list)
+    siguiente: str = None     # cursor de la página siguiente (None si es la última)
+
+    @property
+    def hay_mas(self):
+        return self.siguiente is not None
+
+
+def campos_orden(queryset):
+    """
+    [(campo, descendente)] del orden keyset: order_by explícito o
+    Meta.ordering, terminado siempre en la pk.
+    """
+    modelo = queryset.model
+    orden = list(queryset.query.order_by or modelo._meta.ordering or ['-pk'])
+
+    campos = []
+    for item in orden:
+        if not isinstance(item, str):
+            raise ValueError('La paginación por cursor solo admite órdenes por nombre de campo')
+        descendente = item.startswith('-')
+        nombre = item.lstrip('-')
+        campos.append((modelo._meta.pk.name if nombre == 'pk' else nombre, descendente))
+
+    pk = modelo._meta.pk.name
+    if campos[-1][0] != pk:
+        campos.append((pk, campos[-1][1]))
+    return campos
+
+
+def valor_cursor(valor):
+    """
+    Valor apto para JSON sin perder precisión (DjangoJSONEncoder recorta las
+    fechas a milisegundos y el cursor saltaría filas).
+    """
+    if isinstance(valor, (datetime.datetime, datetime.date, datetime.time)):
+        return valor.isoformat()
+    if isinstance(valor, (str, int, float, bool)) or valor is None:
+        return valor
+    return str(valor)
+
+
+def codificar_cursor(valores):
+    datos = json.dumps([valor_cursor(v) for v in valores], separators=(',', ':'))
+    return base64.urlsafe_b64encode(datos.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decodificar_cursor(cursor, modelo, campos):
+    """Valores del cursor convertidos al tipo de cada campo; ValueError si no es válido"""
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if not isinstance(valores, list) or len(valores) != len(campos):
+            raise ValueError
+        return [
+            modelo._meta.get_field(nombre).to_python(valor)
+            for (nombre, _), valor in zip(campos, valores)
+        ]
+    except (ValueError, TypeError, ValidationError):
+        raise ValueError('Cursor de paginación no válido')
+
+
+def filtro_despues_de(campos, valores):
+    """
+    Q de las filas posteriores a `valores` en el orden de `campos`
+    (comparación lexicográfica de la tupla, campo a campo).
+    """
+    condicion = Q()
+    iguales = Q()
+    for (nombre, descendente), valor in zip(campos, valores):
+        operador = 'lt' if descendente else 'gt'
+        condicion |= iguales & Q(**{f'{nombre}__{operador}': valor})
+        iguales &= Q(**{nombre: valor})
+    return condicion
+
+
+def paginar(queryset, cursor=None, por_pagina=POR_PAGINA):
+    """Página de `queryset` que sigue al cursor (o la primera si no hay)"""
+    por_pagina = max(1, min(por_pagina, MAX_POR_PAGINA))
+    campos = campos_orden(queryset)
+    queryset = queryset.order_by(*[f'-{n}' if d else n for n, d in campos])
+
+    if cursor:
+        valores = decodificar_cursor(cursor, queryset.model, campos)
+        queryset = queryset.filter(filtro_despues_de(campos, valores))
+
+    objetos = list(queryset[:por_pagina + 1])
+    siguiente = None
+    if len(objetos) > por_pagina:
+        objetos = objetos[:por_pagina]
+        ultimo = objetos[-1]
+        siguiente = codificar_cursor([
+            getattr(ultimo, queryset.model._meta.get_field(nombre).attname) for nombre, _ in campos
+        ])
+    return Pagina(objetos, siguiente)
+
+
+def conteos(queryset, campo='estado'):
+    """{'total': n, valor: n, ...} agrupando por `campo` en una sola consulta"""
+    resultado = {'total': 0}
+    for valor, total in queryset.order_by().values_list(campo).annotate(total=Count('pk')):
+        clave = str(valor).lower() if isinstance(valor, bool) else str(valor)
+        resultado[clave] = total
+        resultado['total'] += total
+    return resultado
@@ -0,0 +1,211 @@
+"""
+Creación masiva de postulaciones (RF-03 en lote)
+
+Aplica a miles de pares (vacante, estudiante) las mismas reglas que
+PostulacionForm.clean, pero con consultas por conjunto en lugar de
+consultas por par:
+
+    1. vacantes DISPONIBLE por id          (1 consulta)
+    2. estudiantes APTO por código         (1 consulta)
+    3. postulaciones ya existentes         (1 consulta)
+    4. postulaciones activas por estudiante (1 consulta)
+    5. bulk_create de las filas aceptadas  (dentro de una transacción)
+
+Cada fila se acepta o se rechaza con sus motivos; las aceptadas quedan
+SELECCIONADO igual que en postulacion_crear.
+"""
+import csv
+import io
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Estudiante, Postulacion, Vacante
+
+MAX_POSTULACIONES_ACTIVAS = 3
+ESTADOS_ACTIVOS = ('POSTULADO', 'SELECCIONADO')
+ESTADO_INICIAL = 'SELECCIONADO'
+MAX_FILAS = 10000
+
+
+@dataclass
+class Fila:
+    numero: int
+    vacante: str
+    estudiante: str
+    observaciones: str = ''
+    errores: list = field(default_factory=list)
+    postulacion_id: int = None
+
+    @property
+    def aceptada(self):
+        return not self.errores
+
+    def como_dict(self):
+        return {
+            'fila': self.numero,
+            'vacante': self.vacante,
+            'estudiante': self.estudiante,
+            'aceptada': self.aceptada,
+            'postulacion_id': self.postulacion_id,
+            'errores': self.errores,
+        }
+
+
+def leer_csv(archivo):
+    """
+    Leer un CSV con columnas vacante, estudiante (código) y opcionalmente
+    observaciones. Acepta coma o punto y coma como separador.
+    """
+    contenido = archivo.read()
+    if isinstance(contenido, bytes):
+        contenido = contenido.decode('utf-8-sig')
+
+    try:
+        dialecto = csv.Sniffer().sniff(contenido.split('\n', 1)[0], delimiters=',;')
+    except csv.Error:
+        dialecto = csv.excel
+
+    lector = csv.DictReader(io.StringIO(contenido), dialect=dialecto)
+    columnas = {(c or '').strip().lower() for c in lector.fieldnames or []}
+    if not {'vacante', 'estudiante'} <= columnas:
+        raise ValueError('El archivo debe tener las columnas "vacante" y "estudiante"')
+
+    return [
+        {(k or '').strip().lower(): (v or '').strip() for k, v in registro.items()}
+        for registro in lector
+    ]
+
+
+def construir_filas(registros):
+    """Normalizar los registros (dicts del CSV o del JSON) a Fila"""
+    if len(registros) > MAX_FILAS:
+        raise ValueError(f'Máximo {MAX_FILAS} filas por lote (se recibieron {len(registros)})')
+
+    return [
+        Fila(
+            numero=numero,
+            vacante=str(registro.get('vacante', '')).strip(),
+            estudiante=str(registro.get('estudiante', '')).strip(),
+            observaciones=str(registro.get('observaciones') or '').strip(),
+        )
+        for numero, registro in enumerate(registros, start=1)
+    ]
+
+
+def validar(filas):
+    """
+    Marcar en cada fila los errores de validación.
+    Devuelve {id: Vacante} y {codigo: Estudiante} para crear las aceptadas.
+    """
+    ids_vacantes = {int(f.vacante) for f in filas if f.vacante.isdigit()}
+    codigos = {f.estudiante for f in filas if f.estudiante}
+
+    vacantes = Vacante.objects.filter(id__in=ids_vacantes, estado='DISPONIBLE').in_bulk()
+    estudiantes = Estudiante.objects.filter(codigo__in=codigos, estado='APTO').in_bulk(field_name='codigo')
+
+    ids_estudiantes = {e.id for e in estudiantes.values()}
+    existentes = set(Postulacion.objects.filter(
+        vacante_id__in=vacantes.keys(), estudiante_id__in=ids_estudiantes
+    ).values_list('vacante_id', 'estudiante_id'))
+    activas = Counter(dict(
+        Postulacion.objects.filter(
+            estudiante_id__in=ids_estudiantes, estado__in=ESTADOS_ACTIVOS
+        ).values('estudiante_id').annotate(total=Count('id')).values_list('estudiante_id', 'total')
+    ))
+
+    for fila in filas:
+        vacante = vacantes.get(int(fila.vacante)) if fila.vacante.isdigit() else None
+        estudiante = estudiantes.get(fila.estudiante)
+
+        if vacante is None:
+            fila.errores.append(f'La vacante "{fila.vacante}" no existe o no está disponible.')
+        if estudiante is None:
+            fila.errores.append(f'El estudiante "{fila.estudiante}" no existe o no está apto.')
+        if fila.errores:
+            continue
+
+        par = (vacante.id, estudiante.id)
+        if par in existentes:
+            fila.errores.append(
+                f'El estudiante {estudiante.nombre_completo} ya está postulado a esta vacante.'
+            )
+        if vacante.cupos_ocupados >= vacante.cantidad_cupos:
+            fila.errores.append(f'La vacante "{vacante.titulo}" no tiene cupos disponibles.')
+        if estudiante.semestre < vacante.semestre_minimo:
+            fila.errores.append(
+                f'El estudiante no cumple el requisito de semestre mínimo ({vacante.semestre_minimo}°). '
+                f'El estudiante está en {estudiante.semestre}° semestre.'
+            )
+        if activas[estudiante.id] >= MAX_POSTULACIONES_ACTIVAS:
+            fila.errores.append(
+                f'El estudiante {estudiante.nombre_completo} ya tiene {activas[estudiante.id]} '
+                f'postulaciones activas. Máximo permitido: {MAX_POSTULACIONES_ACTIVAS}.'
+            )
+
+        if fila.aceptada:
+            # Las filas aceptadas cuentan para las siguientes del mismo lote
+            existentes.add(par)
+            activas[estudiante.id] += 1
+
+    return vacantes, estudiantes
+
+
+def procesar(registros, coordinador, solo_validar=False):
+    """
+    Validar y crear (salvo solo_validar) las postulaciones del lote.
+    Devuelve (filas, creadas).
+    """
+    filas = construir_filas(registros)
+    vacantes, estudiantes = validar(filas)
+    aceptadas = [f for f in filas if f.aceptada]
+
+    if solo_validar or not aceptadas:
+        return filas, 0
+
+    ahora = timezone.now()
+    nuevas = [
+        Postulacion(
+            vacante=vacantes[int(f.vacante)],
+            estudiante=estudiantes[f.estudiante],
+            postulado_por=coordinador,
+            estado=ESTADO_INICIAL,
+            fecha_respuesta=ahora,
+            observaciones=f.observaciones or None,
+        )
+        for f in aceptadas
+    ]
+
+    try:
+        with transaction.atomic():
+            creadas = Postulacion.objects.bulk_create(nuevas, batch_size=500)
+            registrar_en_kpis(len(creadas))
+    except IntegrityError:
+        # Otra petición creó alguno de los pares entre la validación y la inserción
+        for fila in aceptadas:
+            fila.errores.append('Conflicto con otra postulación creada al mismo tiempo; vuelve a enviar el lote.')
+        return filas, 0
+
+    for fila, postulacion in zip(aceptadas, creadas):
+        fila.postulacion_id = postulacion.id
+    return filas, len(creadas)
+
+
+def registrar_en_kpis(cantidad):
+    """bulk_create no dispara señales: ajustar KpiSnapshot a mano"""
+    from .signals import aplicar_deltas, campos_kpi
+
+    aplicar_deltas(Postulacion, {campo: cantidad for campo in campos_kpi(Postulacion, ESTADO_INICIAL)})
+
+
+def resumen(filas, creadas):
+    rechazadas = sum(1 for f in filas if not f.aceptada)
+    return {
+        'total': len(filas),
+        'aceptadas': len(filas) - rechazadas,
+        'rechazadas': rechazadas,
+        'creadas': creadas,
+    }
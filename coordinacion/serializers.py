@@ -1,11 +1,177 @@
 """
 Serializadores para convertir modelos Django a formato JSON
 para ser consumidos por React
+
+Cada serializador se registra con @serializador declarando las relaciones
+que recorre (select_related) y los campos que lee (only()). Así:
+    - preparar(queryset) deja la consulta lista para serializar sin
+      consultas perezosas por fila;
+    - serializar_lista(objetos) reutiliza la salida de cada fila desde la
+      caché mientras no cambie su fecha_actualizacion (ni la de los objetos
+      relacionados que incluye);
+    - to_json codifica con orjson cuando está instalado.
 """
+import hashlib
 import json
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import caches
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db.models import Model
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+from .models import (
+    Empresa, Vacante, Estudiante, Postulacion, PracticaEmpresarial,
+    TutorEmpresarial, DocenteAsesor, Sustentacion, Mensaje,
+)
+
+# Cambiar si se modifica la forma de algún serializador (invalida la caché)
+VERSION_CACHE = 1
+
+CAMPO_VERSION = 'fecha_actualizacion'
+
+
+# ============================================
+# REGISTRO DE SERIALIZADORES
+# ============================================
+
+@dataclass(frozen=True)
+class Serializador:
+    funcion: callable
+    modelo: type
+    relaciones: tuple = ()      # select_related
+    campos: tuple = None        # only(); None carga todos los campos
+    cache: bool = True
+
+    def preparar(self, queryset):
+        """select_related/only() de lo que lee el serializador"""
+        if self.relaciones:
+            queryset = queryset.select_related(*self.relaciones)
+        if self.campos is not None:
+            queryset = queryset.only(*self.campos_cargados())
+        return queryset
+
+    def campos_cargados(self):
+        """Campos declarados + orden por defecto + fecha_actualizacion de cada objeto"""
+        campos = list(self.campos)
+        campos += [c.lstrip('-') for c in self.modelo._meta.ordering if '__' not in c]
+        for ruta, modelo in self.modelos():
+            if any(f.name == CAMPO_VERSION for f in modelo._meta.concrete_fields):
+                campos.append(f'{ruta}__{CAMPO_VERSION}' if ruta else CAMPO_VERSION)
+        return list(dict.fromkeys(campos))
+
+    def modelos(self):
+        """(ruta, modelo) del objeto principal y de cada relación"""
+        yield '', self.modelo
+        for ruta in self.relaciones:
+            modelo = self.modelo
+            for nombre in ruta.split('__'):
+                modelo = modelo._meta.get_field(nombre).related_model
+            yield ruta, modelo
+
+    def clave(self, objeto):
+        """
+        Clave de caché (modelo, pk, fecha_actualizacion de cada objeto incluido).
+        None si algún objeto o relación no está cargado: consultarlo aquí
+        costaría más que serializar.
+        """
+        versiones = [self.modelo._meta.label, str(objeto.pk)]
+        for ruta, _ in self.modelos():
+            actual = objeto
+            for nombre in ruta.split('__') if ruta else ():
+                campo = actual._meta.get_field(nombre)
+                if not campo.is_cached(actual):
+                    return None
+                actual = campo.get_cached_value(actual)
+                if actual is None:
+                    break
+            if actual is None:
+                versiones.append('-')
+                continue
+            version = actual.__dict__.get(CAMPO_VERSION)
+            if version is None:
+                return None
+            versiones.append(version.isoformat())
+
+        resumen = hashlib.blake2b('|'.join(versiones).encode(), digest_size=16).hexdigest()
+        return f'serializador:{VERSION_CACHE}:{self.funcion.__name__}:{resumen}'
+
+
+SERIALIZADORES = {}
+
+
+def serializador(modelo, relaciones=(), campos=None, cache=True):
+    """Registrar un serializador de `modelo` con las relaciones y campos que usa"""
+    def registrar(funcion):
+        funcion.registro = Serializador(funcion, modelo, tuple(relaciones), campos, cache)
+        SERIALIZADORES[modelo] = funcion
+        return funcion
+    return registrar
+
+
+def _registro(funcion, modelo):
+    funcion = funcion or SERIALIZADORES.get(modelo)
+    if funcion is None:
+        raise LookupError(f'No hay serializador registrado para {modelo.__name__}')
+    return funcion.registro
+
+
+def preparar(queryset, funcion=None):
+    """Aplicar al queryset el select_related/only() que declara su serializador"""
+    return _registro(funcion, queryset.model).preparar(queryset)
+
+
+def serializar_lista(objetos, funcion=None):
+    """
+    Serializar varios objetos del mismo modelo reutilizando la caché por
+    objeto (settings.SERIALIZADORES_CACHE). Sin `funcion` se usa el
+    serializador registrado para el modelo.
+    """
+    objetos = list(objetos)
+    if not objetos:
+        return []
+
+    registro = _registro(funcion, type(objetos[0]))
+    alias = getattr(settings, 'SERIALIZADORES_CACHE', None)
+    if not registro.cache or alias is None:
+        return [registro.funcion(objeto) for objeto in objetos]
+
+    cache = caches[alias]
+    claves = [registro.clave(objeto) for objeto in objetos]
+    guardados = cache.get_many([clave for clave in claves if clave])
+
+    resultado, nuevos = [], {}
+    for objeto, clave in zip(objetos, claves):
+        datos = guardados.get(clave) if clave else None
+        if datos is None:
+            datos = registro.funcion(objeto)
+            if clave:
+                nuevos[clave] = datos
+        resultado.append(datos)
+
+    if nuevos:
+        cache.set_many(nuevos, getattr(settings, 'SERIALIZADORES_CACHE_TIMEOUT', None))
+    return resultado
+
+
+# ============================================
+# SERIALIZADORES
+# ============================================
+
+@serializador(
+    Empresa,
+    relaciones=('aprobada_por',),
+    campos=(
+        'razon_social', 'nit', 'direccion', 'telefono', 'email', 'ciudad',
+        'representante_nombre', 'representante_cargo', 'representante_email',
+        'representante_telefono', 'estado', 'fecha_registro', 'fecha_aprobacion',
+        'observaciones', 'aprobada_por__nombre_completo',
+    ),
+)
 def serialize_empresa(empresa):
     """Serializar una empresa a formato JSON"""
     return {
@@ -27,6 +193,16 @@ def serialize_empresa(empresa):
         'aprobada_por': empresa.aprobada_por.nombre_completo if empresa.aprobada_por else None,
     }
 
+@serializador(
+    Vacante,
+    relaciones=('empresa', 'creada_por'),
+    campos=(
+        'titulo', 'area_practica', 'descripcion', 'cantidad_cupos', 'cupos_ocupados',
+        'programa_academico', 'semestre_minimo', 'horario', 'duracion_meses', 'estado',
+        'fecha_creacion', 'fecha_publicacion',
+        'empresa__razon_social', 'empresa__nit', 'creada_por__nombre_completo',
+    ),
+)
 def serialize_vacante(vacante):
     """Serializar una vacante a formato JSON"""
     return {
@@ -52,6 +228,13 @@ def serialize_vacante(vacante):
         'creada_por': vacante.creada_por.nombre_completo if vacante.creada_por else None,
     }
 
+@serializador(
+    Estudiante,
+    campos=(
+        'codigo', 'nombre_completo', 'email', 'telefono', 'programa_academico',
+        'semestre', 'estado', 'promedio_academico', 'fecha_registro',
+    ),
+)
 def serialize_estudiante(estudiante):
     """Serializar un estudiante a formato JSON"""
     return {
@@ -67,6 +250,15 @@ def serialize_estudiante(estudiante):
         'fecha_registro': estudiante.fecha_registro.isoformat() if estudiante.fecha_registro else None,
     }
 
+@serializador(
+    Postulacion,
+    relaciones=('estudiante', 'vacante', 'vacante__empresa', 'postulado_por'),
+    campos=(
+        'estado', 'fecha_postulacion', 'fecha_respuesta', 'observaciones',
+        'estudiante__codigo', 'estudiante__nombre_completo', 'estudiante__programa_academico',
+        'vacante__titulo', 'vacante__empresa__razon_social', 'postulado_por__nombre_completo',
+    ),
+)
 def serialize_postulacion(postulacion):
     """Serializar una postulación a formato JSON"""
     return {
@@ -89,6 +281,16 @@ def serialize_postulacion(postulacion):
         'postulado_por': postulacion.postulado_por.nombre_completo if postulacion.postulado_por else None,
     }
 
+@serializador(
+    PracticaEmpresarial,
+    relaciones=('estudiante', 'empresa', 'tutor_empresarial', 'docente_asesor'),
+    campos=(
+        'estado', 'fecha_inicio', 'fecha_fin_estimada', 'fecha_fin_real', 'plan_aprobado',
+        'observaciones', 'estudiante__codigo', 'estudiante__nombre_completo',
+        'empresa__razon_social', 'tutor_empresarial__nombre_completo',
+        'docente_asesor__nombre_completo',
+    ),
+)
 def serialize_practica(practica):
     """Serializar una práctica a formato JSON - VERSIÓN CORREGIDA"""
     return {
@@ -111,6 +313,11 @@ def serialize_practica(practica):
     }
 
 
+@serializador(
+    TutorEmpresarial,
+    relaciones=('empresa',),
+    campos=('nombre_completo', 'cargo', 'email', 'telefono', 'activo', 'empresa__razon_social'),
+)
 def serialize_tutor(tutor):
     """Serializar un tutor empresarial a formato JSON"""
     return {
@@ -126,6 +333,10 @@ def serialize_tutor(tutor):
         },
     }
 
+@serializador(
+    DocenteAsesor,
+    campos=('nombre_completo', 'email', 'telefono', 'especialidad', 'activo'),
+)
 def serialize_docente(docente):
     """Serializar un docente asesor a formato JSON"""
     return {
@@ -137,6 +348,15 @@ def serialize_docente(docente):
         'activo': docente.activo,
     }
 
+@serializador(
+    Sustentacion,
+    relaciones=('practica', 'practica__estudiante', 'jurado_1', 'jurado_2'),
+    campos=(
+        'fecha_programada', 'lugar', 'estado', 'calificacion', 'observaciones',
+        'practica__estudiante__nombre_completo',
+        'jurado_1__nombre_completo', 'jurado_2__nombre_completo',
+    ),
+)
 def serialize_sustentacion(sustentacion):
     """Serializar una sustentación a formato JSON"""
     return {
@@ -160,6 +380,45 @@ def serialize_sustentacion(sustentacion):
         } if sustentacion.jurado_2 else None,
     }
 
+# El remitente (User) no tiene fecha_actualizacion: sin caché por objeto
+@serializador(
+    Mensaje,
+    relaciones=('remitente', 'remitente__estudiante', 'remitente__docente_asesor'),
+    cache=False,
+)
+def serialize_mensaje(mensaje):
+    """
+    Serializar un mensaje del chat estudiante-docente.
+    Espera el remitente con select_related('remitente__estudiante',
+    'remitente__docente_asesor') para no consultar el perfil por mensaje.
+    El campo es_mio depende de quién lo lee: lo agrega cada vista. `leido`
+    sale de lectura.anotar_leido(); un mensaje recién creado no está leído.
+    """
+    remitente = mensaje.remitente
+    perfil = getattr(remitente, 'estudiante', None) or getattr(remitente, 'docente_asesor', None)
+    return {
+        'id': mensaje.id,
+        'practica_id': mensaje.practica_id,
+        'contenido': mensaje.contenido,
+        'fecha_envio': mensaje.fecha_envio.strftime('%d/%m/%Y %H:%M'),
+        'remitente': remitente.username,
+        'remitente_id': remitente.id,
+        'remitente_nombre': perfil.nombre_completo if perfil else remitente.username,
+        'remitente_foto': perfil.foto_perfil.url if perfil and perfil.foto_perfil else None,
+        'archivo': mensaje.archivo_adjunto.url if mensaje.archivo_adjunto else None,
+        'leido': getattr(mensaje, 'leido', False),
+    }
+
+# ============================================
+# JSON
+# ============================================
+
+_encoder = DjangoJSONEncoder()
+
+
 def to_json(data):
-    """Convertir datos a JSON de forma segura"""
+    """Convertir datos a JSON de forma segura (orjson si está instalado)"""
+    if orjson is not None:
+        # Decimal, textos traducibles, etc. siguen las reglas de DjangoJSONEncoder
+        return orjson.dumps(data, default=_encoder.default, option=orjson.OPT_NON_STR_KEYS).decode()
     return json.dumps(data, cls=DjangoJSONEncoder)
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""
+Señales de la app coordinación
+"""
+from collections import Counter, defaultdict
+
+from django.contrib.auth.signals import user_logged_in
+from django.db.models import F
+from django.db.models.signals import post_init, post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from config import roles
+from . import afinidad, busqueda, cola, miniaturas, sondeo
+from .chat_pubsub import publicar_mensaje
+from .models import (
+    Empresa, Vacante, Estudiante, PracticaEmpresarial, Postulacion,
+    Mensaje, KpiSnapshot, Coordinador, DocenteAsesor,
+)
+
+
+@receiver(post_save, sender=Mensaje)
+def mensaje_creado(sender, instance, created, **kwargs):
+    """Notificar a los chats abiertos de la práctica y avanzar su último mensaje"""
+    if created:
+        sondeo.registrar_mensaje(instance)
+        publicar_mensaje(instance)
+
+
+# ============================================
+# ROLES EN SESIÓN (config/roles.py)
+# ============================================
+
+MODELOS_PERFIL = (Coordinador, Estudiante, DocenteAsesor)
+
+
+@receiver(user_logged_in)
+def roles_al_iniciar_sesion(sender, request, user, **kwargs):
+    """Guardar en la sesión los roles del usuario que acaba de entrar"""
+    if request is not None and hasattr(request, 'session'):
+        roles.recordar(request, user)
+
+
+def perfil_guardado(sender, instance, created, **kwargs):
+    # Solo cambia qué roles tiene el usuario al crear o borrar el perfil
+    if created:
+        roles.invalidar(instance.user_id)
+
+
+def perfil_eliminado(sender, instance, **kwargs):
+    roles.invalidar(instance.user_id)
+
+
+for modelo in MODELOS_PERFIL:
+    post_save.connect(perfil_guardado, sender=modelo, dispatch_uid=f'roles_post_save_{modelo.__name__}')
+    post_delete.connect(perfil_eliminado, sender=modelo, dispatch_uid=f'roles_post_delete_{modelo.__name__}')
+
+
+# ============================================
+# MINIATURAS DE FOTOS DE PERFIL (miniaturas.py)
+# ============================================
+
+_SIN_FOTO = object()
+
+
+def foto_recordar(sender, instance, **kwargs):
+    # Nombre guardado de la foto ('' si es una subida nueva; ausente si el campo se cargó diferido)
+    anterior = instance.__dict__.get('foto_perfil', _SIN_FOTO)
+    instance._foto_anterior = anterior if anterior is _SIN_FOTO or isinstance(anterior, str) else ''
+
+
+def foto_guardada(sender, instance, **kwargs):
+    anterior = instance._foto_anterior
+    if anterior is _SIN_FOTO:
+        return
+    actual = instance.foto_perfil.name or ''
+    if anterior != actual:
+        if anterior:
+            miniaturas.eliminar(anterior)
+        if actual:
+            miniaturas.programar(actual)
+    instance._foto_anterior = actual
+
+
+def foto_eliminada(sender, instance, **kwargs):
+    if instance.foto_perfil:
+        miniaturas.eliminar(instance.foto_perfil.name)
+
+
+for modelo in MODELOS_PERFIL:
+    post_init.connect(foto_recordar, sender=modelo, dispatch_uid=f'foto_init_{modelo.__name__}')
+    post_save.connect(foto_guardada, sender=modelo, dispatch_uid=f'foto_post_save_{modelo.__name__}')
+    post_delete.connect(foto_eliminada, sender=modelo, dispatch_uid=f'foto_post_delete_{modelo.__name__}')
+
+
+# ============================================
+# INDICADORES (KpiSnapshot)
+# ============================================
+
+MODELOS_KPI = (Empresa, Vacante, Estudiante, PracticaEmpresarial, Postulacion)
+
+# Cambios en estos modelos pueden alterar el ranking de empresas con más prácticas
+MODELOS_EMPRESAS_TOP = (Empresa, PracticaEmpresarial)
+
+_SIN_ESTADO = object()
+
+
+def campos_kpi(modelo, estado, totales=True):
+    """Contadores de KpiSnapshot en los que cuenta un registro con ese estado"""
+    return [
+        campo for campo, (nombre, estado_contado) in KpiSnapshot.CONTADORES.items()
+        if nombre == modelo.__name__
+        and (estado_contado == estado or (totales and estado_contado is None))
+    ]
+
+
+def aplicar_deltas(modelo, deltas):
+    """Sumar los deltas a la fila de indicadores en la misma transacción del cambio"""
+    cambios = {campo: F(campo) + delta for campo, delta in deltas.items() if delta}
+    if modelo in MODELOS_EMPRESAS_TOP:
+        cambios['empresas_top_vigente'] = False
+    if cambios:
+        # Si la fila aún no existe no se actualiza nada: KpiSnapshot.obtener() la construye
+        KpiSnapshot.objects.filter(pk=1).update(**cambios)
+
+
+def kpi_recordar_estado(sender, instance, **kwargs):
+    instance._kpi_estado = instance.__dict__.get('estado', _SIN_ESTADO)
+
+
+def kpi_estado_anterior(sender, instance, **kwargs):
+    """Si el estado se cargó diferido, leer el valor guardado antes de sobrescribirlo"""
+    if instance._kpi_estado is _SIN_ESTADO and not instance._state.adding:
+        instance._kpi_estado = sender.objects.filter(pk=instance.pk).values_list(
+            'estado', flat=True
+        ).first()
+
+
+def kpi_guardado(sender, instance, created, **kwargs):
+    deltas = Counter()
+    if created:
+        deltas.update(campos_kpi(sender, instance.estado))
+    elif instance._kpi_estado != instance.estado:
+        deltas.subtract(campos_kpi(sender, instance._kpi_estado, totales=False))
+        deltas.update(campos_kpi(sender, instance.estado, totales=False))
+
+    instance._kpi_estado = instance.estado
+    aplicar_deltas(sender, deltas)
+
+
+def kpi_eliminado(sender, instance, **kwargs):
+    deltas = Counter()
+    deltas.subtract(campos_kpi(sender, instance.estado))
+    aplicar_deltas(sender, deltas)
+
+
+for modelo in MODELOS_KPI:
+    post_init.connect(kpi_recordar_estado, sender=modelo, dispatch_uid=f'kpi_init_{modelo.__name__}')
+    pre_save.connect(kpi_estado_anterior, sender=modelo, dispatch_uid=f'kpi_pre_save_{modelo.__name__}')
+    post_save.connect(kpi_guardado, sender=modelo, dispatch_uid=f'kpi_post_save_{modelo.__name__}')
+    post_delete.connect(kpi_eliminado, sender=modelo, dispatch_uid=f'kpi_post_delete_{modelo.__name__}')
+
+
+# ============================================
+# ÍNDICE DE AFINIDAD (afinidad.py)
+# ============================================
+
+# Recalcular una vacante recorre a todos sus candidatos: se hace en segundo
+# plano (tareas afinidad_vacante / afinidad_estudiante), no en la petición
+
+def afinidad_vacante_guardada(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or set(update_fields) & set(afinidad.CAMPOS_VACANTE):
+        cola.encolar_recalculo('afinidad_vacante', vacante_id=instance.pk)
+
+
+def afinidad_estudiante_guardado(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or set(update_fields) & set(afinidad.CAMPOS_ESTUDIANTE):
+        cola.encolar_recalculo('afinidad_estudiante', estudiante_id=instance.pk)
+
+
+post_save.connect(afinidad_vacante_guardada, sender=Vacante, dispatch_uid='afinidad_post_save_Vacante')
+post_save.connect(afinidad_estudiante_guardado, sender=Estudiante, dispatch_uid='afinidad_post_save_Estudiante')
+
+
+# ============================================
+# ÍNDICE DE BÚSQUEDA (busqueda.py)
+# ============================================
+
+def busqueda_guardado(sender, instance, update_fields=None, **kwargs):
+    documento = busqueda.documento_de(sender)
+    if update_fields is None or set(update_fields) & documento.campos:
+        busqueda.indexar(documento.tipo, [instance.pk])
+
+
+def busqueda_eliminado(sender, instance, **kwargs):
+    busqueda.eliminar(busqueda.documento_de(sender).tipo, [instance.pk])
+
+
+# Modelo relacionado -> documentos que copian sus campos (la razón social
+# de la empresa está en las filas de sus vacantes y tutores)
+BUSQUEDA_DEPENDIENTES = defaultdict(list)
+for documento in busqueda.DOCUMENTOS.values():
+    for relacion, campos in documento.relaciones.items():
+        relacionado = documento.modelo._meta.get_field(relacion).related_model
+        BUSQUEDA_DEPENDIENTES[relacionado].append((documento, relacion, campos))
+
+
+def busqueda_relacion_guardada(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    for documento, relacion, campos in BUSQUEDA_DEPENDIENTES[sender]:
+        if update_fields is None or set(update_fields) & campos:
+            busqueda.indexar(
+                documento.tipo,
+                documento.modelo.objects.filter(**{relacion: instance.pk}).values_list('pk', flat=True),
+            )
+
+
+for documento in busqueda.DOCUMENTOS.values():
+    modelo = documento.modelo
+    post_save.connect(busqueda_guardado, sender=modelo, dispatch_uid=f'busqueda_post_save_{modelo.__name__}')
+    post_delete.connect(busqueda_eliminado, sender=modelo, dispatch_uid=f'busqueda_post_delete_{modelo.__name__}')
+for modelo in BUSQUEDA_DEPENDIENTES:
+    post_save.connect(busqueda_relacion_guardada, sender=modelo,
+                      dispatch_uid=f'busqueda_relacion_post_save_{modelo.__name__}')
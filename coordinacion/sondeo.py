@@ -0,0 +1,252 @@
+"""
+Sondeo adaptativo del chat estudiante-docente
+
+El chat recibe los mensajes por Server-Sent Events mientras la ventana
+está abierta y la pestaña visible. Minimizado, en una pestaña oculta o sin
+EventSource, el widget consulta obtener_mensajes, y cada respuesta dice
+cuándo volver a preguntar (`next_poll_ms`, también en la cabecera
+X-Next-Poll-Ms):
+
+    pestaña oculta                          60 s
+    último mensaje hace menos de 1 minuto    2 s
+    ... menos de 10 minutos                  5 s
+    ... menos de 1 hora                     15 s
+    más antiguo o sin mensajes              30 s
+
+El cliente duplica la espera mientras no lleguen mensajes, sin bajar de
+la sugerencia ni pasar de un minuto.
+
+El último mensaje de cada práctica se guarda en ConversacionChat (lo
+escribe la señal de Mensaje), así que una consulta sin novedades se
+responde con la fila de la práctica: 304 si el cliente manda el ETag de
+la respuesta anterior (If-None-Match), o una lista vacía si su ultimo_id
+ya es el último, sin consultar ni actualizar Mensaje.
+
+El historial se sirve por páginas de MENSAJES_POR_PAGINA, del más nuevo al
+más viejo por id (`historial()`): la primera carga del chat trae solo la
+página más reciente y ?before_id=<id más viejo en pantalla> la anterior.
+
+Un docente con varios estudiantes no sondea cada conversación: consulta
+su bandeja (`bandeja()`, no leídos y último mensaje de todas sus prácticas
+en curso en una sola llamada) y pide los mensajes solo de la conversación
+abierta cuando su último id cambió.
+
+Los mensajes cargados con bulk_create() no disparan la señal:
+sondeo.reconstruir() (lo llama generate_load_dataset).
+"""
+from django.db.models import Count, Max, OuterRef, Q
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from . import lectura
+from .chat_pubsub import ultimo_id_cliente
+from .models import ConversacionChat, Mensaje, PracticaEmpresarial
+from .serializers import serialize_mensaje
+
+# (segundos desde el último mensaje, milisegundos hasta la siguiente consulta)
+INTERVALOS = ((60, 2000), (600, 5000), (3600, 15000))
+INTERVALO_INACTIVO = 30000
+INTERVALO_OCULTO = 60000
+VISTA_PREVIA = 80
+MENSAJES_POR_PAGINA = 50
+
+
+# ============================================
+# ÚLTIMO MENSAJE DE CADA CONVERSACIÓN
+# ============================================
+
+def registrar_mensaje(mensaje):
+    """Avanzar el último mensaje de la conversación (nunca hacia atrás)"""
+    datos = {'ultimo_mensaje_id': mensaje.id, 'fecha_ultimo_mensaje': mensaje.fecha_envio}
+    conversacion = ConversacionChat.objects.filter(practica_id=mensaje.practica_id, ultimo_mensaje_id__lt=mensaje.id)
+    if conversacion.update(**datos):
+        return
+    ConversacionChat.objects.bulk_create(
+        [ConversacionChat(practica_id=mensaje.practica_id, **datos)], ignore_conflicts=True
+    )
+    # Si otra transacción la creó a la vez con un mensaje anterior
+    conversacion.update(**datos)
+
+
+def reconstruir():
+    """Recalcular ConversacionChat desde Mensaje; devuelve las conversaciones"""
+    ultimos = Mensaje.objects.values('practica_id').annotate(ultimo=Max('id'), fecha=Max('fecha_envio'))
+    ConversacionChat.objects.all().delete()
+    return len(ConversacionChat.objects.bulk_create(
+        [
+            ConversacionChat(practica_id=fila['practica_id'], ultimo_mensaje_id=fila['ultimo'],
+                             fecha_ultimo_mensaje=fila['fecha'])
+            for fila in ultimos.iterator()
+        ],
+        batch_size=1000,
+    ))
+
+
+def ultimo_mensaje(practica):
+    """(id, fecha) del último mensaje; (0, None) si la práctica no tiene chat"""
+    try:
+        conversacion = practica.conversacion
+    except ConversacionChat.DoesNotExist:
+        return 0, None
+    return conversacion.ultimo_mensaje_id, conversacion.fecha_ultimo_mensaje
+
+
+# ============================================
+# RESPUESTA DEL SONDEO
+# ============================================
+
+def proximo_sondeo_ms(fecha_ultimo_mensaje, visible=True):
+    """Milisegundos sugeridos hasta la siguiente consulta"""
+    if not visible:
+        return INTERVALO_OCULTO
+    if fecha_ultimo_mensaje is None:
+        return INTERVALO_INACTIVO
+    segundos = (timezone.now() - fecha_ultimo_mensaje).total_seconds()
+    for limite, intervalo in INTERVALOS:
+        if segundos < limite:
+            return intervalo
+    return INTERVALO_INACTIVO
+
+
+def etag(practica_id, ultimo_id):
+    return f'"chat-{practica_id}-{ultimo_id}"'
+
+
+def responder(request, practica, mensajes):
+    """
+    Respuesta de obtener_mensajes. `mensajes` es el queryset del chat de la
+    práctica (con el remitente en select_related y lectura.anotar_leido);
+    solo se consulta si hay algo que el cliente no tiene.
+
+        ?ultimo_id=N    los posteriores a N (sondeo)
+        sin ultimo_id   la página más reciente del historial
+        ?before_id=N    la página anterior a N ("cargar anteriores"), sin sondeo
+
+    Los mensajes entregados por sondeo o en la página más reciente avanzan
+    el cursor de lectura de quien consulta.
+    """
+    antes_id = id_parametro(request, 'before_id')
+    if antes_id:
+        return respuesta_historial(request, mensajes, antes_id)
+
+    ultimo, fecha = ultimo_mensaje(practica)
+    espera = proximo_sondeo_ms(fecha, visible=request.GET.get('visible') != '0')
+    etiqueta = etag(practica.id, ultimo)
+    ultimo_id = ultimo_id_cliente(request)
+
+    if request.headers.get('If-None-Match') == etiqueta:
+        response = HttpResponseNotModified()
+    elif ultimo_id >= ultimo:
+        response = JsonResponse({'mensajes': [], 'next_poll_ms': espera})
+    else:
+        datos = {'next_poll_ms': espera}
+        if ultimo_id:
+            entregados = list(mensajes.filter(id__gt=ultimo_id).order_by('id'))
+        else:
+            entregados, datos['hay_anteriores'] = historial(mensajes)
+        lectura.avanzar(practica.id, request.user.id, entregados[-1].id if entregados else 0)
+        response = JsonResponse({'mensajes': serializar(request, entregados), **datos})
+
+    response['ETag'] = etiqueta
+    response['X-Next-Poll-Ms'] = espera
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def id_parametro(request, nombre):
+    try:
+        return max(0, int(request.GET.get(nombre) or 0))
+    except ValueError:
+        return 0
+
+
+def serializar(request, mensajes):
+    return [
+        {**serialize_mensaje(mensaje), 'es_mio': mensaje.remitente_id == request.user.id}
+        for mensaje in mensajes
+    ]
+
+
+# ============================================
+# HISTORIAL (del más nuevo al más viejo, por id)
+# ============================================
+
+def historial(mensajes, antes_id=None, por_pagina=MENSAJES_POR_PAGINA):
+    """
+    Página del historial anterior a `antes_id` (o la más reciente):
+    (mensajes en orden ascendente para pintarlos, hay_anteriores).
+
+        WHERE practica_id = :p AND id < :antes_id ORDER BY id DESC LIMIT n + 1
+
+    Cuesta lo mismo en cualquier punto de la conversación (índice practica, id).
+    """
+    if antes_id:
+        mensajes = mensajes.filter(id__lt=antes_id)
+    pagina = list(mensajes.order_by('-id')[:por_pagina + 1])
+    return pagina[:por_pagina][::-1], len(pagina) > por_pagina
+
+
+def respuesta_historial(request, mensajes, antes_id):
+    pagina, hay_anteriores = historial(mensajes, antes_id)
+    response = JsonResponse({'mensajes': serializar(request, pagina), 'hay_anteriores': hay_anteriores})
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+# ============================================
+# BANDEJA DEL DOCENTE
+# ============================================
+
+def bandeja(docente):
+    """
+    Conversaciones de las prácticas EN_CURSO del docente, la más reciente
+    primero: [{'practica_id', 'estudiante', 'no_leidos', 'ultimo_id',
+    'vista_previa', 'ultimo_es_mio', 'fecha_ultimo'}, ...]. Los no leídos y
+    el último id salen de un solo agregado agrupado sobre Mensaje; el texto
+    de los últimos mensajes, de una consulta por clave primaria.
+    """
+    practicas = list(
+        PracticaEmpresarial.objects.filter(docente_asesor=docente, estado='EN_CURSO')
+        .values_list('id', 'estudiante__nombre_completo')
+    )
+    if not practicas:
+        return []
+
+    resumen = {
+        fila['practica_id']: fila
+        for fila in Mensaje.objects.filter(practica_id__in=[p for p, _ in practicas])
+        .values('practica_id')
+        .annotate(
+            no_leidos=Count('id', filter=(
+                Q(id__gt=lectura.leido_hasta(docente.user_id, OuterRef('practica_id')))
+                & ~Q(remitente_id=docente.user_id)
+            )),
+            ultimo_id=Max('id'),
+        )
+    }
+    ultimos = {
+        mensaje['id']: mensaje
+        for mensaje in Mensaje.objects.filter(id__in=[fila['ultimo_id'] for fila in resumen.values()])
+        .values('id', 'contenido', 'archivo_adjunto', 'remitente_id', 'fecha_envio')
+    }
+
+    conversaciones = []
+    for practica_id, estudiante in practicas:
+        fila = resumen.get(practica_id, {'no_leidos': 0, 'ultimo_id': 0})
+        ultimo = ultimos.get(fila['ultimo_id'])
+        conversaciones.append({
+            'practica_id': practica_id,
+            'estudiante': estudiante,
+            'no_leidos': fila['no_leidos'],
+            'ultimo_id': fila['ultimo_id'],
+            'vista_previa': (
+                Truncator(ultimo['contenido']).chars(VISTA_PREVIA)
+                or ('📎 Archivo adjunto' if ultimo['archivo_adjunto'] else '')
+            ) if ultimo else '',
+            'ultimo_es_mio': bool(ultimo) and ultimo['remitente_id'] == docente.user_id,
+            'fecha_ultimo': ultimo['fecha_envio'] if ultimo else None,
+        })
+    conversaciones.sort(key=lambda c: c['ultimo_id'], reverse=True)
+    return conversaciones
+
@@ -0,0 +1,122 @@
+/*
+ * Listados paginados de coordinación ("Cargar más")
+ *
+ * La vista Django envía la primera página como
+ *     {resultados, siguiente, filtros, conteos, url}
+ * (ver coordinacion/listas.py). useListaPaginada guarda las filas
+ * cargadas, pide a `url` la página siguiente con el cursor y vuelve a la
+ * primera página cuando cambian los filtros. Los filtros se aplican en el
+ * servidor, así que la tabla nunca necesita todas las filas.
+ *
+ * Uso dentro de un componente React:
+ *     const lista = useListaPaginada(window.empresasLista, { estado, buscar });
+ *     lista.items.map(...)
+ *     <CargarMas lista={lista} />
+ */
+(function () {
+    function construirUrl(base, filtros, cursor) {
+        const params = new URLSearchParams();
+        Object.keys(filtros).forEach(function (clave) {
+            if (filtros[clave] !== '' && filtros[clave] != null) {
+                params.append(clave, filtros[clave]);
+            }
+        });
+        if (cursor) {
+            params.append('cursor', cursor);
+        }
+        return base + '?' + params.toString();
+    }
+
+    // Clave estable de los filtros (sin depender del orden de las claves)
+    function claveFiltros(filtros) {
+        return JSON.stringify(Object.keys(filtros).sort().map(function (clave) {
+            return [clave, filtros[clave] == null ? '' : String(filtros[clave])];
+        }));
+    }
+
+    function useListaPaginada(inicial, filtros) {
+        const { useState, useEffect, useRef } = React;
+        const [items, setItems] = useState(inicial.resultados);
+        const [siguiente, setSiguiente] = useState(inicial.siguiente);
+        const [cargando, setCargando] = useState(false);
+        const [error, setError] = useState(null);
+
+        const clave = claveFiltros(filtros);
+        const claveCargada = useRef(claveFiltros(inicial.filtros));
+        const ultimaPeticion = useRef(0);
+
+        function pedir(cursor, agregar) {
+            const peticion = ++ultimaPeticion.current;
+            setCargando(true);
+
+            fetch(construirUrl(inicial.url, filtros, cursor), {
+                credentials: 'same-origin',
+                headers: { 'X-Requested-With': 'XMLHttpRequest' },
+            })
+                .then(function (response) {
+                    if (!response.ok) {
+                        throw new Error('HTTP ' + response.status);
+                    }
+                    return response.json();
+                })
+                .then(function (datos) {
+                    // Respuesta de una petición ya reemplazada (otro filtro)
+                    if (peticion !== ultimaPeticion.current) return;
+                    setItems(function (previos) {
+                        return agregar ? previos.concat(datos.resultados) : datos.resultados;
+                    });
+                    setSiguiente(datos.siguiente);
+                    setError(null);
+                })
+                .catch(function () {
+                    if (peticion === ultimaPeticion.current) {
+                        setError('No se pudo cargar el listado. Intenta de nuevo.');
+                    }
+                })
+                .finally(function () {
+                    if (peticion === ultimaPeticion.current) {
+                        setCargando(false);
+                    }
+                });
+        }
+
+        // Filtros nuevos: recargar desde la primera página (espera a que se deje de escribir)
+        useEffect(function () {
+            if (clave === claveCargada.current) return undefined;
+            const temporizador = setTimeout(function () {
+                claveCargada.current = clave;
+                pedir(null, false);
+            }, 300);
+            return function () { clearTimeout(temporizador); };
+        }, [clave]);
+
+        return {
+            items: items,
+            hayMas: siguiente !== null,
+            cargando: cargando,
+            error: error,
+            cargarMas: function () {
+                if (siguiente && !cargando) pedir(siguiente, true);
+            },
+        };
+    }
+
+    function CargarMas(props) {
+        const lista = props.lista;
+        if (!lista.hayMas && !lista.error) return null;
+
+        const h = React.createElement;
+        return h('div', { className: 'text-center mt-3' },
+            lista.error ? h('div', { className: 'text-danger small mb-2' }, lista.error) : null,
+            lista.hayMas ? h('button', {
+                type: 'button',
+                className: 'btn btn-outline-primary',
+                disabled: lista.cargando,
+                onClick: lista.cargarMas,
+            }, lista.cargando ? 'Cargando...' : 'Cargar más') : null
+        );
+    }
+
+    window.useListaPaginada = useListaPaginada;
+    window.CargarMas = CargarMas;
+})();
@@ -0,0 +1,69 @@
+"""
+Tareas en segundo plano de coordinación (ver cola.py)
+
+Deben ser idempotentes: ante un reintento no pueden duplicar efectos.
+"""
+import json
+import logging
+
+from django.apps import apps
+
+from . import afinidad, miniaturas
+from .cola import tarea
+from .models import Estudiante
+
+logger = logging.getLogger(__name__)
+
+
+@tarea('estudiante_actualizar_estado')
+def estudiante_actualizar_estado(estudiante_id, estado, excepto=(), origen=None):
+    """
+    Cascada de una transición (postulación vinculada/rechazada/desvinculada,
+    práctica cerrada/finalizada/cancelada) al estado del estudiante. No lo
+    cambia si ya tiene ese estado o si está en alguno de `excepto`.
+
+    `origen` es [modelo, id, estado] del objeto que hizo la transición: si al
+    ejecutarse la tarea ese objeto ya pasó a otro estado (se desvinculó antes
+    de procesar la vinculación, p. ej.) no se escribe nada, manda la tarea de
+    la transición posterior. Tampoco vuelve a APTO con una práctica en curso.
+    """
+    estudiante = Estudiante.objects.select_for_update().get(pk=estudiante_id)
+    if estudiante.estado == estado or estudiante.estado in excepto:
+        return
+    if origen is not None:
+        modelo, objeto_id, estado_origen = origen
+        if not apps.get_model('coordinacion', modelo).objects.filter(pk=objeto_id, estado=estado_origen).exists():
+            return
+    if estado == 'APTO' and estudiante.practicas.filter(estado='EN_CURSO').exists():
+        return
+    estudiante.estado = estado
+    estudiante.save(update_fields=['estado', 'fecha_actualizacion'])
+
+
+@tarea('notificar_transicion')
+def notificar_transicion(modelo, objeto_id, estado, coordinador_id=None):
+    """
+    Punto de extensión para notificaciones y documentos de un cambio de
+    estado. Por ahora solo deja constancia en el log.
+    """
+    logger.info(json.dumps({
+        'modelo': modelo, 'id': objeto_id, 'estado': estado, 'coordinador': coordinador_id,
+    }))
+
+
+@tarea('generar_miniaturas')
+def generar_miniaturas(foto):
+    """Miniaturas WebP de una foto de perfil recién subida"""
+    miniaturas.generar(foto, forzar=True)
+
+
+@tarea('afinidad_vacante')
+def afinidad_vacante(vacante_id):
+    """Recalcular las filas del índice de afinidad de una vacante guardada"""
+    afinidad.actualizar_vacante(vacante_id)
+
+
+@tarea('afinidad_estudiante')
+def afinidad_estudiante(estudiante_id):
+    """Recalcular las filas del índice de afinidad de un estudiante guardado"""
+    afinidad.actualizar_estudiante(estudiante_id)
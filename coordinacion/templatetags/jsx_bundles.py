@@ -0,0 +1,125 @@
+"""
+Template tags para servir el JSX de las vistas React
+
+El JSX de cada página se declara dentro de {% jsxbundle "nombre" %}.
+Si el comando `python manage.py build_jsx` ya generó el bundle
+precompilado, el tag emite un <script defer> apuntando al archivo con hash
+servido por staticfiles. Si no existe (entorno de desarrollo sin compilar),
+se emite el bloque <script type="text/babel"> original para que Babel lo
+transpile en el navegador.
+"""
+import json
+
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+# Clave en render_context para saber si la página necesita Babel en el cliente
+NEEDS_BABEL_KEY = 'jsx_bundles_needs_babel'
+
+REACT_DEVELOPMENT = (
+    'https://unpkg.com/react@18/umd/react.development.js',
+    'https://unpkg.com/react-dom@18/umd/react-dom.development.js',
+)
+REACT_PRODUCTION = (
+    'https://unpkg.com/react@18/umd/react.production.min.js',
+    'https://unpkg.com/react-dom@18/umd/react-dom.production.min.js',
+)
+BABEL_STANDALONE = 'https://unpkg.com/@babel/standalone/babel.min.js'
+
+_manifest_cache = {'mtime': None, 'data': {}}
+
+
+def manifest_path():
+    """Ruta del manifest generado por build_jsx"""
+    return settings.JSX_BUNDLES_DIR / 'manifest.json'
+
+
+def load_manifest():
+    """
+    Leer el manifest {nombre: ruta estática} de los bundles compilados.
+    Se recarga solo cuando cambia el archivo en disco.
+    """
+    path = manifest_path()
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        _manifest_cache.update(mtime=None, data={})
+        return {}
+
+    if _manifest_cache['mtime'] != mtime:
+        with open(path, encoding='utf-8') as fh:
+            _manifest_cache.update(mtime=mtime, data=json.load(fh))
+    return _manifest_cache['data']
+
+
+def bundle_url(nombre):
+    """URL estática del bundle compilado, o None si no está disponible"""
+    if not getattr(settings, 'JSX_BUNDLES_ENABLED', True):
+        return None
+    ruta = load_manifest().get(nombre)
+    return static(ruta) if ruta else None
+
+
+class JsxBundleNode(template.Node):
+    """Bloque JSX que se sirve precompilado o, en su defecto, vía Babel"""
+
+    def __init__(self, nombre, nodelist):
+        self.nombre = nombre
+        self.nodelist = nodelist
+
+    def source(self):
+        """Código JSX tal como aparece en la plantilla (debe ir en {% verbatim %})"""
+        return self.nodelist.render(template.Context())
+
+    def render(self, context):
+        url = bundle_url(self.nombre)
+        if url:
+            return format_html('<script defer src="{}"></script>', url)
+
+        context.render_context[NEEDS_BABEL_KEY] = True
+        return mark_safe(
+            '<script type="text/babel">%s</script>' % self.nodelist.render(context)
+        )
+
+
+@register.tag
+def jsxbundle(parser, token):
+    """
+    Uso:
+        {% jsxbundle "empresas_lista" %}{% verbatim %}
+            ... JSX ...
+        {% endverbatim %}{% endjsxbundle %}
+    """
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError("'jsxbundle' requiere exactamente un nombre de bundle")
+
+    nombre = bits[1]
+    if nombre[0] not in ('"', "'") or nombre[0] != nombre[-1]:
+        raise template.TemplateSyntaxError("El nombre del bundle debe ir entre comillas")
+
+    nodelist = parser.parse(('endjsxbundle',))
+    parser.delete_first_token()
+    return JsxBundleNode(nombre[1:-1], nodelist)
+
+
+@register.simple_tag(takes_context=True)
+def react_scripts(context):
+    """
+    Scripts de React para el final de base.html.
+    Solo se cargan React de desarrollo y Babel si algún bloque de la página
+    no tiene bundle compilado; en otro caso basta la build de producción.
+    """
+    if context.render_context.get(NEEDS_BABEL_KEY):
+        scripts = [*REACT_DEVELOPMENT, BABEL_STANDALONE]
+    else:
+        scripts = list(REACT_PRODUCTION)
+
+    return mark_safe('\n    '.join(
+        format_html('<script crossorigin src="{}"></script>', src) for src in scripts
+    ))
@@ -0,0 +1,49 @@
+"""
+Template tags para las fotos de perfil con miniaturas WebP
+
+    {% load miniaturas %}
+    <img {% foto_attrs estudiante_actual.foto_perfil 32 %} alt="..." class="...">
+
+emite src (el derivado más pequeño que cubre el tamaño), srcset con los
+derivados de coordinacion/miniaturas.py y sizes, para que el navegador elija
+según la densidad de la pantalla. Si los derivados aún no se generaron se
+emite solo el src de la foto original.
+"""
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+
+from coordinacion import miniaturas
+
+register = template.Library()
+
+# Clave en render_context: {nombre de la foto: derivados disponibles}
+DISPONIBLES_KEY = 'miniaturas_disponibles'
+
+
+def _disponible(context, nombre):
+    """Comprobar una sola vez por render (la misma foto puede repetirse, p. ej. en el chat)"""
+    cache = context.render_context.setdefault(DISPONIBLES_KEY, {})
+    if nombre not in cache:
+        cache[nombre] = miniaturas.disponible(nombre)
+    return cache[nombre]
+
+
+@register.simple_tag(takes_context=True)
+def foto_attrs(context, foto, tamano):
+    """Atributos src/srcset/sizes de una foto de perfil mostrada a `tamano` px"""
+    if not foto:
+        return ''
+    if not _disponible(context, foto.name):
+        return format_html('src="{}"', foto.url)
+
+    tamano = int(tamano)
+    src = next((t for t in miniaturas.TAMANOS if t >= tamano), miniaturas.TAMANOS[-1])
+    srcset = ', '.join(
+        f'{default_storage.url(miniaturas.nombre_miniatura(foto.name, t))} {t}w'
+        for t in miniaturas.TAMANOS
+    )
+    return format_html(
+        'src="{}" srcset="{}" sizes="{}px"',
+        default_storage.url(miniaturas.nombre_miniatura(foto.name, src)), srcset, tamano,
+    )
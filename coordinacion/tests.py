@@ -1,3 +1,1746 @@
-from django.test import TestCase
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection, connections, transaction
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from config import roles
+from config.basedatos import reintentar_bloqueos
+from config.instrumentacion import PresupuestoConsultasMixin
+
+from . import afinidad, busqueda, cola, cupos, lectura, miniaturas, serializers, sondeo
+from .asignacion import Candidato, Solicitud, proponer
+from .models import (
+    AfinidadVacante, ConversacionChat, Coordinador, CursorLectura, Empresa, Vacante, Estudiante, Postulacion,
+    DocenteAsesor, PracticaEmpresarial, Mensaje, KpiSnapshot, SeguimientoSemanal,
+    Sustentacion, Tarea, TutorEmpresarial, VersionRoles,
+)
+
+
+def crear_coordinador(username='coordinador'):
+    user = User.objects.create_user(username=username, password='test123')
+    return Coordinador.objects.create(
+        user=user, nombre_completo=f'Coordinador {username}', email=f'{username}@example.com'
+    )
+
+
+def crear_estudiante(username='estudiante', programa='Ingeniería de Software', semestre=6):
+    user = User.objects.create_user(username=username, password='test123')
+    return Estudiante.objects.create(
+        user=user,
+        codigo=username.upper(),
+        nombre_completo=f'Estudiante {username}',
+        email=f'{username}@example.com',
+        telefono='3000000000',
+        programa_academico=programa,
+        semestre=semestre,
+    )
+
+
+def crear_empresa(nit='900000001'):
+    return Empresa.objects.create(
+        razon_social=f'Empresa {nit}', nit=nit, direccion='Calle 1', telefono='1',
+        email='empresa@example.com', ciudad='Armenia', representante_nombre='Rep',
+        representante_cargo='Gerente', representante_email='rep@example.com',
+        representante_telefono='1', estado='APROBADA',
+    )
+
+
+def crear_vacantes(empresa, coordinador, cantidad, **extra):
+    datos = {
+        'area_practica': 'Desarrollo', 'descripcion': 'Descripción',
+        'programa_academico': 'Ingeniería de Software', 'semestre_minimo': 5,
+        'horario': 'Diurno', 'estado': 'DISPONIBLE', 'fecha_publicacion': timezone.now(),
+    }
+    datos.update(extra)
+    return Vacante.objects.bulk_create([
+        Vacante(empresa=empresa, creada_por=coordinador, titulo=f'Vacante {i}', **datos)
+        for i in range(cantidad)
+    ])
+
+
+def crear_docente(username='docente'):
+    user = User.objects.create_user(username=username, password='test123')
+    return DocenteAsesor.objects.create(
+        user=user, nombre_completo=f'Docente {username}', email=f'{username}@example.com',
+        telefono='3000000000', especialidad='Software',
+    )
+
+
+def crear_practica(estudiante, empresa, coordinador, docente=None):
+    hoy = timezone.now().date()
+    return PracticaEmpresarial.objects.create(
+        estudiante=estudiante, empresa=empresa, docente_asesor=docente, asignada_por=coordinador,
+        fecha_inicio=hoy, fecha_fin_estimada=hoy + timezone.timedelta(days=180),
+    )
+
+
+class VacantesDisponiblesTests(TestCase):
+    """Vista Estudiante.vacantes_disponibles"""
+
+    def setUp(self):
+        self.coordinador = crear_coordinador()
+        self.estudiante = crear_estudiante()
+        self.empresa = crear_empresa()
+        self.client.force_login(self.estudiante.user)
+
+    def contar_consultas(self, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/estudiante/vacantes/', params or {})
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_numero_de_consultas_constante(self):
+        vacantes = crear_vacantes(self.empresa, self.coordinador, 3)
+        Postulacion.objects.create(
+            vacante=vacantes[0], estudiante=self.estudiante, postulado_por=self.coordinador
+        )
+        pocas = self.contar_consultas()
+
+        crear_vacantes(self.empresa, self.coordinador, 40)
+        muchas = self.contar_consultas()
+
+        self.assertEqual(pocas, muchas)
+
+    def test_elegibilidad_calculada_en_sql(self):
+        postulada, = crear_vacantes(self.empresa, self.coordinador, 1)
+        crear_vacantes(self.empresa, self.coordinador, 1, semestre_minimo=9)
+        crear_vacantes(self.empresa, self.coordinador, 1, programa_academico='Administración de Empresas')
+        Postulacion.objects.create(
+            vacante=postulada, estudiante=self.estudiante, postulado_por=self.coordinador
+        )
+
+        response = self.client.get('/estudiante/vacantes/')
+        vacantes = json.loads(response.context['vacantes'])
+        self.assertEqual(sum(v['ya_postulado'] for v in vacantes), 1)
+        self.assertEqual(sum(v['cumple_requisitos'] for v in vacantes), 1)
+
+        response = self.client.get('/estudiante/vacantes/', {'solo_aptos': '1'})
+        self.assertEqual(json.loads(response.context['pagina'])['total_vacantes'], 1)
+
+    def test_programa_sin_distinguir_mayusculas_acentuadas(self):
+        # LIKE de SQLite solo ignora mayúsculas ASCII: 'Í' no coincide con 'í'
+        Estudiante.objects.filter(pk=self.estudiante.pk).update(programa_academico='INGENIERÍA DE SOFTWARE')
+        crear_vacantes(self.empresa, self.coordinador, 1, programa_academico='Ingeniería de Software')
+
+        response = self.client.get('/estudiante/vacantes/', {'solo_aptos': '1', 'programa': 'mi_programa'})
+        self.assertEqual(json.loads(response.context['pagina'])['total_vacantes'], 1)
+
+
+@override_settings(CHAT_STREAM_TIMEOUT=5, CHAT_STREAM_KEEPALIVE=0.01)
+class ChatStreamTests(TestCase):
+    """Stream SSE del chat estudiante-docente"""
+
+    def setUp(self):
+        self.estudiante = crear_estudiante()
+        self.docente = crear_docente()
+        self.practica = crear_practica(
+            self.estudiante, crear_empresa(), crear_coordinador(), self.docente
+        )
+        self.client.force_login(self.estudiante.user)
+
+    def abrir_stream(self, params=None):
+        response = self.client.get('/estudiante/chat/stream/', params or {})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.addCleanup(response.close)
+        eventos = (chunk.decode('utf-8') for chunk in response.streaming_content)
+        self.assertTrue(next(eventos).startswith('retry:'))
+        return eventos
+
+    def enviar_como_docente(self, contenido):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Mensaje.objects.create(
+                practica=self.practica, remitente=self.docente.user, contenido=contenido
+            )
+
+    def test_envia_pendientes_al_conectar(self):
+        anterior = self.enviar_como_docente('Hola')
+        nuevo = self.enviar_como_docente('¿Cómo vas?')
+
+        eventos = self.abrir_stream({'ultimo_id': anterior.id})
+        evento = next(eventos)
+
+        self.assertIn(f'id: {nuevo.id}\n', evento)
+        self.assertNotIn(f'id: {anterior.id}\n', evento)
+        self.assertIn('"es_mio": false', evento)
+
+    def test_pestana_inactiva_no_consulta_la_base_de_datos(self):
+        eventos = self.abrir_stream()
+        self.assertEqual(next(eventos), ': keepalive\n\n')
+
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(5):
+                self.assertEqual(next(eventos), ': keepalive\n\n')
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_mensaje_publicado_llega_al_stream(self):
+        eventos = self.abrir_stream()
+        next(eventos)
+
+        mensaje = self.enviar_como_docente('Revisé tu informe')
+        evento = next(eventos)
+
+        self.assertIn('event: mensaje\n', evento)
+        datos = json.loads(evento.split('data: ', 1)[1])
+        self.assertEqual(datos['id'], mensaje.id)
+        self.assertEqual(datos['contenido'], 'Revisé tu informe')
+        self.assertEqual(
+            CursorLectura.objects.get(practica=self.practica, usuario=self.estudiante.user).ultimo_leido_id,
+            mensaje.id,
+        )
+
+
+class SondeoChatTests(TestCase):
+    """Sondeo adaptativo del chat: next_poll_ms, ETag y respuestas sin consultar Mensaje (sondeo.py)"""
+
+    def setUp(self):
+        self.estudiante = crear_estudiante()
+        self.docente = crear_docente()
+        self.practica = crear_practica(
+            self.estudiante, crear_empresa(), crear_coordinador(), self.docente
+        )
+        self.client.force_login(self.estudiante.user)
+
+    def sondear(self, **params):
+        headers = {'If-None-Match': params.pop('etag')} if 'etag' in params else {}
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/estudiante/chat/mensajes/', params, headers=headers)
+        consulto_mensajes = any('coordinacion_mensaje' in q['sql'] for q in ctx.captured_queries)
+        return response, consulto_mensajes
+
+    def test_sin_novedades_no_consulta_mensajes(self):
+        response, consulto = self.sondear(ultimo_id=0)
+        self.assertEqual(response.json(), {'mensajes': [], 'next_poll_ms': 30000})
+        self.assertFalse(consulto)
+
+        mensaje = Mensaje.objects.create(practica=self.practica, remitente=self.docente.user, contenido='Hola')
+        self.assertEqual(self.practica.conversacion.ultimo_mensaje_id, mensaje.id)
+
+        response, consulto = self.sondear(ultimo_id=0)
+        self.assertEqual([m['id'] for m in response.json()['mensajes']], [mensaje.id])
+        self.assertEqual(response.json()['next_poll_ms'], 2000)  # conversación activa
+        self.assertTrue(consulto)
+
+        response, consulto = self.sondear(ultimo_id=mensaje.id, visible=0)
+        self.assertEqual(response.json(), {'mensajes': [], 'next_poll_ms': 60000})
+        self.assertFalse(consulto)
+
+        # Inactiva: el último mensaje es de hace dos horas
+        ConversacionChat.objects.update(fecha_ultimo_mensaje=timezone.now() - timezone.timedelta(hours=2))
+        self.assertEqual(self.sondear(ultimo_id=mensaje.id)[0]['X-Next-Poll-Ms'], '30000')
+
+    def test_etag_responde_304_hasta_el_siguiente_mensaje(self):
+        Mensaje.objects.create(practica=self.practica, remitente=self.docente.user, contenido='Hola')
+        etag = self.sondear(ultimo_id=0)[0]['ETag']
+
+        response, consulto = self.sondear(ultimo_id=0, etag=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(consulto)
+
+        nuevo = Mensaje.objects.create(practica=self.practica, remitente=self.docente.user, contenido='¿Y?')
+        response, _ = self.sondear(ultimo_id=nuevo.id - 1, etag=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([m['id'] for m in response.json()['mensajes']], [nuevo.id])
+        self.assertNotEqual(response['ETag'], etag)
+
+        # Mismo camino en el endpoint del docente
+        self.client.force_login(self.docente.user)
+        response = self.client.get('/docente/chat/mensajes/', {'practica_id': self.practica.id, 'ultimo_id': nuevo.id},
+                                   headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+
+class BandejaDocenteTests(TestCase):
+    """Bandeja del docente: no leídos y último mensaje de todas sus conversaciones (sondeo.bandeja)"""
+
+    def setUp(self):
+        self.docente = crear_docente()
+        coordinador, empresa = crear_coordinador(), crear_empresa()
+        self.practicas = [
+            crear_practica(crear_estudiante(f'estudiante{i}'), empresa, coordinador, self.docente)
+            for i in range(3)
+        ]
+        self.client.force_login(self.docente.user)
+
+    def escribir(self, practica, contenido, remitente=None):
+        return Mensaje.objects.create(
+            practica=practica, remitente=remitente or practica.estudiante.user, contenido=contenido
+        )
+
+    def test_resume_todas_las_conversaciones_con_consultas_constantes(self):
+        primera, segunda, tercera = self.practicas
+        self.escribir(primera, 'Hola profe')
+        ultimo = self.escribir(primera, 'Adjunto el informe semanal ' * 10)
+        respuesta = self.escribir(segunda, 'Revisado', remitente=self.docente.user)
+
+        with self.assertNumQueries(6):  # sesión, usuario, docente, prácticas, agregado, últimos
+            data = self.client.get('/docente/chat/bandeja/').json()
+
+        conversaciones = {c['practica_id']: c for c in data['conversaciones']}
+        self.assertEqual([c['practica_id'] for c in data['conversaciones']], [segunda.id, primera.id, tercera.id])
+        self.assertEqual(conversaciones[primera.id]['no_leidos'], 2)
+        self.assertEqual(conversaciones[primera.id]['ultimo_id'], ultimo.id)
+        self.assertEqual(len(conversaciones[primera.id]['vista_previa']), sondeo.VISTA_PREVIA)
+        self.assertEqual(conversaciones[segunda.id]['no_leidos'], 0)
+        self.assertTrue(conversaciones[segunda.id]['ultimo_es_mio'])
+        self.assertEqual(conversaciones[segunda.id]['ultimo_id'], respuesta.id)
+        self.assertEqual(conversaciones[tercera.id]['ultimo_id'], 0)
+        self.assertEqual(data['total_no_leidos'], 2)
+        self.assertEqual(data['next_poll_ms'], 2000)
+
+        # Con más conversaciones y mensajes el número de consultas no cambia
+        for practica in self.practicas:
+            self.escribir(practica, 'Otro mensaje')
+        with self.assertNumQueries(6):
+            self.client.get('/docente/chat/bandeja/')
+
+    def test_listas_muestran_no_leidos_por_estudiante(self):
+        primera = self.practicas[0]
+        self.escribir(primera, 'Hola profe')
+        self.escribir(primera, '¿Me revisa el plan?')
+
+        for url, clave in (('/docente/dashboard/', 'practicas_activas'), ('/docente/mis-estudiantes/', 'practicas')):
+            response = self.client.get(url)
+            no_leidos = {practica.id: practica.no_leidos for practica in response.context[clave]}
+            self.assertEqual(no_leidos[primera.id], 2)
+            self.assertEqual(no_leidos[self.practicas[1].id], 0)
+            self.assertContains(response, f'data-no-leidos="{primera.id}"')
+
+        # Leer la conversación limpia el contador
+        self.client.get('/docente/chat/mensajes/', {'practica_id': primera.id, 'ultimo_id': 0})
+        self.assertEqual(sondeo.bandeja(self.docente)[0]['no_leidos'], 0)
+
+
+class CursorLecturaTests(TestCase):
+    """Lo leído del chat como cursor por participante (lectura.py), sin UPDATE sobre Mensaje"""
+
+    def setUp(self):
+        self.estudiante = crear_estudiante()
+        self.docente = crear_docente()
+        self.practica = crear_practica(
+            self.estudiante, crear_empresa(), crear_coordinador(), self.docente
+        )
+        self.client.force_login(self.estudiante.user)
+
+    def sondear(self, ultimo_id):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/estudiante/chat/mensajes/', {'ultimo_id': ultimo_id})
+        escrituras = [q['sql'] for q in ctx.captured_queries
+                      if q['sql'].startswith(('UPDATE', 'INSERT')) and 'django_session' not in q['sql']]
+        return response.json()['mensajes'], escrituras
+
+    def test_leer_solo_avanza_el_cursor(self):
+        primero = Mensaje.objects.create(practica=self.practica, remitente=self.docente.user, contenido='Hola')
+        segundo = Mensaje.objects.create(practica=self.practica, remitente=self.docente.user, contenido='¿Vas bien?')
+        self.assertEqual(lectura.no_leidos(self.practica.id, self.estudiante.user_id), 2)
+
+        mensajes, escrituras = self.sondear(0)
+        self.assertEqual([m['id'] for m in mensajes], [primero.id, segundo.id])
+        # La primera lectura crea el cursor; nada toca coordinacion_mensaje
+        self.assertTrue(any(sql.startswith('INSERT') for sql in escrituras))
+        self.assertTrue(all('coordinacion_cursorlectura' in sql for sql in escrituras))
+        self.assertEqual(lectura.no_leidos(self.practica.id, self.estudiante.user_id), 0)
+
+        # Sin novedades no se escribe nada; con novedades, un solo UPDATE del cursor
+        self.assertEqual(self.sondear(segundo.id), ([], []))
+        tercero = Mensaje.objects.create(practica=self.practica, remitente=self.docente.user, contenido='Avísame')
+        mensajes, escrituras = self.sondear(segundo.id)
+        self.assertEqual([m['id'] for m in mensajes], [tercero.id])
+        self.assertEqual(len(escrituras), 1)
+
+        # Nunca retrocede (otra pestaña con un ultimo_id viejo)
+        lectura.avanzar(self.practica.id, self.estudiante.user_id, primero.id)
+        self.assertEqual(CursorLectura.objects.get().ultimo_leido_id, tercero.id)
+
+    def test_doble_check_cuando_el_otro_participante_lee(self):
+        mensaje = Mensaje.objects.create(practica=self.practica, remitente=self.docente.user, contenido='Hola')
+        self.client.force_login(self.docente.user)
+        url = '/docente/chat/mensajes/'
+        datos = self.client.get(url, {'practica_id': self.practica.id, 'ultimo_id': 0}).json()['mensajes']
+        self.assertFalse(datos[0]['leido'])
+        self.assertEqual(list(lectura.anotar_no_leidos(
+            PracticaEmpresarial.objects.all(), self.estudiante.user_id
+        ).values_list('no_leidos', flat=True)), [1])
+
+        self.client.force_login(self.estudiante.user)
+        response = self.client.get('/estudiante/chat/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(lectura.no_leidos(self.practica.id, self.estudiante.user_id), 0)
+
+        self.client.force_login(self.docente.user)
+        datos = self.client.get(url, {'practica_id': self.practica.id, 'ultimo_id': 0}).json()['mensajes']
+        self.assertEqual([(m['id'], m['es_mio'], m['leido']) for m in datos], [(mensaje.id, True, True)])
+
+
+class HistorialChatTests(TestCase):
+    """Historial del chat por páginas, del más nuevo al más viejo por id (sondeo.historial)"""
+
+    def setUp(self):
+        self.estudiante = crear_estudiante()
+        self.docente = crear_docente()
+        self.practica = crear_practica(
+            self.estudiante, crear_empresa(), crear_coordinador(), self.docente
+        )
+        usuarios = (self.estudiante.user, self.docente.user)
+        Mensaje.objects.bulk_create([
+            Mensaje(practica=self.practica, remitente=usuarios[i % 2], contenido=f'Mensaje {i}')
+            for i in range(120)
+        ])
+        sondeo.reconstruir()
+        self.ids = list(Mensaje.objects.order_by('id').values_list('id', flat=True))
+        self.client.force_login(self.estudiante.user)
+
+    def test_la_vista_del_chat_carga_solo_la_pagina_mas_reciente(self):
+        response = self.client.get('/estudiante/chat/')
+        mensajes = response.context['mensajes']
+        self.assertEqual([m.id for m in mensajes], self.ids[-sondeo.MENSAJES_POR_PAGINA:])
+        self.assertEqual(response.context['ultimo_mensaje_id'], self.ids[-1])
+        self.assertTrue(response.context['hay_anteriores'])
+        self.assertContains(response, 'cargarAnterioresBtn')
+
+        # Sin ultimo_id, obtener_mensajes también devuelve solo la página más reciente
+        self.client.force_login(self.docente.user)
+        datos = self.client.get('/docente/chat/mensajes/', {'practica_id': self.practica.id}).json()
+        self.assertEqual([m['id'] for m in datos['mensajes']], self.ids[-sondeo.MENSAJES_POR_PAGINA:])
+        self.assertTrue(datos['hay_anteriores'])
+
+    def test_before_id_recorre_el_historial_hacia_atras(self):
+        paginas, antes_id = [], self.ids[-1] + 1
+        while True:
+            with self.assertNumQueries(5):  # sesión, usuario, estudiante, práctica, página
+                datos = self.client.get('/estudiante/chat/mensajes/', {'before_id': antes_id}).json()
+            ids = [m['id'] for m in datos['mensajes']]
+            self.assertEqual(ids, sorted(ids))
+            paginas.append(ids)
+            if not datos['hay_anteriores']:
+                break
+            antes_id = ids[0]
+
+        self.assertEqual([len(ids) for ids in paginas], [50, 50, 20])
+        self.assertEqual(sorted(i for ids in paginas for i in ids), self.ids)
+        # Cargar páginas anteriores no mueve el cursor de lectura
+        self.assertFalse(CursorLectura.objects.filter(usuario=self.estudiante.user).exists())
+
+
+class KpiSnapshotTests(TestCase):
+    """Contadores materializados de los dashboards de coordinación"""
+
+    def setUp(self):
+        self.coordinador = crear_coordinador()
+        self.empresa = crear_empresa()
+        self.estudiante = crear_estudiante()
+        self.vacante = Vacante.objects.create(
+            empresa=self.empresa, creada_por=self.coordinador, titulo='Vacante',
+            area_practica='Desarrollo', descripcion='Descripción',
+            programa_academico='Ingeniería de Software', semestre_minimo=5, horario='Diurno',
+        )
+        KpiSnapshot.reconstruir()
+
+    def assertSnapshotConsistente(self):
+        self.assertEqual(KpiSnapshot.obtener().diferencias(), {})
+
+    def test_senales_mantienen_los_contadores(self):
+        postulacion = Postulacion.objects.create(
+            vacante=self.vacante, estudiante=self.estudiante, postulado_por=self.coordinador
+        )
+        self.assertEqual(KpiSnapshot.obtener().postulaciones_pendientes, 1)
+
+        postulacion.estado = 'SELECCIONADO'
+        postulacion.save()
+        self.vacante.estado = 'OCUPADA'
+        self.vacante.save()
+        crear_practica(self.estudiante, self.empresa, self.coordinador)
+
+        # Estado cargado diferido: la señal consulta el valor anterior
+        estudiante = Estudiante.objects.only('id').get(pk=self.estudiante.pk)
+        estudiante.estado = 'EN_PRACTICA'
+        estudiante.save()
+        self.assertSnapshotConsistente()
+
+        otra = crear_empresa('900000002')
+        otra.estado = 'RECHAZADA'
+        otra.save()
+        self.empresa.delete()
+        self.assertSnapshotConsistente()
+
+    def test_ranking_de_empresas_se_recalcula(self):
+        crear_practica(self.estudiante, self.empresa, self.coordinador)
+
+        top = KpiSnapshot.obtener().empresas_top
+        self.assertEqual(top[0]['id'], self.empresa.id)
+        self.assertEqual(top[0]['num_practicas'], 1)
+
+    def test_dashboards_no_cuentan_en_cada_carga(self):
+        self.client.force_login(self.coordinador.user)
+        for url in ('/coordinacion/dashboard/', '/coordinacion/reportes/'):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            consultas = ' '.join(q['sql'] for q in ctx.captured_queries)
+            self.assertNotIn('COUNT(', consultas.upper())
+
+    def test_check_detecta_cambios_sin_senales(self):
+        call_command('rebuild_kpis', '--check', stdout=StringIO())
+
+        crear_vacantes(self.empresa, self.coordinador, 3)  # bulk_create no dispara señales
+        with self.assertRaises(CommandError):
+            call_command('rebuild_kpis', '--check', stdout=StringIO())
+
+        call_command('rebuild_kpis', stdout=StringIO())
+        self.assertSnapshotConsistente()
+
+
+class DocentesAsesoresListaTests(TestCase):
+    """Vista coordinacion.docentes_asesores_lista"""
+
+    def setUp(self):
+        self.coordinador = crear_coordinador()
+        self.empresa = crear_empresa()
+        self.client.force_login(self.coordinador.user)
+
+    def crear_docentes(self, cantidad, inicio=0):
+        return [
+            DocenteAsesor.objects.create(
+                user=User.objects.create(username=f'docente{i}'),
+                nombre_completo=f'Docente {i:03d}', email=f'docente{i}@example.com',
+                telefono='1', especialidad='Software',
+            )
+            for i in range(inicio, inicio + cantidad)
+        ]
+
+    def asignar(self, docente, practicas, seguimientos_pendientes=0):
+        for _ in range(practicas):
+            n = Estudiante.objects.count()
+            estudiante = Estudiante.objects.create(
+                user=User.objects.create(username=f'estudiante{n}'),
+                codigo=f'E{n}', nombre_completo='Estudiante', email='e@example.com',
+                telefono='1', programa_academico='Ingeniería de Software', semestre=8,
+            )
+            practica = crear_practica(estudiante, self.empresa, self.coordinador, docente)
+            hoy = timezone.now().date()
+            for semana in range(seguimientos_pendientes):
+                SeguimientoSemanal.objects.create(
+                    practica=practica, semana_numero=semana + 1, fecha_inicio=hoy,
+                    fecha_fin=hoy, actividades_realizadas='Actividades',
+                )
+
+    def contar_consultas(self, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/coordinacion/docentes-asesores/', params or {})
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_numero_de_consultas_constante(self):
+        for docente in self.crear_docentes(2):
+            self.asignar(docente, 1, seguimientos_pendientes=1)
+        pocos = self.contar_consultas()
+
+        for docente in self.crear_docentes(15, inicio=2):
+            self.asignar(docente, 2, seguimientos_pendientes=1)
+        muchos = self.contar_consultas()
+
+        self.assertEqual(pocos, muchos)
+
+    def test_contadores_y_orden_por_carga(self):
+        libre, ocupado = self.crear_docentes(2)
+        self.asignar(ocupado, 2, seguimientos_pendientes=3)
+        PracticaEmpresarial.objects.filter(docente_asesor=ocupado).update(estado='FINALIZADA')
+        self.asignar(ocupado, 1)
+
+        response = self.client.get('/coordinacion/docentes-asesores/', {'orden': 'carga'})
+        primero = response.context['docentes'][0]
+
+        self.assertEqual(primero.id, ocupado.id)
+        self.assertEqual(primero.practicas_activas, 1)
+        self.assertEqual(primero.seguimientos_pendientes, 6)
+        self.assertEqual(primero.carga, 10)
+
+
+class AsignacionDocentesTests(TestCase):
+    """Asignación automática de docentes asesores (coordinacion.asignacion)"""
+
+    def test_prefiere_especialidad_sin_disparar_la_carga(self):
+        propuesta = proponer(
+            [Solicitud(i, 'Desarrollo de Software') for i in range(4)],
+            [Candidato(1, 'Ingeniería de Software', 0), Candidato(2, 'Contabilidad', 0)],
+            tolerancia=2,
+        )
+
+        self.assertEqual(propuesta.cargas, {1: 3, 2: 1})
+        self.assertEqual(propuesta.afines, {0, 1, 2})
+        self.assertEqual(propuesta.asignaciones[3], 2)
+
+    def test_reparte_por_menor_carga(self):
+        propuesta = proponer(
+            [Solicitud(i, 'Logística') for i in range(6)],
+            [Candidato(1, 'Redes', 4), Candidato(2, 'Bases de Datos', 0), Candidato(3, 'Software', 1)],
+        )
+
+        self.assertEqual(propuesta.carga_maxima, 4)
+        self.assertEqual(propuesta.cargas, {1: 4, 2: 4, 3: 3})
+
+    def test_vista_previa_y_aplicar(self):
+        coordinador = crear_coordinador()
+        estudiante = crear_estudiante()
+        vacante, = crear_vacantes(crear_empresa(), coordinador, 1, area_practica='Desarrollo de Software')
+        postulacion = Postulacion.objects.create(
+            vacante=vacante, estudiante=estudiante, postulado_por=coordinador, estado='VINCULADO'
+        )
+        crear_docente('contador')
+        docente = crear_docente('ingeniero')
+        DocenteAsesor.objects.filter(pk=docente.pk).update(especialidad='Desarrollo de Software')
+        DocenteAsesor.objects.exclude(pk=docente.pk).update(especialidad='Contabilidad')
+        self.client.force_login(coordinador.user)
+
+        response = self.client.get('/coordinacion/practicas/asignacion-automatica/')
+        self.assertContains(response, docente.nombre_completo)
+        response = self.client.get(f'/coordinacion/postulaciones/{postulacion.id}/crear-practica/')
+        self.assertEqual(response.context['docente_sugerido'], docente)
+        self.assertFalse(PracticaEmpresarial.objects.exists())
+
+        self.client.post('/coordinacion/practicas/asignacion-automatica/', {'fecha_inicio': '2026-02-02'})
+        practica = PracticaEmpresarial.objects.get()
+        self.assertEqual(practica.docente_asesor_id, docente.id)
+        self.assertEqual(practica.estado, 'EN_CURSO')
+
+        response = self.client.get('/coordinacion/practicas/asignacion-automatica/')
+        self.assertContains(response, 'No hay postulaciones vinculadas pendientes')
+
+
+class PostulacionesLoteTests(TestCase):
+    """Creación masiva de postulaciones (coordinacion.postulaciones_lote)"""
+
+    def setUp(self):
+        self.coordinador = crear_coordinador()
+        self.estudiante = crear_estudiante()
+        self.vacantes = crear_vacantes(crear_empresa(), self.coordinador, 5)
+        KpiSnapshot.reconstruir()
+        self.client.force_login(self.coordinador.user)
+
+    def enviar(self, filas, **extra):
+        return self.client.post(
+            '/coordinacion/api/postulaciones/lote/',
+            json.dumps({'postulaciones': filas, **extra}),
+            content_type='application/json',
+        )
+
+    def crear_estudiantes(self, cantidad):
+        """Estudiantes sin contraseña (bulk_create) para lotes grandes"""
+        inicio = Estudiante.objects.count()
+        usuarios = User.objects.bulk_create([
+            User(username=f'lote{inicio + i}') for i in range(cantidad)
+        ])
+        return Estudiante.objects.bulk_create([
+            Estudiante(
+                user=usuario, codigo=usuario.username.upper(), nombre_completo=usuario.username,
+                email=f'{usuario.username}@example.com', telefono='3000000000',
+                programa_academico='Ingeniería de Software', semestre=6,
+            )
+            for usuario in usuarios
+        ])
+
+    def test_reporte_por_fila(self):
+        llena = self.vacantes[1]
+        llena.cupos_ocupados = llena.cantidad_cupos
+        llena.save()
+        primiparo = crear_estudiante('primiparo', semestre=2)
+        vacante = self.vacantes[0]
+
+        response = self.enviar([
+            {'vacante': vacante.id, 'estudiante': self.estudiante.codigo, 'observaciones': 'Buen perfil'},
+            {'vacante': vacante.id, 'estudiante': self.estudiante.codigo},
+            {'vacante': llena.id, 'estudiante': self.estudiante.codigo},
+            {'vacante': vacante.id, 'estudiante': primiparo.codigo},
+            {'vacante': 999999, 'estudiante': self.estudiante.codigo},
+            {'vacante': vacante.id, 'estudiante': 'NO-EXISTE'},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        datos = response.json()
+        self.assertEqual(datos['resumen'], {'total': 6, 'aceptadas': 1, 'rechazadas': 5, 'creadas': 1})
+        self.assertEqual([f['aceptada'] for f in datos['filas']], [True] + [False] * 5)
+        self.assertIn('ya está postulado', datos['filas'][1]['errores'][0])
+        self.assertIn('cupos disponibles', datos['filas'][2]['errores'][0])
+        self.assertIn('semestre mínimo', datos['filas'][3]['errores'][0])
+
+        postulacion = Postulacion.objects.get()
+        self.assertEqual(datos['filas'][0]['postulacion_id'], postulacion.id)
+        self.assertEqual(postulacion.estado, 'SELECCIONADO')
+        self.assertEqual(postulacion.observaciones, 'Buen perfil')
+        self.assertEqual(KpiSnapshot.obtener().diferencias(), {})
+
+    def test_maximo_de_activas_cuenta_filas_del_mismo_lote(self):
+        filas = [{'vacante': v.id, 'estudiante': self.estudiante.codigo} for v in self.vacantes]
+
+        datos = self.enviar(filas, solo_validar=True).json()
+        self.assertEqual([f['aceptada'] for f in datos['filas']], [True, True, True, False, False])
+        self.assertFalse(Postulacion.objects.exists())
+
+        datos = self.enviar(filas).json()
+        self.assertEqual(datos['resumen']['creadas'], 3)
+        self.assertIn('Máximo permitido: 3', datos['filas'][3]['errores'][0])
+
+    def test_numero_de_consultas_constante(self):
+        def contar(estudiantes):
+            filas = [
+                {'vacante': self.vacantes[i % 5].id, 'estudiante': e.codigo}
+                for i, e in enumerate(estudiantes)
+            ]
+            with CaptureQueriesContext(connection) as ctx:
+                datos = self.enviar(filas).json()
+            self.assertEqual(datos['resumen']['creadas'], len(filas))
+            return len(ctx.captured_queries)
+
+        Vacante.objects.update(cantidad_cupos=1000)
+        self.assertEqual(contar(self.crear_estudiantes(3)), contar(self.crear_estudiantes(60)))
+
+    def test_carga_csv(self):
+        archivo = SimpleUploadedFile('postulaciones.csv', (
+            'vacante;estudiante;observaciones\n'
+            f'{self.vacantes[0].id};{self.estudiante.codigo};Desde CSV\n'
+            f'{self.vacantes[0].id};NO-EXISTE;\n'
+        ).encode('utf-8'))
+
+        response = self.client.post('/coordinacion/postulaciones/carga-masiva/', {'archivo': archivo})
+
+        self.assertContains(response, '1 postulaciones creadas')
+        self.assertContains(response, 'no existe o no está apto')
+        self.assertEqual(Postulacion.objects.get().observaciones, 'Desde CSV')
+
+        archivo = SimpleUploadedFile('otro.csv', b'id,codigo\n1,X\n')
+        response = self.client.post('/coordinacion/postulaciones/carga-masiva/', {'archivo': archivo})
+        self.assertContains(response, 'columnas')
+
+
+class ListasPaginadasTests(TestCase):
+    """Paginación por cursor de los listados de coordinación (listas.py)"""
+
+    def setUp(self):
+        self.coordinador = crear_coordinador()
+        self.empresa = crear_empresa()
+        self.client.force_login(self.coordinador.user)
+
+    def api(self, nombre, **params):
+        response = self.client.get(f'/coordinacion/api/listas/{nombre}/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_recorre_todas_las_filas_sin_repetir(self):
+        vacantes = crear_vacantes(self.empresa, self.coordinador, 7)
+        # Misma fecha para todas: el desempate por id mantiene el orden estable
+        Vacante.objects.update(fecha_creacion=timezone.now())
+
+        ids, cursor = [], ''
+        while True:
+            datos = self.api('vacantes', por_pagina=3, cursor=cursor)
+            ids += [v['id'] for v in datos['resultados']]
+            cursor = datos['siguiente']
+            if not cursor:
+                break
+
+        self.assertEqual(ids, sorted((v.id for v in vacantes), reverse=True))
+
+    def test_filtros_en_el_servidor(self):
+        crear_vacantes(self.empresa, self.coordinador, 4)
+        crear_vacantes(self.empresa, self.coordinador, 2, estado='CERRADA', area_practica='Otra')
+        Vacante.objects.filter(estado='CERRADA').update(titulo='Analista de datos')
+        # bulk_create() y update() no pasan por las señales del índice de búsqueda
+        busqueda.reconstruir()
+
+        datos = self.api('vacantes', estado='CERRADA', buscar='analista', por_pagina=1)
+        self.assertEqual(len(datos['resultados']), 1)
+        datos = self.api('vacantes', estado='CERRADA', buscar='analista', cursor=datos['siguiente'])
+        self.assertEqual([v['estado'] for v in datos['resultados']], ['CERRADA'])
+        self.assertIsNone(datos['siguiente'])
+
+        response = self.client.get('/coordinacion/vacantes/', {'estado': 'CERRADA'})
+        inicial = json.loads(response.context['vacantes'])
+        self.assertEqual(len(inicial['resultados']), 2)
+        self.assertEqual(inicial['filtros'], {'estado': 'CERRADA', 'buscar': ''})
+        self.assertEqual(inicial['conteos'], {'total': 6, 'DISPONIBLE': 4, 'CERRADA': 2})
+
+    def test_numero_de_consultas_constante(self):
+        def contar(url):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            return len(ctx.captured_queries)
+
+        estudiante = crear_estudiante()
+        for vacante in crear_vacantes(self.empresa, self.coordinador, 3):
+            Postulacion.objects.create(vacante=vacante, estudiante=estudiante, postulado_por=self.coordinador)
+        pocas = contar('/coordinacion/postulaciones/')
+
+        vacantes = crear_vacantes(self.empresa, self.coordinador, 120)
+        Postulacion.objects.bulk_create([
+            Postulacion(vacante=v, estudiante=estudiante, postulado_por=self.coordinador) for v in vacantes
+        ])
+        self.assertEqual(pocas, contar('/coordinacion/postulaciones/'))
+
+        siguiente = self.api('postulaciones')['siguiente']
+        with CaptureQueriesContext(connection) as ctx:
+            datos = self.api('postulaciones', cursor=siguiente)
+        self.assertEqual(len(datos['resultados']), 50)
+        # sesión, usuario, coordinador y la página (con select_related)
+        self.assertLessEqual(len(ctx.captured_queries), 4)
+
+    def test_listados_y_errores(self):
+        for nombre in ('empresas', 'vacantes', 'estudiantes', 'postulaciones',
+                       'practicas', 'tutores', 'sustentaciones'):
+            self.assertEqual(self.client.get(f'/coordinacion/{nombre}/').status_code, 200)
+            self.api(nombre)
+
+        response = self.client.get('/coordinacion/api/listas/vacantes/', {'cursor': 'no-es-un-cursor'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/coordinacion/api/listas/usuarios/')
+        self.assertEqual(response.status_code, 404)
+
+
+class IndicesConsultasFrecuentesTests(TestCase):
+    """Las consultas más frecuentes de las vistas usan un índice (EXPLAIN)"""
+
+    def consultas(self):
+        from .listas import LISTAS
+
+        return [
+            (LISTAS['empresas'].queryset({'estado': 'APROBADA'}), 'empresa_estado_fecha_idx'),
+            (Vacante.objects.filter(estado='DISPONIBLE'), 'vacante_estado_fecha_idx'),
+            (Estudiante.objects.filter(estado='APTO'), 'estudiante_estado_nombre_idx'),
+            (LISTAS['postulaciones'].queryset({'estado': 'SELECCIONADO'}), 'postulacion_estado_fecha_idx'),
+            (Postulacion.objects.filter(estudiante_id=1, estado__in=['POSTULADO', 'SELECCIONADO']),
+             'postulacion_estud_estado_idx'),
+            (LISTAS['practicas'].queryset({'estado': 'FINALIZADA'}), 'practica_estado_fecha_idx'),
+            (PracticaEmpresarial.objects.filter(estudiante_id=1, estado='EN_CURSO'), 'practica_estud_estado_idx'),
+            (PracticaEmpresarial.objects.filter(docente_asesor_id=1, estado='EN_CURSO'),
+             'practica_docente_estado_idx'),
+            (SeguimientoSemanal.objects.filter(practica__docente_asesor_id=1, estado='PENDIENTE')
+             .order_by('-fecha_registro'), 'seguimiento_prac_estado_idx'),
+            (LISTAS['sustentaciones'].queryset({'estado': 'PROGRAMADA'}), 'sustentacion_estado_fecha_idx'),
+            (Mensaje.objects.filter(practica_id=1).order_by('fecha_envio'), 'mensaje_practica_fecha_idx'),
+            (Mensaje.objects.filter(practica_id=1, id__gt=10).order_by(), 'mensaje_practica_id_idx'),
+        ]
+
+    def test_cada_consulta_usa_su_indice(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Los planes esperados corresponden a SQLite')
+
+        for queryset, indice in self.consultas():
+            with self.subTest(indice=indice):
+                plan = queryset.explain()
+                self.assertIn(f'INDEX {indice} ', plan)
+                self.assertNotRegex(plan, r'\bSCAN coordinacion_')
+
+
+class InstrumentacionTests(PresupuestoConsultasMixin, TestCase):
+    """Middleware de instrumentación y presupuestos por vista (config/instrumentacion.py)"""
+
+    def setUp(self):
+        self.coordinador = crear_coordinador()
+        self.empresa = crear_empresa()
+        self.client.force_login(self.coordinador.user)
+
+    def test_server_timing_y_conteo_de_consultas(self):
+        crear_vacantes(self.empresa, self.coordinador, 3)
+
+        with CaptureQueriesContext(connection) as ctx, self.assertLogs('config.instrumentacion', 'INFO') as logs:
+            response = self.client.get('/coordinacion/vacantes/')
+
+        medicion = response.wsgi_request.medicion
+        self.assertEqual(medicion.vista, 'coordinacion:vacantes_lista')
+        self.assertEqual(medicion.consultas, len(ctx.captured_queries))
+        self.assertGreater(medicion.plantillas_ms, 0)
+        self.assertRegex(
+            response['Server-Timing'],
+            rf'^db;dur=[\d.]+;desc="{medicion.consultas} consultas", tpl;dur=[\d.]+, total;dur=[\d.]+$'
+        )
+
+        registro = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(registro['vista'], 'coordinacion:vacantes_lista')
+        self.assertEqual(registro['consultas'], medicion.consultas)
+        self.assertEqual(registro['estado'], 200)
+
+    def test_listados_dentro_del_presupuesto(self):
+        estudiante = crear_estudiante()
+        for vacante in crear_vacantes(self.empresa, self.coordinador, 60):
+            Postulacion.objects.create(vacante=vacante, estudiante=estudiante, postulado_por=self.coordinador)
+
+        for nombre in ('empresas', 'vacantes', 'estudiantes', 'postulaciones',
+                       'practicas', 'tutores', 'sustentaciones'):
+            with self.subTest(lista=nombre):
+                self.assertDentroDelPresupuesto(self.client.get(f'/coordinacion/{nombre}/'))
+                self.assertDentroDelPresupuesto(self.client.get(f'/coordinacion/api/listas/{nombre}/'))
+
+    @override_settings(PRESUPUESTOS_VISTAS={'coordinacion:vacantes_lista': {'consultas': 1}})
+    def test_presupuesto_excedido(self):
+        with self.assertLogs('config.instrumentacion', 'WARNING') as logs:
+            response = self.client.get('/coordinacion/vacantes/')
+
+        self.assertEqual(json.loads(logs.records[-1].getMessage())['excede'], {'consultas': 1})
+        with self.assertRaisesMessage(AssertionError, 'presupuesto: 1'):
+            self.assertDentroDelPresupuesto(response)
+
+    def test_carpeta_del_log_se_crea_con_el_primer_registro(self):
+        from config.instrumentacion import ArchivoRotativo
+        with tempfile.TemporaryDirectory() as directorio:
+            carpeta = os.path.join(directorio, 'logs')
+            handler = ArchivoRotativo(os.path.join(carpeta, 'rendimiento.log'))
+            self.assertFalse(os.path.exists(carpeta))
+
+            handler.emit(logging.makeLogRecord({'msg': 'primera'}))
+            handler.close()
+            self.assertTrue(os.path.isfile(os.path.join(carpeta, 'rendimiento.log')))
+
+
+class SerializadoresTests(TestCase):
+    """Registro de serializadores: preparar(), caché por objeto y to_json"""
+
+    def setUp(self):
+        caches['serializadores'].clear()
+        self.coordinador = crear_coordinador()
+        self.empresa = crear_empresa()
+        docente = crear_docente()
+        vacante = crear_vacantes(self.empresa, self.coordinador, 1)[0]
+        for i in range(3):
+            estudiante = crear_estudiante(f'est{i}')
+            Postulacion.objects.create(vacante=vacante, estudiante=estudiante, postulado_por=self.coordinador)
+            practica = crear_practica(estudiante, self.empresa, self.coordinador, docente)
+            Sustentacion.objects.create(
+                practica=practica, fecha_programada=timezone.now(), lugar='Aula 1',
+                jurado_1=docente, registrada_por=self.coordinador,
+            )
+        TutorEmpresarial.objects.create(
+            empresa=self.empresa, nombre_completo='Tutor', cargo='Líder', email='t@example.com', telefono='1'
+        )
+
+    def test_preparar_evita_consultas_por_fila(self):
+        for modelo, funcion in serializers.SERIALIZADORES.items():
+            with self.subTest(modelo=modelo.__name__):
+                queryset = serializers.preparar(modelo.objects.all())
+                with self.assertNumQueries(1):
+                    [funcion(objeto) for objeto in queryset]
+
+    def test_cache_por_objeto_segun_fecha_actualizacion(self):
+        def vacantes():
+            return serializers.serializar_lista(serializers.preparar(Vacante.objects.all()))
+
+        primera = vacantes()
+        vacante = Vacante.objects.get()
+        # Mismo pk y misma fecha_actualizacion: se reutiliza la salida guardada
+        Vacante.objects.update(titulo='Cambio sin save()')
+        self.assertEqual(vacantes(), primera)
+
+        vacante.titulo = 'Nuevo título'
+        vacante.save()
+        self.assertEqual(vacantes()[0]['titulo'], 'Nuevo título')
+
+        # Un objeto relacionado incluido en la salida también invalida la fila
+        self.empresa.razon_social = 'Empresa renombrada'
+        self.empresa.save()
+        self.assertEqual(vacantes()[0]['empresa']['razon_social'], 'Empresa renombrada')
+
+    def test_sin_relacion_cargada_no_se_usa_cache(self):
+        postulacion = Postulacion.objects.first()
+        self.assertIsNone(serializers.serialize_postulacion.registro.clave(postulacion))
+        self.assertEqual(
+            serializers.serializar_lista([postulacion])[0]['vacante']['empresa'],
+            self.empresa.razon_social,
+        )
+
+    def test_to_json(self):
+        Sustentacion.objects.update(calificacion='4.5')
+        fecha = timezone.now().replace(microsecond=0)
+        datos = json.loads(serializers.to_json({
+            'fecha': fecha, 'calificacion': Sustentacion.objects.first().calificacion, 1: 'uno',
+        }))
+        self.assertEqual(timezone.datetime.fromisoformat(datos['fecha']), fecha)
+        self.assertEqual(datos['calificacion'], '4.5')
+        self.assertEqual(datos['1'], 'uno')
+
+
+class GenerarDatosCargaTests(TestCase):
+    """Comando generate_load_dataset (datos_carga.py)"""
+
+    def generar(self, prefijo, semilla=7):
+        salida = StringIO()
+        call_command(
+            'generate_load_dataset', students=60, companies=6, coordinators=2,
+            seed=semilla, prefix=prefijo, batch_size=25, until=timezone.datetime(2026, 6, 30).date(),
+            stdout=salida,
+        )
+        return salida.getvalue()
+
+    def huella(self, prefijo):
+        """Datos generados sin ids ni identificadores con prefijo"""
+        estudiantes = Estudiante.objects.filter(codigo__startswith=prefijo.upper()).order_by('codigo')
+        return (
+            list(estudiantes.values_list('nombre_completo', 'programa_academico', 'estado', 'fecha_registro')),
+            [(codigo[len(prefijo):], estado, fecha) for codigo, estado, fecha in
+             Postulacion.objects.filter(estudiante__in=estudiantes)
+             .order_by('estudiante__codigo', 'fecha_postulacion')
+             .values_list('estudiante__codigo', 'estado', 'fecha_postulacion')],
+            Mensaje.objects.filter(practica__estudiante__in=estudiantes).count(),
+        )
+
+    def test_grafo_consistente(self):
+        salida = self.generar('uno')
+        self.assertIn('filas/s', salida)
+        self.assertEqual(Estudiante.objects.count(), 60)
+        self.assertTrue(PracticaEmpresarial.objects.exists())
+        self.assertTrue(SeguimientoSemanal.objects.exists())
+
+        from django.db.models import Count, F, Q
+
+        ocupados = Vacante.objects.annotate(
+            n=Count('practicas', filter=~Q(practicas__estado='CANCELADA'))
+        )
+        self.assertFalse(ocupados.exclude(n=F('cupos_ocupados')).exists())
+        self.assertFalse(Vacante.objects.filter(cupos_ocupados__gt=F('cantidad_cupos')).exists())
+        self.assertFalse(Vacante.objects.exclude(empresa__estado='APROBADA').exists())
+        self.assertFalse(PracticaEmpresarial.objects.exclude(empresa=F('vacante__empresa')).exists())
+        self.assertFalse(PracticaEmpresarial.objects.filter(estado='EN_CURSO')
+                         .exclude(estudiante__estado='EN_PRACTICA').exists())
+        self.assertFalse(Estudiante.objects.annotate(
+            activas=Count('postulaciones', filter=Q(postulaciones__estado__in=['POSTULADO', 'SELECCIONADO']))
+        ).filter(activas__gt=3).exists())
+        self.assertEqual(KpiSnapshot.objects.get(pk=1).diferencias(), {})
+
+    def test_determinista_por_semilla(self):
+        self.generar('uno')
+        self.generar('dos')
+        self.generar('tres', semilla=8)
+        self.assertEqual(self.huella('uno'), self.huella('dos'))
+        self.assertNotEqual(self.huella('uno'), self.huella('tres'))
+
+        with self.assertRaisesMessage(CommandError, 'prefijo "uno"'):
+            self.generar('uno')
+
+
+class RolesTests(TestCase):
+    """RolesMiddleware y config/roles.py"""
+
+    def setUp(self):
+        self.estudiante = crear_estudiante()
+        self.user = self.estudiante.user
+
+    def peticion(self):
+        request = RequestFactory().get('/')
+        request.user = User.objects.get(pk=self.user.pk)
+        request.session = self.client.session
+        return request
+
+    def test_una_consulta_y_perfiles_en_cache(self):
+        request = self.peticion()
+        with self.assertNumQueries(1):
+            resueltos = roles.resolver(request)
+        self.assertEqual(resueltos.disponibles, ['estudiante'])
+        with self.assertNumQueries(0):
+            self.assertEqual(request.user.estudiante, self.estudiante)
+            self.assertFalse(hasattr(request.user, 'coordinador'))
+            self.assertFalse(hasattr(request.user, 'docente_asesor'))
+
+    def test_sesion_e_invalidacion(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.session[roles.CLAVE_SESION]['roles'], ['estudiante'])
+
+        # Con los roles en sesión solo se une la tabla del perfil que existe
+        request = self.peticion()
+        self.assertIn(roles.CLAVE_SESION, request.session)
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertEqual(roles.resolver(request).disponibles, ['estudiante'])
+        self.assertEqual(len(consultas), 1)
+        self.assertNotIn('coordinacion_coordinador', consultas[0]['sql'])
+
+        DocenteAsesor.objects.create(
+            user=self.user, nombre_completo='Docente', email='d@example.com',
+            telefono='1', especialidad='Software',
+        )
+        self.assertEqual(roles.resolver(self.peticion()).disponibles, ['estudiante', 'docente'])
+
+        response = self.client.get(reverse('login_unificado'))
+        self.assertRedirects(response, reverse('seleccionar_rol'), fetch_redirect_response=False)
+        self.assertEqual(response.wsgi_request.roles.disponibles, ['estudiante', 'docente'])
+        self.assertEqual(self.client.session[roles.CLAVE_SESION]['roles'], ['estudiante', 'docente'])
+
+    def test_invalidacion_compartida_entre_procesos(self):
+        self.client.force_login(self.user)
+        request = self.peticion()
+
+        guardada = request.session[roles.CLAVE_SESION]['version']
+
+        # Otro trabajador borra el perfil: la versión está en la base de datos, no en su caché local
+        caches['default'].clear()
+        self.estudiante.delete()
+        version = VersionRoles.objects.get(usuario_id=self.user.pk).version
+        self.assertEqual(version, guardada + 1)
+
+        self.assertEqual(roles.resolver(request).disponibles, [])
+        self.assertEqual(request.session[roles.CLAVE_SESION]['version'], version)
+        # Con la sesión al día basta una consulta y no se vuelve a escribir
+        request.session.modified = False
+        with self.assertNumQueries(1):
+            self.assertEqual(roles.resolver(request).disponibles, [])
+        self.assertFalse(request.session.modified)
+
+    def test_decoradores_y_context_processors(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('estudiante:dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['estudiante_actual'], self.estudiante)
+        self.assertNotIn('coordinador', response.context)
+        self.assertEqual(self.client.get(reverse('coordinacion:dashboard')).status_code, 403)
+
+
+class AlmacenamientoDeduplicadoTests(TestCase):
+    """config/almacenamiento.py y comando deduplicate_media"""
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.media = directorio.name
+        ajustes = override_settings(MEDIA_ROOT=self.media)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+    def test_subidas_identicas_comparten_blob(self):
+        contenido = b'%PDF-1.4 camara de comercio' * 5000
+        primero = default_storage.save('empresas/documentos/rut.pdf', ContentFile(contenido))
+        segundo = default_storage.save('empresas/documentos/rut.pdf', ContentFile(contenido))
+        otro = default_storage.save('estudiantes/hojas_vida/hv.pdf', ContentFile(b'otro'))
+
+        self.assertNotEqual(primero, segundo)
+        self.assertTrue(os.path.samefile(default_storage.path(primero), default_storage.path(segundo)))
+        with default_storage.open(segundo) as fh:
+            self.assertEqual(fh.read(), contenido)
+
+        sha256 = hashlib.sha256(contenido).hexdigest()
+        self.assertEqual(default_storage.referencias(sha256), 2)
+
+        default_storage.delete(primero)
+        self.assertEqual(default_storage.referencias(sha256), 1)
+        default_storage.delete(segundo)
+        self.assertFalse(os.path.exists(default_storage.ruta_blob(sha256)))
+        self.assertTrue(default_storage.exists(otro))
+
+    def test_comando_migra_media_existente(self):
+        contenido = b'hoja de vida' * 1000
+        for nombre in ('estudiantes/hojas_vida/a.pdf', 'estudiantes/hojas_vida/b.pdf', 'mensajes/adjuntos/c.pdf'):
+            ruta = os.path.join(self.media, nombre)
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            with open(ruta, 'wb') as fh:
+                fh.write(contenido)
+
+        salida = StringIO()
+        call_command('deduplicate_media', dry_run=True, stdout=salida)
+        self.assertIn(f'({2 * len(contenido):,} bytes)', salida.getvalue())
+        self.assertEqual(os.stat(os.path.join(self.media, 'mensajes/adjuntos/c.pdf')).st_nlink, 1)
+
+        salida = StringIO()
+        call_command('deduplicate_media', stdout=salida)
+        self.assertIn(f'({2 * len(contenido):,} bytes)', salida.getvalue())
+        self.assertEqual(os.stat(os.path.join(self.media, 'mensajes/adjuntos/c.pdf')).st_nlink, 4)
+        with open(os.path.join(self.media, 'estudiantes/hojas_vida/b.pdf'), 'rb') as fh:
+            self.assertEqual(fh.read(), contenido)
+
+        salida = StringIO()
+        call_command('deduplicate_media', stdout=salida)
+        self.assertIn('(0 bytes)', salida.getvalue())
+
+
+class MiniaturasTests(TestCase):
+    """Miniaturas WebP de las fotos de perfil (miniaturas.py)"""
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        ajustes = override_settings(MEDIA_ROOT=directorio.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        self.estudiante = crear_estudiante()
+
+    def foto(self, nombre, color='red'):
+        from PIL import Image
+
+        salida = io.BytesIO()
+        Image.new('RGB', (640, 480), color).save(salida, 'JPEG')
+        return SimpleUploadedFile(nombre, salida.getvalue(), content_type='image/jpeg')
+
+    def test_genera_al_subir_y_borra_al_cambiar(self):
+        from PIL import Image
+
+        self.estudiante.foto_perfil = self.foto('ana.jpg')
+        self.estudiante.save()
+        cola.ejecutar_pendientes()
+        nombre = self.estudiante.foto_perfil.name
+        for tamano in miniaturas.TAMANOS:
+            with default_storage.open(miniaturas.nombre_miniatura(nombre, tamano)) as fh:
+                imagen = Image.open(fh)
+                self.assertEqual((imagen.format, imagen.size), ('WEBP', (tamano, tamano)))
+
+        estudiante = Estudiante.objects.get(pk=self.estudiante.pk)
+        estudiante.foto_perfil = self.foto('ana2.jpg', color='blue')
+        estudiante.save()
+        cola.ejecutar_pendientes()
+        self.assertFalse(miniaturas.disponible(nombre))
+        self.assertTrue(miniaturas.disponible(estudiante.foto_perfil.name))
+
+    def test_fotos_que_solo_difieren_en_la_extension(self):
+        jpg = default_storage.save('estudiantes/fotos_perfil/descargar.jpg', self.foto('descargar.jpg'))
+        png = default_storage.save('estudiantes/fotos_perfil/descargar.png', self.foto('descargar.png', 'blue'))
+        self.assertNotEqual(miniaturas.nombre_miniatura(jpg, 64), miniaturas.nombre_miniatura(png, 64))
+
+        miniaturas.generar(jpg)
+        miniaturas.generar(png)
+        # Borrar las miniaturas de una no toca las de la otra
+        miniaturas.eliminar(jpg)
+        self.assertFalse(miniaturas.disponible(jpg))
+        self.assertTrue(miniaturas.disponible(png))
+
+    def test_template_tag_y_backfill(self):
+        # Foto existente sin señales (como las subidas anteriores al cambio)
+        nombre = default_storage.save('estudiantes/fotos_perfil/vieja.jpg', self.foto('vieja.jpg'))
+        Estudiante.objects.filter(pk=self.estudiante.pk).update(foto_perfil=nombre)
+        estudiante = Estudiante.objects.get(pk=self.estudiante.pk)
+        plantilla = Template('{% load miniaturas %}<img {% foto_attrs e.foto_perfil 32 %}>')
+
+        self.assertEqual(plantilla.render(Context({'e': estudiante})), f'<img src="/media/{nombre}">')
+
+        salida = StringIO()
+        call_command('generate_thumbnails', stdout=salida)
+        self.assertIn('1 fotos procesadas', salida.getvalue())
+        html = plantilla.render(Context({'e': estudiante}))
+        self.assertIn('src="/media/miniaturas/estudiantes/fotos_perfil/vieja.jpg_32.webp"', html)
+        self.assertIn('vieja.jpg_64.webp 64w', html)
+        self.assertIn('sizes="32px"', html)
+
+        salida = StringIO()
+        call_command('generate_thumbnails', stdout=salida)
+        self.assertIn('0 fotos procesadas, 1 ya tenían miniaturas', salida.getvalue())
+
+
+@cola.tarea('prueba_falla')
+def tarea_que_falla(mensaje):
+    raise RuntimeError(mensaje)
+
+
+class ColaTareasTests(TestCase):
+    """Cola de tareas en segundo plano (cola.py, tareas.py, run_tasks)"""
+
+    def setUp(self):
+        self.coordinador = crear_coordinador()
+        self.estudiante = crear_estudiante()
+        self.vacante = crear_vacantes(crear_empresa(), self.coordinador, 1, cantidad_cupos=1)[0]
+        self.postulacion = Postulacion.objects.create(
+            estudiante=self.estudiante, vacante=self.vacante, postulado_por=self.coordinador,
+            estado='SELECCIONADO',
+        )
+        # Sin las tareas de afinidad que encolaron las señales al crear los datos
+        Tarea.objects.all().delete()
+        self.client.force_login(self.coordinador.user)
+
+    def test_aprobar_encola_y_el_trabajador_actualiza_al_estudiante(self):
+        url = reverse('coordinacion:postulacion_aprobar', args=[self.postulacion.id])
+        response = self.client.post(url, {'accion': 'aprobar'})
+        self.assertEqual(response.status_code, 302)
+
+        # Los cupos se descuentan en la petición; el estudiante, en segundo plano
+        self.vacante.refresh_from_db()
+        self.assertEqual((self.vacante.cupos_ocupados, self.vacante.estado), (1, 'OCUPADA'))
+        self.estudiante.refresh_from_db()
+        self.assertEqual(self.estudiante.estado, 'APTO')
+        self.assertEqual(
+            sorted(Tarea.objects.values_list('nombre', flat=True)),
+            ['estudiante_actualizar_estado', 'notificar_transicion'],
+        )
+
+        self.assertEqual(cola.ejecutar_pendientes(), 2)
+        self.estudiante.refresh_from_db()
+        self.assertEqual(self.estudiante.estado, 'EN_PRACTICA')
+        self.assertFalse(Tarea.objects.exclude(estado='COMPLETADA').exists())
+
+    def test_clave_de_idempotencia(self):
+        clave = f'postulacion:{self.postulacion.id}:VINCULADO:estudiante'
+        primera = cola.encolar('estudiante_actualizar_estado', clave=clave,
+                               estudiante_id=self.estudiante.id, estado='EN_PRACTICA')
+        segunda = cola.encolar('estudiante_actualizar_estado', clave=clave,
+                               estudiante_id=self.estudiante.id, estado='EN_PRACTICA')
+        self.assertEqual(primera.pk, segunda.pk)
+        self.assertEqual(Tarea.objects.count(), 1)
+        with self.assertRaises(ValueError):
+            cola.encolar('no_registrada')
+
+        # Terminada la tarea, la clave queda libre para la siguiente transición
+        cola.ejecutar_pendientes()
+        tercera = cola.encolar('estudiante_actualizar_estado', clave=clave,
+                               estudiante_id=self.estudiante.id, estado='EN_PRACTICA')
+        self.assertNotEqual(tercera.pk, primera.pk)
+        self.assertEqual(tercera.estado, 'PENDIENTE')
+
+    def aprobar(self):
+        url = reverse('coordinacion:postulacion_aprobar', args=[self.postulacion.id])
+        self.assertEqual(self.client.post(url, {'accion': 'aprobar'}).status_code, 302)
+
+    def desvincular(self):
+        url = reverse('coordinacion:postulacion_desvincular', args=[self.postulacion.id])
+        self.assertEqual(self.client.post(url, {'motivo': 'Cambio de empresa'}).status_code, 302)
+
+    def test_volver_a_aprobar_tras_desvincular(self):
+        self.aprobar()
+        cola.ejecutar_pendientes()
+        self.desvincular()
+        cola.ejecutar_pendientes()
+        self.estudiante.refresh_from_db()
+        self.assertEqual(self.estudiante.estado, 'APTO')
+
+        # La misma transición otra vez encola su propia tarea
+        self.aprobar()
+        cola.ejecutar_pendientes()
+        self.estudiante.refresh_from_db()
+        self.assertEqual(self.estudiante.estado, 'EN_PRACTICA')
+        self.assertEqual(Tarea.objects.filter(nombre='estudiante_actualizar_estado').count(), 3)
+
+    def test_cascada_de_una_transicion_ya_superada(self):
+        # Aprobar y desvincular antes de que corra el trabajador: la vinculación
+        # ya no está vigente y no deja al estudiante EN_PRACTICA
+        self.aprobar()
+        self.desvincular()
+        cola.ejecutar_pendientes()
+        self.estudiante.refresh_from_db()
+        self.assertEqual(self.estudiante.estado, 'APTO')
+
+    def test_cancelar_practica_pasa_por_la_cola(self):
+        self.aprobar()
+        cola.ejecutar_pendientes()
+        practica = crear_practica(self.estudiante, self.vacante.empresa, self.coordinador)
+
+        response = self.client.post(reverse('coordinacion:practica_cancelar', args=[practica.id]),
+                                    {'motivo_cancelacion': 'La empresa cerró la sede de la práctica'})
+        self.assertEqual(response.status_code, 302)
+        self.estudiante.refresh_from_db()
+        self.assertEqual(self.estudiante.estado, 'EN_PRACTICA')
+
+        cola.ejecutar_pendientes()
+        self.estudiante.refresh_from_db()
+        self.assertEqual(self.estudiante.estado, 'APTO')
+
+    def test_reintentos_y_pagina_de_tareas(self):
+        fallida = cola.encolar('prueba_falla', max_intentos=2, mensaje='sin conexión')
+
+        with self.assertLogs('coordinacion.cola', 'WARNING'):
+            self.assertEqual(cola.ejecutar_pendientes(), 1)
+        fallida.refresh_from_db()
+        self.assertEqual((fallida.estado, fallida.intentos), ('PENDIENTE', 1))
+        self.assertGreater(fallida.ejecutar_despues, timezone.now())
+        self.assertIn('sin conexión', fallida.ultimo_error)
+
+        # Vence la espera: segundo y último intento
+        Tarea.objects.filter(pk=fallida.pk).update(ejecutar_despues=timezone.now())
+        with self.assertLogs('coordinacion.cola', 'ERROR'):
+            cola.ejecutar_pendientes()
+        fallida.refresh_from_db()
+        self.assertEqual((fallida.estado, fallida.intentos), ('FALLIDA', 2))
+
+        response = self.client.get(reverse('coordinacion:tareas_lista'), {'estado': 'FALLIDA'})
+        self.assertContains(response, 'prueba_falla')
+        self.assertContains(response, 'sin conexión')
+
+        self.client.post(reverse('coordinacion:tarea_reintentar', args=[fallida.pk]))
+        fallida.refresh_from_db()
+        self.assertEqual((fallida.estado, fallida.intentos), ('PENDIENTE', 0))
+
+
+class PerfilSQLiteTests(TransactionTestCase):
+    """Pragmas de conexión y reintento de escrituras bloqueadas (config/basedatos.py)"""
+
+    def test_pragmas_al_conectar(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+    def pragmas(self, ruta, init_command):
+        """Abrir `ruta` con `init_command` y devolver (journal_mode, synchronous)"""
+        from django.db.backends.sqlite3.base import DatabaseWrapper
+        opciones = {**connection.settings_dict['OPTIONS'], 'init_command': init_command}
+        conexion = DatabaseWrapper({**connection.settings_dict, 'NAME': ruta, 'OPTIONS': opciones}, 'perfil')
+        try:
+            with conexion.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                modo = cursor.fetchone()[0]
+                cursor.execute('PRAGMA synchronous')
+                return modo, cursor.fetchone()[0]
+        finally:
+            conexion.close()
+
+    def test_wal_solo_fuera_de_la_base_versionada(self):
+        from django.conf import settings
+        self.assertFalse(settings.SQLITE_WAL)  # sin SQLITE_PATH: db.sqlite3 del repositorio
+
+        with tempfile.TemporaryDirectory() as directorio:
+            # La base versionada no cambia: la cabecera sigue en modo rollback (bytes 18-19 = 1)
+            copia = os.path.join(directorio, 'db.sqlite3')
+            with open(settings.SQLITE_VERSIONADA, 'rb') as origen, open(copia, 'wb') as destino:
+                destino.write(origen.read())
+            self.assertEqual(self.pragmas(copia, settings.DATABASES['default']['OPTIONS']['init_command'])[0],
+                             'delete')
+            with open(copia, 'rb') as archivo:
+                self.assertEqual(archivo.read(20)[18:20], b'\x01\x01')
+
+            # Perfil de producción (SQLITE_PATH fuera del repositorio)
+            produccion = os.path.join(directorio, 'produccion.sqlite3')
+            self.assertEqual(self.pragmas(produccion, settings.PRAGMAS_WAL + settings.PRAGMAS_SQLITE),
+                             ('wal', 1))  # synchronous NORMAL
+
+    @override_settings(BD_REINTENTO_BASE=0.001)
+    def test_reintenta_solo_bloqueos(self):
+        llamadas = []
+
+        @reintentar_bloqueos(intentos=3)
+        def escribir(error=None):
+            llamadas.append(connection.in_atomic_block)
+            crear_coordinador(f'coordinador{len(llamadas)}')
+            if error and len(llamadas) < 3:
+                raise OperationalError(error)
+            return len(llamadas)
+
+        with self.assertLogs('config.basedatos', 'WARNING'):
+            self.assertEqual(escribir('database is locked'), 3)
+        self.assertEqual(llamadas, [True, True, True])
+        # Los intentos fallidos se deshicieron
+        self.assertEqual(list(Coordinador.objects.values_list('user__username', flat=True)), ['coordinador3'])
+
+        llamadas.clear()
+        with self.assertRaises(OperationalError):
+            escribir('no such table: x')
+        self.assertEqual(len(llamadas), 1)
+
+
+class CuposConcurrenciaTests(TransactionTestCase):
+    """Reserva y liberación de cupos con varios coordinadores a la vez (cupos.py)"""
+
+    HILOS = 16
+    INTENTOS_POR_HILO = 4
+
+    def setUp(self):
+        self.coordinador = crear_coordinador()
+        self.vacante = crear_vacantes(crear_empresa(), self.coordinador, 1, cantidad_cupos=5)[0]
+        KpiSnapshot.reconstruir()
+
+    def en_paralelo(self, operacion, objeto=None):
+        """
+        Ejecutar `operacion` INTENTOS_POR_HILO veces desde HILOS hilos a la
+        vez, cada una en su transacción como en las vistas. Devuelve cuántas
+        veces devolvió True.
+        """
+        objeto = objeto or self.vacante
+        barrera = threading.Barrier(self.HILOS)
+
+        def hilo(_):
+            try:
+                # Cada hilo con su copia, leída antes de que los demás escriban
+                copia = type(objeto).objects.get(pk=objeto.pk)
+                barrera.wait()
+                exitos = 0
+                for _ in range(self.INTENTOS_POR_HILO):
+                    for _ in range(500):
+                        try:
+                            with transaction.atomic():
+                                resultado = operacion(copia)
+                        except OperationalError:
+                            # SQLite en memoria: la tabla está bloqueada por otro hilo
+                            time.sleep(0.001)
+                        else:
+                            exitos += resultado
+                            break
+                return exitos
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=self.HILOS) as pool:
+            return sum(pool.map(hilo, range(self.HILOS)))
+
+    def test_reservas_concurrentes_no_sobrepasan_la_vacante(self):
+        self.assertEqual(self.en_paralelo(cupos.reservar), 5)
+
+        self.vacante.refresh_from_db()
+        self.assertEqual((self.vacante.cupos_ocupados, self.vacante.estado), (5, 'OCUPADA'))
+        self.assertEqual(KpiSnapshot.obtener().diferencias(), {})
+
+    def test_liberaciones_concurrentes_no_bajan_de_cero(self):
+        Vacante.objects.filter(pk=self.vacante.pk).update(cupos_ocupados=5, estado='OCUPADA')
+        KpiSnapshot.reconstruir()
+
+        self.assertEqual(self.en_paralelo(cupos.liberar), 5)
+
+        self.vacante.refresh_from_db()
+        self.assertEqual((self.vacante.cupos_ocupados, self.vacante.estado), (0, 'DISPONIBLE'))
+        self.assertEqual(KpiSnapshot.obtener().diferencias(), {})
+
+    def test_aprobar_y_desvincular_la_misma_postulacion_a_la_vez(self):
+        postulacion = Postulacion.objects.create(
+            vacante=self.vacante, estudiante=crear_estudiante(), postulado_por=self.coordinador,
+            estado='SELECCIONADO',
+        )
+        KpiSnapshot.reconstruir()
+
+        # Todas las copias se leyeron SELECCIONADO; solo una la vincula y ocupa cupo
+        self.assertEqual(self.en_paralelo(cupos.vincular, postulacion), 1)
+        postulacion.refresh_from_db()
+        self.vacante.refresh_from_db()
+        self.assertEqual((postulacion.estado, self.vacante.cupos_ocupados), ('VINCULADO', 1))
+
+        self.assertEqual(self.en_paralelo(cupos.desvincular, postulacion), 1)
+        postulacion.refresh_from_db()
+        self.vacante.refresh_from_db()
+        self.assertEqual((postulacion.estado, self.vacante.cupos_ocupados), ('SELECCIONADO', 0))
+        self.assertEqual(KpiSnapshot.obtener().diferencias(), {})
+
+
+class AfinidadTests(TestCase):
+    """Índice de afinidad estudiante-vacante y recomendaciones (afinidad.py)"""
+
+    def setUp(self):
+        self.coordinador = crear_coordinador()
+        self.empresa = crear_empresa()
+        self.estudiante = crear_estudiante(semestre=7)
+        self.estudiante.habilidades = 'Python, Django y bases de datos'
+        self.estudiante.promedio_academico = '4.50'
+        self.estudiante.save()
+
+    def vacante(self, titulo, **extra):
+        vacante, = crear_vacantes(self.empresa, self.coordinador, 1, **extra)
+        vacante.titulo = titulo
+        vacante.save()  # bulk_create no dispara señales
+        cola.ejecutar_pendientes()
+        return vacante
+
+    def test_guardar_encola_el_recalculo(self):
+        vacante = self.vacante('afin', habilidades_requeridas='Python')
+        self.assertTrue(AfinidadVacante.objects.filter(vacante=vacante).exists())
+
+        # El guardado no recorre a los candidatos; varios seguidos encolan un solo recálculo
+        vacante.habilidades_requeridas = 'Java'
+        vacante.save()
+        vacante.semestre_minimo = 9
+        vacante.save()
+        vacante.save(update_fields=['titulo'])
+        self.assertTrue(AfinidadVacante.objects.filter(vacante=vacante).exists())
+        self.assertEqual(Tarea.objects.filter(nombre='afinidad_vacante', estado='PENDIENTE').count(), 1)
+
+        cola.ejecutar_pendientes()
+        self.assertFalse(AfinidadVacante.objects.filter(vacante=vacante).exists())
+
+    def test_indice_incremental_y_ranking(self):
+        afin = self.vacante('afin', habilidades_requeridas='Python, Django')
+        parcial = self.vacante('parcial', habilidades_requeridas='Python, Java, Kotlin')
+        self.vacante('otro programa', programa_academico='Contaduría Pública')
+        self.vacante('semestre alto', semestre_minimo=9)
+
+        self.assertEqual(
+            [v.titulo for v in afinidad.vacantes_recomendadas(self.estudiante)], ['afin', 'parcial']
+        )
+        fila = AfinidadVacante.objects.get(estudiante=self.estudiante, vacante=afin)
+        # programa 30 + semestre 20*3/5 + promedio 25*0.9 + habilidades 25*2/2
+        self.assertEqual((fila.puntaje, fila.habilidades_comunes), (90, 2))
+
+        self.client.force_login(self.estudiante.user)
+        response = self.client.get('/estudiante/dashboard/')
+        vacantes = json.loads(response.context['vacantes'])
+        self.assertEqual([(v['titulo'], v['afinidad']) for v in vacantes], [('afin', 90), ('parcial', 73)])
+
+        # Editar el perfil y cerrar una vacante recalculan sus filas
+        self.estudiante.habilidades = 'Java, Kotlin'
+        self.estudiante.save()
+        cola.ejecutar_pendientes()
+        self.assertEqual(
+            [v.titulo for v in afinidad.vacantes_recomendadas(self.estudiante)], ['parcial', 'afin']
+        )
+        parcial.estado = 'CERRADA'
+        parcial.save()
+        cola.ejecutar_pendientes()
+        self.assertFalse(AfinidadVacante.objects.filter(vacante=parcial).exists())
+
+    def test_senales_y_reconstruccion_comparan_igual_el_programa(self):
+        # Mayúsculas acentuadas: LIKE de SQLite solo las ignora en ASCII
+        self.estudiante.programa_academico = 'INGENIERÍA DE SOFTWARE'
+        self.estudiante.save()
+        cola.ejecutar_pendientes()
+        vacante = self.vacante('acentos', programa_academico='ingeniería de software')
+        por_senales = set(AfinidadVacante.objects.values_list('estudiante_id', 'vacante_id', 'puntaje'))
+        self.assertEqual({(e, v) for e, v, _ in por_senales}, {(self.estudiante.id, vacante.id)})
+
+        afinidad.reconstruir()
+        self.assertEqual(
+            set(AfinidadVacante.objects.values_list('estudiante_id', 'vacante_id', 'puntaje')), por_senales
+        )
+
+    def test_reconstruir_y_recomendados_para_coordinacion(self):
+        vacante, = crear_vacantes(self.empresa, self.coordinador, 1, habilidades_requeridas='Python')
+        otro = crear_estudiante('otro', semestre=5)
+        postulado = crear_estudiante('postulado', semestre=8)
+        en_practica = crear_estudiante('en_practica')
+        Estudiante.objects.filter(pk=en_practica.pk).update(estado='EN_PRACTICA')
+        Postulacion.objects.create(vacante=vacante, estudiante=postulado, postulado_por=self.coordinador)
+
+        salida = StringIO()
+        call_command('rebuild_match_index', stdout=salida)
+        self.assertIn('4 pares', salida.getvalue())
+        reconstruido = set(AfinidadVacante.objects.values_list('estudiante_id', 'vacante_id', 'puntaje'))
+        afinidad.actualizar_vacante(vacante.id)
+        self.assertEqual(
+            set(AfinidadVacante.objects.values_list('estudiante_id', 'vacante_id', 'puntaje')), reconstruido
+        )
+
+        self.client.force_login(self.coordinador.user)
+        url = reverse('coordinacion:api_vacante_recomendados', args=[vacante.id])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(sum('coordinacion_afinidadvacante' in q['sql'] for q in ctx.captured_queries), 1)
+        # Solo APTO y sin postular, el de mejor puntaje primero
+        self.assertEqual(
+            [e['id'] for e in response.json()['resultados']], [self.estudiante.id, otro.id]
+        )
+
+
+class BusquedaTests(TestCase):
+    """Índice de búsqueda de texto completo (busqueda.py)"""
+
+    def setUp(self):
+        self.coordinador = crear_coordinador()
+        self.empresa = crear_empresa()
+        self.client.force_login(self.coordinador.user)
+
+    def test_sin_tildes_por_prefijo_y_sincronizado(self):
+        estudiante = crear_estudiante('ana')
+        estudiante.nombre_completo = 'Ana María Gómez Peña'
+        estudiante.save()
+
+        def encontrados(texto):
+            return list(busqueda.filtrar(Estudiante.objects.all(), texto).values_list('id', flat=True))
+
+        self.assertEqual(encontrados('gomez pena'), [estudiante.id])
+        self.assertEqual(encontrados('MAR GÓM'), [estudiante.id])
+        self.assertEqual(encontrados('gomez lopez'), [])
+        self.assertEqual(encontrados('!!'), [])
+
+        estudiante.nombre_completo = 'Ana López'
+        estudiante.save(update_fields=['nombre_completo'])
+        self.assertEqual(encontrados('gomez'), [])
+        self.assertEqual(encontrados('lopez'), [estudiante.id])
+
+        estudiante.delete()
+        self.assertEqual(encontrados('lopez'), [])
+
+    def test_listados_usan_el_indice_y_la_empresa_se_propaga(self):
+        vacante = Vacante.objects.create(
+            empresa=self.empresa, creada_por=self.coordinador, titulo='Desarrollador backend',
+            area_practica='Software', descripcion='-', programa_academico='Ingeniería de Software',
+            semestre_minimo=5, horario='Diurno',
+        )
+        TutorEmpresarial.objects.create(
+            empresa=self.empresa, nombre_completo='Tutor Uno', cargo='Líder', email='t@example.com', telefono='1',
+        )
+
+        self.empresa.razon_social = 'Tecnología Andina'
+        self.empresa.save()
+
+        datos = self.client.get('/coordinacion/api/listas/vacantes/', {'buscar': 'tecnologia'}).json()
+        self.assertEqual([v['id'] for v in datos['resultados']], [vacante.id])
+        datos = self.client.get('/coordinacion/api/listas/tutores/', {'busqueda': 'andina'}).json()
+        self.assertEqual(len(datos['resultados']), 1)
+        datos = self.client.get('/coordinacion/api/listas/empresas/', {'buscar': 'andina backend'}).json()
+        self.assertEqual(datos['resultados'], [])
+
+    def test_busqueda_global_ordenada_por_relevancia(self):
+        self.empresa.razon_social = 'Datos Sur'
+        self.empresa.save()
+        Vacante.objects.create(
+            empresa=self.empresa, creada_por=self.coordinador, titulo='Analista de datos',
+            area_practica='Analítica', descripcion='-', programa_academico='Ingeniería de Software',
+            semestre_minimo=5, horario='Diurno',
+        )
+        estudiante = crear_estudiante('luis')
+
+        datos = self.client.get('/coordinacion/api/busqueda/', {'q': 'datos'}).json()
+        self.assertEqual([r['tipo'] for r in datos['resultados']], ['empresa', 'vacante'])
+        self.assertEqual(datos['resultados'][0]['url'], f'/coordinacion/empresas/{self.empresa.id}/')
+
+        datos = self.client.get('/coordinacion/api/busqueda/', {'q': 'LUIS', 'tipos': 'estudiante,otro'}).json()
+        self.assertEqual([r['id'] for r in datos['resultados']], [estudiante.id])
+        self.assertEqual(self.client.get('/coordinacion/api/busqueda/', {'q': 'x', 'limite': 'n'}).status_code, 400)
+
+
+class MigracionesIndicesTests(TransactionTestCase):
+    """Las migraciones de los índices los llenan con los datos que ya existían"""
+
+    def migrar(self, destino):
+        """Migrar coordinación a `destino` y devolver los modelos históricos de ese estado"""
+        from django.db.migrations.executor import MigrationExecutor
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([('coordinacion', destino)])
+        return executor.loader.project_state([('coordinacion', destino)]).apps
+
+    def tearDown(self):
+        call_command('migrate', 'coordinacion', verbosity=0)
+
+    def crear_datos(self, apps):
+        """Coordinador, empresa, vacante y estudiante creados con los modelos históricos"""
+        Usuario = apps.get_model('auth', 'User')
+        coordinador = apps.get_model('coordinacion', 'Coordinador').objects.create(
+            user=Usuario.objects.create(username='coordinador'), nombre_completo='Coordinador',
+            email='coordinador@example.com',
+        )
+        empresa = apps.get_model('coordinacion', 'Empresa').objects.create(
+            razon_social='Comercializadora Andina', nit='900000001', direccion='Calle 1', telefono='1',
+            email='empresa@example.com', ciudad='Armenia', representante_nombre='Rep',
+            representante_cargo='Gerente', representante_email='rep@example.com',
+            representante_telefono='1', estado='APROBADA',
+        )
+        vacante = apps.get_model('coordinacion', 'Vacante').objects.create(
+            empresa=empresa, creada_por=coordinador, titulo='Desarrollador', area_practica='Desarrollo',
+            descripcion='-', programa_academico='Ingeniería de Software', semestre_minimo=5,
+            horario='Diurno', estado='DISPONIBLE',
+        )
+        estudiante = apps.get_model('coordinacion', 'Estudiante').objects.create(
+            user=Usuario.objects.create(username='andres'), codigo='E1', nombre_completo='Andrés Gómez',
+            email='andres@example.com', telefono='1', programa_academico='INGENIERÍA DE SOFTWARE', semestre=6,
+        )
+        return empresa, vacante, estudiante
+
+    def test_afinidad_de_datos_anteriores(self):
+        _, vacante, estudiante = self.crear_datos(self.migrar('0011_tarea'))
+
+        apps = self.migrar('0012_afinidadvacante')
+        self.assertEqual(
+            list(apps.get_model('coordinacion', 'AfinidadVacante').objects.values_list('estudiante_id', 'vacante_id')),
+            [(estudiante.id, vacante.id)],
+        )
+
+    def test_busqueda_de_datos_anteriores(self):
+        empresa, vacante, estudiante = self.crear_datos(self.migrar('0012_afinidadvacante'))
+
+        apps = self.migrar('0013_busqueda')
+        empresas = apps.get_model('coordinacion', 'Empresa').objects.values_list('id', flat=True)
+        estudiantes = apps.get_model('coordinacion', 'Estudiante').objects.values_list('id', flat=True)
+        self.assertEqual(list(busqueda.filtrar(empresas, 'Comercializadora', 'empresa')), [empresa.id])
+        self.assertEqual(list(busqueda.filtrar(estudiantes, 'Andrés', 'estudiante')), [estudiante.id])
+        # La vacante lleva la razón social de su empresa
+        self.assertEqual([r['id'] for r in busqueda.buscar('andina', tipos=['vacante'])], [vacante.id])
@@ -18,6 +18,12 @@ urlpatterns = [
     # ============================================
     path('dashboard/', views.coordinador_dashboard, name='dashboard'),
 
+    # ============================================
+    # API DE LISTADOS ("Cargar más")
+    # ============================================
+    path('api/listas/<slug:nombre>/', views.api_lista, name='api_lista'),
+    path('api/busqueda/', views.api_busqueda, name='api_busqueda'),
+
     # ============================================
     # GESTIÓN DE EMPRESAS (RF-01)
     # ============================================
@@ -44,6 +50,9 @@ urlpatterns = [
     path('estudiantes/<int:estudiante_id>/', views.estudiante_detalle, name='estudiante_detalle'),
     path('postulaciones/', views.postulaciones_lista, name='postulaciones_lista'),
     path('postulaciones/crear/', views.postulacion_crear, name='postulacion_crear'),
+    path('api/vacantes/<int:vacante_id>/recomendados/', views.api_vacante_recomendados, name='api_vacante_recomendados'),
+    path('postulaciones/carga-masiva/', views.postulaciones_carga_masiva, name='postulaciones_carga_masiva'),
+    path('api/postulaciones/lote/', views.api_postulaciones_lote, name='api_postulaciones_lote'),
     path('postulaciones/<int:postulacion_id>/', views.postulacion_detalle, name='postulacion_detalle'),
     path('postulaciones/<int:postulacion_id>/aprobar/', views.postulacion_aprobar, name='postulacion_aprobar'),
     path('postulaciones/<int:postulacion_id>/crear-practica/', views.practica_crear_desde_postulacion, name='practica_crear_desde_postulacion'),
@@ -77,6 +86,7 @@ urlpatterns = [
     # GESTIÓN DE PRÁCTICAS
     # ============================================
     path('practicas/', views.practicas_lista, name='practicas_lista'),
+    path('practicas/asignacion-automatica/', views.practicas_asignacion_automatica, name='practicas_asignacion_automatica'),
     path('practicas/<int:practica_id>/', views.practica_detalle, name='practica_detalle'),
     path('practicas/<int:practica_id>/cerrar/', views.practica_cerrar, name='practica_cerrar'),
     path('practicas/<int:practica_id>/', views.practica_detalle, name='practica_detalle'),
@@ -99,6 +109,12 @@ urlpatterns = [
     # ============================================
     path('reportes/', views.reportes_dashboard, name='reportes_dashboard'),
 
+    # ============================================
+    # TAREAS EN SEGUNDO PLANO
+    # ============================================
+    path('tareas/', views.tareas_lista, name='tareas_lista'),
+    path('tareas/<int:tarea_id>/reintentar/', views.tarea_reintentar, name='tarea_reintentar'),
+
     # ============================================
     # PERFIL DE COORDINADOR
     # ============================================
@@ -3,15 +3,18 @@ from django.contrib.auth import login, logout
 from django.contrib import messages
 from django.db.models import Q, Count
 from django.utils import timezone
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.conf import settings
 from .forms import CoordinadorLoginForm, VacanteForm, PostulacionForm, TutorEmpresarialForm, \
-    SustentacionForm
+    SustentacionForm, PostulacionCSVForm
 from .models import (
     Coordinador, Empresa, Vacante, Estudiante, Postulacion,
     TutorEmpresarial, DocenteAsesor, PracticaEmpresarial,
-    Sustentacion, Evaluacion, SeguimientoSemanal
+    Sustentacion, Evaluacion, SeguimientoSemanal, KpiSnapshot
 )
-from . import serializers
+from . import serializers, asignacion, postulaciones_lote, listas, cola, cupos, afinidad, busqueda
+from config.basedatos import reintentar_bloqueos
+from config.roles import cargar as cargar_roles
 from .forms import SustentacionForm
 
 
@@ -26,7 +29,7 @@ def coordinador_login(request):
     """
     # Si ya está autenticado, verificar su rol
     if request.user.is_authenticated:
-        if hasattr(request.user, 'coordinador'):
+        if 'coordinador' in request.roles:
             # Es coordinador, redirigir a su dashboard
             return redirect('coordinacion:dashboard')
         else:
@@ -43,7 +46,7 @@ def coordinador_login(request):
             user = form.get_user()
 
             # Verificar que el usuario sea realmente un coordinador
-            if not hasattr(user, 'coordinador'):
+            if 'coordinador' not in cargar_roles(user):
                 messages.error(
                     request,
                     '❌ Esta cuenta no está registrada como coordinador. '
@@ -96,8 +99,8 @@ def coordinator_required(view_func):
         if not request.user.is_active:
             messages.error(request, 'Tu cuenta está desactivada')
             return HttpResponseForbidden('Cuenta inactiva')
-        # Si no tiene atributo 'coordinador', denegar acceso
-        if not hasattr(request.user, 'coordinador'):
+        # Si no tiene perfil de coordinador, denegar acceso
+        if 'coordinador' not in request.roles:
             messages.error(request, 'Acceso denegado: se requiere rol Coordinador')
             return HttpResponseForbidden('Acceso denegado')
         # Verificar que el rol activo de la sesión sea coordinador (si existe)
@@ -114,18 +117,18 @@ def coordinador_dashboard(request):
     """Dashboard principal del Coordinador Empresarial"""
 
     # Obtener el coordinador
-    coordinador = None
+    coordinador = request.roles.coordinador
     nombre_usuario = request.user.username
-    if hasattr(request.user, 'coordinador'):
-        coordinador = request.user.coordinador
+    if coordinador is not None:
         nombre_usuario = coordinador.nombre_completo
 
-    # Estadísticas para el dashboard
+    # Estadísticas para el dashboard (fila materializada, ver KpiSnapshot)
+    kpis = KpiSnapshot.obtener()
     stats = {
-        'empresas_activas': Empresa.objects.filter(estado='APROBADA').count(),
-        'vacantes_disponibles': Vacante.objects.filter(estado='DISPONIBLE').count(),
-        'estudiantes_en_practica': PracticaEmpresarial.objects.filter(estado='EN_CURSO').count(),
-        'postulaciones_pendientes': Postulacion.objects.filter(estado='POSTULADO').count(),
+        'empresas_activas': kpis.empresas_activas,
+        'vacantes_disponibles': kpis.vacantes_disponibles,
+        'estudiantes_en_practica': kpis.practicas_en_curso,
+        'postulaciones_pendientes': kpis.postulaciones_pendientes,
     }
 
     # Convertir stats a JSON para React
@@ -143,35 +146,62 @@ def coordinador_dashboard(request):
 
 
 # ============================================
-# GESTIÓN DE EMPRESAS (RF-01)
+# API DE LISTADOS ("Cargar más")
 # ============================================
 
 @coordinator_required
-def empresas_lista(request):
-    """Listar todas las empresas registradas"""
-    estado_filtro = request.GET.get('estado', '')
-    buscar = request.GET.get('buscar', '')
+def api_lista(request, nombre):
+    """
+    Página siguiente de un listado de coordinación (ver listas.py).
+    GET ?cursor=...&<filtros>&por_pagina=50 -> {"resultados": [...], "siguiente": cursor}
+    """
+    from django.http import Http404, HttpResponse, JsonResponse
+
+    lista = listas.LISTAS.get(nombre)
+    if lista is None:
+        raise Http404('Listado no encontrado')
 
-    empresas = Empresa.objects.all()
+    filtros = {clave: request.GET.get(clave, '') for clave in lista.filtros}
+    try:
+        por_pagina = int(request.GET.get('por_pagina') or listas.POR_PAGINA)
+        datos = lista.pagina(filtros, request.GET.get('cursor') or None, por_pagina)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
 
-    if estado_filtro:
-        empresas = empresas.filter(estado=estado_filtro)
+    return HttpResponse(serializers.to_json(datos), content_type='application/json')
 
-    if buscar:
-        empresas = empresas.filter(
-            Q(razon_social__icontains=buscar) |
-            Q(nit__icontains=buscar)
-        )
 
-    # Serializar empresas para React
-    empresas_json = serializers.to_json([
-        serializers.serialize_empresa(empresa) for empresa in empresas
-    ])
+BUSQUEDA_MAX_RESULTADOS = 50
+
+
+@coordinator_required
+def api_busqueda(request):
+    """
+    Búsqueda global por relevancia en empresas, vacantes, estudiantes,
+    tutores y docentes (ver busqueda.py).
+    GET ?q=...&tipos=vacante,empresa&limite=20 -> {"resultados": [...]}
+    """
+    from django.http import JsonResponse
+
+    texto = request.GET.get('q', '').strip()
+    tipos = [tipo for tipo in request.GET.get('tipos', '').split(',') if tipo] or None
+    try:
+        limite = min(int(request.GET.get('limite') or 20), BUSQUEDA_MAX_RESULTADOS)
+    except ValueError:
+        return JsonResponse({'error': 'limite debe ser un número'}, status=400)
+
+    return JsonResponse({'q': texto, 'resultados': busqueda.buscar(texto, tipos, max(limite, 1))})
+
+
+# ============================================
+# GESTIÓN DE EMPRESAS (RF-01)
+# ============================================
 
+@coordinator_required
+def empresas_lista(request):
+    """Listar las empresas registradas (primera página, el resto por api_lista)"""
     context = {
-        'empresas': empresas_json,
-        'estado_filtro': estado_filtro,
-        'buscar': buscar,
+        'empresas': listas.contexto_lista('empresas', request),
     }
 
     return render(request, 'coordinacion/empresas/lista.html', context)
@@ -214,7 +244,9 @@ def empresa_validar(request, empresa_id):
             empresa.fecha_aprobacion = timezone.now()
             empresa.aprobada_por = coordinador
             empresa.observaciones = observaciones if observaciones else 'Empresa aprobada correctamente'
-            empresa.save()
+            with transaction.atomic():
+                empresa.save()
+                encolar_notificacion(empresa, coordinador)
 
             messages.success(
                 request,
@@ -228,7 +260,9 @@ def empresa_validar(request, empresa_id):
 
             empresa.estado = 'RECHAZADA'
             empresa.observaciones = observaciones
-            empresa.save()
+            with transaction.atomic():
+                empresa.save()
+                encolar_notificacion(empresa, coordinador)
 
             messages.warning(
                 request,
@@ -247,22 +281,9 @@ def empresa_validar(request, empresa_id):
 
 @coordinator_required
 def vacantes_lista(request):
-    """Listar todas las vacantes"""
-    estado_filtro = request.GET.get('estado', '')
-
-    vacantes = Vacante.objects.select_related('empresa', 'creada_por').all()
-
-    if estado_filtro:
-        vacantes = vacantes.filter(estado=estado_filtro)
-
-    # ✅ CORRECCIÓN: Usar el serializador existente
-    vacantes_json = serializers.to_json([
-        serializers.serialize_vacante(vacante) for vacante in vacantes
-    ])
-
+    """Listar las vacantes (primera página, el resto por api_lista)"""
     context = {
-        'vacantes': vacantes_json,
-        'estado_filtro': estado_filtro,
+        'vacantes': listas.contexto_lista('vacantes', request),
     }
 
     return render(request, 'coordinacion/vacantes/lista.html', context)
@@ -332,7 +353,9 @@ def vacante_editar(request, vacante_id):
                     'postulaciones_count': postulaciones_count,
                 })
 
-            vacante = form.save()
+            # cupos_ocupados no se reescribe: lo llevan cupos.reservar/liberar
+            vacante = form.save(commit=False)
+            vacante.save(update_fields=[*form.Meta.fields, 'fecha_actualizacion'])
 
             messages.success(
                 request,
@@ -372,22 +395,14 @@ def vacante_detalle(request, vacante_id):
 
 @coordinator_required
 def estudiantes_lista(request):
-    """Listar estudiantes aptos para postular"""
-    estado_filtro = request.GET.get('estado', '')
-
-    estudiantes = Estudiante.objects.all()
-
-    if estado_filtro:
-        estudiantes = estudiantes.filter(estado=estado_filtro)
-
-    # Serializar estudiantes para React
-    estudiantes_json = serializers.to_json([
-        serializers.serialize_estudiante(estudiante) for estudiante in estudiantes
-    ])
+    """Listar estudiantes aptos para postular (primera página, el resto por api_lista)"""
+    programas = list(
+        Estudiante.objects.order_by('programa_academico')
+        .values_list('programa_academico', flat=True).distinct()
+    )
 
     context = {
-        'estudiantes': estudiantes_json,
-        'estado_filtro': estado_filtro,
+        'estudiantes': listas.contexto_lista('estudiantes', request, programas=programas),
     }
 
     return render(request, 'coordinacion/estudiantes/lista.html', context)
@@ -433,24 +448,9 @@ def estudiante_detalle(request, estudiante_id):
 
 @coordinator_required
 def postulaciones_lista(request):
-    """Listar todas las postulaciones"""
-    estado_filtro = request.GET.get('estado', '')
-
-    postulaciones = Postulacion.objects.select_related(
-        'estudiante', 'vacante', 'vacante__empresa'
-    ).all()
-
-    if estado_filtro:
-        postulaciones = postulaciones.filter(estado=estado_filtro)
-
-    # Serializar postulaciones para React
-    postulaciones_json = serializers.to_json([
-        serializers.serialize_postulacion(postulacion) for postulacion in postulaciones
-    ])
-
+    """Listar las postulaciones (primera página, el resto por api_lista)"""
     context = {
-        'postulaciones': postulaciones_json,
-        'estado_filtro': estado_filtro,
+        'postulaciones': listas.contexto_lista('postulaciones', request),
     }
 
     return render(request, 'coordinacion/postulaciones/lista.html', context)
@@ -491,6 +491,116 @@ def postulacion_crear(request):
     return render(request, 'coordinacion/postulaciones/crear.html', context)
 
 
+ESTUDIANTES_RECOMENDADOS = 10
+
+
+@coordinator_required
+def api_vacante_recomendados(request, vacante_id):
+    """
+    Estudiantes APTO más afines a la vacante (índice de afinidad), para el
+    formulario de postulación. GET -> {"resultados": [...]}
+    """
+    from django.http import JsonResponse
+
+    vacante = get_object_or_404(Vacante, id=vacante_id)
+    estudiantes = afinidad.estudiantes_recomendados(vacante).only(
+        'id', 'codigo', 'nombre_completo', 'programa_academico', 'semestre', 'promedio_academico'
+    )[:ESTUDIANTES_RECOMENDADOS]
+
+    return JsonResponse({'resultados': [
+        {
+            'id': estudiante.id,
+            'codigo': estudiante.codigo,
+            'nombre_completo': estudiante.nombre_completo,
+            'programa_academico': estudiante.programa_academico,
+            'semestre': estudiante.semestre,
+            'promedio_academico': estudiante.promedio_academico,
+            'afinidad': estudiante.afinidad,
+            'habilidades_comunes': estudiante.habilidades_comunes,
+        }
+        for estudiante in estudiantes
+    ]})
+
+
+@coordinator_required
+def postulaciones_carga_masiva(request):
+    """
+    RF-03 en lote: postular desde un CSV (vacante, estudiante, observaciones).
+    Todas las filas se validan juntas; las aceptadas se crean en una sola
+    transacción y se muestra el resultado fila por fila.
+    """
+    filas = []
+    resumen = None
+
+    if request.method == 'POST':
+        form = PostulacionCSVForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                registros = postulaciones_lote.leer_csv(form.cleaned_data['archivo'])
+                filas, creadas = postulaciones_lote.procesar(
+                    registros, request.user.coordinador,
+                    solo_validar=form.cleaned_data['solo_validar'],
+                )
+            except (ValueError, UnicodeDecodeError) as e:
+                messages.error(request, f'❌ {e}')
+            else:
+                resumen = postulaciones_lote.resumen(filas, creadas)
+                if creadas:
+                    messages.success(request, f'✅ {creadas} postulaciones creadas exitosamente')
+                if resumen['rechazadas']:
+                    messages.warning(request, f'{resumen["rechazadas"]} filas rechazadas, revisa el detalle')
+        else:
+            for field, errors in form.errors.items():
+                for error in errors:
+                    messages.error(request, f'❌ {error}')
+    else:
+        form = PostulacionCSVForm()
+
+    context = {
+        'form': form,
+        'filas': filas,
+        'resumen': resumen,
+    }
+
+    return render(request, 'coordinacion/postulaciones/carga_masiva.html', context)
+
+
+@coordinator_required
+def api_postulaciones_lote(request):
+    """
+    API de creación masiva de postulaciones.
+    POST JSON: {"postulaciones": [{"vacante", "estudiante", "observaciones"}], "solo_validar": false}
+    Responde el resumen y el resultado de cada fila.
+    """
+    import json
+    from django.http import JsonResponse
+
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Método no permitido'}, status=405)
+
+    try:
+        datos = json.loads(request.body)
+        registros = datos['postulaciones']
+        if not isinstance(registros, list) or not all(isinstance(r, dict) for r in registros):
+            raise ValueError
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse(
+            {'error': 'Se esperaba un JSON con la lista "postulaciones"'}, status=400
+        )
+
+    try:
+        filas, creadas = postulaciones_lote.procesar(
+            registros, request.user.coordinador, solo_validar=bool(datos.get('solo_validar'))
+        )
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({
+        'resumen': postulaciones_lote.resumen(filas, creadas),
+        'filas': [fila.como_dict() for fila in filas],
+    })
+
+
 @coordinator_required
 def postulacion_aprobar(request, postulacion_id):
     """
@@ -516,24 +626,34 @@ def postulacion_aprobar(request, postulacion_id):
 
         if accion == 'aprobar':
             # APROBAR Y VINCULAR
-            postulacion.estado = 'VINCULADO'
-            postulacion.fecha_respuesta = timezone.now()
-            postulacion.observaciones = observaciones if observaciones else 'Postulación aprobada y estudiante vinculado'
-            postulacion.save()
-
-            # Actualizar el estado del estudiante
-            postulacion.estudiante.estado = 'EN_PRACTICA'
-            postulacion.estudiante.save()
-
-            # Incrementar cupos ocupados de la vacante
-            vacante = postulacion.vacante
-            vacante.cupos_ocupados += 1
-
-            # Actualizar estado de la vacante si se llenaron todos los cupos
-            if vacante.cupos_ocupados >= vacante.cantidad_cupos:
-                vacante.estado = 'OCUPADA'
-
-            vacante.save()
+            @reintentar_bloqueos
+            def vincular():
+                # Estado y cupo con UPDATEs condicionales: un doble envío o dos
+                # coordinadores a la vez solo vinculan (y ocupan cupo) una vez
+                if not cupos.vincular(
+                    postulacion,
+                    fecha_respuesta=timezone.now(),
+                    observaciones=observaciones if observaciones else 'Postulación aprobada y estudiante vinculado',
+                ):
+                    return False
+
+                # El estado del estudiante se actualiza en segundo plano
+                encolar_estado_estudiante(postulacion, 'EN_PRACTICA')
+                encolar_notificacion(postulacion, coordinador)
+                return True
+
+            if not vincular():
+                if postulacion.estado != 'SELECCIONADO':
+                    messages.warning(
+                        request,
+                        f'Esta postulación ya fue procesada: está en estado "{postulacion.get_estado_display()}".'
+                    )
+                else:
+                    messages.error(
+                        request,
+                        f'❌ La vacante "{postulacion.vacante.titulo}" ya no tiene cupos disponibles'
+                    )
+                return redirect('coordinacion:postulaciones_lista')
 
             messages.success(
                 request,
@@ -558,12 +678,13 @@ def postulacion_aprobar(request, postulacion_id):
             postulacion.estado = 'RECHAZADO'
             postulacion.fecha_respuesta = timezone.now()
             postulacion.observaciones = observaciones
-            postulacion.save()
 
-            # El estudiante vuelve a estar APTO
-            if postulacion.estudiante.estado != 'EN_PRACTICA':
-                postulacion.estudiante.estado = 'APTO'
-                postulacion.estudiante.save()
+            with transaction.atomic():
+                postulacion.save()
+
+                # El estudiante vuelve a estar APTO (salvo que ya esté en práctica)
+                encolar_estado_estudiante(postulacion, 'APTO', excepto=['EN_PRACTICA'])
+                encolar_notificacion(postulacion, coordinador)
 
             messages.warning(
                 request,
@@ -621,6 +742,7 @@ def practica_crear_desde_postulacion(request, postulacion_id):
         activo=True
     )
     docentes = DocenteAsesor.objects.filter(activo=True)
+    docente_sugerido = asignacion.sugerir_docente(postulacion)
 
     if request.method == 'POST':
         tutor_id = request.POST.get('tutor_empresarial')
@@ -635,6 +757,7 @@ def practica_crear_desde_postulacion(request, postulacion_id):
                 'postulacion': postulacion,
                 'tutores': tutores,
                 'docentes': docentes,
+                'docente_sugerido': docente_sugerido,
             })
 
         if not docente_id:
@@ -643,6 +766,7 @@ def practica_crear_desde_postulacion(request, postulacion_id):
                 'postulacion': postulacion,
                 'tutores': tutores,
                 'docentes': docentes,
+                'docente_sugerido': docente_sugerido,
             })
 
         # Crear la práctica empresarial
@@ -677,6 +801,7 @@ def practica_crear_desde_postulacion(request, postulacion_id):
         'postulacion': postulacion,
         'tutores': tutores,
         'docentes': docentes,
+        'docente_sugerido': docente_sugerido,
     }
 
     return render(request, 'coordinacion/practicas/crear_desde_postulacion.html', context)
@@ -776,12 +901,12 @@ def postulacion_rechazar(request, postulacion_id):
         postulacion.estado = 'RECHAZADO'
         postulacion.fecha_respuesta = timezone.now()
         postulacion.observaciones = observaciones
-        postulacion.save()
 
-        # El estudiante vuelve a estar APTO
-        if postulacion.estudiante.estado != 'EN_PRACTICA':
-            postulacion.estudiante.estado = 'APTO'
-            postulacion.estudiante.save()
+        with transaction.atomic():
+            postulacion.save()
+
+            # El estudiante vuelve a estar APTO (salvo que ya esté en práctica)
+            encolar_estado_estudiante(postulacion, 'APTO', excepto=['EN_PRACTICA'])
 
         messages.warning(
             request,
@@ -833,33 +958,33 @@ def postulacion_desvincular(request, postulacion_id):
                 'practica_asociada': practica_asociada
             })
 
-        # Si existe una práctica asociada y se confirma cancelarla
-        if practica_asociada and cancelar_practica:
-            practica_asociada.estado = 'CANCELADA'
-            practica_asociada.fecha_fin_real = timezone.now().date()
-            practica_asociada.observaciones = f"{practica_asociada.observaciones or ''}\n\nCANCELADA: {motivo}"
-            practica_asociada.save()
-
-        # Desvincular la postulación (volver a SELECCIONADO)
-        postulacion.estado = 'SELECCIONADO'
-        postulacion.observaciones = f"{postulacion.observaciones or ''}\n\nDESVINCULADO: {motivo}"
-        postulacion.save()
-
-        # Actualizar estado del estudiante
-        # Si no tiene otras prácticas activas, volver a APTO
-        practicas_activas = PracticaEmpresarial.objects.filter(
-            estudiante=postulacion.estudiante,
-            estado='EN_CURSO'
-        ).exists()
+        observaciones = f"{postulacion.observaciones or ''}\n\nDESVINCULADO: {motivo}"
+
+        @reintentar_bloqueos
+        def desvincular():
+            # Desvincular la postulación (volver a SELECCIONADO) y liberar su cupo,
+            # solo si sigue VINCULADO: dos desvinculaciones no liberan dos cupos
+            if not cupos.desvincular(postulacion, observaciones=observaciones):
+                return False
 
-        if not practicas_activas:
-            postulacion.estudiante.estado = 'APTO'
-            postulacion.estudiante.save()
+            # Si existe una práctica asociada y se confirma cancelarla
+            if practica_asociada and cancelar_practica:
+                practica_asociada.estado = 'CANCELADA'
+                practica_asociada.fecha_fin_real = timezone.now().date()
+                practica_asociada.observaciones = f"{practica_asociada.observaciones or ''}\n\nCANCELADA: {motivo}"
+                practica_asociada.save()
 
-        # Liberar cupo de la vacante
-        if postulacion.vacante.cupos_ocupados > 0:
-            postulacion.vacante.cupos_ocupados -= 1
-            postulacion.vacante.save()
+            # El estudiante vuelve a APTO si no le queda una práctica en curso
+            # (lo comprueba la tarea al ejecutarse)
+            encolar_estado_estudiante(postulacion, 'APTO')
+            return True
+
+        if not desvincular():
+            messages.warning(
+                request,
+                f'Esta postulación ya fue desvinculada: está en estado "{postulacion.get_estado_display()}".'
+            )
+            return redirect('coordinacion:postulaciones_lista')
 
         messages.success(
             request,
@@ -883,47 +1008,19 @@ def postulacion_desvincular(request, postulacion_id):
 
 @coordinator_required
 def tutores_lista(request):
-    """Listar tutores empresariales con filtros"""
-    busqueda = request.GET.get('busqueda', '')
-    filtro_activo = request.GET.get('activo', '')
-    filtro_empresa = request.GET.get('empresa', '')
-
-    tutores = TutorEmpresarial.objects.select_related('empresa').all()
-
-    # Aplicar filtros
-    if filtro_activo != '':
-        activo = filtro_activo == 'true'
-        tutores = tutores.filter(activo=activo)
-
-    if filtro_empresa:
-        tutores = tutores.filter(empresa_id=filtro_empresa)
-
-    if busqueda:
-        tutores = tutores.filter(
-            Q(nombre_completo__icontains=busqueda) |
-            Q(cargo__icontains=busqueda) |
-            Q(email__icontains=busqueda) |
-            Q(empresa__razon_social__icontains=busqueda)
-        )
-
+    """Listar tutores empresariales con filtros (primera página, el resto por api_lista)"""
     # Obtener lista de empresas para el filtro
     empresas = Empresa.objects.filter(estado='APROBADA').order_by('razon_social')
 
-    # Serializar tutores para React
-    tutores_json = serializers.to_json([
-        serializers.serialize_tutor(tutor) for tutor in tutores
-    ])
-
     empresas_json = serializers.to_json([
         {'id': e.id, 'razon_social': e.razon_social} for e in empresas
     ])
 
+    empresas_con_tutor = TutorEmpresarial.objects.values('empresa').distinct().count()
+
     context = {
-        'tutores': tutores_json,
+        'tutores': listas.contexto_lista('tutores', request, empresas_con_tutor=empresas_con_tutor),
         'empresas': empresas_json,
-        'busqueda': busqueda,
-        'filtro_activo': filtro_activo,
-        'filtro_empresa': filtro_empresa,
     }
 
     return render(request, 'coordinacion/tutores/lista.html', context)
@@ -1090,38 +1187,82 @@ def practica_asignar(request, postulacion_id):
         'postulacion': postulacion,
         'tutores': tutores,
         'docentes': docentes,
+        'docente_sugerido': asignacion.sugerir_docente(postulacion),
     }
 
     return render(request, 'coordinacion/practicas/asignar.html', context)
 
 
-# ============================================
-# GESTIÓN DE PRÁCTICAS
-# ============================================
-
 @coordinator_required
-def practicas_lista(request):
-    """Listar todas las prácticas"""
-    estado_filtro = request.GET.get('estado', '')
+def practicas_asignacion_automatica(request):
+    """
+    Asignación automática de docentes asesores para las postulaciones
+    vinculadas sin práctica: GET muestra la propuesta (sin guardar nada),
+    POST crea las prácticas con los docentes propuestos.
+    """
+    postulaciones, docentes, propuesta = asignacion.proponer_para_postulaciones()
 
-    practicas = PracticaEmpresarial.objects.select_related(
-        'estudiante', 'empresa', 'tutor_empresarial', 'docente_asesor'
-    ).all()
+    if request.method == 'POST':
+        if not postulaciones:
+            messages.info(request, 'No hay postulaciones vinculadas pendientes de práctica')
+            return redirect('coordinacion:practicas_asignacion_automatica')
+        if not docentes:
+            messages.error(request, '❌ No hay docentes asesores activos para asignar')
+            return redirect('coordinacion:practicas_asignacion_automatica')
 
-    if estado_filtro:
-        practicas = practicas.filter(estado=estado_filtro)
+        from datetime import datetime
 
-    # Serializar prácticas para React
-    practicas_json = serializers.to_json([
-        serializers.serialize_practica(practica) for practica in practicas
-    ])
+        try:
+            fecha_inicio = datetime.strptime(request.POST.get('fecha_inicio', ''), '%Y-%m-%d').date()
+        except ValueError:
+            fecha_inicio = timezone.now().date()
+
+        creadas = asignacion.aplicar(postulaciones, propuesta, request.user.coordinador, fecha_inicio)
+        messages.success(request, f'✅ {len(creadas)} prácticas creadas con docente asesor asignado')
+        return redirect('coordinacion:practicas_lista')
 
-    print(f"DEBUG: Total prácticas: {practicas.count()}")  # ✅ AÑADIR ESTA LÍNEA PARA DEBUG
-    print(f"DEBUG: JSON generado: {practicas_json[:200]}")  # ✅ VER LOS PRIMEROS 200 CARACTERES
+    filas = [
+        {
+            'postulacion': postulacion,
+            'docente': docentes.get(propuesta.asignaciones.get(postulacion.id)),
+            'afin': postulacion.id in propuesta.afines,
+        }
+        for postulacion in postulaciones
+    ]
+    resumen_docentes = sorted(
+        (
+            {
+                'docente': docente,
+                'carga_actual': docente.practicas_activas,
+                'nuevas': propuesta.cargas[docente.id] - docente.practicas_activas,
+                'carga_final': propuesta.cargas[docente.id],
+            }
+            for docente in docentes.values()
+        ),
+        key=lambda fila: (-fila['carga_final'], fila['docente'].nombre_completo),
+    )
 
     context = {
-        'practicas': practicas_json,
-        'estado_filtro': estado_filtro,
+        'filas': filas,
+        'resumen_docentes': resumen_docentes,
+        'carga_maxima': propuesta.carga_maxima,
+        'total_afines': len(propuesta.afines),
+        'capacidad': getattr(settings, 'DOCENTE_MAX_PRACTICAS', 10),
+        'hoy': timezone.now().date(),
+    }
+
+    return render(request, 'coordinacion/practicas/asignacion_automatica.html', context)
+
+
+# ============================================
+# GESTIÓN DE PRÁCTICAS
+# ============================================
+
+@coordinator_required
+def practicas_lista(request):
+    """Listar las prácticas (primera página, el resto por api_lista)"""
+    context = {
+        'practicas': listas.contexto_lista('practicas', request),
     }
 
     return render(request, 'coordinacion/practicas/lista.html', context)
@@ -1189,23 +1330,16 @@ def practica_cancelar(request, practica_id):
         else:
             practica.observaciones = f"PRÁCTICA CANCELADA\nFecha: {timezone.now().strftime('%d/%m/%Y %H:%M')}\nMotivo: {motivo_cancelacion}"
 
-        practica.save()
+        with transaction.atomic():
+            practica.save()
 
-        # Actualizar estado del estudiante a APTO
-        estudiante = practica.estudiante
-        estudiante.estado = 'APTO'
-        estudiante.save()
+            # El estudiante vuelve a APTO (en segundo plano)
+            encolar_estado_estudiante(practica, 'APTO')
 
-        # Liberar cupo de la vacante
-        vacante = practica.vacante
-        if vacante and vacante.cupos_ocupados > 0:
-            vacante.cupos_ocupados -= 1
-
-            # Si la vacante estaba ocupada y ahora tiene cupos, cambiar a disponible
-            if vacante.estado == 'OCUPADA' and vacante.cupos_ocupados < vacante.cantidad_cupos:
-                vacante.estado = 'DISPONIBLE'
-
-            vacante.save()
+            # Liberar cupo de la vacante (vuelve a DISPONIBLE si estaba ocupada)
+            if practica.vacante:
+                cupos.liberar(practica.vacante)
+        estudiante = practica.estudiante
 
         messages.warning(
             request,
@@ -1239,11 +1373,13 @@ def practica_cerrar(request, practica_id):
     if request.method == 'POST' and puede_cerrar:
         practica.estado = 'FINALIZADA'
         practica.fecha_fin_real = timezone.now().date()
-        practica.save()
 
-        # Actualizar estado del estudiante
-        practica.estudiante.estado = 'FINALIZADO'
-        practica.estudiante.save()
+        with transaction.atomic():
+            practica.save()
+
+            # Actualizar estado del estudiante (en segundo plano)
+            encolar_estado_estudiante(practica, 'FINALIZADO')
+            encolar_notificacion(practica, request.user.coordinador)
 
         messages.success(request, f'Práctica de {practica.estudiante.nombre_completo} cerrada exitosamente')
         return redirect('coordinacion:practicas_lista')
@@ -1275,12 +1411,14 @@ def practica_finalizar(request, practica_id):
         # Finalizar la práctica
         practica.estado = 'FINALIZADA'
         practica.fecha_fin = timezone.now().date()
-        practica.save()
 
-        # Actualizar estado del estudiante
+        with transaction.atomic():
+            practica.save()
+
+            # Actualizar estado del estudiante (en segundo plano)
+            encolar_estado_estudiante(practica, 'FINALIZADO')
+            encolar_notificacion(practica, request.user.coordinador)
         estudiante = practica.estudiante
-        estudiante.estado = 'FINALIZADO'
-        estudiante.save()
 
         messages.success(
             request,
@@ -1303,34 +1441,9 @@ def practica_finalizar(request, practica_id):
 
 @coordinator_required
 def sustentaciones_lista(request):
-    """Listar sustentaciones con filtros"""
-    estado_filtro = request.GET.get('estado', '')
-    busqueda = request.GET.get('busqueda', '')
-
-    sustentaciones = Sustentacion.objects.select_related(
-        'practica', 'practica__estudiante', 'jurado_1', 'jurado_2', 'registrada_por'
-    ).all()
-
-    # Aplicar filtros
-    if estado_filtro:
-        sustentaciones = sustentaciones.filter(estado=estado_filtro)
-
-    if busqueda:
-        sustentaciones = sustentaciones.filter(
-            Q(practica__estudiante__nombre_completo__icontains=busqueda) |
-            Q(lugar__icontains=busqueda) |
-            Q(jurado_1__nombre_completo__icontains=busqueda)
-        )
-
-    # Serializar sustentaciones para React
-    sustentaciones_json = serializers.to_json([
-        serializers.serialize_sustentacion(sustentacion) for sustentacion in sustentaciones
-    ])
-
+    """Listar sustentaciones con filtros (primera página, el resto por api_lista)"""
     context = {
-        'sustentaciones': sustentaciones_json,
-        'estado_filtro': estado_filtro,
-        'busqueda': busqueda,
+        'sustentaciones': listas.contexto_lista('sustentaciones', request),
     }
 
     return render(request, 'coordinacion/sustentaciones/lista.html', context)
@@ -1551,7 +1664,9 @@ def sustentacion_aprobar(request, sustentacion_id):
                 else:
                     sustentacion.observaciones = observaciones
 
-            sustentacion.save()
+            with transaction.atomic():
+                sustentacion.save()
+                encolar_notificacion(sustentacion, request.user.coordinador)
 
             messages.success(
                 request,
@@ -1574,38 +1689,25 @@ def sustentacion_aprobar(request, sustentacion_id):
 def reportes_dashboard(request):
     """Dashboard de reportes e indicadores"""
 
-    # Estadísticas generales
+    # Estadísticas generales y empresas con más prácticas (fila materializada, ver KpiSnapshot)
+    kpis = KpiSnapshot.obtener()
     estadisticas = {
-        'total_empresas': Empresa.objects.count(),
-        'empresas_activas': Empresa.objects.filter(estado='APROBADA').count(),
-        'total_vacantes': Vacante.objects.count(),
-        'vacantes_disponibles': Vacante.objects.filter(estado='DISPONIBLE').count(),
-        'total_estudiantes': Estudiante.objects.count(),
-        'estudiantes_activos': Estudiante.objects.filter(estado='EN_PRACTICA').count(),
-        'practicas_finalizadas': PracticaEmpresarial.objects.filter(estado='FINALIZADA').count(),
-        'practicas_en_curso': PracticaEmpresarial.objects.filter(estado='EN_CURSO').count(),
+        'total_empresas': kpis.total_empresas,
+        'empresas_activas': kpis.empresas_activas,
+        'total_vacantes': kpis.total_vacantes,
+        'vacantes_disponibles': kpis.vacantes_disponibles,
+        'total_estudiantes': kpis.total_estudiantes,
+        'estudiantes_activos': kpis.estudiantes_activos,
+        'practicas_finalizadas': kpis.practicas_finalizadas,
+        'practicas_en_curso': kpis.practicas_en_curso,
     }
 
-    # Empresas con más prácticas
-    empresas_top = Empresa.objects.annotate(
-        num_practicas=Count('practicas')
-    ).order_by('-num_practicas')[:5]
-
     # ✅ CORRECCIÓN: Usar serialización consistente
     import json
     from django.core.serializers.json import DjangoJSONEncoder
 
     estadisticas_json = json.dumps(estadisticas, cls=DjangoJSONEncoder)
-    empresas_top_json = json.dumps([
-        {
-            'id': empresa.id,
-            'razon_social': empresa.razon_social,
-            'nit': empresa.nit,
-            'ciudad': empresa.ciudad,
-            'num_practicas': empresa.num_practicas
-        }
-        for empresa in empresas_top
-    ], cls=DjangoJSONEncoder)
+    empresas_top_json = json.dumps(kpis.empresas_top, cls=DjangoJSONEncoder)
 
     context = {
         'estadisticas': estadisticas_json,
@@ -1638,3 +1740,69 @@ def perfil_coordinador(request):
         'form': form
     }
     return render(request, 'coordinacion/perfil.html', context)
+
+
+# ============================================
+# TAREAS EN SEGUNDO PLANO (cola.py)
+# ============================================
+
+TAREAS_POR_PAGINA = 50
+
+
+def encolar_estado_estudiante(objeto, estado, excepto=()):
+    """
+    Encolar la cascada de la transición de `objeto` (postulación o práctica,
+    ya guardada con su nuevo estado) al estado de su estudiante. La tarea
+    comprueba que `objeto` siga en ese estado antes de escribir.
+    """
+    modelo = objeto._meta.model_name
+    cola.encolar(
+        'estudiante_actualizar_estado', clave=f'{modelo}:{objeto.pk}:{objeto.estado}:estudiante',
+        estudiante_id=objeto.estudiante_id, estado=estado, excepto=list(excepto),
+        origen=[modelo, objeto.pk, objeto.estado],
+    )
+
+
+def encolar_notificacion(objeto, coordinador):
+    """Encolar la notificación del cambio de estado de `objeto` (tarea notificar_transicion)"""
+    modelo = objeto._meta.model_name
+    cola.encolar(
+        'notificar_transicion', clave=f'{modelo}:{objeto.pk}:{objeto.estado}:notificacion',
+        modelo=modelo, objeto_id=objeto.pk, estado=objeto.estado, coordinador_id=coordinador.pk,
+    )
+
+
+@coordinator_required
+def tareas_lista(request):
+    """Estado de la cola: totales por estado y últimas tareas (filtrables por estado y nombre)"""
+    from django.core.paginator import Paginator
+    from .models import Tarea
+
+    totales = dict(Tarea.objects.order_by().values_list('estado').annotate(total=Count('id')))
+    tareas = Tarea.objects.order_by('-id')
+    estado = request.GET.get('estado', '')
+    nombre = request.GET.get('nombre', '')
+    if estado:
+        tareas = tareas.filter(estado=estado)
+    if nombre:
+        tareas = tareas.filter(nombre=nombre)
+
+    context = {
+        'totales': [(clave, etiqueta, totales.get(clave, 0)) for clave, etiqueta in Tarea.ESTADOS],
+        'nombres': sorted(cola.TAREAS),
+        'page_obj': Paginator(tareas, TAREAS_POR_PAGINA).get_page(request.GET.get('page')),
+        'estado': estado,
+        'nombre': nombre,
+    }
+    return render(request, 'coordinacion/tareas/lista.html', context)
+
+
+@coordinator_required
+def tarea_reintentar(request, tarea_id):
+    """Volver a encolar una tarea fallida"""
+    if request.method == 'POST':
+        if cola.reintentar(tarea_id):
+            messages.success(request, f'✅ Tarea #{tarea_id} encolada de nuevo')
+        else:
+            messages.warning(request, f'La tarea #{tarea_id} no está fallida o su clave ya tiene otra tarea en cola')
+    return redirect('coordinacion:tareas_lista')
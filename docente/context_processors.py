@@ -2,6 +2,8 @@
 Context processors para docentes
 Inyecta datos del docente en todos los templates automáticamente
 """
+from config import roles
+
 
 def docente_data(request):
     """
@@ -10,8 +12,9 @@ def docente_data(request):
     """
     context = {}
 
-    if request.user.is_authenticated and hasattr(request.user, 'docente_asesor'):
-        context['docente_actual'] = request.user.docente_asesor
+    docente = roles.obtener(request).docente
+    if docente is not None:
+        context['docente_actual'] = docente
 
     return context
 
@@ -6,7 +6,10 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
 from django.db.models import Q, Count
+from django.http import HttpResponse, JsonResponse
 from coordinacion.models import DocenteAsesor, PracticaEmpresarial, SeguimientoSemanal, Estudiante
+from coordinacion import chat_pubsub, lectura, sondeo
+from config.basedatos import escribir
 
 
 @login_required
@@ -30,6 +33,9 @@ def dashboard_docente(request):
         estado='PENDIENTE'
     ).select_related('practica__estudiante').order_by('-fecha_registro')
 
+    # Mensajes sin leer de cada estudiante
+    practicas_activas = lectura.anotar_no_leidos(practicas_activas, docente.user_id)
+
     # Estadísticas
     total_practicas = practicas_activas.count()
     total_pendientes = seguimientos_pendientes.count()
@@ -66,6 +72,9 @@ def mis_estudiantes(request):
     if estado_filtro:
         practicas = practicas.filter(estado=estado_filtro)
 
+    # Mensajes sin leer de cada estudiante
+    practicas = lectura.anotar_no_leidos(practicas, docente.user_id)
+
     context = {
         'docente': docente,
         'practicas': practicas,
@@ -209,7 +218,7 @@ def revisar_seguimiento(request, seguimiento_id):
         seguimiento.calificacion = calificacion
         seguimiento.observaciones_docente = observaciones
         seguimiento.fecha_revision_docente = timezone.now()
-        seguimiento.save()
+        escribir(seguimiento.save)
 
         # Mensaje de confirmación
         if msg_type == 'success':
@@ -295,26 +304,22 @@ def chat_con_estudiante(request, practica_id):
         messages.error(request, 'No tienes un perfil de Docente Asesor.')
         return redirect('login_unificado')
 
-    # Obtener la práctica
+    # Obtener la práctica (con su último mensaje)
     practica = get_object_or_404(
-        PracticaEmpresarial,
+        PracticaEmpresarial.objects.select_related('conversacion'),
         id=practica_id,
         docente_asesor=docente
     )
 
     estudiante = practica.estudiante
 
-    # Obtener mensajes de esta práctica (últimos 100)
-    mensajes_list = list(Mensaje.objects.filter(
+    # Página más reciente del historial (las anteriores se piden con ?before_id=)
+    mensajes_list, hay_anteriores = sondeo.historial(lectura.anotar_leido(Mensaje.objects.filter(
         practica=practica
-    ).select_related('remitente').order_by('fecha_envio')[:100])
+    )).select_related('remitente'))
 
-    # Marcar como leídos los mensajes del estudiante
-    Mensaje.objects.filter(
-        practica=practica,
-        remitente=estudiante.user,
-        leido=False
-    ).update(leido=True, fecha_lectura=timezone.now())
+    # Marcar la conversación como leída (avanza el cursor de lectura)
+    lectura.avanzar(practica.id, request.user.id, sondeo.ultimo_mensaje(practica)[0])
 
     # Obtener ID del último mensaje
     ultimo_mensaje_id = mensajes_list[-1].id if mensajes_list else 0
@@ -325,6 +330,7 @@ def chat_con_estudiante(request, practica_id):
         'estudiante': estudiante,
         'mensajes': mensajes_list,
         'ultimo_mensaje_id': ultimo_mensaje_id,
+        'hay_anteriores': hay_anteriores,
     }
 
     return render(request, 'docente/chat.html', context)
@@ -362,7 +368,8 @@ def enviar_mensaje_docente(request):
         return JsonResponse({'error': 'Debes escribir un mensaje o adjuntar un archivo'}, status=400)
 
     # Crear el mensaje
-    mensaje = Mensaje.objects.create(
+    mensaje = escribir(
+        Mensaje.objects.create,
         practica=practica,
         remitente=request.user,
         contenido=contenido,
@@ -383,7 +390,11 @@ def enviar_mensaje_docente(request):
 
 @login_required
 def obtener_mensajes_docente(request):
-    """AJAX: Obtener nuevos mensajes"""
+    """
+    AJAX: Obtener nuevos mensajes (?practica_id=&ultimo_id=&visible=0|1) o una
+    página anterior del historial (?practica_id=&before_id=). Sin novedades
+    responde 304 o una lista vacía sin consultar Mensaje (ver coordinacion/sondeo.py)
+    """
     from django.http import JsonResponse
     from coordinacion.models import Mensaje
 
@@ -397,54 +408,63 @@ def obtener_mensajes_docente(request):
     if not practica_id:
         return JsonResponse({'error': 'practica_id requerido'}, status=400)
 
-    # Obtener la práctica
+    # Obtener la práctica (con su último mensaje)
     practica = get_object_or_404(
-        PracticaEmpresarial,
+        PracticaEmpresarial.objects.select_related('conversacion'),
         id=practica_id,
         docente_asesor=docente
     )
 
-    # Obtener ID del último mensaje que tiene el cliente
-    ultimo_id = request.GET.get('ultimo_id', 0)
+    mensajes = lectura.anotar_leido(Mensaje.objects.filter(
+        practica=practica
+    )).select_related('remitente__estudiante', 'remitente__docente_asesor')
 
-    # Obtener mensajes nuevos
-    mensajes = Mensaje.objects.filter(
-        practica=practica,
-        id__gt=ultimo_id
-    ).select_related('remitente').order_by('fecha_envio')
+    return sondeo.responder(request, practica, mensajes)
 
-    # Marcar como leídos los mensajes del estudiante
-    Mensaje.objects.filter(
-        practica=practica,
-        remitente=practica.estudiante.user,
-        leido=False,
-        id__gt=ultimo_id
-    ).update(leido=True, fecha_lectura=timezone.now())
-
-    mensajes_data = []
-    for mensaje in mensajes:
-        # Obtener foto de perfil del remitente
-        foto_perfil_url = None
-        if hasattr(mensaje.remitente, 'estudiante') and mensaje.remitente.estudiante.foto_perfil:
-            foto_perfil_url = mensaje.remitente.estudiante.foto_perfil.url
-        elif hasattr(mensaje.remitente, 'docente_asesor') and mensaje.remitente.docente_asesor.foto_perfil:
-            foto_perfil_url = mensaje.remitente.docente_asesor.foto_perfil.url
-
-        mensajes_data.append({
-            'id': mensaje.id,
-            'contenido': mensaje.contenido,
-            'fecha_envio': mensaje.fecha_envio.strftime('%d/%m/%Y %H:%M'),
-            'remitente': mensaje.remitente.username,
-            'remitente_nombre': (
-                mensaje.remitente.estudiante.nombre_completo
-                if hasattr(mensaje.remitente, 'estudiante')
-                else mensaje.remitente.docente_asesor.nombre_completo
-            ),
-            'remitente_foto': foto_perfil_url,
-            'es_mio': mensaje.remitente == request.user,
-            'archivo': mensaje.archivo_adjunto.url if mensaje.archivo_adjunto else None,
-            'leido': mensaje.leido,
-        })
 
-    return JsonResponse({'mensajes': mensajes_data})
+@login_required
+def bandeja_docente(request):
+    """
+    AJAX: resumen de todas las conversaciones del docente en una llamada
+    (no leídos, último id y vista previa por práctica EN_CURSO). El widget
+    pide los mensajes solo de la conversación abierta si su último id cambió
+    """
+    try:
+        docente = request.user.docente_asesor
+    except DocenteAsesor.DoesNotExist:
+        return JsonResponse({'conversaciones': [], 'total_no_leidos': 0})
+
+    conversaciones = sondeo.bandeja(docente)
+    reciente = max((c['fecha_ultimo'] for c in conversaciones if c['fecha_ultimo']), default=None)
+    espera = sondeo.proximo_sondeo_ms(reciente, visible=request.GET.get('visible') != '0')
+
+    response = JsonResponse({
+        'conversaciones': conversaciones,
+        'total_no_leidos': sum(c['no_leidos'] for c in conversaciones),
+        'next_poll_ms': espera,
+    })
+    response['X-Next-Poll-Ms'] = espera
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@login_required
+def stream_mensajes_docente(request):
+    """SSE: mensajes nuevos del chat con un estudiante en cuanto se envían"""
+    try:
+        docente = request.user.docente_asesor
+    except DocenteAsesor.DoesNotExist:
+        return HttpResponse(status=204)
+
+    practica_id = request.GET.get('practica_id')
+    if not practica_id:
+        return JsonResponse({'error': 'practica_id requerido'}, status=400)
+
+    practica = get_object_or_404(
+        PracticaEmpresarial.objects.only('id'),
+        id=practica_id,
+        docente_asesor=docente
+    )
+
+    return chat_pubsub.stream_mensajes(request, practica, chat_pubsub.ultimo_id_cliente(request))
 
@@ -24,5 +24,7 @@ urlpatterns = [
     # Chat con Estudiantes (con parámetros query)
     path('chat/enviar/', docente_views.enviar_mensaje_docente, name='enviar_mensaje'),
     path('chat/mensajes/', docente_views.obtener_mensajes_docente, name='obtener_mensajes'),
+    path('chat/bandeja/', docente_views.bandeja_docente, name='bandeja'),
+    path('chat/stream/', docente_views.stream_mensajes_docente, name='stream_mensajes'),
 ]
 
@@ -0,0 +1,73 @@
+"""
+Benchmark de la asignación automática de docentes asesores
+
+Genera en memoria 5.000 solicitudes y 200 docentes con especialidades y
+áreas de práctica aleatorias (semilla fija) y mide coordinacion.asignacion.proponer.
+No usa la base de datos: mide solo el algoritmo, que es lo que crece con el
+tamaño del lote (la carga de postulaciones y docentes son dos consultas).
+
+Uso:
+    python scripts/bench_asignacion.py
+    python scripts/bench_asignacion.py --practicas 20000 --docentes 500
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+import django
+django.setup()
+
+from coordinacion.asignacion import Candidato, Solicitud, proponer
+
+AREAS = [
+    'Desarrollo de Software', 'Redes y Telecomunicaciones', 'Bases de Datos',
+    'Seguridad Informática', 'Inteligencia Artificial', 'Gestión de Proyectos TI',
+    'Soporte Técnico', 'Análisis de Datos', 'Infraestructura Cloud', 'Calidad de Software',
+    'Contabilidad', 'Mercadeo Digital', 'Talento Humano', 'Logística',
+]
+
+LIMITE_SEGUNDOS = 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--practicas', type=int, default=5000)
+    parser.add_argument('--docentes', type=int, default=200)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    rnd = random.Random(42)
+    solicitudes = [Solicitud(i, rnd.choice(AREAS)) for i in range(args.practicas)]
+
+    tiempos = []
+    for _ in range(args.repeticiones):
+        candidatos = [
+            Candidato(i, rnd.choice(AREAS), rnd.randint(0, 5)) for i in range(args.docentes)
+        ]
+        inicial = max(c.carga for c in candidatos)
+        inicio = time.perf_counter()
+        propuesta = proponer(solicitudes, candidatos)
+        tiempos.append(time.perf_counter() - inicio)
+
+    ideal = -(-(args.practicas + sum(c.carga for c in candidatos)) // args.docentes)
+    mejor = min(tiempos)
+    print(f'{args.practicas} prácticas / {args.docentes} docentes, {args.repeticiones} repeticiones')
+    print(f'  tiempo mínimo   {mejor * 1000:8.1f} ms')
+    print(f'  tiempo mediano  {sorted(tiempos)[len(tiempos) // 2] * 1000:8.1f} ms')
+    print(f'  carga máxima    {propuesta.carga_maxima:8d} (ideal {max(ideal, inicial)}, inicial {inicial})')
+    print(f'  por afinidad    {len(propuesta.afines) / args.practicas:8.1%}')
+
+    if mejor >= LIMITE_SEGUNDOS:
+        print(f'❌ Supera el objetivo de {LIMITE_SEGUNDOS:.0f} s')
+        sys.exit(1)
+    print(f'✅ Dentro del objetivo de {LIMITE_SEGUNDOS:.0f} s')
+
+
+if __name__ == '__main__':
+    main()
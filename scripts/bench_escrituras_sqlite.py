@@ -0,0 +1,175 @@
+"""
+Benchmark de escrituras concurrentes en SQLite: configuración anterior vs perfil actual
+
+Crea dos bases de datos temporales y lanza N escritores (hilos) que repiten
+una transacción parecida a enviar un mensaje de chat: leer la conversación,
+insertar el mensaje y actualizar la conversación. Cada transacción se trata
+como una petición: al terminar se cierra la conexión si CONN_MAX_AGE lo pide
+(lo que hace Django en request_finished).
+
+    antes     journal por defecto, sin busy_timeout propio, transacciones
+              DEFERRED, una conexión por petición y sin reintentos
+    despues   DATABASES['default'] de config/settings.py con el perfil de
+              producción (WAL, pragmas, IMMEDIATE, conexiones persistentes)
+              + config/basedatos.py
+
+Reporta transacciones por segundo, errores "database is locked" y latencia
+p50/p95 de las que terminaron bien.
+
+Uso:
+    python scripts/bench_escrituras_sqlite.py
+    python scripts/bench_escrituras_sqlite.py --escritores 32 --transacciones 200
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+from django.conf import settings  # noqa: E402
+
+DIRECTORIO = tempfile.mkdtemp(prefix='bench_escrituras_')
+PERFILES = {
+    'antes': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(DIRECTORIO, 'antes.sqlite3'),
+    },
+    'despues': {
+        **settings.DATABASES['default'],
+        'NAME': os.path.join(DIRECTORIO, 'despues.sqlite3'),
+        # Base fuera del repositorio: lleva WAL como en producción (SQLITE_PATH)
+        'OPTIONS': {
+            **settings.DATABASES['default']['OPTIONS'],
+            'init_command': settings.PRAGMAS_WAL + settings.PRAGMAS_SQLITE,
+        },
+    },
+}
+settings.DATABASES.update(PERFILES)
+
+import django  # noqa: E402
+django.setup()
+
+from django.db import OperationalError, connections, transaction  # noqa: E402
+
+from config.basedatos import es_bloqueo, reintentar_bloqueos  # noqa: E402
+
+CONVERSACIONES = 50
+
+
+def percentil(valores, p):
+    """Percentil por rango más cercano"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[max(0, min(len(ordenados) - 1, round(p / 100 * len(ordenados) + 0.5) - 1))]
+
+
+def preparar(alias):
+    with connections[alias].cursor() as cursor:
+        cursor.execute('CREATE TABLE conversacion (id INTEGER PRIMARY KEY, mensajes INTEGER NOT NULL, ultimo TEXT)')
+        cursor.execute(
+            'CREATE TABLE mensaje (id INTEGER PRIMARY KEY AUTOINCREMENT, conversacion_id INTEGER NOT NULL, '
+            'contenido TEXT NOT NULL, fecha REAL NOT NULL)'
+        )
+        cursor.execute('CREATE INDEX mensaje_conversacion ON mensaje (conversacion_id, id)')
+        cursor.executemany('INSERT INTO conversacion (id, mensajes) VALUES (%s, 0)',
+                           [(i,) for i in range(CONVERSACIONES)])
+    connections[alias].close()
+
+
+def enviar(alias, conversacion, contenido):
+    """Leer y luego escribir en la misma transacción (como Mensaje.objects.create + señales)"""
+    with transaction.atomic(using=alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT mensajes FROM conversacion WHERE id = %s', [conversacion])
+            cursor.fetchone()
+            cursor.execute('INSERT INTO mensaje (conversacion_id, contenido, fecha) VALUES (%s, %s, %s)',
+                           [conversacion, contenido, time.time()])
+            cursor.execute('UPDATE conversacion SET mensajes = mensajes + 1, ultimo = %s WHERE id = %s',
+                           [contenido, conversacion])
+
+
+def escritor(alias, numero, transacciones, reintentar, inicio, resultados):
+    operacion = reintentar_bloqueos(enviar, using=alias) if reintentar else enviar
+    latencias, errores = [], 0
+    inicio.wait()
+    for i in range(transacciones):
+        t0 = time.perf_counter()
+        try:
+            operacion(alias, (numero * transacciones + i) % CONVERSACIONES, f'mensaje {numero}-{i}')
+            latencias.append((time.perf_counter() - t0) * 1000)
+        except OperationalError as e:
+            if not es_bloqueo(e):
+                raise
+            errores += 1
+        finally:
+            # Fin de la "petición": Django cierra la conexión si CONN_MAX_AGE venció
+            connections[alias].close_if_unusable_or_obsolete()
+    connections[alias].close()
+    resultados.append((latencias, errores))
+
+
+def medir(alias, escritores, transacciones):
+    preparar(alias)
+    reintentar = alias == 'despues'
+    inicio = threading.Barrier(escritores + 1)
+    resultados = []
+    hilos = [
+        threading.Thread(target=escritor, args=(alias, n, transacciones, reintentar, inicio, resultados))
+        for n in range(escritores)
+    ]
+    for hilo in hilos:
+        hilo.start()
+    inicio.wait()
+    t0 = time.perf_counter()
+    for hilo in hilos:
+        hilo.join()
+    segundos = time.perf_counter() - t0
+
+    latencias = [ms for lista, _ in resultados for ms in lista]
+    errores = sum(e for _, e in resultados)
+    with connections[alias].cursor() as cursor:
+        cursor.execute('SELECT COUNT(*) FROM mensaje')
+        guardados = cursor.fetchone()[0]
+        cursor.execute('PRAGMA journal_mode')
+        modo = cursor.fetchone()[0]
+    connections[alias].close()
+    return {
+        'modo': modo,
+        'ok': len(latencias),
+        'errores': errores,
+        'guardados': guardados,
+        'segundos': segundos,
+        'tps': len(latencias) / segundos,
+        'p50': percentil(latencias, 50),
+        'p95': percentil(latencias, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--escritores', type=int, default=32)
+    parser.add_argument('--transacciones', type=int, default=100, help='Transacciones por escritor')
+    args = parser.parse_args()
+
+    print(f'{args.escritores} escritores x {args.transacciones} transacciones (SQLite en {DIRECTORIO})')
+    print(f'{"perfil":<10}{"journal":>9}{"ok":>8}{"errores":>9}{"tx/s":>10}{"p50 ms":>9}{"p95 ms":>9}')
+    try:
+        for alias in PERFILES:
+            r = medir(alias, args.escritores, args.transacciones)
+            assert r['guardados'] == r['ok'], 'transacciones confirmadas que no quedaron guardadas'
+            print(f'{alias:<10}{r["modo"]:>9}{r["ok"]:>8}{r["errores"]:>9}{r["tps"]:>10.0f}'
+                  f'{r["p50"]:>9.1f}{r["p95"]:>9.1f}')
+    finally:
+        shutil.rmtree(DIRECTORIO, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark antes/después de los bundles JSX precompilados
+
+Renderiza dashboard, empresas y postulaciones de coordinación con Babel en el
+navegador (JSX_BUNDLES_ENABLED=False) y con los bundles de build_jsx, y
+reporta los bytes que descarga el navegador por página (HTML + scripts) y
+cuánto JSX queda por transpilar en el cliente.
+
+Los tamaños de los scripts de unpkg se consultan por red; sin conexión se
+reportan como "n/d". El tiempo hasta el primer render depende del navegador:
+medirlo con Lighthouse/DevTools sobre las mismas páginas.
+
+Uso:
+    python manage.py build_jsx
+    python scripts/bench_jsx_bundles.py
+"""
+import os
+import re
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+import django
+django.setup()
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.staticfiles import finders
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment
+from coordinacion.models import Coordinador
+
+PAGINAS = [
+    ('dashboard', '/coordinacion/dashboard/'),
+    ('empresas', '/coordinacion/empresas/'),
+    ('postulaciones', '/coordinacion/postulaciones/'),
+]
+
+SCRIPT_SRC = re.compile(r'<script[^>]*\ssrc="([^"]+)"')
+BABEL_BLOCK = re.compile(r'<script type="text/babel">(.*?)</script>', re.S)
+
+_tamanos = {}
+
+
+def tamano_recurso(src):
+    """Bytes de un script: archivo local para /static/, petición HEAD para CDN"""
+    if src in _tamanos:
+        return _tamanos[src]
+
+    tamano = None
+    if src.startswith(settings.STATIC_URL) or src.startswith('/' + settings.STATIC_URL):
+        ruta = finders.find(src.split(settings.STATIC_URL, 1)[1])
+        tamano = os.path.getsize(ruta) if ruta else None
+    else:
+        try:
+            req = urllib.request.Request(src, method='HEAD')
+            with urllib.request.urlopen(req, timeout=5) as resp:
+                tamano = int(resp.headers.get('Content-Length') or 0) or None
+        except Exception:
+            tamano = None
+
+    _tamanos[src] = tamano
+    return tamano
+
+
+def medir(client, url):
+    inicio = time.perf_counter()
+    response = client.get(url)
+    render_ms = (time.perf_counter() - inicio) * 1000
+    html = response.content.decode('utf-8')
+
+    scripts = SCRIPT_SRC.findall(html)
+    tamanos = [tamano_recurso(src) for src in scripts]
+    desconocidos = sum(1 for t in tamanos if t is None)
+    jsx_cliente = sum(len(b.encode('utf-8')) for b in BABEL_BLOCK.findall(html))
+
+    return {
+        'html': len(response.content),
+        'scripts': sum(t for t in tamanos if t),
+        'desconocidos': desconocidos,
+        'jsx_cliente': jsx_cliente,
+        'render_ms': render_ms,
+    }
+
+
+def main():
+    setup_test_environment()
+    nombre_db = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = User.objects.create_user('bench_coord', password='bench')
+        Coordinador.objects.create(user=user, nombre_completo='Bench Coord', email='bench@example.com')
+        client = Client()
+        client.force_login(user)
+
+        print(f"{'página':<14} {'modo':<8} {'HTML':>9} {'scripts':>11} {'JSX cliente':>12} {'servidor':>10}")
+        for nombre, url in PAGINAS:
+            for modo, habilitado in (('babel', False), ('bundles', True)):
+                with override_settings(JSX_BUNDLES_ENABLED=habilitado):
+                    m = medir(client, url)
+                scripts = f"{m['scripts']} B" + (f" (+{m['desconocidos']} n/d)" if m['desconocidos'] else '')
+                print(
+                    f"{nombre:<14} {modo:<8} {m['html']:>7} B {scripts:>11} "
+                    f"{m['jsx_cliente']:>10} B {m['render_ms']:>7.1f} ms"
+                )
+    finally:
+        connection.creation.destroy_test_db(nombre_db, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+"""
+Benchmark de las vistas más usadas con django.test.Client
+
+Crea una base de datos de prueba, la llena con generate_load_dataset
+(coordinacion/datos_carga.py, semilla fija) y recorre cada vista con el
+usuario que la usa. Por vista reporta:
+    - latencia p50/p95/p99 (petición completa, middlewares incluidos);
+    - consultas SQL y tiempo en SQL/plantillas (InstrumentacionMiddleware);
+    - memoria pico de Python durante una petición (tracemalloc).
+
+El resultado se guarda en JSON y se compara con la base guardada
+(scripts/bench_vistas_base.json): falla si alguna vista hace más consultas
+o si su p95 o su memoria pico superan la base en más del umbral.
+
+Uso:
+    python scripts/bench_vistas.py
+    python scripts/bench_vistas.py --estudiantes 20000 --empresas 800 --iteraciones 50
+    python scripts/bench_vistas.py --guardar-base      # actualizar la base tras un cambio aceptado
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+import django
+django.setup()
+
+from django.db import connection
+from django.db.models import Count, Q
+from django.test import Client
+from django.test.utils import setup_test_environment
+from coordinacion.datos_carga import GeneradorDatos, Volumen
+from coordinacion.models import Coordinador, DocenteAsesor, PracticaEmpresarial
+
+BASE = os.path.join(ROOT, 'scripts', 'bench_vistas_base.json')
+SALIDA = os.path.join(ROOT, 'bench_vistas.json')
+
+# Fecha fija: con la misma semilla los datos son idénticos entre ejecuciones
+FECHA_DATOS = date(2026, 6, 30)
+
+# (nombre, rol, url); {practica} es la práctica del estudiante medido
+VISTAS = [
+    ('coordinador_dashboard', 'coordinador', '/coordinacion/dashboard/'),
+    ('postulaciones_lista', 'coordinador', '/coordinacion/postulaciones/'),
+    ('docentes_asesores_lista', 'coordinador', '/coordinacion/docentes-asesores/'),
+    ('reportes_dashboard', 'coordinador', '/coordinacion/reportes/'),
+    ('vacantes_disponibles', 'estudiante', '/estudiante/vacantes/'),
+    ('mis_estudiantes', 'docente', '/docente/mis-estudiantes/'),
+    ('chat_estudiante', 'estudiante', '/estudiante/chat/'),
+    ('chat_mensajes_estudiante', 'estudiante', '/estudiante/chat/mensajes/?ultimo_id=0'),
+    ('chat_mensajes_docente', 'docente', '/docente/chat/mensajes/?practica_id={practica}&ultimo_id=0'),
+]
+
+# Diferencias absolutas que se consideran ruido aunque superen el umbral relativo
+HOLGURA = {'p95_ms': 2.0, 'memoria_pico_kb': 64}
+
+
+def percentil(valores, p):
+    """Percentil por rango más cercano"""
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, round(p / 100 * len(ordenados) + 0.5) - 1))
+    return ordenados[indice]
+
+
+def usuarios():
+    """Coordinador, y el docente con más prácticas en curso con uno de sus estudiantes"""
+    coordinador = Coordinador.objects.order_by('id').first()
+    docente = DocenteAsesor.objects.annotate(
+        en_curso=Count('practicas_asesoradas', filter=Q(practicas_asesoradas__estado='EN_CURSO'))
+    ).order_by('-en_curso', 'id').first()
+    practica = PracticaEmpresarial.objects.filter(
+        docente_asesor=docente, estado='EN_CURSO'
+    ).annotate(total=Count('mensajes')).order_by('-total', 'id').select_related('estudiante__user').first()
+    if practica is None:
+        raise SystemExit('❌ El conjunto de datos no tiene prácticas en curso; aumenta --estudiantes')
+
+    clientes = {}
+    for rol, user in (('coordinador', coordinador.user), ('docente', docente.user),
+                      ('estudiante', practica.estudiante.user)):
+        clientes[rol] = Client()
+        clientes[rol].force_login(user)
+    return clientes, practica
+
+
+def medir(client, url, iteraciones, calentamiento):
+    for _ in range(calentamiento):
+        client.get(url)
+
+    tiempos = []
+    for _ in range(iteraciones):
+        inicio = time.perf_counter()
+        response = client.get(url)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        if response.status_code != 200:
+            raise SystemExit(f'❌ {url} respondió {response.status_code}')
+    medicion = response.wsgi_request.medicion
+
+    gc.collect()
+    tracemalloc.start()
+    client.get(url)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'p50_ms': round(percentil(tiempos, 50), 2),
+        'p95_ms': round(percentil(tiempos, 95), 2),
+        'p99_ms': round(percentil(tiempos, 99), 2),
+        'consultas': medicion.consultas,
+        'sql_ms': round(medicion.sql_ms, 2),
+        'plantillas_ms': round(medicion.plantillas_ms, 2),
+        'memoria_pico_kb': round(pico / 1024, 1),
+        'bytes': len(response.content),
+    }
+
+
+def comparar(resultado, base, umbral):
+    """Lista de regresiones respecto a la base"""
+    regresiones = []
+    for vista, actual in resultado['vistas'].items():
+        previo = base['vistas'].get(vista)
+        if previo is None:
+            continue
+        if actual['consultas'] > previo['consultas']:
+            regresiones.append(f"{vista}: {actual['consultas']} consultas (base {previo['consultas']})")
+        for metrica, holgura in HOLGURA.items():
+            limite = previo[metrica] * (1 + umbral) + holgura
+            if actual[metrica] > limite:
+                regresiones.append(
+                    f'{vista}: {metrica} {actual[metrica]} (base {previo[metrica]}, límite {limite:.1f})'
+                )
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--estudiantes', type=int, default=2000)
+    parser.add_argument('--empresas', type=int, default=80)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--iteraciones', type=int, default=30)
+    parser.add_argument('--calentamiento', type=int, default=3)
+    parser.add_argument('--umbral', type=float, default=0.25,
+                        help='Regresión relativa tolerada en p95 y memoria (0.25 = 25%%)')
+    parser.add_argument('--base', default=BASE, help='JSON de referencia')
+    parser.add_argument('--salida', default=SALIDA, help='Dónde guardar el resultado')
+    parser.add_argument('--guardar-base', action='store_true', help='Guardar el resultado como nueva base')
+    parser.add_argument('--solo', nargs='*', help='Medir solo estas vistas')
+    args = parser.parse_args()
+
+    # Una línea de log por petición distorsionaría las latencias
+    logging.getLogger('config.instrumentacion').setLevel(logging.ERROR)
+    setup_test_environment(debug=False)
+    nombre_db = connection.creation.create_test_db(verbosity=0)
+    try:
+        volumen = Volumen(estudiantes=args.estudiantes, empresas=args.empresas)
+        inicio = time.perf_counter()
+        reporte = GeneradorDatos(volumen, semilla=args.semilla, prefijo='bench', hasta=FECHA_DATOS).generar()
+        print(f'Datos: {reporte.total:,} filas en {time.perf_counter() - inicio:.1f} s '
+              f'({args.estudiantes} estudiantes, {args.empresas} empresas, semilla {args.semilla})')
+
+        clientes, practica = usuarios()
+        resultado = {
+            'entorno': {
+                'estudiantes': args.estudiantes, 'empresas': args.empresas, 'semilla': args.semilla,
+                'iteraciones': args.iteraciones, 'motor': connection.vendor,
+                'python': platform.python_version(), 'django': django.get_version(),
+            },
+            'vistas': {},
+        }
+
+        print(f"{'vista':<26} {'p50':>8} {'p95':>8} {'p99':>8} {'SQL':>5} {'sql ms':>8} "
+              f"{'tpl ms':>8} {'mem KB':>9}")
+        for nombre, rol, url in VISTAS:
+            if args.solo and nombre not in args.solo:
+                continue
+            m = medir(clientes[rol], url.format(practica=practica.id), args.iteraciones, args.calentamiento)
+            resultado['vistas'][nombre] = m
+            print(f"{nombre:<26} {m['p50_ms']:>8.1f} {m['p95_ms']:>8.1f} {m['p99_ms']:>8.1f} "
+                  f"{m['consultas']:>5} {m['sql_ms']:>8.1f} {m['plantillas_ms']:>8.1f} "
+                  f"{m['memoria_pico_kb']:>9.1f}")
+    finally:
+        connection.creation.destroy_test_db(nombre_db, verbosity=0)
+
+    with open(args.salida, 'w', encoding='utf-8') as fh:
+        json.dump(resultado, fh, indent=2, ensure_ascii=False)
+    print(f'Resultado en {os.path.relpath(args.salida, ROOT)}')
+
+    if args.guardar_base:
+        with open(args.base, 'w', encoding='utf-8') as fh:
+            json.dump(resultado, fh, indent=2, ensure_ascii=False)
+            fh.write('\n')
+        print(f'✅ Base actualizada: {os.path.relpath(args.base, ROOT)}')
+        return
+
+    if not os.path.exists(args.base):
+        print('Sin base para comparar (usa --guardar-base)')
+        return
+
+    with open(args.base, encoding='utf-8') as fh:
+        base = json.load(fh)
+    claves = ('estudiantes', 'empresas', 'semilla')
+    if any(base['entorno'].get(c) != resultado['entorno'][c] for c in claves):
+        print('❌ La base se midió con otro volumen de datos; usa los mismos parámetros o --guardar-base')
+        sys.exit(2)
+
+    regresiones = comparar(resultado, base, args.umbral)
+    if regresiones:
+        print(f'❌ {len(regresiones)} regresiones respecto a la base (umbral {args.umbral:.0%}):')
+        for regresion in regresiones:
+            print(f'  {regresion}')
+        sys.exit(1)
+    print(f'✅ Sin regresiones respecto a la base (umbral {args.umbral:.0%})')
+
+
+if __name__ == '__main__':
+    main()